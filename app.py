@@ -4,19 +4,19 @@ from decimal import Decimal
 from pathlib import Path
 
 from src.loaders import (
-    load_employees, load_contracts, load_leave_stocks, load_timesheet,
-    load_timesheet_folder, validate_input_folder, find_file, find_timesheet_dir,
-    find_leave_stocks_for_month,
+    load_employees, load_contracts, load_leave_stocks, load_timesheet_file,
+    validate_input_folder, find_file, find_timesheet_dir,
+    find_leave_stocks_for_month, holiday_override_files, read_holiday_overrides,
 )
+from src.cache import default_cache_dir
 from src.calculators import PayrollEngine
+from src.context import PayrollContext
+from src.fingerprint import file_fingerprint, files_fingerprint
 from src.models import LeaveStock
 from src.rates import KenyanHolidays
+from src.artifacts import PayrollArtifacts
 from src.outputs import (
     PayslipRenderer,
-    BankFileGenerator,
-    KRAReturnGenerator,
-    NSSFReturnGenerator,
-    SHAReturnGenerator,
     save_payroll_outputs,
     save_leave_stocks,
     upload_leave_stocks_to_gsheet,
@@ -37,8 +37,25 @@ input_folder = st.sidebar.text_input(
 )
 st.session_state["input_folder"] = input_folder
 
+# Gazetted holiday overrides in the folder, read once per version of its
+# public_holidays*.tsv files and passed to the payroll through its
+# PayrollContext, never installed process-wide: other sessions of this
+# server may be looking at other folders.
+@st.cache_data(max_entries=16)
+def _holiday_overrides(folder_str, fingerprint):
+    return read_holiday_overrides(folder_str)
+
+
+def load_holidays(folder_str):
+    """The folder's holiday overrides, and their files' fingerprints."""
+    fingerprints = {p: file_fingerprint(p) for p in holiday_override_files(folder_str)}
+    return (_holiday_overrides(folder_str, files_fingerprint(folder_str, fingerprints)),
+            fingerprints)
+
+
 # Validate folder
 folder_valid = False
+holiday_overrides, holiday_fingerprints = (), {}
 if input_folder:
     folder_path = Path(input_folder)
     is_valid, messages = validate_input_folder(folder_path)
@@ -48,19 +65,33 @@ if input_folder:
         else:
             st.sidebar.error(msg)
     folder_valid = is_valid
+    if folder_valid:
+        holiday_overrides, holiday_fingerprints = load_holidays(input_folder)
 else:
     st.sidebar.info("Enter a folder path to begin")
 
+# Where computed payslips are cached between runs. They are employee data,
+# so by default they go to the user's own cache directory, not beside the
+# inputs (which may be a shared or synced folder).
+cache_folder = st.sidebar.text_input(
+    "Result cache folder",
+    value=st.session_state.get("cache_folder", str(default_cache_dir())),
+    help="Payslips computed by earlier runs are reused from here. Leave empty "
+         "to compute every payslip afresh and keep nothing on disk.",
+)
+st.session_state["cache_folder"] = cache_folder
+
 # Select payroll month
 st.sidebar.header("Payroll Period")
 year = st.sidebar.selectbox("Year", options=[2025, 2026, 2027], index=1)
 month = st.sidebar.selectbox("Month", options=list(range(1, 13)), index=1, format_func=lambda m: date(2000, m, 1).strftime("%B"))
 
 payroll_date = date(year, month, 28)  # Use 28th as safe end-of-month
+ctx = PayrollContext.for_date(payroll_date, holiday_overrides=holiday_overrides)
 
 # Show month info
-working_days = KenyanHolidays.count_working_days(year, month)
-holidays = KenyanHolidays.get_holidays_for_month(year, month)
+working_days = KenyanHolidays.count_working_days(year, month, overrides=holiday_overrides)
+holidays = ctx.holidays
 st.sidebar.caption(f"Working days: {working_days}")
 if holidays:
     holiday_list = ", ".join(h.name + (" *" if h.is_estimated else "") for h in holidays)
@@ -69,26 +100,56 @@ if holidays:
         st.sidebar.caption("* estimated date")
 
 
-@st.cache_data
-def load_data(folder_str, year, month):
+# Each loader is cached on the fingerprint of the file it reads (see
+# src/fingerprint.py), so an edited TSV is reloaded on the next rerun and
+# an unchanged one is not reparsed. The path is part of the key only to
+# tell apart files with the same contents.
+@st.cache_data(max_entries=64)
+def _employees(path_str, fingerprint):
+    return {e.employee_id: e for e in load_employees(path_str)}
+
+
+@st.cache_data(max_entries=64)
+def _contracts(path_str, fingerprint):
+    return {c.employee_id: c for c in load_contracts(path_str)}
+
+
+@st.cache_data(max_entries=64)
+def _leave_stocks(path_str, fingerprint):
+    return {l.employee_id: l for l in load_leave_stocks(path_str)}
+
+
+@st.cache_data(max_entries=20_000)
+def _timesheet(path_str, fingerprint, year, month):
+    return load_timesheet_file(path_str, year, month)
+
+
+def load_data(folder_str, year, month, holiday_fingerprints):
+    """The month's inputs, and a fingerprint of every file they came from
+    (the holiday overrides' included) that keys the payroll results."""
     folder = Path(folder_str)
 
     emp_path = find_file(folder, "master_employees.tsv")
     con_path = find_file(folder, "contracts.tsv")
     leave_path = find_leave_stocks_for_month(folder, year, month)
+    ts_dir = find_timesheet_dir(folder, year)
+    ts_paths = sorted(ts_dir.glob("*.tsv")) if ts_dir else []
 
-    employees = {e.employee_id: e for e in load_employees(emp_path)}
-    contracts = {c.employee_id: c for c in load_contracts(con_path)}
-    leave_stocks = {l.employee_id: l for l in load_leave_stocks(leave_path)} if leave_path else {}
+    paths = [emp_path, con_path, *([leave_path] if leave_path else []), *ts_paths]
+    fingerprints = {p: file_fingerprint(p) for p in paths}
+
+    employees = _employees(str(emp_path), fingerprints[emp_path])
+    contracts = _contracts(str(con_path), fingerprints[con_path])
+    leave_stocks = (dict(_leave_stocks(str(leave_path), fingerprints[leave_path]))
+                    if leave_path else {})
 
     # Load per-employee timesheets from year subfolder
-    ts_dir = find_timesheet_dir(folder, year)
-    if ts_dir:
-        timesheet = load_timesheet_folder(ts_dir, year, month)
-        ts_exists = len(timesheet) > 0
-    else:
-        timesheet = {}
-        ts_exists = False
+    timesheet = {}
+    for p in ts_paths:
+        month_rows = _timesheet(str(p), fingerprints[p], year, month)
+        if month_rows is not None:
+            timesheet[month_rows.employee_id] = month_rows
+    ts_exists = len(timesheet) > 0
 
     # Fill in default leave stocks for employees without records
     for emp_id in contracts:
@@ -101,7 +162,27 @@ def load_data(folder_str, year, month):
                 as_of_date=date(2025, 12, 31),
             )
 
-    return employees, contracts, leave_stocks, timesheet, ts_exists
+    fingerprint = files_fingerprint(folder, {**fingerprints, **holiday_fingerprints},
+                                    year, month)
+    return employees, contracts, leave_stocks, timesheet, ts_exists, fingerprint
+
+
+# Payroll results, memoized on the inputs' fingerprint (which includes the
+# month): going back to a month already run, or to a tab, shows its
+# payslips without recomputing them. The inputs themselves are not hashed
+# by Streamlit (the leading underscores); the fingerprint stands for them.
+@st.cache_data(max_entries=24, show_spinner="Running payroll...")
+def compute_payroll(fingerprint, cache_str, _ctx, _employees, _contracts, _timesheet,
+                    _leave_stocks):
+    from src.cache import PayslipCache
+
+    # The result cache lets unchanged employees come straight back even
+    # after the inputs have changed.
+    cache = PayslipCache(Path(cache_str).expanduser()) if cache_str else None
+    engine = PayrollEngine(_ctx.payroll_date, cache=cache)
+    engine.ctx = _ctx
+    payslips = engine.process_batch(_employees, _contracts, _timesheet, _leave_stocks)
+    return payslips, (cache.hits, cache.misses) if cache else None
 
 
 if not folder_valid:
@@ -110,7 +191,8 @@ if not folder_valid:
 
 # Load data
 try:
-    employees, contracts, leave_stocks, timesheet, ts_exists = load_data(input_folder, year, month)
+    (employees, contracts, leave_stocks, timesheet, ts_exists,
+     fingerprint) = load_data(input_folder, year, month, holiday_fingerprints)
 except Exception as e:
     st.error(f"Error loading data: {e}")
     st.stop()
@@ -120,29 +202,63 @@ if not ts_exists:
     st.stop()
 
 
-# Run payroll button
+# Download files for a payroll result, kept (not copied) per results
+# fingerprint so each is built once however often the page reruns. See
+# src/artifacts.py.
+@st.cache_resource(max_entries=8)
+def payroll_artifacts(fingerprint, _payslips, _ctx):
+    return PayrollArtifacts(_payslips, company_name="B'aida Daycare & Learning Centre",
+                            ctx=_ctx)
+
+
+@st.fragment(run_every=0.5)
+def _pdf_progress(artifacts):
+    # Redrawn on its own every half second while the build runs; once it
+    # ends, a full rerun swaps the bar for the download button.
+    if not artifacts.pdf_building():
+        st.rerun()
+    done, total = artifacts.pdf_progress()
+    st.progress(done / total if total else 1.0,
+                text=f"Building payslips PDF: {done} of {total}")
+
+
+def pdf_download(artifacts, file_name):
+    pdf = artifacts.pdf()
+    if pdf is not None:
+        st.download_button("Download All Payslips (PDF)", pdf, file_name=file_name,
+                           mime="application/pdf")
+    elif artifacts.pdf_building():
+        _pdf_progress(artifacts)
+    elif artifacts.pdf_error is not None:
+        st.error(f"Could not build the PDF: {artifacts.pdf_error}")
+        if st.button("Retry building the PDF"):
+            artifacts.start_pdf()
+            st.rerun()
+    elif st.button("Build All Payslips (PDF)"):
+        artifacts.start_pdf()
+        st.rerun()
+
+
+# Run payroll button. Every (folder, month) run in this session is
+# remembered with the fingerprint it ran on; its results stay on screen
+# until the inputs change, and come back from the memo when the month is
+# selected again.
+runs = st.session_state.setdefault("runs", {})
+run_key = (input_folder, year, month)
 if st.sidebar.button("Run Payroll", type="primary"):
-    engine = PayrollEngine(payroll_date)
-    payslips = []
-
-    for emp_id in sorted(contracts.keys()):
-        if emp_id in timesheet and emp_id in employees and emp_id in leave_stocks:
-            payslip = engine.process(
-                employees[emp_id],
-                contracts[emp_id],
-                timesheet[emp_id],
-                leave_stocks[emp_id],
-            )
-            payslips.append(payslip)
-
-    st.session_state["payslips"] = payslips
-    st.session_state["payroll_date"] = payroll_date
+    runs[run_key] = fingerprint
+stale = run_key in runs and runs[run_key] != fingerprint
+if stale:
+    st.sidebar.warning("Inputs have changed since this month was run. "
+                       "Click 'Run Payroll' to recompute.")
 
 
 # Display results if payroll has been run
-if "payslips" in st.session_state:
-    payslips = st.session_state["payslips"]
-    payroll_date = st.session_state["payroll_date"]
+if run_key in runs and not stale:
+    payslips, cache_stats = compute_payroll(fingerprint, cache_folder, ctx, employees,
+                                            contracts, timesheet, leave_stocks)
+    if cache_stats:
+        st.sidebar.caption("Result cache: {} hits, {} misses".format(*cache_stats))
 
     st.header(f"Payroll Results - {payroll_date.strftime('%B %Y')}")
 
@@ -164,7 +280,7 @@ if "payslips" in st.session_state:
     tab1, tab2, tab3 = st.tabs(["Payslips", "Summary Table", "Downloads"])
 
     with tab1:
-        renderer = PayslipRenderer(company_name="B'aida Daycare & Learning Centre")
+        renderer = PayslipRenderer("B'aida Daycare & Learning Centre", ctx)
         for ps in payslips:
             with st.expander(f"{ps.employee.name} - Net: KES {ps.net_pay:,.2f}"):
                 st.code(renderer.render(ps), language=None)
@@ -206,51 +322,42 @@ if "payslips" in st.session_state:
     with tab3:
         st.subheader("Download Files")
 
+        artifacts = payroll_artifacts(fingerprint, payslips, ctx)
         col1, col2 = st.columns(2)
 
         with col1:
-            # All payslips PDF
-            pdf_renderer = PayslipRenderer(company_name="B'aida Daycare & Learning Centre")
-            st.download_button(
-                "Download All Payslips (PDF)",
-                pdf_renderer.render_all_pdf(payslips),
-                file_name=f"payslips_{year}_{month:02d}.pdf",
-                mime="application/pdf",
-            )
+            # All payslips PDF, built in the background on request
+            pdf_download(artifacts, f"payslips_{year}_{month:02d}.pdf")
 
             # Bank file
-            bank_gen = BankFileGenerator(payslips)
             st.download_button(
                 "Download Bank CSV",
-                bank_gen.to_equity_csv(),
+                artifacts.csv("bank"),
                 file_name=f"equity_salaries_{year}_{month:02d}.csv",
                 mime="text/csv",
             )
 
             # KRA P10
-            kra_gen = KRAReturnGenerator(payslips)
             st.download_button(
                 "Download KRA P10 CSV",
-                kra_gen.to_p10_csv(),
+                artifacts.csv("kra_p10"),
                 file_name=f"kra_p10_{year}_{month:02d}.csv",
                 mime="text/csv",
             )
 
         with col2:
             # NSSF
-            nssf_gen = NSSFReturnGenerator(payslips)
             st.download_button(
                 "Download NSSF Return CSV",
-                nssf_gen.to_nssf_csv(),
+                artifacts.csv("nssf"),
                 file_name=f"nssf_return_{year}_{month:02d}.csv",
                 mime="text/csv",
             )
 
             # SHA
-            sha_gen = SHAReturnGenerator(payslips)
             st.download_button(
                 "Download SHA/SHIF Return CSV",
-                sha_gen.to_sha_csv(),
+                artifacts.csv("sha"),
                 file_name=f"sha_shif_{year}_{month:02d}.csv",
                 mime="text/csv",
             )
@@ -261,7 +368,8 @@ if "payslips" in st.session_state:
         output_dir = Path(input_folder) / "outputs"
         company_name = "B'aida Daycare & Learning Centre"
         if st.button(f"Save to {output_dir}"):
-            written = save_payroll_outputs(payslips, year, month, output_dir, company_name)
+            written = save_payroll_outputs(payslips, year, month, output_dir, company_name,
+                                           ctx)
             st.success(f"Saved {len(written)} files to {output_dir / f'{year}_{month:02d}'}")
 
         st.divider()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Work out back pay for past months after a retroactive correction.
+
+For each month of the range, the inputs the month was originally paid
+from are pulled out of its archived inputs_snapshot.zip, the corrections
+are laid over a copy of them, and both versions are computed (months in
+parallel with --workers). Every employee's gross is diffed, month by
+month, and the totals are written as an arrears file that
+run_payroll.py --arrears pays with the current month through the
+adj_with_housing / adj_no_housing columns. Nothing is published here.
+
+Corrections are either files -- a directory laid out like the staged
+inputs (contracts.tsv, master_employees.tsv, the attendance workbook,
+leave_stocks/...) whose files replace the snapshot's -- or rates, with
+--rate-change as for project_costs.py. Give either or both.
+
+Usage:
+    python backpay.py --from 2026-01 --to 2026-03 --corrections /tmp/fixed --out arrears.tsv
+    python backpay.py --from 2026-02 --to 2026-04 --rate-change 2026-02:shif_rate=0.0275 \\
+        --out arrears.tsv --detail arrears_by_month.tsv --workers 4
+    python run_payroll.py --year 2026 --month 5 --arrears arrears.tsv
+"""
+
+import argparse
+import csv
+import shutil
+import sys
+import tempfile
+from datetime import date
+from pathlib import Path
+
+from src.backpay import back_pay, month_inputs, write_arrears
+from src.cli import (
+    load_registers, load_timesheets, month_range, parse_month, parse_rate_change,
+)
+from src.loaders import find_leave_stocks_for_month, load_leave_stocks
+from src.snapshot import SNAPSHOT_NAME, describe, read_snapshot, restore_snapshot
+
+
+def _snapshot(year: int, month: int, snapshots: Path | None) -> dict:
+    if snapshots:
+        return read_snapshot(snapshots / f"{year}_{month:02d}" / SNAPSHOT_NAME)
+    from src.outputs import download_archived_file
+    return read_snapshot(download_archived_file(year, month, SNAPSHOT_NAME))
+
+
+def _load_month(inputs: Path, year: int, month: int, rate_overrides: dict):
+    """MonthInputs from a staged inputs directory, or None."""
+    employees, contracts = load_registers(inputs)
+    leave_path = find_leave_stocks_for_month(inputs, year, month)
+    leave_stocks = (
+        {l.employee_id: l for l in load_leave_stocks(leave_path)} if leave_path else {}
+    )
+    timesheets = load_timesheets(inputs, year, month)
+    if timesheets is None:
+        return None
+    return month_inputs(date(year, month, 28), employees, contracts, timesheets,
+                        leave_stocks, rate_overrides)
+
+
+def _overrides_for(year: int, month: int, rate_changes: list) -> dict:
+    """Every rate change in force on the last day of the month, in date order."""
+    from calendar import monthrange
+
+    last = date(year, month, monthrange(year, month)[1])
+    overrides = {}
+    for effective, values in sorted(rate_changes, key=lambda c: c[0]):
+        if effective <= last:
+            overrides.update(values)
+    return overrides
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--from", dest="from_month", type=parse_month, required=True,
+                        metavar="YYYY-MM", help="First month to correct")
+    parser.add_argument("--to", dest="to_month", type=parse_month, required=True,
+                        metavar="YYYY-MM", help="Last month to correct")
+    parser.add_argument("--corrections", type=Path, metavar="DIR",
+                        help="Corrected input files, laid out like the staged inputs")
+    parser.add_argument("--rate-change", type=parse_rate_change, action="append",
+                        default=[], metavar="YYYY-MM:RATE=VALUE,...",
+                        help="Rates that should have applied from that month (repeatable)")
+    parser.add_argument("--snapshots", type=Path, metavar="DIR",
+                        help="Read YYYY_MM/inputs_snapshot.zip from here instead of "
+                             "the Drive archive")
+    parser.add_argument("--out", type=Path, required=True, metavar="TSV",
+                        help="Arrears per employee, for run_payroll.py --arrears")
+    parser.add_argument("--detail", type=Path, metavar="TSV",
+                        help="Also write each employee-month's difference here")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="Recompute months in N processes (default: 1, serial)")
+    args = parser.parse_args()
+
+    if args.from_month > args.to_month:
+        parser.error("--from is after --to")
+    if not args.corrections and not args.rate_change:
+        parser.error("nothing to correct: give --corrections and/or --rate-change")
+    if args.corrections and not args.corrections.is_dir():
+        parser.error(f"--corrections {args.corrections} is not a directory")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    pairs = []
+    with tempfile.TemporaryDirectory(prefix="kenyacc_") as tmp:
+        for year, month in month_range(args.from_month, args.to_month):
+            print(f"--- {year}-{month:02d} ---")
+            try:
+                payload = _snapshot(year, month, args.snapshots)
+            except (FileNotFoundError, ValueError) as e:
+                print(f"Cannot read the {year}-{month:02d} snapshot: {e}", file=sys.stderr)
+                return 1
+            print(f"  {describe(payload)}")
+
+            original = Path(tmp) / f"{year}_{month:02d}" / "original"
+            corrected = Path(tmp) / f"{year}_{month:02d}" / "corrected"
+            restore_snapshot(payload, original)
+            restore_snapshot(payload, corrected)
+            if args.corrections:
+                shutil.copytree(args.corrections, corrected, dirs_exist_ok=True)
+
+            # Each version is loaded, calendar and all, before the next one
+            # can load different holiday overrides.
+            before = _load_month(original, year, month, {})
+            after = _load_month(corrected, year, month,
+                                _overrides_for(year, month, args.rate_change))
+            if before is None or after is None:
+                return 1
+            pairs.append((before, after))
+            print()
+
+    arrears, differences = back_pay(pairs, workers=args.workers)
+
+    write_arrears(arrears, args.out)
+    if args.detail:
+        with open(args.detail, "w", newline="") as f:
+            writer = csv.writer(f, delimiter="\t")
+            writer.writerow(["employee_id", "year", "month", "original_gross",
+                             "corrected_gross", "gross_difference", "net_difference"])
+            for d in differences:
+                writer.writerow([d.employee_id, d.year, d.month, f"{d.original_gross:.2f}",
+                                 f"{d.corrected_gross:.2f}", f"{d.gross_difference:.2f}",
+                                 f"{d.net_difference:.2f}"])
+
+    print(f"  BACK PAY - {args.from_month[0]}-{args.from_month[1]:02d} to "
+          f"{args.to_month[0]}-{args.to_month[1]:02d}")
+    print(f"  {'ID':>4}  {'Employee':<30} {'Months':>6} {'Gross diff':>12} "
+          f"{'Adj w/ hsg':>12} {'Adj no hsg':>12}")
+    for a in arrears:
+        print(f"  {a.employee_id:>4}  {a.name[:30]:<30} {len(a.months):>6} "
+              f"{a.gross_difference:>12,.2f} {a.adj_with_housing:>12,.2f} "
+              f"{a.adj_no_housing:>12,.2f}")
+    print(f"\n{len(arrears)} employees owed or owing; arrears written to {args.out}")
+    print(f"Pay them with: python run_payroll.py --year Y --month M --arrears {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
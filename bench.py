@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""Benchmark loaders, engine and outputs against a synthetic workforce.
+
+Generates a workforce of the given size with src/synthetic.py (or reuses
+one written by generate_workforce.py), then times each stage of a payroll
+run on it, month by month -- the load_* functions, extract_month,
+PayrollEngine.process and process_batch, save_payroll_outputs and
+write_snapshot -- plus a 24-month project_costs over the contracts, and
+writes the throughput of each to a JSON results
+file. Run the same arguments on two commits and diff the files.
+
+A stage whose optional dependency is missing (openpyxl for the workbook,
+reportlab for the payslip PDF) is reported as skipped rather than failing
+the whole run.
+
+Usage:
+    python bench.py --employees 1000 --months 3
+    python bench.py --employees 100000 --months 1 --no-xlsx --results big.json
+    python bench.py --inputs /tmp/workforce_10k --start 2026-01 --months 12
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from importlib.util import find_spec
+from pathlib import Path
+
+from src.calculators import PayrollEngine, default_leave_stock
+from src.cli import parse_month
+from src.loaders import (
+    find_leave_stocks_for_month, load_contracts, load_employees, load_leave_stocks,
+    load_timesheet_folder,
+)
+from src.projection import project_costs
+from src.synthetic import generate_inputs, months
+
+
+class Bench:
+    """Seconds and items processed, per stage, summed over the months."""
+
+    def __init__(self):
+        self.stages: dict[str, dict] = {}
+        self.skipped: dict[str, str] = {}
+
+    def time(self, stage: str, fn, *args, items: int | None = None, **kw):
+        """Call fn, counting items (default: len of what it returns)."""
+        t0 = time.perf_counter()
+        result = fn(*args, **kw)
+        self.add(stage, time.perf_counter() - t0, len(result) if items is None else items)
+        return result
+
+    def add(self, stage: str, seconds: float, items: int) -> None:
+        s = self.stages.setdefault(stage, {"seconds": 0.0, "items": 0})
+        s["seconds"] += seconds
+        s["items"] += items
+
+    def skip(self, stage: str, reason: str) -> None:
+        self.skipped.setdefault(stage, reason)
+
+    def results(self) -> dict[str, dict]:
+        return {stage: {**s, "per_second": s["items"] / s["seconds"] if s["seconds"] else None}
+                for stage, s in self.stages.items()}
+
+    def report(self) -> str:
+        lines = [f"  {'Stage':<28} {'Items':>9} {'Seconds':>10} {'Items/s':>12}"]
+        for stage, s in self.results().items():
+            rate = f"{s['per_second']:>12,.0f}" if s["per_second"] else f"{'-':>12}"
+            lines.append(f"  {stage:<28} {s['items']:>9} {s['seconds']:>10.3f} {rate}")
+        for stage, reason in self.skipped.items():
+            lines.append(f"  {stage:<28} skipped: {reason}")
+        return "\n".join(lines)
+
+
+def _extract(bench: Bench, inputs: Path, year: int, month: int, workbooks: dict,
+             scratch: Path) -> None:
+    """Split the month out of the attendance workbook, as run_payroll does,
+    into scratch so the generated TSVs stay as they are."""
+    from extract_timesheets_xlsx2tsvs import extract_month, open_workbook
+
+    if find_spec("openpyxl") is None:
+        bench.skip("extract_month", "openpyxl is not installed")
+        return
+    xlsx = inputs / "timesheets" / f"Attendance{year}.xlsx"
+    if not xlsx.is_file():
+        bench.skip("extract_month", "no attendance workbook (generated with --no-xlsx)")
+        return
+    if year not in workbooks:
+        workbooks[year] = bench.time("open_workbook", open_workbook, xlsx, items=1)
+    t0 = time.perf_counter()
+    written = extract_month(xlsx, scratch / f"{year}_{month:02d}", year, month,
+                            log=lambda _: None, wb=workbooks[year])
+    bench.add("extract_month", time.perf_counter() - t0, written)
+
+
+def _save_outputs(bench: Bench, payslips: list, year: int, month: int, out: Path) -> None:
+    from src.outputs import save_payroll_outputs
+
+    try:
+        bench.time("save_payroll_outputs", save_payroll_outputs, payslips, year, month,
+                   out, items=len(payslips))
+    except ImportError as e:
+        bench.skip("save_payroll_outputs", f"{e.name} is not installed")
+
+
+def run(inputs: Path, start: tuple[int, int], n_months: int, workers: int,
+        workdir: Path) -> Bench:
+    """Time every stage of a payroll run over n_months from start."""
+    from src.snapshot import write_snapshot
+
+    bench = Bench()
+    employees = bench.time("load_employees", load_employees,
+                           inputs / "master_employees.tsv")
+    contracts = bench.time("load_contracts", load_contracts, inputs / "contracts.tsv")
+    employees = {e.employee_id: e for e in employees}
+    contracts = {c.employee_id: c for c in contracts}
+    # Items are contract-months, the projection's unit of work.
+    bench.time("project_costs", project_costs, contracts, start, 24,
+               items=len(contracts) * 24)
+
+    stocks = bench.time("load_leave_stocks", load_leave_stocks,
+                        find_leave_stocks_for_month(inputs, *start))
+    leave_stocks = {s.employee_id: s for s in stocks}
+
+    workbooks = {}
+    for year, month in months(start, n_months):
+        payroll_date = date(year, month, 28)
+        _extract(bench, inputs, year, month, workbooks, workdir / "extract")
+        timesheets = bench.time("load_timesheet_folder", load_timesheet_folder,
+                                inputs / "timesheets" / f"{year}_{month:02d}", year, month)
+
+        ids = [i for i in sorted(contracts) if i in employees and i in timesheets]
+        for i in ids:
+            if i not in leave_stocks:
+                leave_stocks[i] = default_leave_stock(i, contracts[i], payroll_date)
+
+        engine = PayrollEngine(payroll_date)
+        t0 = time.perf_counter()
+        for i in ids:
+            engine.process(employees[i], contracts[i], timesheets[i], leave_stocks[i])
+        bench.add("PayrollEngine.process", time.perf_counter() - t0, len(ids))
+
+        payslips = bench.time("PayrollEngine.process_batch", engine.process_batch,
+                              employees, contracts, timesheets, leave_stocks,
+                              workers=workers)
+
+        _save_outputs(bench, payslips, year, month, workdir / "outputs")
+        bench.time("write_snapshot", write_snapshot, inputs,
+                   workdir / "snapshots" / f"{year}_{month:02d}.zip", year, month,
+                   items=len(employees))
+
+        # Next month opens on this month's closing balances, as it would
+        # after a real run.
+        leave_stocks = {ps.employee.employee_id: ps.leave.updated_stock for ps in payslips}
+    return bench
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--employees", type=int, default=1000,
+                        help="Workforce size to generate (default: 1000)")
+    parser.add_argument("--months", type=int, default=1,
+                        help="Months to run, from --start (default: 1)")
+    parser.add_argument("--start", type=parse_month, default=(2026, 1), metavar="YYYY-MM",
+                        help="First month (default: 2026-01)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for process_batch")
+    parser.add_argument("--no-xlsx", action="store_true",
+                        help="Do not generate attendance workbooks (skips extract_month)")
+    parser.add_argument("--inputs", type=Path, metavar="DIR",
+                        help="Benchmark an inputs folder already written by "
+                             "generate_workforce.py instead of generating one")
+    parser.add_argument("--workdir", type=Path,
+                        help="Keep the generated inputs and outputs here instead of "
+                             "a temp dir")
+    parser.add_argument("--results", type=Path, default=Path("bench_results.json"),
+                        metavar="PATH", help="Where to write the results "
+                                             "(default: bench_results.json)")
+    args = parser.parse_args()
+
+    if not 1 <= args.months <= 36:
+        parser.error("--months must be between 1 and 36")
+
+    with tempfile.TemporaryDirectory(prefix="kenyacc_bench_") as tmp:
+        workdir = args.workdir or Path(tmp)
+        inputs = args.inputs
+        generated = None
+        if inputs is None:
+            inputs = workdir / "inputs"
+            print(f"Generating {args.employees} employees x {args.months} month(s) "
+                  f"in {inputs}")
+            t0 = time.perf_counter()
+            # Without openpyxl there is no workbook to write; extract_month
+            # is then reported as skipped and the rest still runs.
+            xlsx = not args.no_xlsx and find_spec("openpyxl") is not None
+            generated = generate_inputs(inputs, args.employees, args.start, args.months,
+                                        seed=args.seed, xlsx=xlsx)
+            generated["seconds"] = time.perf_counter() - t0
+        bench = run(inputs, args.start, args.months, args.workers, workdir)
+
+    print()
+    print(bench.report())
+
+    from src.snapshot import git_commit
+
+    args.results.write_text(json.dumps({
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "commit": git_commit(),
+        "employees": args.employees if args.inputs is None else None,
+        "months": args.months,
+        "start": f"{args.start[0]}-{args.start[1]:02d}",
+        "seed": args.seed,
+        "workers": args.workers,
+        "generated": generated,
+        "stages": bench.results(),
+        "skipped": bench.skipped,
+    }, indent=2))
+    print()
+    print(f"Results written to {args.results}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
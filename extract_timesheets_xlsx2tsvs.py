@@ -20,8 +20,6 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
-import openpyxl
-
 
 # The first two columns are read positionally: their header cells are
 # unreliable across tabs (variously "date", "Date", blank, or a stray number).
@@ -65,13 +63,23 @@ def _fmt_num(v):
     return str(v)
 
 
+def open_workbook(xlsx_path: Path):
+    """Load the attendance workbook with cached cell values, not formulas."""
+    import openpyxl
+
+    return openpyxl.load_workbook(xlsx_path, data_only=True)
+
+
 def extract_month(xlsx_path: Path, dest_dir: Path, year: int, month: int,
-                  log=print) -> int:
+                  log=print, wb=None) -> int:
     """Extract one TSV per worksheet, filtered to the given year/month.
 
-    Returns the number of TSV files written.
+    Pass an already-opened workbook as `wb` to extract several months
+    without re-parsing the file each time; xlsx_path is then only used for
+    messages. Returns the number of TSV files written.
     """
-    wb = openpyxl.load_workbook(xlsx_path, data_only=True)
+    if wb is None:
+        wb = open_workbook(xlsx_path)
     dest_dir.mkdir(parents=True, exist_ok=True)
     # Clear any stale TSVs from prior runs (e.g. renamed sheets)
     for stale in dest_dir.glob("*.tsv"):
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Write a synthetic payroll inputs folder at any scale.
+
+The folder is laid out as run_payroll.py stages one -- master_employees.tsv,
+contracts.tsv, leave_stocks/, per-month timesheet TSVs and an attendance
+workbook per year -- so bench.py --inputs DIR, or any loader, can be
+pointed straight at it, and written to WORKDIR/inputs it is what
+run_payroll.py --workdir WORKDIR --no-sync runs on. Every contract type,
+housing arrangement and casual arrangement is represented, and the same
+--seed always writes the same files. See src/synthetic.py.
+
+Usage:
+    python generate_workforce.py --out /tmp/pay/inputs --employees 1000
+    python run_payroll.py --year 2026 --month 1 --workdir /tmp/pay --no-sync
+    python generate_workforce.py --out /tmp/workforce_10k --employees 10000 \\
+        --start 2025-01 --months 36 --no-xlsx
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from src.cli import parse_month
+from src.synthetic import generate_inputs
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--out", type=Path, required=True, metavar="DIR",
+                        help="Inputs folder to write (created if missing)")
+    parser.add_argument("--employees", type=int, default=100,
+                        help="Workforce size, 10 to 100000 (default: 100)")
+    parser.add_argument("--start", type=parse_month, default=(2026, 1), metavar="YYYY-MM",
+                        help="First month of timesheets (default: 2026-01)")
+    parser.add_argument("--months", type=int, default=1,
+                        help="Months of timesheets, 1 to 36 (default: 1)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-xlsx", action="store_true",
+                        help="Skip the attendance workbooks (they need openpyxl and "
+                             "are slow to write at scale)")
+    args = parser.parse_args()
+
+    if not 10 <= args.employees <= 100_000:
+        parser.error("--employees must be between 10 and 100000")
+    if not 1 <= args.months <= 36:
+        parser.error("--months must be between 1 and 36")
+
+    t0 = time.perf_counter()
+    try:
+        written = generate_inputs(args.out, args.employees, args.start, args.months,
+                                  seed=args.seed, xlsx=not args.no_xlsx)
+    except ImportError as e:
+        if e.name != "openpyxl":
+            raise
+        print("openpyxl is not installed, and the attendance workbooks need it. "
+              "Install it, or rerun with --no-xlsx to write the TSVs only.", file=sys.stderr)
+        return 1
+    print(f"Wrote {written['employees']} employees, {written['months']} month(s): "
+          f"{written['timesheet_files']} timesheet TSVs and {written['workbooks']} "
+          f"workbook(s) to {args.out} in {time.perf_counter() - t0:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
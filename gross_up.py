@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Work out the gross pay that leaves a given net.
+
+For offers quoted net, salary grids, and bonuses paid "tax-free". Answers
+come from src/grossup.py, which inverts the deduction and PAYE tables in
+closed form, so a grid of thousands of figures prints instantly. Gross
+figures are rounded up to the cent, so the net is never short.
+
+Usage:
+    python gross_up.py 30000 45000 60000                 # net -> gross
+    python gross_up.py --grid 20000 200000 5000          # a salary grid
+    python gross_up.py 50000 --salary-basis base         # contract base figure
+    python gross_up.py 25000 --housing quarters --market-value 4000
+    python gross_up.py --bonus 10000 --current-gross 80000
+"""
+
+import argparse
+import sys
+from datetime import date
+from decimal import ROUND_CEILING, Decimal, InvalidOperation
+
+from src.grossup import GrossUpSolver
+from src.models import Contract
+from src.rates import StatutoryRates
+
+CENT = Decimal("0.01")
+
+
+def _amount(value: str) -> Decimal:
+    """argparse type for a money figure."""
+    try:
+        return Decimal(value.replace(",", ""))
+    except InvalidOperation:
+        raise argparse.ArgumentTypeError(f"not an amount: {value!r}") from None
+
+
+def _terms(args) -> Contract:
+    """A contract carrying just the terms the solver reads."""
+    return Contract(
+        employee_id=0, contract_type="fixed_monthly", base_salary=Decimal(0),
+        weekly_hours=None, housing_type=args.housing,
+        housing_market_value=args.market_value, nssf_tier=args.nssf_tier,
+        start_date=None, end_date=None, status="active",
+        salary_basis=args.salary_basis,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("nets", nargs="*", type=_amount, metavar="NET",
+                        help="Target monthly net pay figures")
+    parser.add_argument("--grid", nargs=3, type=_amount, metavar=("FROM", "TO", "STEP"),
+                        help="Every net from FROM to TO inclusive, STEP apart")
+    parser.add_argument("--bonus", type=_amount, metavar="NET",
+                        help="Gross up a one-off payment that should add NET to "
+                             "the month's pay (needs --current-gross)")
+    parser.add_argument("--current-gross", type=_amount,
+                        help="The month's gross before the bonus")
+    parser.add_argument("--year", type=int, default=date.today().year)
+    parser.add_argument("--month", type=int, default=date.today().month)
+    parser.add_argument("--salary-basis", choices=("gross", "base"), default="gross")
+    parser.add_argument("--housing", choices=("none", "quarters", "dorm"), default="none")
+    parser.add_argument("--market-value", type=_amount,
+                        help="Market value of the housing (quarters/dorm)")
+    parser.add_argument("--nssf-tier", choices=("standard", "contracted_out"),
+                        default="standard")
+    args = parser.parse_args()
+
+    if args.housing != "none" and args.market_value is None:
+        parser.error("--housing quarters/dorm needs --market-value")
+    if (args.bonus is None) != (args.current_gross is None):
+        parser.error("--bonus and --current-gross go together")
+
+    nets = list(args.nets)
+    if args.grid:
+        start, stop, step = args.grid
+        if step <= 0:
+            parser.error("--grid STEP must be positive")
+        while start <= stop:
+            nets.append(start)
+            start += step
+    if not nets and args.bonus is None:
+        parser.error("give at least one NET, a --grid or a --bonus")
+
+    solver = GrossUpSolver(StatutoryRates(date(args.year, args.month, 28)), _terms(args))
+
+    if args.bonus is not None:
+        extra = solver.bonus_for_net(args.current_gross, args.bonus)
+        extra = extra.quantize(CENT, rounding=ROUND_CEILING)
+        print(f"Bonus of KES {args.bonus:,.2f} net on a gross of "
+              f"KES {args.current_gross:,.2f}: pay KES {extra:,.2f} gross")
+        if nets:
+            print()
+
+    if nets:
+        try:
+            grosses = solver.gross_many(nets)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 1
+        label = "Base" if args.salary_basis == "base" else "Contract"
+        print(f"{'Net':>12} {'Gross':>12} {label:>12} {'NSSF':>10} {'SHIF':>10} "
+              f"{'AHL':>10} {'PAYE':>10}")
+        for net, gross in zip(nets, grosses):
+            r = solver.breakdown(gross.quantize(CENT, rounding=ROUND_CEILING))
+            d = r.deductions
+            print(f"{net:>12,.2f} {r.total_gross:>12,.2f} {r.base_salary:>12,.2f} "
+                  f"{d.nssf_tier_1 + d.nssf_tier_2:>10,.2f} {d.shif:>10,.2f} "
+                  f"{d.ahl_employee:>10,.2f} {d.paye:>10,.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Write KRA P9 tax deduction cards from the YTD store.
+
+run_payroll.py --ytd PATH records each published month's tax figures in a
+local store (src/ytd.py). This reads a whole year back out in one go and
+writes one P9 card per employee plus an annual summary for the
+reconciliation -- no Drive archives are downloaded.
+
+If the store is missing months, or was started part-way through the year,
+--rebuild replays every month's archived input snapshot from Drive and
+records it. That reproduces the published figures only under the code
+version that published them (the snapshot records its commit); after a
+change to the calculations it records what the current code computes.
+
+Usage:
+    python p9.py --year 2026 --ytd ~/kenyacc/ytd.sqlite --out /tmp/p9_2026
+    python p9.py --year 2026 --ytd ~/kenyacc/ytd.sqlite --rebuild --out /tmp/p9_2026
+    python p9.py --year 2026 --ytd ~/kenyacc/ytd.sqlite --rebuild --months 1-6
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+from src.outputs import P9Generator
+from src.ytd import YTDStore
+
+
+def _parse_months(value: str) -> list[int]:
+    """argparse type for M or M-N."""
+    try:
+        first, _, last = value.partition("-")
+        months = list(range(int(first), int(last or first) + 1))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected M or M-N, got {value!r}") from None
+    if not months or months[0] < 1 or months[-1] > 12:
+        raise argparse.ArgumentTypeError(f"months out of range in {value!r}")
+    return months
+
+
+def rebuild(store_path: Path, year: int, months: list[int]) -> list[int]:
+    """Replay each month's archived inputs into the store. Returns the
+    months that could not be replayed."""
+    import run_payroll
+
+    failed = []
+    for month in months:
+        print(f"--- {year}-{month:02d} ---")
+        with tempfile.TemporaryDirectory(prefix="kenyacc_") as tmp:
+            code = run_payroll.run(year, month, Path(tmp), sync=False, save=False,
+                                   replay=True, ytd=store_path)
+        if code:
+            failed.append(month)
+        print()
+    return failed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--year", type=int, required=True)
+    parser.add_argument("--ytd", type=Path, required=True, metavar="PATH",
+                        help="The YTD store run_payroll.py --ytd records into")
+    parser.add_argument("--out", type=Path,
+                        help="Write the cards here (private employee data: keep it "
+                             "outside the repo)")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="First replay the archived snapshots into the store")
+    parser.add_argument("--months", type=_parse_months, default=list(range(1, 13)),
+                        metavar="M-N", help="Months to --rebuild (default: 1-12)")
+    args = parser.parse_args()
+
+    if not args.rebuild and not args.out:
+        parser.error("nothing to do: give --out, --rebuild, or both")
+
+    if args.rebuild:
+        failed = rebuild(args.ytd, args.year, args.months)
+        if failed:
+            print(f"Could not replay {args.year} month(s): "
+                  f"{', '.join(str(m) for m in failed)}", file=sys.stderr)
+
+    with YTDStore(args.ytd) as store:
+        on_file = store.recorded_months(args.year)
+        cards = store.cards(args.year)
+
+    missing = [m for m in range(1, 13) if m not in on_file]
+    print(f"{len(cards)} employees, months on file: "
+          f"{', '.join(str(m) for m in on_file) or 'none'}")
+    if on_file and missing:
+        print(f"Missing months: {', '.join(str(m) for m in missing)}")
+
+    if args.out and cards:
+        args.out.mkdir(parents=True, exist_ok=True)
+        generator = P9Generator(cards)
+        for emp_id, card in cards.items():
+            safe_name = card.name.replace(" ", "_") or "unnamed"
+            (args.out / f"p9_{args.year}_{emp_id}_{safe_name}.csv").write_text(
+                generator.to_p9_csv(emp_id))
+        (args.out / f"p9_{args.year}_summary.csv").write_text(generator.to_summary_csv())
+        print(f"Wrote {len(cards)} P9 cards and a summary to {args.out}")
+    return 0 if cards else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
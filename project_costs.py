@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Project monthly cost to company over the coming months.
+
+Reads the current contracts from Google Sheets (nothing else: the
+projection assumes standard attendance, so no timesheets or leave stocks
+are needed) and prints gross, employer NSSF and AHL, net pay and cost to
+company for each month, under the statutory rates in force that month.
+Later rate changes that are known but not yet in src/rates.py can be
+given with --rate-change; the overrides are the scenario file's columns.
+
+Usage:
+    python project_costs.py                          # next 12 months
+    python project_costs.py --from 2026-07 --months 36
+    python project_costs.py --rate-change 2027-02:nssf_lel=10000,nssf_uel=120000
+    python project_costs.py --workdir /tmp/pay --no-sync --out /tmp/pay/projection.tsv
+"""
+
+import argparse
+import csv
+import sys
+import tempfile
+from contextlib import nullcontext
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+from src.cli import parse_month, parse_rate_change
+from src.loaders import load_contracts, load_employees, load_holiday_overrides
+from src.projection import project_costs
+
+FIELDS = ("gross", "nssf_employer", "ahl_employer", "paye", "net_pay", "employer_cost")
+
+
+def _next_month() -> tuple[int, int]:
+    today = date.today()
+    return (today.year + 1, 1) if today.month == 12 else (today.year, today.month + 1)
+
+
+def run(inputs: Path, sync: bool, start: tuple[int, int], months: int,
+        rate_changes: list, out: Path | None) -> int:
+    if sync:
+        from src.gsync import sync_inputs
+
+        print("Syncing contracts from Google Sheets...")
+        missing = sync_inputs(inputs, start[0], only=("master_employees", "contracts"))
+        if missing:
+            print("\nCannot run - no spreadsheet key configured for:", file=sys.stderr)
+            for m in missing:
+                print(f"  - {m}", file=sys.stderr)
+            return 1
+        print()
+
+    contracts = {c.employee_id: c for c in load_contracts(inputs / "contracts.tsv")}
+    load_holiday_overrides(inputs)
+    try:
+        projection = project_costs(contracts, start, months, rate_changes)
+    except ValueError as e:
+        print(f"Cannot project: {e}", file=sys.stderr)
+        return 1
+
+    print(f"  COST PROJECTION - {len(contracts)} active contracts, standard attendance")
+    print(f"  {'Month':<8} {'Staff':>6} {'Gross':>14} {'NSSF (er)':>12} {'AHL (er)':>12} "
+          f"{'PAYE':>12} {'Net Pay':>14} {'Cost to Co':>14}")
+    totals = dict.fromkeys(FIELDS, Decimal(0))
+    for p in projection:
+        row = {name: p.total(name) for name in FIELDS}
+        for name in FIELDS:
+            totals[name] += row[name]
+        print(f"  {p.year}-{p.month:02d}  {p.headcount:>6} {row['gross']:>14,.2f} "
+              f"{row['nssf_employer']:>12,.2f} {row['ahl_employer']:>12,.2f} "
+              f"{row['paye']:>12,.2f} {row['net_pay']:>14,.2f} {row['employer_cost']:>14,.2f}")
+    print(f"  {'Total':<8} {'':>6} {totals['gross']:>14,.2f} "
+          f"{totals['nssf_employer']:>12,.2f} {totals['ahl_employer']:>12,.2f} "
+          f"{totals['paye']:>12,.2f} {totals['net_pay']:>14,.2f} "
+          f"{totals['employer_cost']:>14,.2f}")
+
+    if out:
+        names = {e.employee_id: e.name for e in load_employees(inputs / "master_employees.tsv")}
+        with open(out, "w", newline="") as f:
+            writer = csv.writer(f, delimiter="\t")
+            writer.writerow(("year", "month", "employee_id", "name") + FIELDS)
+            for p in projection:
+                for emp_id, pay in sorted(p.pay.items()):
+                    writer.writerow((p.year, p.month, emp_id, names.get(emp_id, ""))
+                                    + tuple(f"{getattr(pay, n):.2f}" for n in FIELDS))
+        print(f"\nPer-employee figures written to {out}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--from", dest="from_month", type=parse_month, metavar="YYYY-MM",
+                        default=_next_month(), help="First month (default: next month)")
+    parser.add_argument("--months", type=int, default=12,
+                        help="How many months to project (default: 12)")
+    parser.add_argument("--rate-change", type=parse_rate_change, action="append",
+                        default=[], metavar="YYYY-MM:RATE=VALUE,...",
+                        help="Rates that change from that month on (repeatable)")
+    parser.add_argument("--workdir", type=Path,
+                        help="Stage files here and keep them, instead of a temp dir")
+    parser.add_argument("--no-sync", action="store_true",
+                        help="Reuse inputs already in --workdir instead of re-downloading")
+    parser.add_argument("--out", type=Path, metavar="TSV",
+                        help="Also write each employee's projected months here "
+                             "(private employee data: keep it outside the repo)")
+    args = parser.parse_args()
+
+    if args.no_sync and not args.workdir:
+        parser.error("--no-sync requires --workdir (a temp dir starts empty)")
+    if args.months < 1:
+        parser.error("--months must be at least 1")
+
+    if args.workdir:
+        args.workdir.mkdir(parents=True, exist_ok=True)
+        ctx = nullcontext(str(args.workdir))
+    else:
+        ctx = tempfile.TemporaryDirectory(prefix="kenyacc_")
+
+    with ctx as tmp:
+        return run(Path(tmp) / "inputs", sync=not args.no_sync, start=args.from_month,
+                   months=args.months, rate_changes=args.rate_change, out=args.out)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,70 +16,120 @@ Usage:
     python run_payroll.py --year 2026 --month 2 --replay      # rerun archived inputs
     python run_payroll.py --year 2026 --month 2 --workdir /tmp/pay  # keep files
     python run_payroll.py --year 2026 --month 2 --workdir /tmp/pay --no-sync
+    python run_payroll.py --year 2026 --month 2 --workdir /tmp/pay --incremental
+    python run_payroll.py --year 2026 --month 2 --workers 8   # parallel compute
+    python run_payroll.py --from 2026-01 --to 2026-12 --no-save  # chained year
+    python run_payroll.py --year 2026 --month 2 --scenarios what_if.tsv
+    python run_payroll.py --year 2026 --month 5 --arrears arrears.tsv  # pay back pay
+    python run_payroll.py --year 2026 --month 5 --derive-overtime --no-save
+    python run_payroll.py --year 2026 --month 5 --no-save --timings-json t.json
+    python run_payroll.py --year 2026 --month 5 --no-save --profile /tmp/prof
+
+With --workdir --incremental, each month's payslips are also kept there
+together with a fingerprint of every employee's inputs. Rerunning the
+month the same way (say after a one-cell fix to the attendance sheet)
+recomputes only the employees whose inputs changed, and prints how many
+it reused. Only changed output files are re-uploaded either way.
+
+--ytd PATH keeps every published (or replayed) month's tax figures in a
+local store, from which p9.py prints the year's P9 cards.
+
+--cache-dir keeps a cache of computed payslips, keyed by each employee's
+inputs, rates and the calculator code, that any run can draw on: repeated
+previews, replays and chained runs alike. It holds employee data, so
+point it outside the working tree.
 """
 
 import argparse
 import sys
 import tempfile
 from contextlib import nullcontext
+from dataclasses import replace
 from datetime import date
 from pathlib import Path
 
-from extract_timesheets_xlsx2tsvs import extract_month
-from src.calculators import PayrollEngine, default_leave_stock
-from src.gsync import attendance_xlsx_path, sync_inputs
-from src.loaders import (
-    find_leave_stocks_for_month, load_contracts, load_employees,
-    load_leave_stocks, load_timesheet_folder,
-)
-from src.outputs import (
-    PayslipRenderer, download_archived_file, save_payroll_outputs,
-    upload_leave_stocks_to_gsheet, upload_payroll_outputs_to_gdrive,
-)
+# Only what every run needs is imported here. The Google client (gspread),
+# the workbook reader (openpyxl) and the output writers load inside the
+# functions that use them, so --help, --no-save previews and --replay-file
+# runs never pay for them. tests/test_startup.py holds this to a budget.
+from src.calculators import PayrollEngine, seed_leave_stocks
+from src.cli import load_registers, load_timesheets, month_range, parse_month
+from src.context import PayrollContext
+from src.loaders import find_leave_stocks_for_month, load_leave_stocks
 from src.snapshot import (
     SNAPSHOT_NAME, describe, read_snapshot, restore_snapshot, write_snapshot,
 )
+from src.validation import CHECKS
 
 
 COMPANY_NAME = "B'aida Daycare & Learning Centre"
 
 
 def run(year: int, month: int, workdir: Path, sync: bool, save: bool,
-        replay: bool = False, replay_file: Path | None = None) -> int:
-    """Stage inputs in workdir, run payroll, publish results. Returns exit code."""
+        replay: bool = False, replay_file: Path | None = None,
+        workers: int = 1, incremental: bool = False,
+        cache_dir: Path | None = None, scenarios: Path | None = None,
+        ytd: Path | None = None, arrears: Path | None = None,
+        derive_overtime: bool = False, checks: tuple | None = None,
+        timings: bool = False, timings_json: Path | None = None,
+        profiler=None) -> int:
+    """Stage inputs in workdir, run payroll, publish results. Returns exit code.
+
+    With incremental, the previous run of this month kept in workdir is
+    reused for every employee whose inputs are unchanged, and this run is
+    kept for the next one.
+
+    With ytd (a YTD store path), the month is recorded in the store when
+    it is published or replayed -- never from a preview of live sheets.
+
+    arrears is a back-pay file (see backpay.py) whose adjustments are paid
+    with this month.
+
+    With derive_overtime, overtime is worked out from hours worked (see
+    src/overtime.py) in place of the hand-entered figures, and the days
+    where the two differ are reported.
+
+    checks are the validation codes to run (default: all; see
+    src/validation.py).
+
+    With timings, the time spent in each step of the engine is printed
+    after the summary (see src/timings.py), and with timings_json also
+    written there as JSON.
+
+    profiler, a PhaseProfiler, profiles each phase of the run (see
+    src/profiling.py); the caller reports it.
+    """
     inputs = workdir / "inputs"
     outputs = workdir / "outputs"
     out_month = outputs / f"{year}_{month:02d}"
     payroll_date = date(year, month, 28)  # Use 28th as safe end-of-month
 
     if replay or replay_file:
+        from src.outputs import download_archived_file
+
         source = replay_file or f"Drive archive for {year}-{month:02d}"
         print(f"Replaying archived inputs from {source}...")
-        try:
-            if replay_file:
-                payload = read_snapshot(replay_file)
-            else:
-                payload = read_snapshot(
-                    download_archived_file(year, month, SNAPSHOT_NAME))
-        except (FileNotFoundError, ValueError) as e:
-            print(f"Cannot replay: {e}", file=sys.stderr)
-            return 1
-        if (payload["year"], payload["month"]) != (year, month):
-            print(f"Snapshot is for {payload['year']}-{payload['month']:02d}, "
-                  f"not {year}-{month:02d}", file=sys.stderr)
-            return 1
-        n = restore_snapshot(payload, inputs)
+        with _phase(profiler, "replay"):
+            try:
+                if replay_file:
+                    payload = read_snapshot(replay_file)
+                else:
+                    payload = read_snapshot(
+                        download_archived_file(year, month, SNAPSHOT_NAME))
+            except (FileNotFoundError, ValueError) as e:
+                print(f"Cannot replay: {e}", file=sys.stderr)
+                return 1
+            if (payload["year"], payload["month"]) != (year, month):
+                print(f"Snapshot is for {payload['year']}-{payload['month']:02d}, "
+                      f"not {year}-{month:02d}", file=sys.stderr)
+                return 1
+            n = restore_snapshot(payload, inputs)
         print(f"  restored {n} files: {describe(payload)}")
         print()
     elif sync:
-        print(f"Syncing inputs for {year} from Google Sheets...")
-        missing = sync_inputs(inputs, year)
-        if missing:
-            print("\nCannot run - no spreadsheet key configured for:", file=sys.stderr)
-            for m in missing:
-                print(f"  - {m}", file=sys.stderr)
-            return 1
-        print()
+        with _phase(profiler, "sync"):
+            if not _sync(inputs, year):
+                return 1
     else:
         print(f"Using already-staged inputs in {inputs}")
 
@@ -87,18 +137,19 @@ def run(year: int, month: int, workdir: Path, sync: bool, save: bool,
     # reproduced. Skipped on replay: the archived snapshot is already the
     # authority, and rewriting it from itself would only risk clobbering it.
     if not (replay or replay_file):
-        write_snapshot(inputs, out_month / SNAPSHOT_NAME, year, month)
+        with _phase(profiler, "snapshot"):
+            write_snapshot(inputs, out_month / SNAPSHOT_NAME, year, month)
         print(f"Snapshotted inputs: {out_month / SNAPSHOT_NAME}")
 
     print(f"Loading data for {payroll_date.strftime('%B %Y')}...")
     print()
 
-    employees = {e.employee_id: e for e in load_employees(inputs / "master_employees.tsv")}
-    contracts = {c.employee_id: c for c in load_contracts(inputs / "contracts.tsv")}
-    leave_path = find_leave_stocks_for_month(inputs, year, month)
-    leave_stocks = (
-        {l.employee_id: l for l in load_leave_stocks(leave_path)} if leave_path else {}
-    )
+    with _phase(profiler, "load"):
+        employees, contracts = load_registers(inputs)
+        leave_path = find_leave_stocks_for_month(inputs, year, month)
+        leave_stocks = (
+            {l.employee_id: l for l in load_leave_stocks(leave_path)} if leave_path else {}
+        )
 
     print(f"Loaded {len(employees)} employees, {len(contracts)} active contracts, "
           f"{len(leave_stocks)} leave records")
@@ -107,25 +158,200 @@ def run(year: int, month: int, workdir: Path, sync: bool, save: bool,
     else:
         print(f"No leave stocks found for {year}-{month:02d} - starting from defaults")
 
-    # Split the attendance workbook into one TSV per employee for this month
-    xlsx = attendance_xlsx_path(inputs, year)
-    if not xlsx.is_file():
-        print(f"Attendance workbook not found: {xlsx}", file=sys.stderr)
+    with _phase(profiler, "extract"):
+        timesheets = load_timesheets(inputs, year, month)
+    if timesheets is None:
         return 1
-    ts_dir = inputs / "timesheets" / f"{year}_{month:02d}"
-    extract_month(xlsx, ts_dir, year, month, log=lambda _: None)
-    timesheets = load_timesheet_folder(ts_dir, year, month)
+    with _phase(profiler, "compute"):
+        if derive_overtime:
+            timesheets = _derive_overtime(payroll_date, timesheets, contracts, leave_stocks)
+        if arrears:
+            timesheets = _add_arrears(arrears, payroll_date, timesheets, contracts)
+            if timesheets is None:
+                return 1
+        print()
 
-    if not timesheets:
-        print(f"No timesheet rows for {year}-{month:02d} in {xlsx.name}", file=sys.stderr)
-        return 1
-    print(f"Loaded timesheets for {len(timesheets)} employees")
+        if scenarios:
+            return _compare_scenarios(scenarios, payroll_date, employees, contracts,
+                                      timesheets, leave_stocks, workers)
+
+        state = workdir / "state" / f"{year}_{month:02d}.json" if incremental else None
+        cache = _open_cache(cache_dir)
+        stage_timings = _stage_timings(timings or timings_json)
+        payslips, skipped = _compute(payroll_date, employees, contracts, timesheets,
+                                     leave_stocks, workers, state=state, cache=cache,
+                                     checks=checks, timings=stage_timings)
+    _print_results(payslips, payroll_date, cache)
+    _report_timings(stage_timings, timings_json, period=f"{year}-{month:02d}",
+                    employees=len(payslips), workers=workers)
+    if payslips and save:
+        _publish(payslips, year, month, outputs, profiler)
+    if payslips and ytd and (save or replay or replay_file):
+        with _phase(profiler, "ytd"):
+            _record_ytd(ytd, payroll_date, payslips,
+                        "replay" if replay or replay_file else "run")
+    _print_skipped(skipped)
+
+    return 0 if payslips else 1
+
+
+def run_range(start: tuple[int, int], end: tuple[int, int], workdir: Path,
+              sync: bool, save: bool, workers: int = 1,
+              cache_dir: Path | None = None, ytd: Path | None = None,
+              derive_overtime: bool = False, checks: tuple | None = None,
+              timings: bool = False, timings_json: Path | None = None,
+              profiler=None) -> int:
+    """Run consecutive months from one load of the inputs. Returns exit code.
+
+    Month by month, each run would re-sync the sheets, re-parse the whole
+    attendance workbook, and round-trip leave balances through the
+    leave_stocks_YYYY sheet. Here the registers are loaded once, each
+    year's workbook is opened once, and every month's closing leave
+    balances are handed straight to the next month as its opening ones.
+    Only the first month reads a leave-stocks tab.
+
+    The carried balances are also written into the staged inputs, where a
+    single-month run would have found them, before each month is
+    snapshotted -- so any month of the range can still be replayed on its
+    own and reproduce the same figures.
+
+    Nothing is published until every month has computed. Publishing then
+    goes in month order, each month's leave tab after its Drive upload, so
+    the later-tab guard in upload_leave_stocks_to_gsheet still holds.
+    """
+    from calendar import monthrange
+
+    from extract_timesheets_xlsx2tsvs import open_workbook
+    from src.gsync import attendance_xlsx_path
+    from src.outputs import generate_leave_stocks_tsv
+
+    months = month_range(start, end)
+    inputs = workdir / "inputs"
+    outputs = workdir / "outputs"
+    years = sorted({y for y, _ in months})
+
+    if sync:
+        for y in years:
+            with _phase(profiler, "sync"):
+                if not _sync(inputs, y):
+                    return 1
+    else:
+        print(f"Using already-staged inputs in {inputs}")
+
+    with _phase(profiler, "load"):
+        employees, contracts = load_registers(inputs)
+        first_year, first_month = months[0]
+        leave_path = find_leave_stocks_for_month(inputs, first_year, first_month)
+        leave_stocks = (
+            {l.employee_id: l for l in load_leave_stocks(leave_path)} if leave_path else {}
+        )
+    print(f"Loaded {len(employees)} employees, {len(contracts)} active contracts, "
+          f"{len(leave_stocks)} leave records")
+    if leave_path:
+        print(f"Opening leave stocks from: {leave_path.name}")
+    else:
+        print(f"No leave stocks found for {first_year}-{first_month:02d} "
+              f"- starting from defaults")
     print()
 
-    # Run payroll
-    engine = PayrollEngine(payroll_date)
-    renderer = PayslipRenderer(company_name=COMPANY_NAME)
-    payslips = []
+    cache = _open_cache(cache_dir)
+    stage_timings = _stage_timings(timings or timings_json)
+    workbooks = {}
+    results = []  # (year, month, payslips)
+    skipped_any = False
+    for year, month in months:
+        payroll_date = date(year, month, 28)
+        out_month = outputs / f"{year}_{month:02d}"
+
+        if results:
+            # Last month's closing balances, exactly as the leave-stocks tab
+            # would have carried them: one row per payslip, dated month end.
+            prev_year, prev_month, prev = results[-1]
+            as_of = date(prev_year, prev_month, monthrange(prev_year, prev_month)[1])
+            leave_stocks = {
+                ps.employee.employee_id: replace(ps.leave.updated_stock, as_of_date=as_of)
+                for ps in prev
+            }
+            carried = (inputs / "leave_stocks" / str(year)
+                       / f"leave_stocks_{as_of:%Y_%m_%d}.tsv")
+            carried.parent.mkdir(parents=True, exist_ok=True)
+            carried.write_text(generate_leave_stocks_tsv(prev, prev_year, prev_month))
+
+        with _phase(profiler, "snapshot"):
+            write_snapshot(inputs, out_month / SNAPSHOT_NAME, year, month)
+
+        with _phase(profiler, "extract"):
+            xlsx = attendance_xlsx_path(inputs, year)
+            if year not in workbooks and xlsx.is_file():
+                workbooks[year] = open_workbook(xlsx)
+            timesheets = load_timesheets(inputs, year, month, wb=workbooks.get(year))
+        if timesheets is None:
+            return 1
+
+        with _phase(profiler, "compute"):
+            if derive_overtime:
+                timesheets = _derive_overtime(payroll_date, timesheets, contracts,
+                                              leave_stocks)
+            payslips, skipped = _compute(payroll_date, employees, contracts, timesheets,
+                                         dict(leave_stocks), workers, cache=cache,
+                                         checks=checks, timings=stage_timings)
+        _print_results(payslips, payroll_date, cache)
+        _print_skipped(skipped)
+        print()
+        if not payslips:
+            print(f"No payslips for {year}-{month:02d}; stopping before later months",
+                  file=sys.stderr)
+            return 1
+        skipped_any = skipped_any or bool(skipped)
+        results.append((year, month, payslips))
+
+    _report_timings(stage_timings, timings_json,
+                    period=f"{months[0][0]}-{months[0][1]:02d}..{months[-1][0]}-"
+                           f"{months[-1][1]:02d}",
+                    employees=sum(len(p) for _, _, p in results), workers=workers)
+
+    if save:
+        for year, month, payslips in results:
+            print(f"Publishing {year}-{month:02d}...")
+            _publish(payslips, year, month, outputs, profiler)
+            if ytd:
+                with _phase(profiler, "ytd"):
+                    _record_ytd(ytd, date(year, month, 28), payslips, "run")
+            print()
+
+    print(f"Computed {len(results)} months, {months[0][0]}-{months[0][1]:02d} "
+          f"to {months[-1][0]}-{months[-1][1]:02d}"
+          + ("" if save else " (preview, nothing published)"))
+    return 0
+
+
+def _sync(inputs: Path, year: int) -> bool:
+    from src.gsync import sync_inputs
+
+    print(f"Syncing inputs for {year} from Google Sheets...")
+    missing = sync_inputs(inputs, year)
+    if missing:
+        print("\nCannot run - no spreadsheet key configured for:", file=sys.stderr)
+        for m in missing:
+            print(f"  - {m}", file=sys.stderr)
+        return False
+    print()
+    return True
+
+
+def _compute(payroll_date: date, employees: dict, contracts: dict, timesheets: dict,
+             leave_stocks: dict, workers: int,
+             state: Path | None = None, cache=None,
+             checks: tuple | None = None, timings=None) -> tuple[list, list]:
+    """Run payroll for one month. Returns (payslips, skipped).
+
+    With a state path, reuse the payslips kept there for employees whose
+    inputs are unchanged, then keep this run's payslips there. With a
+    cache (a PayslipCache), look everyone up there before computing.
+    timings, a StageTimings, collects the engine's step times.
+    """
+    engine = PayrollEngine(payroll_date, cache=cache, checks=checks)
+    engine.timings = timings
     skipped = []
 
     for emp_id in sorted(contracts.keys()):
@@ -134,16 +360,77 @@ def run(year: int, month: int, workdir: Path, sync: bool, save: bool,
             continue
         if emp_id not in timesheets:
             skipped.append((emp_id, f"no timesheet ({employees[emp_id].name})"))
-            continue
-        if emp_id not in leave_stocks:
-            leave_stocks[emp_id] = default_leave_stock(
-                emp_id, contracts[emp_id], payroll_date)
+    leave_stocks = seed_leave_stocks(leave_stocks, contracts, payroll_date)
+
+    if state is None:
+        payslips = engine.process_batch(employees, contracts, timesheets, leave_stocks,
+                                        workers=workers)
+        return payslips, skipped
+
+    from src.incremental import PreviousRun, process_incremental
+
+    previous = PreviousRun.load(state, payroll_date.year, payroll_date.month)
+    payslips, recomputed, current = process_incremental(
+        engine, employees, contracts, timesheets, leave_stocks, previous, workers=workers)
+    current.save(state)
+    print(f"Recomputed {len(recomputed)} of {len(payslips)} employees "
+          f"({len(payslips) - len(recomputed)} unchanged since the last run)")
+    print()
+    return payslips, skipped
+
+
+def _stage_timings(enabled):
+    if not enabled:
+        return None
+    from src.timings import StageTimings
+    return StageTimings()
+
+
+def _report_timings(timings, path: Path | None, **meta) -> None:
+    """Print the stage timings, and write them to path as JSON."""
+    if timings is None:
+        return
+    print("  ENGINE STAGE TIMINGS (employees computed this run; cache hits and "
+          "reused payslips are not timed)")
+    print(timings.report())
+    print()
+    if path:
+        from src.snapshot import git_commit
+        path.write_text(timings.to_json(commit=git_commit(), **meta))
+        print(f"Stage timings written to {path}")
+
+
+def _phase(profiler, name: str):
+    """profiler.phase(name), or nothing without --profile."""
+    return profiler.phase(name) if profiler is not None else nullcontext()
+
+
+def _report_profile(profiler, directory: Path) -> None:
+    """Print the phase table and write the profiles into directory."""
+    if profiler is None:
+        return
+    print()
+    print("  RUN PHASES (cProfile on; times include its overhead)")
+    print(profiler.report())
+    print()
+    written = profiler.write(directory)
+    print(f"Profiles written to {directory}: "
+          + ", ".join(p.name for p in written))
+
+
+def _open_cache(cache_dir: Path | None):
+    if cache_dir is None:
+        return None
+    from src.cache import PayslipCache
+    return PayslipCache(cache_dir)
 
-        payslip = engine.process(
-            employees[emp_id], contracts[emp_id], timesheets[emp_id], leave_stocks[emp_id]
-        )
-        payslips.append(payslip)
 
+def _print_results(payslips: list, payroll_date: date, cache=None) -> None:
+    from src.outputs import PayslipRenderer
+
+    renderer = PayslipRenderer(company_name=COMPANY_NAME,
+                               ctx=PayrollContext.for_date(payroll_date))
+    for payslip in payslips:
         print(renderer.render(payslip))
         print()
         print()
@@ -188,32 +475,129 @@ def run(year: int, month: int, workdir: Path, sync: bool, save: bool,
         # Cost to company
         total_employer = total_gross + total_nssf_er + total_ahl_er
         print(f"  Cost to Company       KES {total_employer:>14,.2f}")
+        if cache is not None:
+            print()
+            print(f"  Result cache: {cache.summary()}")
         print("=" * 60)
 
+
+def _publish(payslips: list, year: int, month: int, outputs: Path,
+             profiler=None) -> None:
     # Publish results. The leave-stocks tab is what next month's run reads
     # back in, so it is written last - a failed Drive upload should not
     # leave the input sheet advanced past outputs nobody can see.
-    if payslips and save:
+    from src.outputs import (
+        save_payroll_outputs, upload_leave_stocks_to_gsheet,
+        upload_payroll_outputs_to_gdrive,
+    )
+
+    with _phase(profiler, "outputs"):
         written = save_payroll_outputs(payslips, year, month, outputs, COMPANY_NAME)
-        print(f"\nGenerated {len(written)} output files")
+    print(f"\nGenerated {len(written)} output files")
+    with _phase(profiler, "upload"):
         drive_url, n_uploaded, trashed = upload_payroll_outputs_to_gdrive(
             year, month, outputs, replace=True)
-        print(f"Uploaded {n_uploaded} output files to Google Drive: {drive_url}")
-        if trashed:
-            print(f"Trashed {len(trashed)} stale file(s) this run did not produce:")
-            for t in trashed:
-                print(f"  - {t}")
+    print(f"Uploaded {n_uploaded} changed output files to Google Drive: {drive_url}")
+    if trashed:
+        print(f"Trashed {len(trashed)} stale file(s) this run did not produce:")
+        for t in trashed:
+            print(f"  - {t}")
+    with _phase(profiler, "upload"):
         tab = upload_leave_stocks_to_gsheet(payslips, year, month)
-        print(f"Uploaded leave stocks to gsheet tab: {tab}")
+    print(f"Uploaded leave stocks to gsheet tab: {tab}")
+
 
+def _compare_scenarios(path: Path, payroll_date: date, employees: dict, contracts: dict,
+                       timesheets: dict, leave_stocks: dict, workers: int) -> int:
+    """Print the month's totals under each rate table in path, against the
+    actual rates. Publishes nothing."""
+    from src.rates import StatutoryRates
+    from src.scenarios import load_scenarios, run_scenarios
+
+    actual = StatutoryRates(payroll_date)
+    try:
+        variants = load_scenarios(path, actual)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read scenarios: {e}", file=sys.stderr)
+        return 1
+    leave_stocks = seed_leave_stocks(leave_stocks, contracts, payroll_date)
+
+    results = run_scenarios(payroll_date, employees, contracts, timesheets, leave_stocks,
+                            [("actual rates", actual)] + variants, workers=workers)
+    base = results[0]
+    print(f"  SCENARIOS - {payroll_date.strftime('%B %Y')}, "
+          f"{len(variants)} variants")
+    print(f"  {'Scenario':<24} {'Cost to Co':>14} {'Change':>12} {'Net Pay':>14} "
+          f"{'PAYE':>12} {'NSSF (ee)':>12} {'SHIF':>12} {'AHL (ee)':>12}")
+    for r in results:
+        print(f"  {r.name[:24]:<24} {r.employer_cost:>14,.2f} "
+              f"{r.employer_cost - base.employer_cost:>+12,.2f} {r.net_pay:>14,.2f} "
+              f"{r.paye:>12,.2f} {r.nssf_employee:>12,.2f} {r.shif:>12,.2f} "
+              f"{r.ahl_employee:>12,.2f}")
+    return 0
+
+
+def _add_arrears(path: Path, payroll_date: date, timesheets: dict,
+                 contracts: dict) -> dict | None:
+    """The timesheets with the back pay in path added to this month's
+    adjustments. Returns None (having reported why) on failure."""
+    from src.backpay import arrears_moved, inject_arrears, load_arrears
+
+    try:
+        arrears = load_arrears(path)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read arrears: {e}", file=sys.stderr)
+        return None
+    timesheets, missing = inject_arrears(timesheets, arrears, contracts)
+    print(f"Added back pay for {len(arrears) - len(missing)} employees from {path.name}")
+    if missing:
+        print(f"  not paid - no timesheet this month, or a prorated_min_wage contract: "
+              f"ID {', '.join(map(str, missing))}", file=sys.stderr)
+    moved = arrears_moved(timesheets, {i: a for i, a in arrears.items() if i not in missing},
+                          PayrollContext.for_date(payroll_date))
+    if moved:
+        print(f"  also moves overtime, holiday premium or leave deductions (valued "
+              f"with the month's adjustments), so check the gross paid: "
+              f"ID {', '.join(map(str, moved))}")
+    return timesheets
+
+
+def _derive_overtime(payroll_date: date, timesheets: dict, contracts: dict,
+                     leave_stocks: dict) -> dict:
+    """The timesheets with overtime derived from hours worked, reporting
+    every day where that differs from the overtime entered."""
+    from src.overtime import derive_month
+
+    ctx = PayrollContext.for_date(payroll_date)
+    timesheets, mismatches = derive_month(timesheets, contracts, ctx, leave_stocks)
+    days = sum(len(m) for m in mismatches.values())
+    print(f"Derived overtime from hours worked: {days} days differ from the "
+          f"hand-entered figures for {len(mismatches)} employees")
+    for emp_id, diffs in sorted(mismatches.items()):
+        for m in diffs:
+            print(f"  ID {emp_id}  {m}")
+    return timesheets
+
+
+def _record_ytd(path: Path, payroll_date: date, payslips: list, source: str) -> None:
+    from src.ytd import YTDStore
+
+    year, month = payroll_date.year, payroll_date.month
+    with YTDStore(path) as store:
+        store.record(year, month, PayrollEngine(payroll_date).tax_months(payslips),
+                     [ps.employee for ps in payslips], source=source)
+        on_file = store.recorded_months(year)
+    print(f"Recorded {year}-{month:02d} in the YTD store ({len(payslips)} employees); "
+          f"{len(on_file)} month(s) of {year} on file")
+
+
+def _print_skipped(skipped: list) -> None:
     if skipped:
         print()
         print("Skipped employees:")
         for emp_id, reason in skipped:
             print(f"  ID {emp_id}: {reason}")
 
-    return 0 if payslips else 1
-
 
 def main():
     parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
@@ -230,14 +614,70 @@ def main():
                              "month, instead of the current sheets")
     parser.add_argument("--replay-file", type=Path,
                         help="Recompute from a local snapshot file")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="Compute payslips in N processes (default: 1, serial)")
+    parser.add_argument("--from", dest="from_month", type=parse_month, metavar="YYYY-MM",
+                        help="First month of a chained multi-month run (with --to)")
+    parser.add_argument("--to", dest="to_month", type=parse_month, metavar="YYYY-MM",
+                        help="Last month of a chained multi-month run (with --from)")
+    parser.add_argument("--cache-dir", type=Path,
+                        help="Reuse payslips computed by earlier runs from this "
+                             "cache directory, and add this run's to it")
+    parser.add_argument("--scenarios", type=Path, metavar="TSV",
+                        help="Compare the month's totals under the alternative rate "
+                             "tables in TSV (see src/scenarios.py); publishes nothing")
+    parser.add_argument("--ytd", type=Path, metavar="PATH",
+                        help="Record published and replayed months in this YTD "
+                             "store, for P9 cards (see p9.py)")
+    parser.add_argument("--arrears", type=Path, metavar="TSV",
+                        help="Pay the back pay in TSV (written by backpay.py) "
+                             "with this month")
+    parser.add_argument("--derive-overtime", action="store_true",
+                        help="Work out overtime from hours worked instead of using the "
+                             "hand-entered columns, and report where they differ")
+    parser.add_argument("--skip-check", action="append", default=[], choices=tuple(CHECKS),
+                        metavar="CODE",
+                        help="Do not run this payslip check (repeatable): "
+                             + ", ".join(CHECKS))
+    parser.add_argument("--timings", action="store_true",
+                        help="Time each step of the payroll engine and print p50/p95/max "
+                             "per step after the summary")
+    parser.add_argument("--timings-json", type=Path, metavar="PATH",
+                        help="As --timings, and also write the figures here as JSON")
+    parser.add_argument("--profile", type=Path, metavar="DIR",
+                        help="Profile each phase of the run (sync, extract, load, "
+                             "compute, outputs, upload...), print wall/CPU/bytes per "
+                             "phase and write pstats and collapsed stacks into DIR")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Reuse the payslips of the previous run kept in --workdir "
+                             "for employees whose inputs are unchanged")
     args = parser.parse_args()
 
     if args.no_sync and not args.workdir:
         parser.error("--no-sync requires --workdir (a temp dir starts empty)")
+    if args.incremental and not args.workdir:
+        parser.error("--incremental requires --workdir (the previous run is kept there)")
     if args.replay and args.replay_file:
         parser.error("--replay and --replay-file are alternatives; pass only one")
     if (args.replay or args.replay_file) and args.no_sync:
         parser.error("--no-sync conflicts with replay (replay supplies the inputs)")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if (args.from_month is None) != (args.to_month is None):
+        parser.error("--from and --to go together")
+    if args.from_month and args.from_month > args.to_month:
+        parser.error("--from is after --to")
+    if args.from_month and args.scenarios:
+        parser.error("--scenarios runs one month; drop --from/--to")
+    if args.from_month and args.arrears:
+        parser.error("--arrears pays back pay in one month; drop --from/--to")
+    if args.from_month and (args.replay or args.replay_file):
+        parser.error("--from/--to cannot replay; replay one month at a time")
+    if args.from_month and args.incremental:
+        parser.error("--incremental reruns one month; drop --from/--to")
+
+    checks = (tuple(c for c in CHECKS if c not in args.skip_check)
+              if args.skip_check else None)
 
     if args.workdir:
         args.workdir.mkdir(parents=True, exist_ok=True)
@@ -245,10 +685,34 @@ def main():
     else:
         ctx = tempfile.TemporaryDirectory(prefix="kenyacc_")
 
+    profiler = None
+    if args.profile:
+        from src.profiling import PhaseProfiler
+        profiler = PhaseProfiler()
+
+    # The profile is reported even when the run fails part-way: a run that
+    # gives up after a slow sync is as worth looking at as one that finishes.
     with ctx as tmp:
-        return run(args.year, args.month, Path(tmp),
-                   sync=not args.no_sync, save=not args.no_save,
-                   replay=args.replay, replay_file=args.replay_file)
+        try:
+            if args.from_month:
+                return run_range(args.from_month, args.to_month, Path(tmp),
+                                 sync=not args.no_sync, save=not args.no_save,
+                                 workers=args.workers, cache_dir=args.cache_dir,
+                                 ytd=args.ytd, derive_overtime=args.derive_overtime,
+                                 checks=checks, timings=args.timings,
+                                 timings_json=args.timings_json, profiler=profiler)
+            return run(args.year, args.month, Path(tmp),
+                       sync=not args.no_sync, save=not args.no_save,
+                       replay=args.replay, replay_file=args.replay_file,
+                       workers=args.workers,
+                       incremental=args.incremental,
+                       cache_dir=args.cache_dir, scenarios=args.scenarios,
+                       ytd=args.ytd, arrears=args.arrears,
+                       derive_overtime=args.derive_overtime, checks=checks,
+                       timings=args.timings, timings_json=args.timings_json,
+                       profiler=profiler)
+        finally:
+            _report_profile(profiler, args.profile)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,95 @@
+"""The app's download files for one payroll result, built once each.
+
+Streamlit reruns app.py on every click, and the Downloads tab used to
+rebuild the payslip PDF and all four statutory CSVs each time, because a
+download button has to be handed its bytes up front. A PayrollArtifacts
+is kept per payroll result instead (app.py holds one per results
+fingerprint). Each CSV is built the first time it is asked for and kept.
+
+The PDF renders a page or more per payslip, which takes long enough with
+a few hundred payslips to freeze the page. So it is built in a background
+thread once asked for, while the app polls pdf_progress() to draw a
+progress bar. The thread only renders; it never calls Streamlit.
+"""
+
+import threading
+
+from .context import PayrollContext
+from .models import PaySlip
+from .outputs import (
+    BankFileGenerator, KRAReturnGenerator, NSSFReturnGenerator, PayslipRenderer,
+    SHAReturnGenerator,
+)
+
+# name -> builder
+CSV_BUILDERS = {
+    "bank": lambda payslips: BankFileGenerator(payslips).to_equity_csv(),
+    "kra_p10": lambda payslips: KRAReturnGenerator(payslips).to_p10_csv(),
+    "nssf": lambda payslips: NSSFReturnGenerator(payslips).to_nssf_csv(),
+    "sha": lambda payslips: SHAReturnGenerator(payslips).to_sha_csv(),
+}
+
+
+class PayrollArtifacts:
+    def __init__(self, payslips: list[PaySlip], company_name: str = "",
+                 ctx: PayrollContext | None = None):
+        self.payslips = payslips
+        self.company_name = company_name
+        # The month the payslips are for, as the PDF renders it (see
+        # PayslipRenderer).
+        self.ctx = ctx
+        self._built: dict[str, str | bytes] = {}
+        self._lock = threading.Lock()
+        self._pdf_thread: threading.Thread | None = None
+        self._pdf_done = 0
+        self.pdf_error: Exception | None = None
+
+    def csv(self, name: str) -> str:
+        """The named CSV (see CSV_BUILDERS), built on first request."""
+        with self._lock:
+            if name not in self._built:
+                self._built[name] = CSV_BUILDERS[name](self.payslips)
+            return self._built[name]
+
+    def start_pdf(self) -> None:
+        """Start building the PDF in the background, unless it is built or
+        being built. A build that failed is started again, its error
+        cleared."""
+        with self._lock:
+            if "pdf" in self._built or self.pdf_building():
+                return
+            self.pdf_error = None
+            self._pdf_done = 0
+            self._pdf_thread = threading.Thread(target=self._build_pdf, daemon=True,
+                                                name="payslip-pdf")
+            self._pdf_thread.start()
+
+    def _build_pdf(self) -> None:
+        def progress(done, total):
+            self._pdf_done = done
+
+        try:
+            pdf = PayslipRenderer(self.company_name, self.ctx).render_all_pdf(
+                self.payslips, progress=progress)
+        except Exception as e:  # reportlab missing, a bad payslip: shown by the app
+            self.pdf_error = e
+            return
+        with self._lock:
+            self._built["pdf"] = pdf
+
+    def pdf(self) -> bytes | None:
+        """The PDF, once built."""
+        return self._built.get("pdf")
+
+    def pdf_building(self) -> bool:
+        return self._pdf_thread is not None and self._pdf_thread.is_alive()
+
+    def pdf_progress(self) -> tuple[int, int]:
+        """(payslips rendered, total) of the PDF being built."""
+        return self._pdf_done, len(self.payslips)
+
+    def wait_pdf(self, timeout: float | None = None) -> bytes | None:
+        """Block until the PDF build started by start_pdf() ends."""
+        if self._pdf_thread is not None:
+            self._pdf_thread.join(timeout)
+        return self.pdf()
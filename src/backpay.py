@@ -0,0 +1,301 @@
+"""Back pay: recompute past months with corrected inputs and pay the difference.
+
+A pay rise agreed in April but effective from January, a mis-keyed
+timesheet found three months late, a rate the payroll applied too early:
+each means rerunning the affected months with the correction and paying
+(or recovering) what each employee was owed. Done by hand that is a replay
+per month and a spreadsheet of diffs.
+
+back_pay takes each affected month twice -- the inputs it was originally
+run from (its archived input snapshot, which reproduces the published
+payslips as long as the calculation code has not changed since) and the
+same inputs with the corrections applied --
+computes both, months in parallel, and diffs every employee's gross. The
+per-employee total is an arrears adjustment split the way the timesheet
+adjustment columns expect it:
+
+- adj_with_housing: the part of the difference that carried a housing
+  allowance, which this month's run adds 15% on top of again;
+- adj_no_housing: everything else (overtime, holiday premium, casual days'
+  housing already added, and all of it for housed staff).
+
+Paid in the current month, the two add back up to the gross difference
+(to the cent), and are taxed there as the month's pay. Like any
+adjustment, though, they are part of the base that month's overtime,
+worked-holiday premium and leave deductions are valued at, so for an
+employee who has any of those in the paying month the gross moves by a
+little more or less than the arrears; arrears_moved() lists them. A negative figure
+is an overpayment to recover. A correction that only moves deductions --
+most rate corrections -- leaves gross where it was: those employees are
+listed with a net difference and no adjustment, since what they are owed
+is settled through the statutory returns, not through pay.
+
+prorated_min_wage pay is worked out from hours alone and has no
+adjustment columns, so arrears for those contracts are listed but have to
+be paid by hand.
+
+Each month is recomputed from its own opening leave balances; a
+correction that changes leave taken does not ripple into later months'
+opening balances.
+"""
+
+import csv
+from dataclasses import dataclass, field, replace
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+from pathlib import Path
+
+from .calculators import GrossCalculator, PayrollEngine, seed_leave_stocks
+from .context import PayrollContext
+from .models import (
+    Contract, Employee, LeaveStock, PaySlip, TimesheetMonth, timesheet_columns,
+)
+
+CENT = Decimal("0.01")
+
+
+@dataclass
+class MonthInputs:
+    """Everything one payroll month is computed from."""
+    ctx: PayrollContext
+    employees: dict[int, Employee]
+    contracts: dict[int, Contract]
+    timesheets: dict
+    leave_stocks: dict[int, LeaveStock]
+    # Rate overrides for the month, as for scenarios.scenario_rates
+    rate_overrides: dict = field(default_factory=dict)
+
+
+@dataclass
+class MonthDifference:
+    """One employee-month: the original figures against the corrected ones."""
+    employee_id: int
+    year: int
+    month: int
+    original_gross: Decimal
+    corrected_gross: Decimal
+    housing_difference: Decimal   # change in the cash housing allowance
+    net_difference: Decimal       # as if corrected in the month itself
+
+    @property
+    def gross_difference(self) -> Decimal:
+        return self.corrected_gross - self.original_gross
+
+
+@dataclass
+class Arrears:
+    """What one employee is owed across the corrected months."""
+    employee_id: int
+    name: str
+    months: list[tuple[int, int]]
+    gross_difference: Decimal
+    adj_with_housing: Decimal
+    adj_no_housing: Decimal
+    net_difference: Decimal       # sum of the month-by-month net differences
+
+
+def compute_month(inputs: MonthInputs) -> list[PaySlip]:
+    """PayrollEngine over one month's inputs, under its rate overrides."""
+    from .scenarios import scenario_rates
+
+    engine = PayrollEngine(inputs.ctx.payroll_date)
+    engine.ctx = inputs.ctx
+    if inputs.rate_overrides:
+        engine.ctx = inputs.ctx.with_rates(
+            scenario_rates(inputs.ctx.rates, **inputs.rate_overrides))
+    stocks = seed_leave_stocks(inputs.leave_stocks, inputs.contracts,
+                               inputs.ctx.payroll_date)
+    return engine.process_batch(inputs.employees, inputs.contracts, inputs.timesheets, stocks)
+
+
+def diff_month(original: list[PaySlip], corrected: list[PaySlip],
+               year: int, month: int) -> list[MonthDifference]:
+    """Per-employee differences, for everyone paid in either version.
+    Employees whose figures did not move are left out."""
+    before = {ps.employee.employee_id: ps for ps in original}
+    after = {ps.employee.employee_id: ps for ps in corrected}
+    zero = Decimal(0)
+    out = []
+    for emp_id in sorted(before.keys() | after.keys()):
+        b, a = before.get(emp_id), after.get(emp_id)
+        d = MonthDifference(
+            employee_id=emp_id, year=year, month=month,
+            original_gross=b.gross.total_gross if b else zero,
+            corrected_gross=a.gross.total_gross if a else zero,
+            housing_difference=((a.gross.housing_allowance if a else zero)
+                                - (b.gross.housing_allowance if b else zero)),
+            net_difference=(a.net_pay if a else zero) - (b.net_pay if b else zero),
+        )
+        if d.gross_difference or d.net_difference:
+            out.append(d)
+    return out
+
+
+def _recompute(pair: tuple[MonthInputs, MonthInputs]) -> list[MonthDifference]:
+    """Worker entry point: one month, original and corrected."""
+    original, corrected = pair
+    ctx = original.ctx
+    return diff_month(compute_month(original), compute_month(corrected), ctx.year, ctx.month)
+
+
+def back_pay(
+    months: list[tuple[MonthInputs, MonthInputs]],
+    workers: int = 1,
+) -> tuple[list[Arrears], list[MonthDifference]]:
+    """Arrears per employee over (original, corrected) pairs of months.
+
+    Returns (arrears in employee_id order, every month's differences). With
+    workers > 1 the months are recomputed in that many processes; each
+    carries its own PayrollContext, so workers see the holiday calendar
+    the inputs were loaded with.
+    """
+    if workers > 1 and len(months) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(months))) as pool:
+            per_month = list(pool.map(_recompute, months))
+    else:
+        per_month = [_recompute(pair) for pair in months]
+
+    differences = [d for month in per_month for d in month]
+    names, housed = {}, {}
+    for original, corrected in months:
+        for inputs in (original, corrected):
+            for emp_id, e in inputs.employees.items():
+                names[emp_id] = e.name
+        for emp_id, c in corrected.contracts.items():
+            housed[emp_id] = c.housing_type in ("quarters", "dorm")
+    return _arrears(differences, names, housed), differences
+
+
+def _arrears(differences: list[MonthDifference], names: dict[int, str],
+             housed: dict[int, bool]) -> list[Arrears]:
+    by_employee: dict[int, list[MonthDifference]] = {}
+    for d in differences:
+        by_employee.setdefault(d.employee_id, []).append(d)
+
+    out = []
+    for emp_id, diffs in sorted(by_employee.items()):
+        gross = sum((d.gross_difference for d in diffs), Decimal(0))
+        housing = sum((d.housing_difference for d in diffs), Decimal(0))
+        with_housing, no_housing = split_arrears(gross, housing, housed.get(emp_id, False))
+        out.append(Arrears(
+            employee_id=emp_id,
+            name=names.get(emp_id, ""),
+            months=sorted({(d.year, d.month) for d in diffs}),
+            gross_difference=gross,
+            adj_with_housing=with_housing,
+            adj_no_housing=no_housing,
+            net_difference=sum((d.net_difference for d in diffs), Decimal(0)),
+        ))
+    return out
+
+
+def split_arrears(gross: Decimal, housing: Decimal, housed: bool) -> tuple[Decimal, Decimal]:
+    """(adj_with_housing, adj_no_housing), in cents, that pay gross in a
+    later month: the base behind the housing difference attracts housing
+    again when paid, the rest is paid as it is."""
+    if housed or not housing:
+        return Decimal(0), gross.quantize(CENT, rounding=ROUND_HALF_UP)
+    with_housing = (housing / GrossCalculator.HOUSING_RATE).quantize(CENT, rounding=ROUND_HALF_UP)
+    paid = with_housing + with_housing * GrossCalculator.HOUSING_RATE
+    return with_housing, (gross - paid).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+# Arrears files
+
+ARREARS_COLUMNS = ("employee_id", "name", "months", "gross_difference",
+                   "adj_with_housing", "adj_no_housing", "net_difference")
+
+
+def write_arrears(arrears: list[Arrears], path: str | Path) -> Path:
+    """Write arrears as a TSV that run_payroll --arrears reads back."""
+    path = Path(path)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f, delimiter="\t")
+        writer.writerow(ARREARS_COLUMNS)
+        for a in arrears:
+            writer.writerow([
+                a.employee_id, a.name,
+                ",".join(f"{y}-{m:02d}" for y, m in a.months),
+                f"{a.gross_difference:.2f}", f"{a.adj_with_housing:.2f}",
+                f"{a.adj_no_housing:.2f}", f"{a.net_difference:.2f}",
+            ])
+    return path
+
+
+def load_arrears(path: str | Path) -> dict[int, tuple[Decimal, Decimal]]:
+    """employee_id -> (adj_with_housing, adj_no_housing) from an arrears TSV."""
+    out = {}
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for lineno, row in enumerate(csv.DictReader(f, delimiter="\t"), start=2):
+            try:
+                emp_id = int(row["employee_id"])
+                adj = (Decimal(row["adj_with_housing"] or 0),
+                       Decimal(row["adj_no_housing"] or 0))
+            except (KeyError, TypeError, ArithmeticError, ValueError):
+                raise ValueError(f"{path}:{lineno}: not an arrears row") from None
+            if emp_id in out:
+                raise ValueError(f"{path}:{lineno}: employee {emp_id} listed twice")
+            out[emp_id] = adj
+    return out
+
+
+def inject_arrears(timesheets: dict, arrears: dict[int, tuple[Decimal, Decimal]],
+                   contracts: dict[int, Contract] | None = None,
+                   ) -> tuple[dict, list[int]]:
+    """The month's timesheets with each employee's arrears added to the
+    adjustment columns of their last day. Returns (timesheets, employee_ids
+    with arrears that cannot be paid this month -- no timesheet, or a
+    prorated_min_wage contract, whose pay ignores the adjustment columns)."""
+    out = dict(timesheets)
+    missing = []
+    for emp_id, (with_housing, no_housing) in arrears.items():
+        days = timesheets.get(emp_id)
+        c = (contracts or {}).get(emp_id)
+        if not days or (c is not None and c.contract_type == "prorated_min_wage"):
+            missing.append(emp_id)
+            continue
+        days = list(days)
+        last = days[-1]
+        days[-1] = replace(last, adj_with_housing=last.adj_with_housing + with_housing,
+                           adj_no_housing=last.adj_no_housing + no_housing)
+        if isinstance(timesheets[emp_id], TimesheetMonth):
+            ts = timesheets[emp_id]
+            days = TimesheetMonth(ts.employee_id, ts.year, ts.month, days)
+        out[emp_id] = days
+    return out, sorted(missing)
+
+
+def arrears_moved(timesheets: dict, arrears: dict, ctx: PayrollContext) -> list[int]:
+    """Employees with arrears whose month also has overtime, a worked
+    public holiday or an absent or sick day. Those hours are valued at an
+    hourly rate that includes the month's adjustments, so paying the
+    arrears moves them too and the gross paid is not exactly the arrears."""
+    moved = []
+    for emp_id in arrears:
+        days = timesheets.get(emp_id)
+        if not days:
+            continue
+        ot_1_5, ot_2_0, absent = timesheet_columns(days, "hours_ot_1_5", "hours_ot_2_0",
+                                                   "absent")
+        if any(ot_1_5) or any(ot_2_0) or any(absent) or ctx.worked_holidays(days):
+            moved.append(emp_id)
+    return sorted(moved)
+
+
+def month_inputs(payroll_date: date, employees: dict, contracts: dict, timesheets: dict,
+                 leave_stocks: dict, rate_overrides: dict | None = None) -> MonthInputs:
+    """MonthInputs for the registers as loaded, with the month's calendar
+    taken now -- i.e. with whatever holiday overrides were loaded with them."""
+    ids = [i for i in contracts if i in employees and i in timesheets]
+    ctx = PayrollContext.for_date(payroll_date,
+                                  {contracts[i].weekly_hours or 45 for i in ids})
+    return MonthInputs(
+        ctx=ctx,
+        employees={i: employees[i] for i in ids},
+        contracts={i: contracts[i] for i in ids},
+        timesheets={i: timesheets[i] for i in ids},
+        leave_stocks=leave_stocks,
+        rate_overrides=dict(rate_overrides or {}),
+    )
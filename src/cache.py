@@ -0,0 +1,124 @@
+"""On-disk cache of computed payslips, keyed by everything they depend on.
+
+Most employees' inputs do not change between a preview run, a rerun after
+a correction, a --replay or another press of "Run Payroll" in the app, so
+PayrollEngine(..., cache=PayslipCache(dir)) looks each employee up here
+before computing and stores whatever it had to compute.
+
+The key is a digest of the employee, contract, timesheet rows and opening
+leave stock, the month's rates and holidays (see incremental.py), the
+engine's backend and checks, and the source of the calculation modules --
+so editing the calculators invalidates every entry without anyone having
+to clear the directory. Entries are JSON payslips (see serialize.py), one file
+each, and the directory is kept under max_bytes by evicting the least
+recently used.
+
+The cache holds payslips, i.e. private employee data: point it somewhere
+that is not the working tree, nor an inputs folder that is shared or
+synced. default_cache_dir() is the per-user cache directory the app uses.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+from .incremental import code_version, input_fingerprint, rates_version
+from .models import Contract, Employee, LeaveStock, PaySlip
+from .serialize import digest, payslip_from_dict, payslip_to_dict
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    """The platform's per-user cache directory for payslips:
+    %LOCALAPPDATA% on Windows, ~/Library/Caches on macOS, and
+    $XDG_CACHE_HOME or ~/.cache elsewhere."""
+    if sys.platform == "win32" and os.environ.get("LOCALAPPDATA"):
+        base = Path(os.environ["LOCALAPPDATA"])
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return base / "kenyacc" / "payslips"
+
+
+class PayslipCache:
+    def __init__(self, directory: str | Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # key -> (last use, size). Last use is the file's mtime, which get()
+        # refreshes, so recency survives between runs.
+        self._index: dict[str, tuple[float, int]] = {}
+        for path in self.directory.glob("*/*.json"):
+            st = path.stat()
+            self._index[path.stem] = (st.st_mtime, st.st_size)
+        self._bytes = sum(size for _, size in self._index.values())
+
+    def version(self, engine) -> str:
+        """The part of every key that is shared by a whole run: rates and
+        holidays for the engine's month, its backend and checks, and the
+        code."""
+        return digest(rates_version(engine.ctx), engine.backend, engine.checks,
+                      code_version())
+
+    def key(self, version: str, employee: Employee, contract: Contract,
+            timesheet, leave_stock: LeaveStock) -> str:
+        return input_fingerprint(employee, contract, timesheet, leave_stock, version)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> PaySlip | None:
+        path = self._path(key)
+        try:
+            payslip = payslip_from_dict(json.loads(path.read_text()))
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, KeyError, TypeError):
+            # Unreadable entry (a crash mid-write, a hand edit): drop it.
+            self._discard(key)
+            self.misses += 1
+            return None
+        os.utime(path)
+        self._index[key] = (path.stat().st_mtime, self._index.get(key, (0, 0))[1])
+        self.hits += 1
+        return payslip
+
+    def put(self, key: str, payslip: PaySlip) -> None:
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        data = json.dumps(payslip_to_dict(payslip)).encode()
+        # Write then rename, so a reader never sees half an entry.
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+        self._bytes -= self._index.get(key, (0, 0))[1]
+        self._index[key] = (path.stat().st_mtime, len(data))
+        self._bytes += len(data)
+        self._evict()
+
+    def _discard(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+        _, size = self._index.pop(key, (0, 0))
+        self._bytes -= size
+
+    def _evict(self) -> None:
+        if self._bytes <= self.max_bytes:
+            return
+        for key, _ in sorted(self._index.items(), key=lambda kv: kv[1][0]):
+            self._discard(key)
+            if self._bytes <= self.max_bytes:
+                return
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def summary(self) -> str:
+        return (f"{self.hits} hits, {self.misses} misses "
+                f"({len(self)} entries, {self._bytes / 1024 / 1024:.1f} MB in {self.directory})")
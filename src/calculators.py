@@ -1,11 +1,17 @@
-from calendar import monthrange
+from bisect import bisect_left
+from dataclasses import replace
 from datetime import date, timedelta
 from decimal import Decimal
+from functools import lru_cache
+from time import perf_counter
 
 from .models import (
-    Contract, Deductions, Employee, GrossBreakdown, LeaveAllocation,
-    LeaveStock, PaySlip, TimesheetDay,
+    Contract, Deductions, Employee, Finding, GrossBreakdown, LeaveAllocation,
+    LeaveStock, PaySlip, TaxMonth, TimesheetDay, TimesheetMonth,
+    timesheet_columns, timesheet_total,
 )
+from .context import PayrollContext, month_context
+from .overtime import week_regular_hours
 from .rates import StatutoryRates
 
 
@@ -13,10 +19,12 @@ class GrossCalculator:
     HOUSING_RATE = Decimal("0.15")
     STATUTORY_DIVISOR = Decimal("225.333333")  # 52 * 52 / 12
 
-    def __init__(self, contract: Contract, timesheet_days: list[TimesheetDay], payroll_date: date = None):
+    def __init__(self, contract: Contract, timesheet_days: list[TimesheetDay],
+                 payroll_date: date | PayrollContext = None):
         self.contract = contract
         self.timesheet_days = timesheet_days
-        self.payroll_date = payroll_date
+        self.ctx = month_context(payroll_date)
+        self.payroll_date = self.ctx.payroll_date if self.ctx else None
 
     def _get_divisor(self) -> Decimal:
         """
@@ -27,24 +35,17 @@ class GrossCalculator:
         - 'monthly': Calculate based on working days in the payroll month
         - A number: Use that custom divisor
         """
-        from .rates import KenyanHolidays
-
         divisor_setting = self.contract.hourly_divisor.lower().strip()
 
         if divisor_setting in ("statutory", "225"):
             return self.STATUTORY_DIVISOR
 
         if divisor_setting == "monthly":
-            if self.payroll_date is None:
+            if self.ctx is None:
                 # Fallback to statutory if no payroll date
                 return self.STATUTORY_DIVISOR
             # Calculate based on working days in the month
-            weekly_hours = self.contract.weekly_hours or 45
-            return KenyanHolidays.get_expected_hours(
-                self.payroll_date.year,
-                self.payroll_date.month,
-                weekly_hours,
-            )
+            return self.ctx.expected_hours(self.contract.weekly_hours or 45)
 
         # Try to parse as a custom number
         try:
@@ -97,9 +98,9 @@ class GrossCalculator:
         divisor = self._get_divisor()
         hourly_rate = self.contract.base_salary / divisor
 
-        total_normal = sum(d.hours_normal for d in self.timesheet_days)
-        total_ot_1_5 = sum(d.hours_ot_1_5 for d in self.timesheet_days)
-        total_ot_2_0 = sum(d.hours_ot_2_0 for d in self.timesheet_days)
+        total_normal = timesheet_total(self.timesheet_days, "hours_normal")
+        total_ot_1_5 = timesheet_total(self.timesheet_days, "hours_ot_1_5")
+        total_ot_2_0 = timesheet_total(self.timesheet_days, "hours_ot_2_0")
 
         raw_base_pay = hourly_rate * total_normal
         overtime_1_5 = hourly_rate * Decimal("1.5") * total_ot_1_5
@@ -128,7 +129,7 @@ class GrossCalculator:
         # other monthly adjustments are applied later in _apply_monthly_adjustments.
         from .rates import StatutoryRates
 
-        monthly_fraction, casual_until = month_split(self.contract, self.payroll_date)
+        monthly_fraction, casual_until = month_split(self.contract, self.ctx)
 
         # Casual days are paid only for hours actually worked -- unlike the
         # monthly portion, where absence is the thing that gets deducted. So an
@@ -154,10 +155,10 @@ class GrossCalculator:
 
         # One-off adjustments for the month. Both are taxable pay and flow
         # into gross like any other earning; only one attracts housing.
-        adj_with_housing = sum((d.adj_with_housing for d in self.timesheet_days),
-                               Decimal(0))
-        adj_no_housing = sum((d.adj_no_housing for d in self.timesheet_days),
-                             Decimal(0))
+        adj_with_housing = timesheet_total(self.timesheet_days, "adj_with_housing",
+                                           Decimal(0))
+        adj_no_housing = timesheet_total(self.timesheet_days, "adj_no_housing",
+                                         Decimal(0))
         adj_housing = (Decimal(0) if self.contract.housing_type in ("quarters", "dorm")
                        else adj_with_housing * self.HOUSING_RATE)
 
@@ -183,11 +184,9 @@ class GrossCalculator:
         )
 
     def _calc_prorated_min_wage(self) -> GrossBreakdown:
-        from .rates import KenyanHolidays
-
         # Standard monthly hours based on weekly hours
         std_monthly_hours = Decimal(self.contract.weekly_hours * 4)
-        worked_hours = sum(d.hours_normal for d in self.timesheet_days)
+        worked_hours = timesheet_total(self.timesheet_days, "hours_normal")
         fraction = worked_hours / std_monthly_hours
         raw_base_pay = self.contract.base_salary * fraction
 
@@ -198,10 +197,8 @@ class GrossCalculator:
 
         # Worked-holiday premium: an extra normal day's pay per holiday worked.
         holiday_premium = Decimal(0)
-        if self.payroll_date is not None:
-            worked_holiday_count = KenyanHolidays.count_worked_holidays(
-                self.payroll_date.year, self.payroll_date.month, self.timesheet_days
-            )
+        if self.ctx is not None:
+            worked_holiday_count = self.ctx.worked_holidays(self.timesheet_days)
             if worked_holiday_count > 0:
                 hourly_rate = self.contract.base_salary / std_monthly_hours
                 daily_hours = LeaveCalculator._get_daily_hours(self.contract)
@@ -221,7 +218,9 @@ class GrossCalculator:
         )
 
 
-def month_split(contract: Contract, payroll_date: date | None) -> tuple[Decimal, date | None]:
+def month_split(
+    contract: Contract, payroll_date: date | PayrollContext | None,
+) -> tuple[Decimal, date | None]:
     """Split a payroll month at the date the monthly contract starts.
 
     Staff routinely work part of a month as a casual on the daily minimum
@@ -235,12 +234,11 @@ def month_split(contract: Contract, payroll_date: date | None) -> tuple[Decimal,
     being questioned on. Tax treatment is unaffected either way -- the two
     portions are summed into one gross and taxed as a single month.
     """
-    if payroll_date is None:
+    ctx = month_context(payroll_date)
+    if ctx is None:
         return Decimal(1), None
 
-    first = date(payroll_date.year, payroll_date.month, 1)
-    days_in_month = monthrange(payroll_date.year, payroll_date.month)[1]
-    last = date(payroll_date.year, payroll_date.month, days_in_month)
+    first, last, days_in_month = ctx.first_day, ctx.last_day, ctx.days_in_month
 
     # Casual treatment is only ever right for someone with a casual_start.
     # Without one, a start_date that does not cover this month means a
@@ -263,8 +261,9 @@ def month_split(contract: Contract, payroll_date: date | None) -> tuple[Decimal,
 class LeaveCalculator:
     def __init__(self, timesheet_days: list[TimesheetDay], leave_stock: LeaveStock,
                  contract: Contract, monthly_fraction: Decimal = Decimal(1),
-                 casual_until: date | None = None):
+                 casual_until: date | None = None, ctx: PayrollContext | None = None):
         self.leave_stock = leave_stock
+        self.ctx = ctx
         self.contract = contract
         # Leave is a feature of monthly employment, not of casual work. A
         # casual is paid per day worked, so a day not worked is simply a day
@@ -272,6 +271,9 @@ class LeaveCalculator:
         # Charging those days against leave would bill a new starter for days
         # they were never engaged for, and drain a balance they have barely
         # begun to accrue.
+        if isinstance(timesheet_days, TimesheetMonth):
+            # Only absences are ever read below; skip building the rest.
+            timesheet_days = timesheet_days.absences()
         self.timesheet_days = [
             d for d in timesheet_days
             if casual_until is None or not in_casual_window(contract, d.date, casual_until)
@@ -320,11 +322,10 @@ class LeaveCalculator:
 
         # Public holidays are paid regardless — absences on those days
         # don't deplete sick/annual leave.
-        holiday_dates = set()
-        for day in self.timesheet_days:
-            holiday_dates.update(
-                h.date for h in KenyanHolidays.get_holidays_for_month(day.date.year, day.date.month)
-            )
+        if self.ctx is not None:
+            is_holiday = self.ctx.is_holiday
+        else:
+            is_holiday = lambda d: KenyanHolidays.calendar(d.year).is_holiday(d)
 
         # consolidated_leave: the off-week is baked into the contract salary,
         # so absences don't deplete any leave stock or unpaid hours.
@@ -346,7 +347,7 @@ class LeaveCalculator:
         for day in self.timesheet_days:
             if not day.absent:
                 continue
-            if day.date in holiday_dates:
+            if is_holiday(day.date):
                 continue
 
             # Absent hours = daily_hours minus any hours actually worked
@@ -424,37 +425,156 @@ class DeductionCalculator:
         self.contract = contract
 
     def calculate(self) -> Deductions:
-        # NSSF Tier 1: 6% of earnings up to LEL
-        nssf_t1 = min(self.gross, self.rates.nssf_lel) * self.rates.nssf_rate
+        return contributions(self.gross, self.contract, self.rates)
 
-        # NSSF Tier 2: 6% of earnings between LEL and UEL (if not contracted out)
-        if self.contract.nssf_tier == "standard":
-            pensionable = min(self.gross, self.rates.nssf_uel) - self.rates.nssf_lel
-            nssf_t2 = max(Decimal(0), pensionable) * self.rates.nssf_rate
-        else:
-            nssf_t2 = Decimal(0)
 
-        # SHIF: 2.75% of gross, minimum 300
-        shif = max(self.gross * self.rates.shif_rate, self.rates.shif_min)
+def contributions(gross: Decimal, contract: Contract, rates: StatutoryRates) -> Deductions:
+    """NSSF, SHIF and AHL on a total gross; PAYE and total are left at zero
+    for settle() to fill in."""
+    zero = Decimal(0)
+
+    # NSSF Tier 1: 6% of earnings up to LEL
+    nssf_t1 = min(gross, rates.nssf_lel) * rates.nssf_rate
 
+    # NSSF Tier 2: 6% of earnings between LEL and UEL (if not contracted out)
+    if contract.nssf_tier == "standard":
+        pensionable = min(gross, rates.nssf_uel) - rates.nssf_lel
+        nssf_t2 = max(zero, pensionable) * rates.nssf_rate
+    else:
+        nssf_t2 = zero
+
+    return Deductions(
+        nssf_tier_1=nssf_t1,
+        nssf_tier_2=nssf_t2,
+        # SHIF: 2.75% of gross, minimum 300
+        shif=max(gross * rates.shif_rate, rates.shif_min),
         # AHL: 1.5% employee contribution
-        ahl = self.gross * self.rates.ahl_rate
-
-        return Deductions(
-            nssf_tier_1=nssf_t1,
-            nssf_tier_2=nssf_t2,
-            shif=shif,
-            ahl_employee=ahl,
-            paye=Decimal(0),  # Calculated separately by PAYECalculator
-            total=Decimal(0),  # Set after PAYE is calculated
-        )
+        ahl_employee=gross * rates.ahl_rate,
+        paye=zero,
+        total=zero,
+    )
+
+
+def settle(
+    gross: Decimal, contract: Contract, rates: StatutoryRates,
+    housing_benefit: Decimal = Decimal(0), table: "PAYETable | None" = None,
+) -> tuple[Deductions, Decimal]:
+    """Steps 5-8 for one total gross: (deductions with PAYE, net pay).
+
+    PAYE is on the gross plus the non-cash housing benefit, less NSSF, SHIF
+    and AHL; net pay is the gross less all of them (the benefit is never
+    paid out). PayrollEngine, the rate scenarios, the cost projection and
+    the gross-up solver all settle through here, so their figures agree to
+    the last digit. Pass the rates' compiled table when settling many rows
+    under one rate set.
+    """
+    if table is None:
+        table = PAYETable.for_rates(rates)
+    d = contributions(gross, contract, rates)
+    # Chargeable = Gross + Housing Benefit - (NSSF + SHIF + AHL)
+    paye = table.tax(gross + housing_benefit
+                     - d.nssf_tier_1 - d.nssf_tier_2 - d.shif - d.ahl_employee)
+    d = Deductions(
+        nssf_tier_1=d.nssf_tier_1,
+        nssf_tier_2=d.nssf_tier_2,
+        shif=d.shif,
+        ahl_employee=d.ahl_employee,
+        paye=paye,
+        total=d.nssf_tier_1 + d.nssf_tier_2 + d.shif + d.ahl_employee + paye,
+    )
+    return d, gross - d.total
+
+
+class PAYETable:
+    """A PAYE band table compiled for lookup.
+
+    Each band stores its lower bound, its rate, and the tax due on
+    everything below it, so the tax on any chargeable pay is one bisect to
+    find the band and one multiply-add within it -- no walk up the bands.
+    All arithmetic stays in Decimal; the figures are exactly the ones the
+    band walk produces, not an approximation of them.
+    """
+
+    def __init__(self, tax_bands, personal_relief: Decimal):
+        self.uppers = []   # band upper limits, for bisect
+        self.lowers = []
+        self.rates = []
+        self.offsets = []  # tax on everything below the band
+        prev_limit = Decimal(0)
+        tax = Decimal(0)
+        for limit, rate in tax_bands:
+            self.uppers.append(limit)
+            self.lowers.append(prev_limit)
+            self.rates.append(rate)
+            self.offsets.append(tax)
+            tax += (limit - prev_limit) * rate
+            prev_limit = limit
+        # Pay above the last limit is taxed no further, as with the band walk.
+        self.top_limit = prev_limit
+        self.top_tax = tax
+        self.personal_relief = personal_relief
+
+    @classmethod
+    def for_rates(cls, rates: StatutoryRates) -> "PAYETable":
+        """The compiled table for a rate set, shared by every rate set that
+        has the same bands and relief (in practice: every effective date)."""
+        return _compiled_paye_table(tuple(rates.tax_bands), rates.personal_relief)
+
+    def tax(self, chargeable_pay: Decimal) -> Decimal:
+        """PAYE after personal relief, never below zero."""
+        return max(self.tax_charged(chargeable_pay) - self.personal_relief, Decimal(0))
+
+    def tax_charged(self, chargeable_pay: Decimal) -> Decimal:
+        """Tax on chargeable pay before personal relief (P9 column J)."""
+        if chargeable_pay <= 0:
+            return Decimal(0)
+        if chargeable_pay >= self.top_limit:
+            return self.top_tax
+        i = bisect_left(self.uppers, chargeable_pay)
+        return self.offsets[i] + (chargeable_pay - self.lowers[i]) * self.rates[i]
+
+    def tax_many(self, chargeable_pays: list[Decimal]) -> list[Decimal]:
+        """tax() over a column of chargeable pay figures."""
+        uppers, lowers, rates, offsets = self.uppers, self.lowers, self.rates, self.offsets
+        top_limit, top_tax, relief = self.top_limit, self.top_tax, self.personal_relief
+        zero = Decimal(0)
+        out = []
+        for c in chargeable_pays:
+            if c <= 0:
+                out.append(zero)
+                continue
+            if c >= top_limit:
+                t = top_tax
+            else:
+                i = bisect_left(uppers, c)
+                t = offsets[i] + (c - lowers[i]) * rates[i]
+            out.append(max(t - relief, zero))
+        return out
+
+
+@lru_cache(maxsize=None)
+def _compiled_paye_table(tax_bands: tuple, personal_relief: Decimal) -> PAYETable:
+    return PAYETable(tax_bands, personal_relief)
 
 
 class PAYECalculator:
     def __init__(self, rates: StatutoryRates):
         self.rates = rates
+        self.table = PAYETable.for_rates(rates)
 
     def calculate(self, chargeable_pay: Decimal) -> Decimal:
+        return self.table.tax(chargeable_pay)
+
+    def calculate_many(self, chargeable_pays: list[Decimal]) -> list[Decimal]:
+        """PAYE for a column of chargeable pay figures."""
+        return self.table.tax_many(chargeable_pays)
+
+    def calculate_banded(self, chargeable_pay: Decimal) -> Decimal:
+        """PAYE by walking the bands one at a time.
+
+        The definition the compiled table has to agree with; kept as the
+        reference for tests rather than used on the payroll path.
+        """
         tax = Decimal(0)
         remaining = chargeable_pay
         prev_limit = Decimal(0)
@@ -472,13 +592,15 @@ class PAYECalculator:
 
 
 class HousingBenefitCalculator:
+    BENEFIT_RATE = Decimal("0.15")  # floor on the benefit, as a share of gross
+
     def __init__(self, contract: Contract, gross: Decimal):
         self.contract = contract
         self.gross = gross
 
     def calculate(self) -> Decimal:
         if self.contract.housing_type in ("quarters", "dorm"):
-            fifteen_pct = self.gross * Decimal("0.15")
+            fifteen_pct = self.gross * self.BENEFIT_RATE
             return max(self.contract.housing_market_value, fifteen_pct)
         return Decimal(0)
 
@@ -494,12 +616,24 @@ class MinimumWageValidator:
         base_pay: Decimal,
         contract: Contract,
         hours_worked: Decimal,
-        payroll_date: date,
+        payroll_date: date | PayrollContext,
     ):
         self.base_pay = base_pay
         self.contract = contract
         self.hours_worked = hours_worked
-        self.payroll_date = payroll_date
+        self.ctx = month_context(payroll_date)
+        self.payroll_date = self.ctx.payroll_date
+
+    def hourly_floor(self) -> Decimal | None:
+        """The minimum effective hourly rate for this contract (None for
+        prorated_min_wage, which is expected to fall below it)."""
+        if self.contract.contract_type == "prorated_min_wage":
+            return None
+        if self.contract.contract_type == "hourly":
+            # Monthly min wage / expected full-time hours this month
+            expected_hours = self.ctx.expected_hours(self.contract.weekly_hours or 45)
+            return self.MIN_WAGE_NAIROBI / expected_hours
+        return StatutoryRates.MIN_HOURLY_NAIROBI
 
     def validate(self) -> tuple[bool, str | None]:
         """
@@ -509,24 +643,13 @@ class MinimumWageValidator:
         For hourly workers: if worked >= expected full-time hours, base should >= min wage.
         For fixed monthly: base pay should >= min wage.
         """
-        from .rates import KenyanHolidays
-
         if self.contract.contract_type == "prorated_min_wage":
             # Prorated workers are expected to be below full minimum
             return True, None
 
         if self.contract.contract_type == "hourly":
-            # Get expected hours for full-time work this month
-            weekly_hours = self.contract.weekly_hours or 45
-            expected_hours = KenyanHolidays.get_expected_hours(
-                self.payroll_date.year,
-                self.payroll_date.month,
-                weekly_hours,
-            )
-
-            # Calculate hourly minimum wage
-            # Monthly min wage / expected monthly hours
-            hourly_min = self.MIN_WAGE_NAIROBI / expected_hours
+            expected_hours = self.ctx.expected_hours(self.contract.weekly_hours or 45)
+            hourly_min = self.hourly_floor()
 
             # Calculate effective hourly rate from actual earnings
             if self.hours_worked > 0:
@@ -538,7 +661,7 @@ class MinimumWageValidator:
                 return False, (
                     f"Effective hourly rate KES {effective_hourly:,.2f} is below "
                     f"minimum KES {hourly_min:,.2f}/hr (based on {expected_hours:.0f} "
-                    f"expected hours in {self.payroll_date.strftime('%B %Y')}). "
+                    f"expected hours in {self.ctx.period}). "
                     f"Base pay KES {self.base_pay:,.2f} for {self.hours_worked:.0f} hours."
                 )
             return True, None
@@ -551,7 +674,7 @@ class MinimumWageValidator:
             if self.hours_worked <= 0:
                 return True, None
             effective = self.base_pay / self.hours_worked
-            floor = StatutoryRates.MIN_HOURLY_NAIROBI
+            floor = self.hourly_floor()
             if effective < floor:
                 shortfall = (floor - effective) * self.hours_worked
                 return False, (
@@ -566,106 +689,51 @@ class MinimumWageValidator:
 def overtime_trigger_warnings(timesheet_days: list[TimesheetDay]) -> list[str]:
     """Flag days over the 9-hour threshold with no overtime recorded.
 
-    Overtime is entered by hand in hrs_ot_1_5 / hrs_ot_2_0; nothing derives it
-    from hrs_wrkd. So a 10-hour day recorded entirely as normal hours is paid
-    as normal hours, and only this check will say so.
+    Overtime is entered by hand in hrs_ot_1_5 / hrs_ot_2_0 unless the run
+    derives it from hrs_wrkd (run_payroll.py --derive-overtime). So a 10-hour
+    day recorded entirely as normal hours is paid as normal hours, and only
+    this check will say so. Runs only the overtime_unrecorded check (see
+    src/validation.py).
     """
-    limit = StatutoryRates.DAILY_HOURS_BEFORE_OT
-    out = []
-    for d in sorted(timesheet_days, key=lambda x: x.date):
-        recorded_ot = d.hours_ot_1_5 + d.hours_ot_2_0
-        excess = d.hours_normal - limit
-        if excess > 0 and recorded_ot < excess:
-            out.append(
-                f"{d.date}: {d.hours_normal:g}h worked exceeds the {limit:g}h daily "
-                f"limit by {excess:g}h, but only {recorded_ot:g}h is recorded as "
-                f"overtime. The excess is being paid at normal rate."
-            )
-    return out
-
-
-def weekly_hours_warnings(timesheet_days: list[TimesheetDay]) -> list[str]:
-    """Flag Monday-to-Sunday weeks exceeding the 52-hour statutory maximum.
+    from .validation import run_checks
 
-    Weeks straddling a month boundary are only partly visible in a single
-    payroll run, so their totals are understated -- this can miss a breach at
-    the edges, never invent one.
-    """
-    limit = StatutoryRates.WEEKLY_HOURS_BEFORE_OT
-    weeks: dict[tuple[int, int], Decimal] = {}
-    for d in timesheet_days:
-        iso = d.date.isocalendar()  # ISO weeks run Monday to Sunday
-        key = (iso[0], iso[1])
-        weeks[key] = weeks.get(key, Decimal(0)) + d.hours_normal + d.hours_ot_1_5 + d.hours_ot_2_0
-
-    out = []
-    for (iso_year, iso_week), total in sorted(weeks.items()):
-        if total > limit:
-            monday = date.fromisocalendar(iso_year, iso_week, 1)
-            out.append(
-                f"Week of {monday} (Mon-Sun): {total:g}h worked exceeds the "
-                f"{limit:g}h weekly maximum by {total - limit:g}h."
-            )
-    return out
+    return [f.message for f in run_checks(timesheet_days, ["overtime_unrecorded"])]
 
 
-def contract_coverage_warnings(
-    contract: Contract, payroll_date: date | None,
+def weekly_hours_warnings(
+    timesheet_days: list[TimesheetDay], opening: LeaveStock | None = None,
 ) -> list[str]:
-    """Flag a payroll month the contract on file does not actually cover.
-
-    Only one contract row per employee survives loading, so a renewal
-    replaces the term that covered earlier months. The month is still paid on
-    monthly terms -- an established employee is not a casual -- but the gap
-    is worth knowing about when the payslip is questioned later.
-    """
-    if payroll_date is None or contract.casual_start is not None:
-        return []
-    first = date(payroll_date.year, payroll_date.month, 1)
-    last = date(payroll_date.year, payroll_date.month,
-                monthrange(payroll_date.year, payroll_date.month)[1])
-
-    if contract.start_date is not None and contract.start_date > last:
-        return [f"Contract on file starts {contract.start_date}, after this payroll "
-                f"month. Paid on monthly terms from the same salary; the term "
-                f"covering this month is not in the sheet."]
-    if contract.end_date is not None and contract.end_date < first:
-        return [f"Contract on file ended {contract.end_date}, before this payroll "
-                f"month. Paid on monthly terms from the same salary; check whether "
-                f"a renewal is missing."]
-    return []
-
-
-def casual_days_worked(contract: Contract, timesheet_days: list[TimesheetDay],
-                       casual_until: date | None) -> int:
-    """Count working-trial days worked, for payment at the daily wage.
+    """Flag Monday-to-Sunday weeks exceeding the 52-hour statutory maximum.
 
-    Any day with hours recorded counts as one day: a daily wage is
-    consideration for turning up, not for a count of hours. Real trial days
-    run 8-9 hours, so part-days are not the normal case -- but a short shift
-    does earn a full day's rate under this rule.
+    A week straddling the start of the month is checked in full when the
+    opening leave stock carries the hours worked in it last month (its
+    open_week). Without that -- a first run, a hand-made leave-stocks file --
+    the total is understated: this can miss a breach at the edge, never
+    invent one. The week straddling the end of the month is checked next
+    month. Runs only the weekly_max check (see src/validation.py).
     """
-    if casual_until is None:
-        return 0
-    return sum(
-        1 for d in timesheet_days
-        if in_casual_window(contract, d.date, casual_until) and d.hours_normal > 0
-    )
+    from .validation import run_checks
 
+    return [f.message for f in run_checks(timesheet_days, ["weekly_max"], opening=opening)]
 
-def in_casual_window(contract: Contract, day: date, casual_until: date) -> bool:
-    """Is `day` inside the working-trial period this contract was paid for?
 
-    The window runs from casual_start (where recorded) to the day before the
-    monthly contract begins.
-    """
-    if day > casual_until:
-        return False
-    return contract.casual_start is None or day >= contract.casual_start
+def open_week(timesheet_days: list[TimesheetDay],
+              ctx: PayrollContext) -> tuple[date | None, Decimal]:
+    """(Monday, hours worked so far) for the week the payroll month ends in,
+    when that week runs on into the next month; (None, 0) when the month
+    ends on a Sunday."""
+    last = ctx.last_day
+    if last.weekday() == 6:
+        return None, Decimal(0)
+    monday = last - timedelta(days=last.weekday())
+    if isinstance(timesheet_days, TimesheetMonth):
+        return monday, timesheet_days.week_totals.get(monday, Decimal(0))
+    return monday, sum((d.hours_normal + d.hours_ot_1_5 + d.hours_ot_2_0
+                        for d in timesheet_days if monday <= d.date <= last), Decimal(0))
 
 
 def contract_coverage_warnings(
-    contract: Contract, payroll_date: date | None,
+    contract: Contract, payroll_date: date | PayrollContext | None,
 ) -> list[str]:
     """Flag a payroll month the contract on file does not actually cover.
 
@@ -676,9 +744,8 @@ def contract_coverage_warnings(
     """
     if payroll_date is None or contract.casual_start is not None:
         return []
-    first = date(payroll_date.year, payroll_date.month, 1)
-    last = date(payroll_date.year, payroll_date.month,
-                monthrange(payroll_date.year, payroll_date.month)[1])
+    ctx = month_context(payroll_date)
+    first, last = ctx.first_day, ctx.last_day
 
     if contract.start_date is not None and contract.start_date > last:
         return [f"Contract on file starts {contract.start_date}, after this payroll "
@@ -702,9 +769,10 @@ def casual_days_worked(contract: Contract, timesheet_days: list[TimesheetDay],
     """
     if casual_until is None:
         return 0
+    dates, normal = timesheet_columns(timesheet_days, "date", "hours_normal")
     return sum(
-        1 for d in timesheet_days
-        if in_casual_window(contract, d.date, casual_until) and d.hours_normal > 0
+        1 for day, hours in zip(dates, normal)
+        if in_casual_window(contract, day, casual_until) and hours > 0
     )
 
 
@@ -725,13 +793,16 @@ def default_leave_stock(employee_id: int, contract: Contract, payroll_date: date
     Previously every such employee was seeded with the full 7+7 sick days,
     which handed a brand-new casual the whole statutory entitlement on their
     first day. Employment Act s.30 earns sick leave only after two months of
-    continuous service, so short-service starters open at zero.
+    continuous service, so short-service starters open at zero -- as does a
+    casual on working trial, who has no start_date until monthly terms begin.
     """
     start = contract.start_date
-    months = (payroll_date.year - start.year) * 12 + (payroll_date.month - start.month)
-    if payroll_date.day < start.day:
-        months -= 1
-    qualified = months >= LeaveCalculator.SICK_QUALIFYING_MONTHS
+    qualified = False
+    if start is not None:
+        months = (payroll_date.year - start.year) * 12 + (payroll_date.month - start.month)
+        if payroll_date.day < start.day:
+            months -= 1
+        qualified = months >= LeaveCalculator.SICK_QUALIFYING_MONTHS
     sick = Decimal("7") if qualified else Decimal(0)
 
     first = date(payroll_date.year, payroll_date.month, 1)
@@ -744,10 +815,63 @@ def default_leave_stock(employee_id: int, contract: Contract, payroll_date: date
     )
 
 
+def seed_leave_stocks(leave_stocks: dict[int, LeaveStock], contracts: dict[int, Contract],
+                      payroll_date: date) -> dict[int, LeaveStock]:
+    """leave_stocks with a default_leave_stock added for every contract that
+    has no leave record on file. Every caller seeds through here, so a month
+    recomputed later (back pay, scenarios) opens on the balances the
+    published run opened on."""
+    seeded = dict(leave_stocks)
+    for emp_id, c in contracts.items():
+        if emp_id not in seeded:
+            seeded[emp_id] = default_leave_stock(emp_id, c, payroll_date)
+    return seeded
+
+
 class PayrollEngine:
-    def __init__(self, payroll_date: date):
+    # "decimal" carries unquantized Decimals throughout, as it always has.
+    # "cents" works in integer cents and hundredths of an hour from the
+    # gross stage to net pay, rounding at fixed points -- see src/cents.py.
+    BACKENDS = ("decimal", "cents")
+
+    def __init__(self, payroll_date: date, cache=None, checks=None,
+                 backend: str = "decimal"):
+        """cache, if given, is a PayslipCache (src/cache.py) consulted for
+        each employee before computing and filled with what was computed.
+        checks are the validation codes to run (src/validation.py; default
+        all of them)."""
+        from .validation import CHECKS
+
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}; expected one of {self.BACKENDS}")
+        self.checks = tuple(CHECKS) if checks is None else tuple(checks)
+        unknown = [c for c in self.checks if c not in CHECKS]
+        if unknown:
+            raise ValueError(f"Unknown check(s) {unknown}; expected some of {tuple(CHECKS)}")
         self.payroll_date = payroll_date
-        self.rates = StatutoryRates(payroll_date)
+        self.backend = backend
+        self.cache = cache
+        # A StageTimings (src/timings.py) to record each step's wall time in;
+        # None records nothing.
+        self.timings = None
+        # To run under other rates, replace ctx with one carrying them
+        # (PayrollContext.with_rates), so the cache key sees them too.
+        self.ctx = PayrollContext.for_date(payroll_date)
+
+    @property
+    def rates(self) -> StatutoryRates:
+        """The month's statutory rates: always the context's."""
+        return self.ctx.rates
+
+    @property
+    def cents_rates(self):
+        """The rates compiled for the cents backend (src/cents.py), for
+        whatever self.rates is now."""
+        from .cents import CentsRates
+
+        if getattr(self, "_cents_rates", (None, None))[0] is not self.rates:
+            self._cents_rates = (self.rates, CentsRates(self.rates))
+        return self._cents_rates[1]
 
     def process(
         self,
@@ -756,23 +880,272 @@ class PayrollEngine:
         timesheet_days: list[TimesheetDay],
         leave_stock: LeaveStock,
     ) -> PaySlip:
+        if self.cache is not None:
+            key = self.cache.key(self.cache.version(self), employee, contract,
+                                 timesheet_days, leave_stock)
+            payslip = self.cache.get(key)
+            if payslip is None:
+                payslip = self._uncached(self.process, employee, contract,
+                                         timesheet_days, leave_stock)
+                self.cache.put(key, payslip)
+            return payslip
+
         # 1. Calculate leave allocation
-        monthly_fraction, casual_until = month_split(contract, self.payroll_date)
+        leave = self._timed("leave", self._allocate_leave, contract, timesheet_days,
+                            leave_stock)
+
+        # 2-4. Gross, hour adjustments and housing benefit
+        gross = self._gross(contract, timesheet_days, leave)
+
+        # 5-8. Deductions, PAYE and net pay
+        [deductions], [net_pay] = self._settle([gross], [contract])
+
+        # 9. Validation
+        findings = self._timed("validation", self._findings, contract, timesheet_days,
+                               gross, leave_stock)
+
+        return self._payslip(employee, contract, timesheet_days, leave, gross,
+                             deductions, net_pay, findings)
+
+    def process_batch(
+        self,
+        employees: dict[int, Employee],
+        contracts: dict[int, Contract],
+        timesheets: dict[int, list[TimesheetDay]],
+        leave_stocks: dict[int, LeaveStock],
+        workers: int = 1,
+    ) -> list[PaySlip]:
+        """Process a whole workforce at once, in employee_id order.
+
+        Takes the same dicts run_payroll builds, keyed by employee_id, and
+        computes every employee who has all four records; callers fill in
+        default leave stocks first, as they do for process(). The month is
+        laid out as columns -- one list per field, one row per employee --
+        and each step runs as a single pass down a column, so per-month work
+        (rates, PAYE bands) is done once rather than once per employee.
+
+        Every figure matches process() exactly: the passes use the same
+        calculators in the same order, only grouped by step instead of by
+        employee.
+
+        With workers > 1 the employees are split into contiguous runs of
+        employee_ids and each run is processed in a separate process. Every
+        employee is independent once the inputs are loaded, and the runs are
+        joined back in order, so the result is the same list a serial call
+        returns.
+        """
+        ids = [emp_id for emp_id in sorted(contracts)
+               if emp_id in employees and emp_id in timesheets and emp_id in leave_stocks]
+        # Expected hours for each schedule in the workforce, worked out once
+        # here rather than per employee (and before any fan-out, so every
+        # worker inherits them).
+        self.ctx = self.ctx.with_weekly_hours({contracts[i].weekly_hours or 45 for i in ids})
+        if self.cache is not None:
+            return self._process_cached(
+                ids, employees, contracts, timesheets, leave_stocks, workers)
+        if workers > 1 and len(ids) > 1:
+            return self._process_parallel(
+                ids, employees, contracts, timesheets, leave_stocks, workers)
+
+        con = [contracts[i] for i in ids]
+        days = [timesheets[i] for i in ids]
+
+        # 1. Leave allocation
+        leave = [self._timed("leave", self._allocate_leave, c, d, leave_stocks[i])
+                 for i, c, d in zip(ids, con, days)]
+
+        # 2-4. Gross, hour adjustments and housing benefit
+        gross = [self._gross(c, d, l) for c, d, l in zip(con, days, leave)]
+
+        # 5-8. Deductions, PAYE and net pay over the gross column
+        deductions, net = self._settle(gross, con)
+
+        # 9. Validation
+        findings = [self._timed("validation", self._findings, c, d, g, leave_stocks[i])
+                    for i, c, d, g in zip(ids, con, days, gross)]
+
+        return [
+            self._payslip(employees[i], c, d, l, g, ded, n, w)
+            for i, c, d, l, g, ded, n, w
+            in zip(ids, con, days, leave, gross, deductions, net, findings)
+        ]
+
+    def tax_months(self, payslips: list[PaySlip]) -> list[TaxMonth]:
+        """Each payslip's month as the P9 tax card reports it."""
+        table = PAYETable.for_rates(self.rates)
+        if self.backend == "cents":
+            from .cents import from_cents, to_cents
+
+            compiled = self.cents_rates
+            tax_charged = lambda pay: from_cents(compiled.tax_charged(to_cents(pay)))
+        else:
+            tax_charged = table.tax_charged
+        out = []
+        for ps in payslips:
+            d = ps.deductions
+            chargeable = self._chargeable(ps.gross, d)
+            charged = tax_charged(chargeable)
+            out.append(TaxMonth(
+                employee_id=ps.employee.employee_id,
+                year=self.ctx.year,
+                month=self.ctx.month,
+                gross=ps.gross.total_gross,
+                housing_benefit=ps.gross.housing_benefit,
+                nssf=d.nssf_tier_1 + d.nssf_tier_2,
+                shif=d.shif,
+                ahl=d.ahl_employee,
+                chargeable=chargeable,
+                tax_charged=charged,
+                relief=min(charged, table.personal_relief),
+                paye=d.paye,
+                net_pay=ps.net_pay,
+            ))
+        return out
+
+    def _process_cached(
+        self, ids: list[int],
+        employees: dict[int, Employee],
+        contracts: dict[int, Contract],
+        timesheets: dict[int, list[TimesheetDay]],
+        leave_stocks: dict[int, LeaveStock],
+        workers: int,
+    ) -> list[PaySlip]:
+        """process_batch through the cache: look everyone up, compute the
+        misses as one (possibly parallel) batch, store them."""
+        version = self.cache.version(self)
+        keys = {i: self.cache.key(version, employees[i], contracts[i], timesheets[i],
+                                  leave_stocks[i])
+                for i in ids}
+        found = {i: self.cache.get(keys[i]) for i in ids}
+        missing = [i for i in ids if found[i] is None]
+        if missing:
+            fresh = self._uncached(
+                self.process_batch,
+                {i: employees[i] for i in missing}, {i: contracts[i] for i in missing},
+                {i: timesheets[i] for i in missing}, {i: leave_stocks[i] for i in missing},
+                workers=workers,
+            )
+            for i, payslip in zip(missing, fresh):
+                self.cache.put(keys[i], payslip)
+                found[i] = payslip
+        return [found[i] for i in ids]
+
+    def _uncached(self, method, *args, **kwargs):
+        """Call method with the cache detached -- so it computes, and so
+        worker processes are not handed the cache along with the engine."""
+        cache, self.cache = self.cache, None
+        try:
+            return method(*args, **kwargs)
+        finally:
+            self.cache = cache
+
+    # Several chunks per worker, so one slow chunk (long timesheets, many
+    # warnings) does not leave the other workers idle at the end.
+    CHUNKS_PER_WORKER = 4
+
+    def _process_parallel(
+        self, ids: list[int],
+        employees: dict[int, Employee],
+        contracts: dict[int, Contract],
+        timesheets: dict[int, list[TimesheetDay]],
+        leave_stocks: dict[int, LeaveStock],
+        workers: int,
+    ) -> list[PaySlip]:
+        """Fan contiguous employee_id chunks out to a process pool."""
+        from concurrent.futures import ProcessPoolExecutor
+
+        n_chunks = min(len(ids), workers * self.CHUNKS_PER_WORKER)
+        size = -(-len(ids) // n_chunks)  # ceiling division
+        chunks = [ids[i:i + size] for i in range(0, len(ids), size)]
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(
+                    _process_chunk, self,
+                    {i: employees[i] for i in chunk},
+                    {i: contracts[i] for i in chunk},
+                    {i: timesheets[i] for i in chunk},
+                    {i: leave_stocks[i] for i in chunk},
+                )
+                for chunk in chunks
+            ]
+            # Gathered in submission order, which is employee_id order.
+            results = [f.result() for f in futures]
+        if self.timings is not None:
+            for _, timings in results:
+                self.timings.merge(timings)
+        return [ps for payslips, _ in results for ps in payslips]
+
+    def _settle(
+        self, gross: list[GrossBreakdown], contracts: list[Contract],
+    ) -> tuple[list[Deductions], list[Decimal]]:
+        """Steps 5-8 for a column of gross figures: (deductions, net pay)."""
+        if self.backend == "cents":
+            from .cents import settle
+
+            return self._timed("settle", settle, gross, contracts, self.cents_rates,
+                               rows=len(gross))
+        return self._timed("settle", self._settle_rows, gross, contracts, rows=len(gross))
+
+    def _settle_rows(
+        self, gross: list[GrossBreakdown], contracts: list[Contract],
+    ) -> tuple[list[Deductions], list[Decimal]]:
+        rates, table = self.rates, PAYETable.for_rates(self.rates)
+        settled = [settle(g.total_gross, c, rates, g.housing_benefit, table)
+                   for g, c in zip(gross, contracts)]
+        return [d for d, _ in settled], [net for _, net in settled]
+
+    def _timed(self, stage: str, fn, *args, rows: int = 1):
+        """fn(*args), its wall time added to self.timings under stage when
+        timings are on."""
+        if self.timings is None:
+            return fn(*args)
+        start = perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self.timings.add(stage, perf_counter() - start, rows)
+
+    def _allocate_leave(
+        self, contract: Contract, timesheet_days: list[TimesheetDay],
+        leave_stock: LeaveStock,
+    ) -> LeaveAllocation:
+        monthly_fraction, casual_until = month_split(contract, self.ctx)
         leave_calc = LeaveCalculator(timesheet_days, leave_stock, contract,
-                                     monthly_fraction, casual_until)
+                                     monthly_fraction, casual_until, self.ctx)
         leave = leave_calc.allocate()
+        # The closing stock also carries the hours of a week that runs on
+        # into next month, for next month's weekly maximum check.
+        monday, hours = open_week(timesheet_days, self.ctx)
+        regular = (week_regular_hours(timesheet_days, monday, self.ctx.last_day)
+                   if monday is not None else Decimal(0))
+        leave.updated_stock = replace(leave.updated_stock, open_week=monday,
+                                      open_week_hours=hours,
+                                      open_week_regular_hours=regular)
+        return leave
+
+    def _gross(
+        self, contract: Contract, timesheet_days: list[TimesheetDay],
+        leave: LeaveAllocation,
+    ) -> GrossBreakdown:
+        if self.backend == "cents":
+            # Steps 2-4 in integers, each figure rounded once at the end.
+            from .cents import gross
+
+            return self._timed("gross", gross, contract, timesheet_days, leave, self.ctx)
 
         # 2. Calculate gross
-        gross_calc = GrossCalculator(contract, timesheet_days, self.payroll_date)
-        gross = gross_calc.calculate()
+        gross_calc = GrossCalculator(contract, timesheet_days, self.ctx)
+        gross = self._timed("gross", gross_calc.calculate)
 
         # 3. Apply hour adjustments (OT, leave deductions) using statutory divisor
         if contract.contract_type in ("hourly", "consolidated_leave", "fixed_monthly"):
-            gross = self._apply_monthly_adjustments(gross, leave, contract, timesheet_days)
+            gross = self._timed("adjustments", self._apply_monthly_adjustments,
+                                gross, leave, contract, timesheet_days)
 
         # 4. Add housing benefit (for quarters - non-cash taxable benefit)
         housing_calc = HousingBenefitCalculator(contract, gross.total_gross)
-        housing_benefit = housing_calc.calculate()
+        housing_benefit = self._timed("housing_benefit", housing_calc.calculate)
         gross = GrossBreakdown(
             base_pay=gross.base_pay,
             overtime_1_5=gross.overtime_1_5,
@@ -788,14 +1161,12 @@ class PayrollEngine:
             holiday_premium=gross.holiday_premium,
             adjustments=gross.adjustments,
         )
+        return gross
 
-        # 5. Calculate deductions (NSSF, SHIF, AHL)
-        ded_calc = DeductionCalculator(gross.total_gross, self.rates, contract)
-        deductions = ded_calc.calculate()
-
-        # 6. Calculate chargeable pay and PAYE
+    @staticmethod
+    def _chargeable(gross: GrossBreakdown, deductions: Deductions) -> Decimal:
         # Chargeable = Gross + Housing Benefit - (NSSF + SHIF + AHL)
-        chargeable = (
+        return (
             gross.total_gross
             + gross.housing_benefit
             - deductions.nssf_tier_1
@@ -804,57 +1175,36 @@ class PayrollEngine:
             - deductions.ahl_employee
         )
 
-        paye_calc = PAYECalculator(self.rates)
-        paye = paye_calc.calculate(chargeable)
-
-        # 7. Build final deductions with PAYE and total
-        deductions = Deductions(
-            nssf_tier_1=deductions.nssf_tier_1,
-            nssf_tier_2=deductions.nssf_tier_2,
-            shif=deductions.shif,
-            ahl_employee=deductions.ahl_employee,
-            paye=paye,
-            total=(
-                deductions.nssf_tier_1
-                + deductions.nssf_tier_2
-                + deductions.shif
-                + deductions.ahl_employee
-                + paye
-            ),
-        )
-
-        # 8. Calculate net pay (housing benefit is non-cash, not added)
-        net_pay = gross.total_gross - deductions.total
-
-        # 9. Validate minimum wage
-        warnings = []
-        hours_worked = sum(d.hours_normal for d in timesheet_days)
-        min_wage_validator = MinimumWageValidator(
-            gross.base_pay, contract, hours_worked, self.payroll_date
-        )
-        is_valid, warning = min_wage_validator.validate()
-        if not is_valid and warning:
-            warnings.append(warning)
-
-        # 9c. Working-time limits. Overtime is entered by hand, so nothing
-        # else notices a day or a week that ran past the statutory maximum.
-        warnings.extend(contract_coverage_warnings(contract, self.payroll_date))
-        warnings.extend(overtime_trigger_warnings(timesheet_days))
-        warnings.extend(weekly_hours_warnings(timesheet_days))
-
-        # 10. Format period string
-        period = self.payroll_date.strftime("%B %Y")
-
+    def _findings(
+        self, contract: Contract, timesheet_days: list[TimesheetDay],
+        gross: GrossBreakdown, leave_stock: LeaveStock | None = None,
+    ) -> list[Finding]:
+        # 9. Minimum wage, contract coverage and working-time limits, in one
+        # pass over the days. Overtime is entered by hand, so nothing else
+        # notices a day or a week that ran past the statutory maximum.
+        from .validation import run_checks
+
+        return run_checks(timesheet_days, self.checks, contract, self.ctx, gross,
+                          leave_stock)
+
+    def _payslip(
+        self, employee: Employee, contract: Contract,
+        timesheet_days: list[TimesheetDay], leave: LeaveAllocation,
+        gross: GrossBreakdown, deductions: Deductions, net_pay: Decimal,
+        findings: list[Finding],
+    ) -> PaySlip:
+        # 10. Period string
         return PaySlip(
             employee=employee,
             contract=contract,
-            period=period,
+            period=self.ctx.period,
             gross=gross,
             deductions=deductions,
             leave=leave,
             net_pay=net_pay,
             days_worked=timesheet_days,
-            warnings=warnings if warnings else None,
+            warnings=[f.message for f in findings] or None,
+            findings=findings,
         )
 
     def _apply_leave_pay(
@@ -868,7 +1218,7 @@ class PayrollEngine:
         if full_hours <= 0 and half_hours <= 0:
             return gross
 
-        gross_calc = GrossCalculator(contract, timesheet_days, self.payroll_date)
+        gross_calc = GrossCalculator(contract, timesheet_days, self.ctx)
         divisor = gross_calc._get_divisor()
         hourly_rate = contract.base_salary / divisor
 
@@ -900,13 +1250,11 @@ class PayrollEngine:
     ) -> GrossBreakdown:
         """Net all hour adjustments (OT, leave, worked-holiday premium) and
         apply the statutory hourly rate."""
-        from .rates import KenyanHolidays
-
         hourly_rate = gross.base_pay / GrossCalculator.STATUTORY_DIVISOR
 
         # Gather hours
-        ot_1_5_hours = sum(d.hours_ot_1_5 for d in timesheet_days)
-        ot_2_0_hours = sum(d.hours_ot_2_0 for d in timesheet_days)
+        ot_1_5_hours = timesheet_total(timesheet_days, "hours_ot_1_5")
+        ot_2_0_hours = timesheet_total(timesheet_days, "hours_ot_2_0")
 
         # Worked-holiday premium: public holidays are paid regardless (the
         # base salary already covers them as paid days off because the
@@ -914,9 +1262,7 @@ class PayrollEngine:
         # extra normal day's pay on top, per Employment Act practice.
         # OT hours on a holiday are tracked separately as ot_2_0 and are
         # NOT double-counted here.
-        worked_holiday_count = KenyanHolidays.count_worked_holidays(
-            self.payroll_date.year, self.payroll_date.month, timesheet_days
-        )
+        worked_holiday_count = self.ctx.worked_holidays(timesheet_days)
         daily_hours = LeaveCalculator._get_daily_hours(contract)
         holiday_premium_hours = Decimal(worked_holiday_count) * daily_hours
         holiday_premium = holiday_premium_hours * hourly_rate
@@ -965,3 +1311,24 @@ class PayrollEngine:
             holiday_premium=holiday_premium,
             adjustments=gross.adjustments,
         )
+
+
+def _process_chunk(
+    engine: PayrollEngine,
+    employees: dict[int, Employee],
+    contracts: dict[int, Contract],
+    timesheets: dict[int, list[TimesheetDay]],
+    leave_stocks: dict[int, LeaveStock],
+) -> tuple[list[PaySlip], object]:
+    """Worker-process entry point for PayrollEngine._process_parallel.
+    Returns the payslips and the stage timings recorded for them (None
+    with timings off).
+
+    Module level so the pool can pickle it by reference.
+    """
+    if engine.timings is not None:
+        # The engine arrives with the parent's samples so far; record
+        # only this chunk's, for the parent to merge.
+        engine.timings = type(engine.timings)()
+    payslips = engine.process_batch(employees, contracts, timesheets, leave_stocks)
+    return payslips, engine.timings
@@ -0,0 +1,343 @@
+"""Integer-cents arithmetic for a payroll run.
+
+The default engine carries unquantized Decimals all the way through, so a
+figure like base_salary / 225.333333 arrives at the deduction stage with
+28 significant digits and every later multiply pays for them. The cents
+backend (PayrollEngine(..., backend="cents")) works in plain ints from the
+timesheet hours to net pay: money in cents, hours in hundredths, statutory
+rates in parts per million. The one exception is leave: the hours drawn
+from a day balance are that many days times the daily hours, to however
+many places the balance has, and are carried exactly as the leave stage
+works them out -- rounding them would move the pay away from the Decimal
+engine's by up to half a hundredth of an hour.
+
+Rounding points are explicit and few:
+  - timesheet hours, half-up to the hundredth, as the month's totals enter
+    the gross stage (attendance is recorded in hundredths, so in practice
+    this never moves them);
+  - each gross figure, once, half-up to the cent. Until then the gross
+    stage keeps every amount as an exact integer over one denominator for
+    the employee's month, so nothing -- the hourly rate, the housing split,
+    the month's proration -- is rounded on the way;
+  - each statutory deduction, half-up to the cent, as it is computed;
+  - PAYE, once, after the band lookup and before personal relief.
+Everything after that is exact integer addition, so the payslip's net pay
+is exactly gross minus the deductions it shows.
+"""
+
+from bisect import bisect_left
+from decimal import ROUND_HALF_UP, Decimal
+from fractions import Fraction
+from math import lcm
+
+from .calculators import (
+    GrossCalculator, HousingBenefitCalculator, LeaveCalculator, casual_days_worked,
+    month_split,
+)
+from .context import PayrollContext
+from .models import (
+    Contract, Deductions, GrossBreakdown, LeaveAllocation, TimesheetDay, timesheet_total,
+)
+from .rates import StatutoryRates
+
+PPM = 1_000_000  # rates are held as integer parts per million
+
+
+def to_cents(amount: Decimal) -> int:
+    """Round a Decimal amount half-up to a whole number of cents."""
+    return int((amount * 100).to_integral_value(ROUND_HALF_UP))
+
+
+def from_cents(cents: int) -> Decimal:
+    """Cents back to a two-place Decimal, e.g. 123456 -> Decimal('1234.56')."""
+    return Decimal(cents).scaleb(-2)
+
+
+# Hours have the same shape as money: two places.
+to_hundredths, from_hundredths = to_cents, from_cents
+
+
+def to_ppm(rate: Decimal) -> int:
+    """A rate as integer parts per million. Refuses rates that don't fit
+    exactly, rather than silently rounding a statutory rate."""
+    ppm = rate * PPM
+    if ppm != ppm.to_integral_value():
+        raise ValueError(f"Rate {rate} is not a whole number of parts per million")
+    return int(ppm)
+
+
+def _round_div(n: int, d: int) -> int:
+    """n / d rounded half away from zero (d > 0), matching ROUND_HALF_UP."""
+    q, r = divmod(abs(n), d)
+    if 2 * r >= d:
+        q += 1
+    return q if n >= 0 else -q
+
+
+def apply_rate(cents: int, ppm: int) -> int:
+    """cents * rate, rounded half-up to the cent."""
+    return _round_div(cents * ppm, PPM)
+
+
+# ---------------------------------------------------------------------------
+# Gross stage (steps 2-4 of PayrollEngine.process)
+# ---------------------------------------------------------------------------
+
+# The gross stage's constants as integer ratios.
+_HOUSING_NUM, _HOUSING_DEN = Fraction(GrossCalculator.HOUSING_RATE).as_integer_ratio()
+_BENEFIT_NUM, _BENEFIT_DEN = Fraction(
+    HousingBenefitCalculator.BENEFIT_RATE).as_integer_ratio()
+_DIVISOR_NUM, _DIVISOR_DEN = Fraction(GrossCalculator.STATUTORY_DIVISOR).as_integer_ratio()
+# Amounts are scaled by _SPLIT before the housing split, so that adding the
+# allowance to a base (x * rate) and taking it off a gross (x / (1 + rate))
+# both divide exactly.
+_SPLIT = _HOUSING_DEN * (_HOUSING_DEN + _HOUSING_NUM)
+_CASUAL_DAILY_RATE = to_cents(StatutoryRates.CASUAL_DAILY_RATE)
+_ZERO = from_cents(0)
+
+
+def _split_housing(amount: int, contract: Contract) -> tuple[int, int, int]:
+    """GrossCalculator._compute_housing on an amount scaled by _SPLIT:
+    (base, housing allowance, gross) on the same scale."""
+    if contract.housing_type in ("quarters", "dorm"):
+        return amount, 0, amount
+    if contract.salary_basis == "base":
+        housing = amount * _HOUSING_NUM // _HOUSING_DEN
+        return amount, housing, amount + housing
+    base = amount * _HOUSING_DEN // (_HOUSING_DEN + _HOUSING_NUM)
+    return base, amount - base, amount
+
+
+def _housing_on(amount: int, contract: Contract) -> int:
+    """The allowance added on top of an amount scaled by _SPLIT (casual
+    days and adjustments, whatever the salary_basis)."""
+    if not amount or contract.housing_type in ("quarters", "dorm"):
+        return 0
+    return amount * _HOUSING_NUM // _HOUSING_DEN
+
+
+def _total_cents(timesheet_days: list[TimesheetDay], field: str) -> int:
+    """The month's total of a money or hours field, in cents or hundredths."""
+    total = timesheet_total(timesheet_days, field, Decimal(0))
+    return to_cents(total) if total else 0
+
+
+def _premium_hours(contract: Contract, timesheet_days: list[TimesheetDay],
+                   ctx: PayrollContext) -> int:
+    """Hours of worked-holiday premium, in hundredths: a normal day's hours
+    per public holiday worked."""
+    worked = ctx.worked_holidays(timesheet_days)
+    if not worked:
+        return 0
+    return worked * to_hundredths(LeaveCalculator._get_daily_hours(contract))
+
+
+def gross(
+    contract: Contract, timesheet_days: list[TimesheetDay], leave: LeaveAllocation,
+    ctx: PayrollContext,
+) -> GrossBreakdown:
+    """GrossCalculator, _apply_monthly_adjustments and the housing benefit
+    in integers, for one employee's month."""
+    if contract.contract_type in ("hourly", "consolidated_leave", "fixed_monthly"):
+        figures, den = _fixed_monthly(contract, timesheet_days, leave, ctx)
+    elif contract.contract_type == "prorated_min_wage":
+        figures, den = _prorated_min_wage(contract, timesheet_days, ctx)
+    else:
+        raise ValueError(f"Unknown contract_type {contract.contract_type!r}")
+
+    # 4. Housing benefit: the larger of the market value and a share of gross.
+    benefit = 0
+    if contract.housing_type in ("quarters", "dorm"):
+        market = to_cents(contract.housing_market_value)
+        share = figures["total_gross"] * _BENEFIT_NUM
+        if market * den * _BENEFIT_DEN >= share:
+            benefit = market
+        else:
+            benefit = _round_div(share, den * _BENEFIT_DEN)
+
+    # The full-time monthly base, for the summary's baseline column.
+    baseline, _, _ = _split_housing(to_cents(contract.base_salary) * _SPLIT, contract)
+    return GrossBreakdown(
+        housing_benefit=from_cents(benefit),
+        baseline_base_pay=from_cents(_round_div(baseline, _SPLIT)),
+        **{name: from_cents(_round_div(value, den)) if value else _ZERO
+           for name, value in figures.items()},
+    )
+
+
+def _fixed_monthly(
+    contract: Contract, timesheet_days: list[TimesheetDay], leave: LeaveAllocation,
+    ctx: PayrollContext,
+) -> tuple[dict[str, int], int]:
+    """Steps 2-3 for the monthly contract types: each figure as an exact
+    integer over the returned denominator."""
+    # 2. The monthly portion, prorated by calendar days, plus casual days
+    # and the month's adjustments; amounts over days_in_month * _SPLIT.
+    fraction, casual_until = month_split(contract, ctx)
+    days = ctx.days_in_month
+    monthly_days = days if fraction == 1 else int((fraction * days).to_integral_value())
+    scale = days * _SPLIT
+    m_base, m_housing, m_gross = _split_housing(
+        to_cents(contract.base_salary) * monthly_days * _SPLIT, contract)
+    casual = (_CASUAL_DAILY_RATE * casual_days_worked(contract, timesheet_days, casual_until)
+              * scale)
+    adj_with = _total_cents(timesheet_days, "adj_with_housing") * scale
+    adj_no = _total_cents(timesheet_days, "adj_no_housing") * scale
+    casual_housing, adj_housing = _housing_on(casual, contract), _housing_on(adj_with, contract)
+
+    base = m_base + casual + adj_with + adj_no
+    housing = m_housing + casual_housing + adj_housing
+
+    # 3. Hour adjustments at base / STATUTORY_DIVISOR an hour. Hours are
+    # weighted by their pay multiple in units of 1 / (2 * unit) of an hour:
+    # halves, so the 1.5x and 0.5x multiples stay whole, of a unit that
+    # divides the timesheet's hundredths and the leave hours exactly. A
+    # weight w pays base * w / (2 * unit) / divisor, which over the
+    # denominator below is base * w * divisor's denominator.
+    half_num, half_den = leave.sick_half_pay_used.as_integer_ratio()
+    unpaid_num, unpaid_den = leave.unpaid_hours.as_integer_ratio()
+    unit = 100 if half_den == unpaid_den == 1 else lcm(100, half_den, unpaid_den)
+    hundredth = unit // 100
+    ot_1_5 = 3 * hundredth * _total_cents(timesheet_days, "hours_ot_1_5")
+    ot_2_0 = 4 * hundredth * _total_cents(timesheet_days, "hours_ot_2_0")
+    premium = 2 * hundredth * _premium_hours(contract, timesheet_days, ctx)
+    half_pay = half_num * (unit // half_den)
+    unpaid = 2 * unpaid_num * (unit // unpaid_den)
+
+    whole = 2 * unit * _DIVISOR_NUM   # an hour's weight times the divisor
+    per = base * _DIVISOR_DEN
+    # Housing scales down with the leave deductions, as in
+    # _apply_monthly_adjustments: housing * (base - deductions) / base.
+    if housing > 0 and base > 0:
+        housing = housing * (whole - (half_pay + unpaid) * _DIVISOR_DEN)
+    else:
+        housing = housing * whole
+    base *= whole
+    ot_1_5, ot_2_0, premium = per * ot_1_5, per * ot_2_0, per * premium
+    half_pay, unpaid = per * half_pay, per * unpaid
+    return {
+        "base_pay": base,
+        "overtime_1_5": ot_1_5,
+        "overtime_2_0": ot_2_0,
+        "housing_allowance": housing,
+        "total_gross": base + ot_1_5 + ot_2_0 + premium + housing - half_pay - unpaid,
+        "worked_base_pay": base,
+        "leave_half_pay_deduction": half_pay,
+        "leave_unpaid_deduction": unpaid,
+        "adjustments": (adj_with + adj_housing + adj_no) * whole,
+        "holiday_premium": premium,
+    }, scale * whole
+
+
+def _prorated_min_wage(
+    contract: Contract, timesheet_days: list[TimesheetDay], ctx: PayrollContext,
+) -> tuple[dict[str, int], int]:
+    """Step 2 for prorated_min_wage: pay in proportion to hours worked out
+    of four standard weeks, plus the worked-holiday premium."""
+    std = contract.weekly_hours * 400  # four weeks, in hundredths of an hour
+    salary = to_cents(contract.base_salary)
+    worked = _total_cents(timesheet_days, "hours_normal")
+    base, housing, total = _split_housing(salary * worked * _SPLIT, contract)
+
+    # An extra normal day's pay per holiday worked, at salary / std an hour.
+    premium = _premium_hours(contract, timesheet_days, ctx) * salary * _SPLIT
+    return {
+        "base_pay": base,
+        "overtime_1_5": 0,
+        "overtime_2_0": 0,
+        "housing_allowance": housing,
+        "total_gross": total + premium,
+        "worked_base_pay": base,
+        "holiday_premium": premium,
+    }, std * _SPLIT
+
+
+# ---------------------------------------------------------------------------
+# Settlement (steps 5-8)
+# ---------------------------------------------------------------------------
+
+class CentsRates:
+    """StatutoryRates compiled to integers for the cents backend."""
+
+    def __init__(self, rates: StatutoryRates):
+        self.lel = to_cents(rates.nssf_lel)
+        self.uel = to_cents(rates.nssf_uel)
+        self.nssf = to_ppm(rates.nssf_rate)
+        self.shif = to_ppm(rates.shif_rate)
+        self.shif_min = to_cents(rates.shif_min)
+        self.ahl = to_ppm(rates.ahl_rate)
+        self.relief = to_cents(rates.personal_relief)
+
+        # PAYE bands as in PAYETable, with offsets kept in cent-ppm so the
+        # only rounding is the one after the lookup.
+        self.uppers, self.lowers, self.band_rates, self.offsets = [], [], [], []
+        prev, tax = 0, 0
+        for limit, rate in rates.tax_bands:
+            limit_c, rate_ppm = to_cents(limit), to_ppm(rate)
+            self.uppers.append(limit_c)
+            self.lowers.append(prev)
+            self.band_rates.append(rate_ppm)
+            self.offsets.append(tax)
+            tax += (limit_c - prev) * rate_ppm
+            prev = limit_c
+        self.top_limit, self.top_tax = prev, tax
+
+    def tax_charged(self, chargeable: int) -> int:
+        """Tax in cents on chargeable pay in cents, before personal relief."""
+        if chargeable <= 0:
+            return 0
+        if chargeable >= self.top_limit:
+            tax = self.top_tax
+        else:
+            i = bisect_left(self.uppers, chargeable)
+            tax = self.offsets[i] + (chargeable - self.lowers[i]) * self.band_rates[i]
+        return (tax + PPM // 2) // PPM  # tax > 0 here
+
+    def paye(self, chargeable: int) -> int:
+        """PAYE in cents on chargeable pay in cents, after personal relief."""
+        return max(self.tax_charged(chargeable) - self.relief, 0)
+
+
+def settle(
+    grosses: list[GrossBreakdown], contracts: list[Contract], rates: CentsRates,
+) -> tuple[list[Deductions], list[Decimal]]:
+    """Deductions and net pay for a column of cent-rounded gross breakdowns."""
+    lel, uel, nssf = rates.lel, rates.uel, rates.nssf
+    shif_rate, shif_min, ahl_rate = rates.shif, rates.shif_min, rates.ahl
+    paye_of, half = rates.paye, PPM // 2
+    D = Decimal
+
+    deductions, net = [], []
+    for gross, contract in zip(grosses, contracts):
+        g = to_cents(gross.total_gross)
+        if g >= 0:
+            # Every product is non-negative here, so half-up rounding is a
+            # plain add-and-floor; the general helper handles the rest.
+            t1 = (min(g, lel) * nssf + half) // PPM
+            t2 = ((min(g, uel) - lel) * nssf + half) // PPM if g > lel else 0
+            shif = (g * shif_rate + half) // PPM
+            ahl = (g * ahl_rate + half) // PPM
+        else:
+            t1, t2 = apply_rate(g, nssf), 0
+            shif, ahl = apply_rate(g, shif_rate), apply_rate(g, ahl_rate)
+        # NSSF Tier 2 only for members who are not contracted out
+        if contract.nssf_tier != "standard":
+            t2 = 0
+        shif = max(shif, shif_min)
+
+        benefit = gross.housing_benefit
+        chargeable = g + (to_cents(benefit) if benefit else 0) - t1 - t2 - shif - ahl
+        paye = paye_of(chargeable)
+        total = t1 + t2 + shif + ahl + paye
+
+        # from_cents, inlined: this loop runs once per employee
+        deductions.append(Deductions(
+            nssf_tier_1=D(t1).scaleb(-2),
+            nssf_tier_2=D(t2).scaleb(-2),
+            shif=D(shif).scaleb(-2),
+            ahl_employee=D(ahl).scaleb(-2),
+            paye=D(paye).scaleb(-2),
+            total=D(total).scaleb(-2),
+        ))
+        net.append(D(g - total).scaleb(-2))
+    return deductions, net
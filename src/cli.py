@@ -0,0 +1,89 @@
+"""Argument types and input loading shared by the command-line scripts.
+
+run_payroll.py, backpay.py, project_costs.py, bench.py and
+generate_workforce.py all take months as YYYY-MM and rate changes as
+YYYY-MM:rate=value; they parse them here so they accept and reject the
+same things. run_payroll.py and backpay.py load a staged month the same
+way, through load_registers() and load_timesheets().
+
+Like the scripts, these report problems on stderr rather than raising,
+and expect to be run from the repo root (load_timesheets uses
+extract_timesheets_xlsx2tsvs.py).
+"""
+
+import argparse
+import sys
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+
+from .loaders import (
+    load_contracts, load_employees, load_holiday_overrides, load_timesheet_folder,
+)
+
+
+def parse_month(value: str) -> tuple[int, int]:
+    """argparse type for YYYY-MM."""
+    try:
+        y, m = (int(x) for x in value.split("-"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM, got {value!r}") from None
+    if not 1 <= m <= 12:
+        raise argparse.ArgumentTypeError(f"month out of range in {value!r}")
+    return y, m
+
+
+def parse_rate_change(value: str) -> tuple[date, dict]:
+    """argparse type for YYYY-MM:rate=value,rate=value."""
+    month, _, assignments = value.partition(":")
+    y, m = parse_month(month)
+    overrides = {}
+    try:
+        for part in assignments.split(","):
+            name, amount = part.split("=")
+            overrides[name.strip()] = Decimal(amount.strip())
+    except (ValueError, InvalidOperation):
+        raise argparse.ArgumentTypeError(
+            f"expected YYYY-MM:rate=value[,rate=value...], got {value!r}") from None
+    return date(y, m, 1), overrides
+
+
+def month_range(start: tuple[int, int], end: tuple[int, int]) -> list[tuple[int, int]]:
+    """Every (year, month) from start to end inclusive."""
+    out = []
+    y, m = start
+    while (y, m) <= end:
+        out.append((y, m))
+        y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+    return out
+
+
+def load_registers(inputs: Path) -> tuple[dict, dict]:
+    """Employees and contracts of a staged inputs folder, by employee_id,
+    with its holiday overrides applied."""
+    employees = {e.employee_id: e for e in load_employees(inputs / "master_employees.tsv")}
+    contracts = {c.employee_id: c for c in load_contracts(inputs / "contracts.tsv")}
+    load_holiday_overrides(inputs)
+    return employees, contracts
+
+
+def load_timesheets(inputs: Path, year: int, month: int, wb=None) -> dict | None:
+    """Split the attendance workbook into one TSV per employee for this
+    month and load them. Returns None (having reported why) on failure."""
+    from extract_timesheets_xlsx2tsvs import extract_month
+
+    from .gsync import attendance_xlsx_path
+
+    xlsx = attendance_xlsx_path(inputs, year)
+    if wb is None and not xlsx.is_file():
+        print(f"Attendance workbook not found: {xlsx}", file=sys.stderr)
+        return None
+    ts_dir = inputs / "timesheets" / f"{year}_{month:02d}"
+    extract_month(xlsx, ts_dir, year, month, log=lambda _: None, wb=wb)
+    timesheets = load_timesheet_folder(ts_dir, year, month)
+
+    if not timesheets:
+        print(f"No timesheet rows for {year}-{month:02d} in {xlsx.name}", file=sys.stderr)
+        return None
+    print(f"Loaded timesheets for {len(timesheets)} employees")
+    return timesheets
@@ -0,0 +1,126 @@
+from calendar import monthrange
+from dataclasses import dataclass, field, replace
+from datetime import date
+from decimal import Decimal
+
+from .models import timesheet_columns
+from .rates import KenyanHolidays, PublicHoliday, StatutoryRates
+
+
+@dataclass(frozen=True)
+class PayrollContext:
+    """Everything about a payroll month that does not depend on the employee.
+
+    Built once per run by PayrollEngine and handed to every calculator and
+    output writer, so per-employee work reads the calendar instead of
+    redoing it: month bounds, the holidays falling in the month, expected
+    hours for each weekly_hours on the contracts, and the statutory rates.
+    Frozen, so one instance can be shared freely -- including across the
+    worker processes of a parallel run. It carries the gazetted holiday
+    overrides its calendar was built with (KenyanHolidays.read_overrides),
+    so those workers, and lookups outside the month, see the same holidays
+    as the parent without any process-wide state.
+    """
+    payroll_date: date
+    first_day: date
+    last_day: date
+    days_in_month: int
+    holidays: tuple[PublicHoliday, ...]
+    holiday_dates: frozenset[date]
+    period: str
+    rates: StatutoryRates = field(compare=False, repr=False)
+    # weekly_hours -> expected hours in the month; see with_weekly_hours()
+    expected: dict[int, Decimal] = field(default_factory=dict, compare=False, repr=False)
+    holiday_overrides: tuple[PublicHoliday, ...] = field(default=(), compare=False,
+                                                         repr=False)
+
+    @classmethod
+    def for_date(cls, payroll_date: date, weekly_hours=(),
+                 holiday_overrides: tuple[PublicHoliday, ...] | None = None,
+                 ) -> "PayrollContext":
+        """holiday_overrides default to the process-wide ones
+        (KenyanHolidays.load_overrides), as they stand now."""
+        if holiday_overrides is None:
+            holiday_overrides = KenyanHolidays.overrides()
+        year, month = payroll_date.year, payroll_date.month
+        days_in_month = monthrange(year, month)[1]
+        holidays = KenyanHolidays.calendar(year, holiday_overrides).holidays_in_month(month)
+        ctx = cls(
+            payroll_date=payroll_date,
+            first_day=date(year, month, 1),
+            last_day=date(year, month, days_in_month),
+            days_in_month=days_in_month,
+            holidays=holidays,
+            holiday_dates=frozenset(h.date for h in holidays),
+            period=payroll_date.strftime("%B %Y"),
+            rates=StatutoryRates(payroll_date),
+            holiday_overrides=holiday_overrides,
+        )
+        return ctx.with_weekly_hours(weekly_hours)
+
+    @classmethod
+    def for_month(cls, year: int, month: int) -> "PayrollContext":
+        """Context for output writers, which know the month but not the run date."""
+        return cls.for_date(date(year, month, monthrange(year, month)[1]))
+
+    @property
+    def year(self) -> int:
+        return self.payroll_date.year
+
+    @property
+    def month(self) -> int:
+        return self.payroll_date.month
+
+    def with_weekly_hours(self, weekly_hours) -> "PayrollContext":
+        """A copy with expected hours precomputed for each of weekly_hours.
+
+        Returns self when nothing new is asked for, so calling this for
+        every batch is free once the workforce's schedules are known.
+        """
+        missing = {w for w in weekly_hours if w not in self.expected}
+        if not missing:
+            return self
+        expected = dict(self.expected)
+        for w in missing:
+            expected[w] = KenyanHolidays.get_expected_hours(
+                self.year, self.month, w, self.holiday_overrides)
+        return replace(self, expected=expected)
+
+    def with_rates(self, rates: StatutoryRates) -> "PayrollContext":
+        """A copy for the same month under other statutory rates (a
+        scenario's, or a back-pay month's overrides)."""
+        return replace(self, rates=rates)
+
+    def expected_hours(self, weekly_hours: int) -> Decimal:
+        """Expected working hours this month for a weekly_hours schedule."""
+        hours = self.expected.get(weekly_hours)
+        if hours is None:
+            hours = KenyanHolidays.get_expected_hours(self.year, self.month, weekly_hours,
+                                                      self.holiday_overrides)
+        return hours
+
+    def is_holiday(self, day: date) -> bool:
+        if self.first_day <= day <= self.last_day:
+            return day in self.holiday_dates
+        return KenyanHolidays.calendar(day.year, self.holiday_overrides).is_holiday(day)
+
+    def worked_holidays(self, timesheet_days) -> int:
+        """Days in this month that fall on a public holiday and have normal
+        hours worked. Used to compute the worked-holiday premium."""
+        if not self.holiday_dates:
+            return 0
+        dates, normal = timesheet_columns(timesheet_days, "date", "hours_normal")
+        return sum(1 for day, hours in zip(dates, normal)
+                   if day in self.holiday_dates and hours > 0)
+
+
+def month_context(month: "date | PayrollContext | None") -> PayrollContext | None:
+    """The context for a calculator's month argument.
+
+    Calculators take either a ready-made context (from PayrollEngine) or a
+    bare payroll date (standalone use and older callers), or None where
+    there is no month to speak of.
+    """
+    if month is None or isinstance(month, PayrollContext):
+        return month
+    return PayrollContext.for_date(month)
@@ -0,0 +1,44 @@
+"""Fingerprints of input files, so the app reloads only what changed.
+
+Streamlit reruns app.py from the top on every click. Caching its loaders
+on the folder path alone served stale data after a TSV was edited, and
+not caching them at all reparsed every file on every rerun. Instead each
+loader is cached on the fingerprint of the file it reads, and the
+payroll results on the fingerprint of all of them together.
+
+A file's fingerprint is its size and the SHA-256 of its contents. The
+hash is only recomputed when the size or mtime differs from the last time
+the file was seen in this process, so a rerun over unchanged inputs costs
+one stat() per file. A file saved again with the same contents keeps its
+fingerprint, and so keeps its cache entries.
+"""
+
+import hashlib
+from pathlib import Path
+
+from .serialize import digest
+
+# Resolved path -> (size, mtime_ns, fingerprint), as last seen
+_seen: dict[str, tuple[int, int, str]] = {}
+
+
+def file_fingerprint(path: str | Path) -> str:
+    """"size:sha256" of the file's contents."""
+    path = Path(path)
+    st = path.stat()
+    key = str(path.resolve())
+    seen = _seen.get(key)
+    if seen and seen[:2] == (st.st_size, st.st_mtime_ns):
+        return seen[2]
+    fingerprint = f"{st.st_size}:{hashlib.sha256(path.read_bytes()).hexdigest()}"
+    _seen[key] = (st.st_size, st.st_mtime_ns, fingerprint)
+    return fingerprint
+
+
+def files_fingerprint(folder: str | Path, fingerprints: dict[Path, str], *parts) -> str:
+    """One digest of several files' fingerprints (as returned by
+    file_fingerprint, keyed by path) and any other parts of a key. Paths
+    are taken relative to folder, so a copied or moved folder keeps it."""
+    folder = Path(folder)
+    files = sorted((str(Path(p).relative_to(folder)), fp) for p, fp in fingerprints.items())
+    return digest(files, *parts)
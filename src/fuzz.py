@@ -0,0 +1,534 @@
+"""Differential fuzzing of the engine's fast paths against process().
+
+PayrollEngine.process, one employee at a time, is the reference: every
+other way of computing a month -- process_batch, the same across worker
+processes, through the payslip cache, under the integer-cents backend --
+exists only to be faster, and is only safe to ship while it gives the same
+payslips. The rate scenarios,
+the cost projection and back pay each reach the figures by their own
+route too, so they are candidates alongside. The tests pin all of that
+on a few hand-made workforces; this throws random ones at it.
+
+A round is one payroll month and a workforce of random cases (an employee,
+contract, month of timesheet days and opening leave stock), drawn to cover
+every contract_type, salary_basis, hourly_divisor and housing_type, casual
+and mid-month starts, and days sick, absent, on overtime, on holidays and
+carrying adjustments. The reference and each candidate compute the round
+and the payslips are compared field for field, or to the cent for the
+cents backend, which is only ever promised to the cent (see test_cents.py).
+
+A mismatch is shrunk before it is reported: the other cases are dropped,
+then days, then each remaining day and the contract are simplified for as
+long as the mismatch persists, so what comes out is usually one employee
+and a day or two. save_repro()/load_repro() keep it as JSON for a test.
+
+Each round draws from its own Random(f"{seed}:{round}"), so a failure is
+reproduced by its seed and round number alone.
+"""
+
+import json
+import random
+import tempfile
+from calendar import monthrange
+from dataclasses import dataclass, fields, is_dataclass, replace
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from .calculators import PayrollEngine
+from .models import Contract, Employee, LeaveStock, PaySlip, TimesheetDay
+from .rates import StatutoryRates
+from .serialize import from_jsonable, to_jsonable
+
+CONTRACT_TYPES = ("fixed_monthly", "hourly", "consolidated_leave", "prorated_min_wage")
+SALARY_BASES = ("gross", "base")
+HOURLY_DIVISORS = ("monthly", "statutory", "225", "200")
+HOUSING_TYPES = ("none", "quarters", "dorm")
+# established, mid-month start, casual converting this month, on trial
+STARTS = ("established", "mid_month", "converting", "trial")
+
+_HOURS = tuple(Decimal(h) for h in ("4", "7.5", "8", "8.67", "9", "10", "12"))
+
+
+@dataclass
+class Case:
+    """One employee's inputs for a month."""
+    employee: Employee
+    contract: Contract
+    days: list[TimesheetDay]
+    leave_stock: LeaveStock
+
+
+@dataclass
+class Mismatch:
+    candidate: str
+    payroll_date: date
+    cases: list[Case]
+    detail: str  # the first figure that differs, or the exception raised
+    seed: str = ""  # "seed:round" of the round it was found in
+
+
+# ---------------------------------------------------------------------------
+# Generation
+# ---------------------------------------------------------------------------
+
+def random_contract(rng: random.Random, emp_id: int, payroll_date: date) -> Contract:
+    first = payroll_date.replace(day=1)
+    last = first.replace(day=monthrange(first.year, first.month)[1])
+    housing = rng.choice(HOUSING_TYPES)
+    start = rng.choice(STARTS)
+    start_date = first - timedelta(days=rng.randrange(1, 1500))
+    casual_start = None
+    base = Decimal(rng.randrange(0, 400_001, 50)) / (100 if rng.random() < 0.2 else 1)
+    if start == "mid_month":
+        start_date = first + timedelta(days=rng.randrange((last - first).days + 1))
+    elif start == "converting":
+        casual_start = first - timedelta(days=rng.randrange(0, 40))
+        start_date = first + timedelta(days=rng.randrange(1, (last - first).days + 1))
+    elif start == "trial":
+        base, start_date = Decimal(0), None
+        casual_start = first + timedelta(days=rng.randrange(-20, (last - first).days + 1))
+    contract_type = rng.choice(CONTRACT_TYPES)
+    # Kept to what the engine accepts: housing provided always has a market
+    # value, and prorated_min_wage always has weekly hours to prorate over
+    # (process() raises on either gap, the sheet's problem, not a fast path's).
+    weekly = rng.choice((45, 52) if contract_type == "prorated_min_wage" else (45, 52, None))
+    return Contract(
+        employee_id=emp_id,
+        contract_type=contract_type,
+        base_salary=base,
+        weekly_hours=weekly,
+        housing_type=housing,
+        housing_market_value=(Decimal(rng.randrange(1_000, 20_001, 250))
+                              if housing != "none" else None),
+        nssf_tier="standard",
+        start_date=start_date,
+        end_date=None,
+        status="active",
+        salary_basis=rng.choice(SALARY_BASES),
+        hourly_divisor=rng.choice(HOURLY_DIVISORS),
+        casual_start=casual_start,
+    )
+
+
+def random_days(rng: random.Random, emp_id: int, payroll_date: date) -> list[TimesheetDay]:
+    """A month of rows: most weekdays worked, some days absent or sick,
+    some overtime (double time mostly on Sundays), the odd adjustment, and
+    some days with no row at all."""
+    year, month = payroll_date.year, payroll_date.month
+    out = []
+    for day in range(1, monthrange(year, month)[1] + 1):
+        d = date(year, month, day)
+        if rng.random() < (0.7 if d.weekday() == 6 else 0.1):
+            continue
+        roll = rng.random()
+        sick, absent = roll < 0.05, roll < 0.1
+        hours = Decimal(0) if absent else rng.choice(_HOURS)
+        ot_1_5 = Decimal(rng.choice((0, 0, 0, 0, 1, 2, 3))) if not absent else Decimal(0)
+        ot_2_0 = (Decimal(rng.choice((0, 4, 8)))
+                  if not absent and d.weekday() == 6 else Decimal(0))
+        adj = rng.random() < 0.03
+        out.append(TimesheetDay(
+            employee_id=emp_id, date=d, hours_normal=hours, hours_ot_1_5=ot_1_5,
+            hours_ot_2_0=ot_2_0, absent=absent, sick=sick,
+            adj_with_housing=Decimal(rng.randrange(0, 20_001, 500)) if adj else Decimal(0),
+            adj_no_housing=(Decimal(rng.randrange(0, 20_001, 500))
+                            if adj and rng.random() < 0.5 else Decimal(0)),
+        ))
+    return out
+
+
+def random_leave_stock(rng: random.Random, emp_id: int, payroll_date: date) -> LeaveStock:
+    first = payroll_date.replace(day=1)
+    open_week = open_hours = open_regular = None
+    if first.weekday() and rng.random() < 0.3:
+        open_week = first - timedelta(days=first.weekday())
+        open_hours = Decimal(rng.randrange(0, 61))
+        open_regular = min(open_hours, StatutoryRates.WEEKLY_HOURS_BEFORE_OT)
+    return LeaveStock(
+        employee_id=emp_id,
+        sick_full_pay=Decimal(rng.randrange(0, 15)) / 2,
+        sick_half_pay=Decimal(rng.randrange(0, 15)) / 2,
+        annual_leave=Decimal(rng.randrange(-4, 43)) / 2,
+        as_of_date=first - timedelta(days=1),
+        open_week=open_week,
+        open_week_hours=open_hours or Decimal(0),
+        open_week_regular_hours=open_regular or Decimal(0),
+    )
+
+
+def random_round(seed: str, size: int) -> tuple[date, list[Case]]:
+    """A payroll month and size random cases, all determined by seed."""
+    rng = random.Random(seed)
+    payroll_date = date(rng.choice((2025, 2026)), rng.randrange(1, 13), 28)
+    cases = []
+    for emp_id in range(1, size + 1):
+        cases.append(Case(
+            employee=Employee(employee_id=emp_id, name=f"Case {emp_id}",
+                              national_id=str(emp_id), kra_pin=f"A{emp_id:09d}X",
+                              phone="", bank_account=str(emp_id)),
+            contract=random_contract(rng, emp_id, payroll_date),
+            days=random_days(rng, emp_id, payroll_date),
+            leave_stock=random_leave_stock(rng, emp_id, payroll_date),
+        ))
+    return payroll_date, cases
+
+
+# ---------------------------------------------------------------------------
+# Reference and candidates
+# ---------------------------------------------------------------------------
+
+def _inputs(cases: list[Case]) -> tuple[dict, dict, dict, dict]:
+    ids = [c.employee.employee_id for c in cases]
+    return ({i: c.employee for i, c in zip(ids, cases)},
+            {i: c.contract for i, c in zip(ids, cases)},
+            {i: c.days for i, c in zip(ids, cases)},
+            {i: c.leave_stock for i, c in zip(ids, cases)})
+
+
+def reference(payroll_date: date, cases: list[Case]) -> list[PaySlip]:
+    engine = PayrollEngine(payroll_date)
+    return [engine.process(c.employee, c.contract, c.days, c.leave_stock)
+            for c in sorted(cases, key=lambda c: c.employee.employee_id)]
+
+
+def _batch(payroll_date, cases, scratch):
+    return PayrollEngine(payroll_date).process_batch(*_inputs(cases))
+
+
+def _parallel(payroll_date, cases, scratch):
+    return PayrollEngine(payroll_date).process_batch(*_inputs(cases), workers=2)
+
+
+def _cached(payroll_date, cases, scratch):
+    """A warm lookup: one engine fills the cache, a second reads it back."""
+    from .cache import PayslipCache
+
+    # A fresh directory each time: PayslipCache indexes its directory on
+    # open, which would otherwise grow with every round.
+    with tempfile.TemporaryDirectory(dir=scratch) as directory:
+        PayrollEngine(payroll_date, cache=PayslipCache(directory)).process_batch(
+            *_inputs(cases))
+        return PayrollEngine(payroll_date, cache=PayslipCache(directory)).process_batch(
+            *_inputs(cases))
+
+
+def _cents(payroll_date, cases, scratch):
+    return PayrollEngine(payroll_date, backend="cents").process_batch(*_inputs(cases))
+
+
+def _scenarios(payroll_date, cases, scratch):
+    """The rate scenarios' path under the month's own rates: each
+    employee's net pay from settle_scenario, on the batch payslip."""
+    from .scenarios import gross_column, settle_scenario
+
+    engine = PayrollEngine(payroll_date)
+    inputs = _inputs(cases)
+    totals = settle_scenario("actual", engine.rates, gross_column(payroll_date, *inputs),
+                             detail=True)
+    return [replace(ps, net_pay=totals.net_by_employee[ps.employee.employee_id])
+            for ps in engine.process_batch(*inputs)]
+
+
+def _projection(payroll_date, cases, scratch):
+    """The cost projection's settlement of each batch payslip's gross."""
+    from .calculators import PAYETable
+    from .projection import _settle
+
+    engine = PayrollEngine(payroll_date)
+    table = PAYETable.for_rates(engine.rates)
+    out = []
+    for ps in engine.process_batch(*_inputs(cases)):
+        pay = _settle(ps.gross.total_gross, ps.contract, engine.rates, table)
+        out.append(replace(
+            ps, gross=replace(ps.gross, housing_benefit=pay.housing_benefit),
+            deductions=replace(ps.deductions, shif=pay.shif, ahl_employee=pay.ahl_employee,
+                               paye=pay.paye),
+            net_pay=pay.net_pay))
+    return out
+
+
+def _backpay(payroll_date, cases, scratch):
+    """A month as back pay recomputes it (backpay.compute_month)."""
+    from .backpay import compute_month, month_inputs
+
+    return compute_month(month_inputs(payroll_date, *_inputs(cases)))
+
+
+# name -> fn(payroll_date, cases, scratch_dir) -> payslips in employee_id order
+CANDIDATES = {"batch": _batch, "parallel": _parallel, "cached": _cached, "cents": _cents,
+              "scenarios": _scenarios, "projection": _projection, "backpay": _backpay}
+
+
+# ---------------------------------------------------------------------------
+# Comparison
+# ---------------------------------------------------------------------------
+
+def first_difference(a, b, path: str = "") -> str | None:
+    """Where two payslips (or any dataclass trees) first differ, or None."""
+    if is_dataclass(a) and is_dataclass(b) and type(a) is type(b):
+        for f in fields(a):
+            found = first_difference(getattr(a, f.name), getattr(b, f.name),
+                                     f"{path}.{f.name}" if path else f.name)
+            if found:
+                return found
+        return None
+    if isinstance(a, list) and isinstance(b, list):
+        if len(a) != len(b):
+            return f"{path}: {len(a)} items != {len(b)}"
+        for n, (x, y) in enumerate(zip(a, b)):
+            found = first_difference(x, y, f"{path}[{n}]")
+            if found:
+                return found
+        return None
+    if a != b:
+        return f"{path}: {a!r} != {b!r}"
+    return None
+
+
+# Deduction -> how many cents the cents backend may be out by. Its gross
+# figures are the reference's rounded to the cent, so each deduction on them
+# is out by at most a cent once rounded again for comparison; but a total is
+# the sum of rounded figures and may be out by half a cent for each: five
+# deductions for the total, those and the gross for net pay.
+_CENTS_TOLERANCE = {
+    "deductions.nssf_tier_1": 1, "deductions.nssf_tier_2": 1, "deductions.shif": 1,
+    "deductions.ahl_employee": 1, "deductions.paye": 1,
+    "deductions.total": 3, "net_pay": 3,
+}
+
+
+# How far a cents gross figure may be from the reference's: half a cent,
+# and a hair over for the reference's own precision. The reference divides
+# in 28 significant digits, so a figure that is exactly on a half cent can
+# come out a hair under it and round down, where the exact ints round up.
+_HALF_CENT = Decimal("0.005") + Decimal("1e-15")
+
+
+def _field(obj, dotted: str):
+    for name in dotted.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+def cents_difference(a: PaySlip, b: PaySlip) -> str | None:
+    """What the cents backend promises: every gross figure the reference's
+    rounded to the cent (_HALF_CENT), each deduction within a cent, totals
+    within their rounding (_CENTS_TOLERANCE), the same leave and the same
+    findings. Findings are matched on code and day, not message: a shortfall
+    printed in a message is itself a figure that may be a cent out."""
+    from .cents import to_cents
+
+    for f in fields(a.gross):
+        x, y = getattr(a.gross, f.name), getattr(b.gross, f.name)
+        if abs(x - y) > _HALF_CENT:
+            return f"gross.{f.name}: {x} != {y}"
+    for name, tolerance in _CENTS_TOLERANCE.items():
+        x, y = _field(a, name), _field(b, name)
+        if abs(to_cents(x) - to_cents(y)) > tolerance:
+            return f"{name}: {x} != {y}"
+    found = first_difference(a.leave, b.leave, "leave")
+    if found:
+        return found
+    found_a = [(f.code, f.day) for f in a.findings]
+    found_b = [(f.code, f.day) for f in b.findings]
+    if found_a != found_b:
+        return f"findings: {found_a} != {found_b}"
+    return None
+
+
+def compare(candidate: str, payroll_date: date, cases: list[Case],
+            scratch: Path, fn=None, expected: list[PaySlip] | None = None) -> str | None:
+    """Run a candidate on one round against the reference (computed here
+    unless already in hand as expected). Returns what differs first, or
+    None when they agree -- or when the reference itself cannot compute
+    the inputs, which makes them no test of the candidate."""
+    if expected is None:
+        try:
+            expected = reference(payroll_date, cases)
+        except Exception:
+            return None
+    try:
+        got = (fn or CANDIDATES[candidate])(payroll_date, cases, scratch)
+    except Exception as e:
+        return f"raised {type(e).__name__}: {e}"
+    if len(got) != len(expected):
+        return f"{len(got)} payslips != {len(expected)}"
+    diff = cents_difference if candidate == "cents" else first_difference
+    for want, have in zip(expected, got):
+        # Dataclass == is the fast path; the walk only runs to name the field.
+        found = want != have and diff(want, have)
+        if found:
+            return f"employee {want.employee.employee_id}: {found}"
+    return None
+
+
+def reference_error(payroll_date: date, cases: list[Case]) -> str | None:
+    """The exception process() raises on these inputs, if any."""
+    try:
+        reference(payroll_date, cases)
+    except Exception as e:
+        return f"raised {type(e).__name__}: {e}"
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Shrinking
+# ---------------------------------------------------------------------------
+
+def _day_simplifications(day: TimesheetDay) -> list[TimesheetDay]:
+    options = []
+    for name in ("hours_ot_1_5", "hours_ot_2_0", "adj_with_housing", "adj_no_housing"):
+        if getattr(day, name):
+            options.append(replace(day, **{name: Decimal(0)}))
+    if day.absent or day.sick:
+        options.append(replace(day, absent=False, sick=False, hours_normal=Decimal(8)))
+    if day.hours_normal not in (0, 8):
+        options.append(replace(day, hours_normal=Decimal(8)))
+    return options
+
+
+def _contract_simplifications(c: Contract) -> list[Contract]:
+    options = []
+    if c.housing_type != "none":
+        options.append(replace(c, housing_type="none", housing_market_value=None))
+    for name, plain in (("salary_basis", "gross"), ("hourly_divisor", "monthly"),
+                        ("contract_type", "fixed_monthly"), ("weekly_hours", 45),
+                        ("casual_start", None)):
+        if getattr(c, name) != plain:
+            options.append(replace(c, **{name: plain}))
+    if c.start_date is None or c.start_date.year > 2020:
+        options.append(replace(c, start_date=date(2020, 1, 1)))
+    if c.base_salary % 1000:
+        options.append(replace(c, base_salary=c.base_salary // 1000 * 1000))
+    return options
+
+
+def _stock_simplifications(s: LeaveStock) -> list[LeaveStock]:
+    options = []
+    if s.open_week is not None:
+        options.append(replace(s, open_week=None, open_week_hours=Decimal(0),
+                               open_week_regular_hours=Decimal(0)))
+    for name in ("sick_full_pay", "sick_half_pay", "annual_leave"):
+        if getattr(s, name):
+            options.append(replace(s, **{name: Decimal(0)}))
+    return options
+
+
+def shrink(fails, payroll_date: date, cases: list[Case]) -> list[Case]:
+    """Greedily reduce cases while fails(payroll_date, cases) stays true:
+    fewer employees, fewer days, plainer days, contracts and leave stocks."""
+    # Fewer employees: alone if possible, else one at a time
+    for c in cases:
+        if fails(payroll_date, [c]):
+            cases = [c]
+            break
+    else:
+        n = 0
+        while n < len(cases) and len(cases) > 1:
+            trial = cases[:n] + cases[n + 1:]
+            if fails(payroll_date, trial):
+                cases = trial
+            else:
+                n += 1
+
+    changed = True
+    while changed:
+        changed = False
+        for n, case in enumerate(cases):
+            def attempt(new_case):
+                nonlocal changed
+                trial = cases[:n] + [new_case] + cases[n + 1:]
+                if fails(payroll_date, trial):
+                    cases[n] = new_case
+                    changed = True
+                    return True
+                return False
+
+            # Fewer days: halves, then quarters, ... then single days
+            chunk = len(case.days) // 2
+            while chunk:
+                i = 0
+                while i < len(cases[n].days):
+                    days = cases[n].days
+                    if not attempt(replace(cases[n], days=days[:i] + days[i + chunk:])):
+                        i += chunk
+                chunk //= 2
+            for i in range(len(cases[n].days)):
+                for day in _day_simplifications(cases[n].days[i]):
+                    days = cases[n].days
+                    if attempt(replace(cases[n], days=days[:i] + [day] + days[i + 1:])):
+                        break
+            for contract in _contract_simplifications(cases[n].contract):
+                if attempt(replace(cases[n], contract=contract)):
+                    break
+            for stock in _stock_simplifications(cases[n].leave_stock):
+                if attempt(replace(cases[n], leave_stock=stock)):
+                    break
+    return cases
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+def fuzz_round(seed: str, size: int, candidates: dict, scratch: Path) -> list[Mismatch]:
+    """Every candidate against the reference on one random round; each
+    mismatch comes back shrunk."""
+    payroll_date, cases = random_round(seed, size)
+    try:
+        expected = reference(payroll_date, cases)
+    except Exception as e:
+        # Generated inputs are all ones a contracts sheet can hold, so the
+        # reference falling over is a finding in its own right.
+        kind = type(e).__name__
+
+        def fails(d, c):
+            error = reference_error(d, c)
+            return error is not None and error.startswith(f"raised {kind}:")
+        small = shrink(fails, payroll_date, cases)
+        return [Mismatch("reference", payroll_date, small,
+                         reference_error(payroll_date, small), seed)]
+    found = []
+    for name, fn in candidates.items():
+        if compare(name, payroll_date, cases, scratch, fn, expected) is None:
+            continue
+        fails = lambda d, c, _name=name, _fn=fn: compare(_name, d, c, scratch, _fn) is not None
+        small = shrink(fails, payroll_date, cases)
+        found.append(Mismatch(name, payroll_date, small,
+                              compare(name, payroll_date, small, scratch, fn), seed))
+    return found
+
+
+def run(seed: int, rounds: int, size: int, candidates=None,
+        first_round: int = 0) -> tuple[int, list[Mismatch]]:
+    """rounds rounds of size cases each, from first_round. Returns (cases
+    run, mismatches)."""
+    if candidates is None:
+        candidates = CANDIDATES
+    elif not isinstance(candidates, dict):
+        candidates = {name: CANDIDATES[name] for name in candidates}
+    found = []
+    with tempfile.TemporaryDirectory(prefix="kenyacc_fuzz_") as scratch:
+        for n in range(first_round, first_round + rounds):
+            found += fuzz_round(f"{seed}:{n}", size, candidates, Path(scratch))
+    return rounds * size, found
+
+
+def save_repro(mismatch: Mismatch, path: str | Path) -> None:
+    """Write a (shrunk) mismatch as JSON; load_repro reads it back."""
+    Path(path).write_text(json.dumps(to_jsonable(mismatch), indent=2))
+
+
+def load_repro(path: str | Path) -> Mismatch:
+    return from_jsonable(Mismatch, json.loads(Path(path).read_text()))
+
+
+def replay(mismatch: Mismatch) -> str | None:
+    """Run a saved mismatch again. Returns what still differs, or None
+    once it is fixed."""
+    if mismatch.candidate == "reference":
+        return reference_error(mismatch.payroll_date, mismatch.cases)
+    with tempfile.TemporaryDirectory(prefix="kenyacc_fuzz_") as scratch:
+        return compare(mismatch.candidate, mismatch.payroll_date, mismatch.cases,
+                       Path(scratch))
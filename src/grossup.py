@@ -0,0 +1,169 @@
+"""Net-to-gross: the gross monthly pay that leaves a given net.
+
+Net pay as a function of gross is piecewise linear: every statutory
+deduction is a rate times gross, clipped at fixed limits (NSSF LEL/UEL,
+the SHIF floor, the quarters benefit against its market value), and PAYE
+is a rate within each band of chargeable pay. So net is a straight line
+between a handful of gross "kinks", and it is strictly increasing -- no
+band rate comes near taking a whole shilling of each extra shilling.
+
+GrossUpSolver finds every kink once for a rate table and a set of
+contract terms, evaluates net at each one with the real calculators, and
+then inverts any target by a bisect to find its segment and one
+multiply-add along it. No iteration, no guessing: each target costs a
+few microseconds, so a whole salary grid comes back at once.
+
+The answer is exact to Decimal precision (28 significant digits);
+callers quoting a figure round it up to the cent, which can only leave
+the net a fraction of a cent above the target.
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from decimal import Decimal
+
+from .calculators import (
+    DeductionCalculator, GrossCalculator, HousingBenefitCalculator, PAYETable, settle,
+)
+from .models import Contract, Deductions
+from .rates import StatutoryRates
+
+
+@dataclass
+class GrossUp:
+    net_pay: Decimal
+    total_gross: Decimal
+    base_salary: Decimal       # what to put in contracts.tsv, per salary_basis
+    housing_allowance: Decimal
+    housing_benefit: Decimal   # taxable value of quarters, non-cash
+    deductions: Deductions
+
+
+class GrossUpSolver:
+    """Gross for net under one rate table and one set of contract terms.
+
+    Only the contract's nssf_tier, housing_type, housing_market_value and
+    salary_basis matter: the solver answers for a full month of fixed pay,
+    with no leave, overtime or proration.
+    """
+
+    def __init__(self, rates: StatutoryRates, contract: Contract):
+        self.rates = rates
+        self.contract = contract
+        self.table = PAYETable.for_rates(rates)
+        self._housed = contract.housing_type in ("quarters", "dorm")
+
+        grosses = self._kinks()
+        self._grosses = grosses
+        self._nets = [self.net_for_gross(g) for g in grosses]
+        # Slope of each segment, and of the ray beyond the last kink.
+        self._slopes = [(n1 - n0) / (g1 - g0) for g0, g1, n0, n1
+                        in zip(grosses, grosses[1:], self._nets, self._nets[1:])]
+
+    # Forward
+
+    def _deductions(self, gross: Decimal) -> Deductions:
+        return DeductionCalculator(gross, self.rates, self.contract).calculate()
+
+    def _benefit(self, gross: Decimal) -> Decimal:
+        return HousingBenefitCalculator(self.contract, gross).calculate()
+
+    def _chargeable(self, gross: Decimal) -> Decimal:
+        d = self._deductions(gross)
+        return (gross + self._benefit(gross)
+                - d.nssf_tier_1 - d.nssf_tier_2 - d.shif - d.ahl_employee)
+
+    def net_for_gross(self, gross: Decimal) -> Decimal:
+        """Net pay for a month's total gross, as PayrollEngine computes it."""
+        return self.breakdown(gross).net_pay
+
+    # Kinks
+
+    def _kinks(self) -> list[Decimal]:
+        """Every gross at which net changes slope, plus one point past the
+        last so the final ray has a slope too."""
+        r = self.rates
+        zero = Decimal(0)
+        # Where a deduction or the benefit changes slope, in gross terms
+        points = {zero, r.nssf_lel, r.shif_min / r.shif_rate}
+        if self.contract.nssf_tier == "standard":
+            points.add(r.nssf_uel)
+        if self._housed:
+            points.add(self.contract.housing_market_value
+                       / HousingBenefitCalculator.BENEFIT_RATE)
+        points = sorted(p for p in points if p >= 0)
+        points.append(points[-1] * 2 + 1)
+
+        # Chargeable pay is linear between those points; find where it
+        # crosses each band limit and the point where PAYE clears relief.
+        targets = list(self.table.uppers) + [self._relief_threshold()]
+        charge = [self._chargeable(p) for p in points]
+        kinks = set(points)
+        for (g0, c0), (g1, c1) in zip(zip(points, charge), zip(points[1:], charge[1:])):
+            last = g1 == points[-1]
+            for t in targets:
+                if c0 < t and (t <= c1 or last):
+                    kinks.add(g0 + (t - c0) * (g1 - g0) / (c1 - c0))
+        kinks = sorted(kinks)
+        kinks.append(kinks[-1] * 2 + 1)
+        return kinks
+
+    def _relief_threshold(self) -> Decimal:
+        """Chargeable pay at which tax before relief equals personal relief."""
+        t = self.table
+        for lower, upper, rate, offset in zip(t.lowers, t.uppers, t.rates, t.offsets):
+            if offset + (upper - lower) * rate >= t.personal_relief:
+                return lower + (t.personal_relief - offset) / rate
+        return t.top_limit
+
+    # Inverse
+
+    def gross_for_net(self, net: Decimal) -> Decimal:
+        """The total gross that leaves exactly net. Raises ValueError below
+        the net of a zero gross (the SHIF floor makes that negative)."""
+        nets = self._nets
+        if net < nets[0]:
+            raise ValueError(f"Net {net} is below the net of a zero gross ({nets[0]})")
+        i = min(bisect_right(nets, net) - 1, len(self._slopes) - 1)
+        return self._grosses[i] + (net - nets[i]) / self._slopes[i]
+
+    def gross_many(self, nets: list[Decimal]) -> list[Decimal]:
+        """gross_for_net over a whole table of targets."""
+        grosses, values, slopes = self._grosses, self._nets, self._slopes
+        last = len(slopes) - 1
+        floor = values[0]
+        out = []
+        for net in nets:
+            if net < floor:
+                raise ValueError(f"Net {net} is below the net of a zero gross ({floor})")
+            i = min(bisect_right(values, net) - 1, last)
+            out.append(grosses[i] + (net - values[i]) / slopes[i])
+        return out
+
+    def solve(self, net: Decimal) -> GrossUp:
+        """gross_for_net with the full breakdown of the answer."""
+        gross = self.gross_for_net(net)
+        return self.breakdown(gross)
+
+    def breakdown(self, gross: Decimal) -> GrossUp:
+        """A month's figures for a total gross, split per the contract."""
+        if self._housed:
+            base, allowance = gross, Decimal(0)
+        else:
+            base = gross / (1 + GrossCalculator.HOUSING_RATE)
+            allowance = gross - base
+        benefit = self._benefit(gross)
+        d, net = settle(gross, self.contract, self.rates, benefit, self.table)
+        return GrossUp(
+            net_pay=net,
+            total_gross=gross,
+            base_salary=base if self.contract.salary_basis == "base" else gross,
+            housing_allowance=allowance,
+            housing_benefit=benefit,
+            deductions=d,
+        )
+
+    def bonus_for_net(self, current_gross: Decimal, extra_net: Decimal) -> Decimal:
+        """Extra gross on top of current_gross that adds extra_net to net
+        pay -- a grossed-up, "tax-free" bonus (paid as adj_no_housing)."""
+        return self.gross_for_net(self.net_for_gross(current_gross) + extra_net) - current_gross
@@ -22,9 +22,6 @@ import csv
 import re
 from pathlib import Path
 
-import gspread
-from gspread.utils import ExportFormat
-
 from .gauth import client
 
 # Google Sheet keys: the <key> in docs.google.com/spreadsheets/d/<key>/edit
@@ -77,6 +74,8 @@ def sync_attendance(gc, key: str, dest: Path, year: int, log=print) -> None:
     Exporting (rather than reading cell strings) preserves real date cells,
     which extract_timesheets_xlsx2tsvs.extract_month depends on.
     """
+    from gspread.utils import ExportFormat
+
     data = gc.export(key, ExportFormat.EXCEL)
     out = attendance_xlsx_path(dest, year)
     out.parent.mkdir(parents=True, exist_ok=True)
@@ -98,6 +97,8 @@ def sync_leave_stocks(gc, dest: Path, year: int, log=print) -> None:
     tab is routed to leave_stocks/{feed_year}/leave_stocks_YYYY_MM_DD.tsv so
     it lands where find_leave_stocks_for_month expects it.
     """
+    import gspread
+
     wrote = 0
     for src_year in (year - 1, year):
         name = LEAVE_STOCKS_NAME.format(year=src_year)
@@ -0,0 +1,143 @@
+"""Rerun a month recomputing only the employees whose inputs changed.
+
+A correction to one cell of the attendance sheet used to mean recomputing
+every payslip. Instead, each employee's inputs -- employee row, contract
+row, the month's timesheet rows, opening leave stock -- are fingerprinted
+together with the month's rates and holidays, and the previous run's
+payslips are kept alongside their fingerprints. On a rerun an employee
+whose fingerprint is unchanged gets last run's payslip back as-is; only
+the rest go through PayrollEngine.
+
+The previous run is also tied to the code that computed it: when the
+calculation modules change, every fingerprint is treated as changed.
+
+The state lives in the run's workdir (see run_payroll --workdir), so it is
+only kept when the staged files are.
+"""
+
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+
+from .calculators import PayrollEngine
+from .context import PayrollContext
+from .models import Contract, Employee, LeaveStock, PaySlip
+from .serialize import digest, payslip_from_dict, payslip_to_dict
+
+STATE_FORMAT = 1
+
+# Modules whose source decides what a payslip contains.
+_CODE_MODULES = ("calculators.py", "cents.py", "context.py", "models.py", "rates.py",
+                 "validation.py")
+
+
+@lru_cache(maxsize=None)
+def code_version() -> str:
+    """A digest of the calculation modules' source, as of when it was first
+    asked for -- i.e. the code this process is running."""
+    h = hashlib.sha256()
+    for name in _CODE_MODULES:
+        h.update((Path(__file__).parent / name).read_bytes())
+    return h.hexdigest()
+
+
+def rates_version(ctx: PayrollContext) -> str:
+    """A digest of everything month-wide a payslip depends on: the
+    statutory rates and the month's public holidays."""
+    return digest(sorted(vars(ctx.rates).items()), ctx.holidays, ctx.period)
+
+
+def input_fingerprint(employee: Employee, contract: Contract, timesheet,
+                      leave_stock: LeaveStock, rates: str) -> str:
+    """A digest of one employee's inputs for the month. rates is
+    rates_version() of the month, computed once by the caller."""
+    return digest(employee, contract, timesheet, leave_stock, rates)
+
+
+class PreviousRun:
+    """Last run's payslips for a month, with the fingerprints they came from."""
+
+    def __init__(self, year: int, month: int,
+                 entries: dict[int, tuple[str, PaySlip]] | None = None):
+        self.year = year
+        self.month = month
+        self.entries = entries or {}
+
+    @classmethod
+    def load(cls, path: str | Path, year: int, month: int) -> "PreviousRun":
+        """Read the state file at path. A missing or unreadable file, one for
+        another month, or one written by different calculation code gives
+        an empty run -- everything is recomputed, nothing is trusted."""
+        try:
+            data = json.loads(Path(path).read_text())
+        except (OSError, ValueError):
+            return cls(year, month)
+        if (data.get("format") != STATE_FORMAT
+                or (data.get("year"), data.get("month")) != (year, month)
+                or data.get("code") != code_version()):
+            return cls(year, month)
+        entries = {
+            int(emp_id): (e["fingerprint"], payslip_from_dict(e["payslip"]))
+            for emp_id, e in data["employees"].items()
+        }
+        return cls(year, month, entries)
+
+    def save(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "format": STATE_FORMAT,
+            "year": self.year,
+            "month": self.month,
+            "code": code_version(),
+            "employees": {
+                str(emp_id): {"fingerprint": fp, "payslip": payslip_to_dict(ps)}
+                for emp_id, (fp, ps) in sorted(self.entries.items())
+            },
+        }
+        path.write_text(json.dumps(data))
+        return path
+
+
+def process_incremental(
+    engine: PayrollEngine,
+    employees: dict,
+    contracts: dict,
+    timesheets: dict,
+    leave_stocks: dict,
+    previous: PreviousRun,
+    workers: int = 1,
+) -> tuple[list[PaySlip], list[int], PreviousRun]:
+    """process_batch(), reusing previous payslips wherever the inputs match.
+
+    Returns (payslips, recomputed employee_ids, the run to save for next
+    time). The payslips are exactly what process_batch would return for
+    the same inputs, in the same order.
+    """
+    ids = [emp_id for emp_id in sorted(contracts)
+           if emp_id in employees and emp_id in timesheets and emp_id in leave_stocks]
+    # Switching a check on or off changes the warnings, and the backend
+    # the rounding, so both are part of what the previous run's payslips
+    # were computed from.
+    rates = digest(rates_version(engine.ctx), engine.backend, engine.checks)
+    fingerprints = {
+        i: input_fingerprint(employees[i], contracts[i], timesheets[i],
+                             leave_stocks[i], rates)
+        for i in ids
+    }
+
+    stale = [i for i in ids
+             if previous.entries.get(i, (None,))[0] != fingerprints[i]]
+    fresh = engine.process_batch(
+        {i: employees[i] for i in stale}, {i: contracts[i] for i in stale},
+        {i: timesheets[i] for i in stale}, {i: leave_stocks[i] for i in stale},
+        workers=workers,
+    ) if stale else []
+
+    by_id = {i: previous.entries[i][1] for i in ids if i not in stale}
+    by_id.update(zip(stale, fresh))
+    payslips = [by_id[i] for i in ids]
+    current = PreviousRun(previous.year, previous.month,
+                          {i: (fingerprints[i], by_id[i]) for i in ids})
+    return payslips, stale, current
@@ -4,7 +4,7 @@ from datetime import date
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
 
-from .models import Contract, Employee, LeaveStock, TimesheetDay
+from .models import Contract, Employee, LeaveStock, TimesheetDay, TimesheetMonth
 
 
 def _employee_from_row(row: dict) -> Employee | None:
@@ -202,7 +202,9 @@ def load_leave_stocks(path: str | Path) -> list[LeaveStock]:
     """Load leave stock balances from a TSV file.
 
     Handles extra columns (name, notes), negative balances, fractional
-    decimals, and blank values (treated as 0).
+    decimals, and blank values (treated as 0). The open_week columns are
+    optional: files written before they existed carry no open week, or no
+    regular hours in it.
     """
     stocks = []
     with open(path, newline="", encoding="utf-8-sig") as f:
@@ -211,6 +213,7 @@ def load_leave_stocks(path: str | Path) -> list[LeaveStock]:
             emp_id_raw = row.get("employee_id", "").strip()
             if not emp_id_raw or emp_id_raw == "???":
                 continue
+            open_week = (row.get("open_week") or "").strip()
 
             stocks.append(
                 LeaveStock(
@@ -219,6 +222,10 @@ def load_leave_stocks(path: str | Path) -> list[LeaveStock]:
                     sick_half_pay=_parse_decimal(row.get("sick_half_pay", "0")),
                     annual_leave=_parse_decimal(row.get("annual_leave", "0")),
                     as_of_date=_parse_date(row.get("as_of_date", "2025-12-31")),
+                    open_week=_parse_date(open_week) if open_week else None,
+                    open_week_hours=_parse_decimal(row.get("open_week_hours", "0")),
+                    open_week_regular_hours=_parse_decimal(
+                        row.get("open_week_regular_hours", "0")),
                 )
             )
     return stocks
@@ -246,71 +253,79 @@ def load_timesheet(path: str | Path) -> list[TimesheetDay]:
 
 def load_timesheet_folder(
     folder: str | Path, year: int, month: int
-) -> dict[int, list[TimesheetDay]]:
+) -> dict[int, TimesheetMonth]:
     """Load per-employee timesheets from a folder of name_id.tsv files.
 
     Each file has columns: date, wkdy, hrs_norm, hrs_wrkd, hrs_miss, hrs_sik,
     hrs_ot_1_5, hrs_ot_2_0. Employee ID is extracted from the filename
     (e.g. beth_1.tsv → ID 1). Rows are filtered to the requested year/month.
     """
+    result: dict[int, TimesheetMonth] = {}
+    for tsv_file in sorted(Path(folder).glob("*.tsv")):
+        timesheet = load_timesheet_file(tsv_file, year, month)
+        if timesheet is not None:
+            result[timesheet.employee_id] = timesheet
+    return result
+
+
+def load_timesheet_file(path: str | Path, year: int, month: int) -> TimesheetMonth | None:
+    """Load one name_id.tsv file's rows for year/month (see
+    load_timesheet_folder). None if the filename carries no employee ID or
+    no row of the month has data."""
     import re
 
-    folder = Path(folder)
-    result: dict[int, list[TimesheetDay]] = {}
-
-    for tsv_file in sorted(folder.glob("*.tsv")):
-        # Extract employee_id from filename: name_id.tsv
-        match = re.match(r"^.+_(\d+)\.tsv$", tsv_file.name)
-        if not match:
-            continue
-        emp_id = int(match.group(1))
-
-        entries = []
-        with open(tsv_file, newline="", encoding="utf-8-sig") as f:
-            reader = csv.DictReader(f, delimiter="\t")
-            reader.fieldnames = [h.strip() for h in reader.fieldnames]
-            for row in reader:
-                date_str = row.get("date", "").strip()
-                if not date_str:
-                    continue
-                row_date = _parse_date(date_str)
-                if row_date.year != year or row_date.month != month:
-                    continue
+    path = Path(path)
+    # Extract employee_id from filename: name_id.tsv
+    match = re.match(r"^.+_(\d+)\.tsv$", path.name)
+    if not match:
+        return None
+    emp_id = int(match.group(1))
 
-                hrs_wrkd = row.get("hrs_wrkd", "").strip()
-                hrs_miss = row.get("hrs_miss", "").strip()
-                hrs_sik = row.get("hrs_sik", "").strip()
-                ot_15 = row.get("hrs_ot_1_5", "").strip()
-                ot_20 = row.get("hrs_ot_2_0", "").strip()
-
-                # Skip rows with no data filled in yet. An adjustment counts
-                # as data: it can be the only thing on a row.
-                if (not hrs_wrkd and not hrs_miss and not hrs_sik
-                        and not row.get("adj_with_housing", "").strip()
-                        and not row.get("adj_no_housing", "").strip()):
-                    continue
+    entries = []
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f, delimiter="\t")
+        reader.fieldnames = [h.strip() for h in reader.fieldnames]
+        for row in reader:
+            date_str = row.get("date", "").strip()
+            if not date_str:
+                continue
+            row_date = _parse_date(date_str)
+            if row_date.year != year or row_date.month != month:
+                continue
 
-                absent = _parse_decimal(hrs_miss) > 0 or _parse_decimal(hrs_sik) > 0
-                sick = _parse_decimal(hrs_sik) > 0
-
-                entries.append(
-                    TimesheetDay(
-                        employee_id=emp_id,
-                        date=row_date,
-                        hours_normal=_parse_decimal(hrs_wrkd),
-                        hours_ot_1_5=_parse_decimal(ot_15),
-                        hours_ot_2_0=_parse_decimal(ot_20),
-                        absent=absent,
-                        sick=sick,
-                        adj_with_housing=_parse_decimal(row.get("adj_with_housing", "")),
-                        adj_no_housing=_parse_decimal(row.get("adj_no_housing", "")),
-                    )
-                )
+            hrs_wrkd = row.get("hrs_wrkd", "").strip()
+            hrs_miss = row.get("hrs_miss", "").strip()
+            hrs_sik = row.get("hrs_sik", "").strip()
+            ot_15 = row.get("hrs_ot_1_5", "").strip()
+            ot_20 = row.get("hrs_ot_2_0", "").strip()
+
+            # Skip rows with no data filled in yet. An adjustment counts
+            # as data: it can be the only thing on a row.
+            if (not hrs_wrkd and not hrs_miss and not hrs_sik
+                    and not row.get("adj_with_housing", "").strip()
+                    and not row.get("adj_no_housing", "").strip()):
+                continue
 
-        if entries:
-            result[emp_id] = entries
+            absent = _parse_decimal(hrs_miss) > 0 or _parse_decimal(hrs_sik) > 0
+            sick = _parse_decimal(hrs_sik) > 0
 
-    return result
+            entries.append(
+                TimesheetDay(
+                    employee_id=emp_id,
+                    date=row_date,
+                    hours_normal=_parse_decimal(hrs_wrkd),
+                    hours_ot_1_5=_parse_decimal(ot_15),
+                    hours_ot_2_0=_parse_decimal(ot_20),
+                    absent=absent,
+                    sick=sick,
+                    adj_with_housing=_parse_decimal(row.get("adj_with_housing", "")),
+                    adj_no_housing=_parse_decimal(row.get("adj_no_housing", "")),
+                )
+            )
+
+    if not entries:
+        return None
+    return TimesheetMonth(emp_id, year, month, entries)
 
 
 # Required filenames for a valid payroll input folder
@@ -423,6 +438,36 @@ def find_file(folder: str | Path, filename: str) -> Path | None:
     return None
 
 
+def holiday_override_files(folder: str | Path) -> list[Path]:
+    """The public_holidays*.tsv files anywhere under folder, in load order."""
+    return sorted(p for p in Path(folder).rglob("public_holidays*.tsv") if p.is_file())
+
+
+def read_holiday_overrides(folder: str | Path) -> tuple:
+    """The gazetted holidays in folder's public_holidays*.tsv files, as
+    PublicHolidays for PayrollContext.for_date(holiday_overrides=...).
+
+    These carry gazetted dates (Eid, one-off holidays) that the built-in
+    calendar can only estimate. Nothing process-wide changes, so a
+    long-lived process (the app) can hold several folders' at once.
+    """
+    from .rates import KenyanHolidays
+
+    return tuple(h for p in holiday_override_files(folder)
+                 for h in KenyanHolidays.read_overrides(p))
+
+
+def load_holiday_overrides(folder: str | Path) -> int:
+    """Make folder's holiday overrides (see read_holiday_overrides) the
+    process-wide ones, for the command-line scripts. Overrides loaded from
+    any earlier folder are dropped first. Returns the number of rows loaded.
+    """
+    from .rates import KenyanHolidays
+
+    KenyanHolidays.clear_overrides()
+    return sum(KenyanHolidays.load_overrides(p) for p in holiday_override_files(folder))
+
+
 def find_timesheet_dir(folder: str | Path, year: int) -> Path | None:
     """Find a timesheet year directory (e.g. 2026/) containing name_id.tsv files."""
     for p in Path(folder).rglob(str(year)):
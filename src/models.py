@@ -1,5 +1,7 @@
-from dataclasses import dataclass
-from datetime import date
+from array import array
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import date, timedelta
 from decimal import Decimal
 
 
@@ -46,6 +48,14 @@ class LeaveStock:
     sick_half_pay: Decimal
     annual_leave: Decimal
     as_of_date: date
+    # The Monday-to-Sunday week the month ended in, when it runs on into the
+    # next month, and the hours worked in it so far: the next month's run
+    # adds them to that week's total (see weekly_hours_warnings). The regular
+    # hours are the part of those not already overtime, which is what the
+    # weekly overtime limit counts (see src/overtime.py).
+    open_week: date | None = None
+    open_week_hours: Decimal = Decimal(0)
+    open_week_regular_hours: Decimal = Decimal(0)
 
 
 @dataclass
@@ -64,6 +74,183 @@ class TimesheetDay:
     adj_no_housing: Decimal = Decimal(0)
 
 
+class TimesheetMonth(Sequence):
+    """One employee's month of attendance, stored by column.
+
+    A month held as a list of TimesheetDay costs a dataclass, a dict and up
+    to seven Decimals per day, and every consumer walks the whole list to
+    add up the same few totals. Here each field is a packed array -- day of
+    month as a byte, each number as an int64 coefficient plus an exponent
+    byte, the flags as bitmasks -- and the totals are added up once, on
+    construction. The numbers come back as the very Decimals that went in
+    (8.67 stays '8.67', 9 stays '9'), so formatting is unchanged; anything
+    too large to pack is kept as-is.
+
+    It still behaves as a read-only list of TimesheetDay: len(), indexing
+    and iteration build the days on demand, in the order they were given.
+    Code that only needs totals or a few fields uses timesheet_total() and
+    timesheet_columns(), which work on either form.
+    """
+
+    FIELDS = ("hours_normal", "hours_ot_1_5", "hours_ot_2_0",
+              "adj_with_housing", "adj_no_housing")
+    _WIDTH = len(FIELDS)
+    _INT64 = 2 ** 63
+
+    __slots__ = ("employee_id", "year", "month", "_day", "_coef", "_exp",
+                 "_absent", "_sick", "_wide", "totals", "days_worked", "week_totals",
+                 "week_normal_hours")
+
+    def __init__(self, employee_id: int, year: int, month: int,
+                 days: "Iterable[TimesheetDay]" = ()):
+        self.employee_id = employee_id
+        self.year = year
+        self.month = month
+        self._day = array("B")
+        self._coef = array("q")   # row-major, _WIDTH values per row
+        self._exp = array("b")
+        self._absent = 0          # bit i set: row i is absent
+        self._sick = 0
+        self._wide = {}           # (row, field index) -> Decimal that did not pack
+        for d in days:
+            self._append(d)
+
+        columns = {name: self.column(name) for name in self.FIELDS}
+        # Added up in row order, exactly as sum(d.field for d in days) would.
+        self.totals = {name: sum(values) for name, values in columns.items()}
+        self.days_worked = sum(1 for h in columns["hours_normal"] if h > 0)
+
+        # Hours worked (normal plus overtime) per Monday-to-Sunday week,
+        # keyed by the week's Monday, for the weekly maximum check; and each
+        # day's normal hours by week, for the regular hours derived overtime
+        # carries into next month (overtime.week_regular_hours).
+        weeks, normal_by_week = {}, {}
+        for day, normal, ot_1_5, ot_2_0 in zip(
+                self.column("date"), columns["hours_normal"],
+                columns["hours_ot_1_5"], columns["hours_ot_2_0"]):
+            monday = day - timedelta(days=day.weekday())
+            weeks[monday] = weeks.get(monday, Decimal(0)) + normal + ot_1_5 + ot_2_0
+            normal_by_week.setdefault(monday, []).append(normal)
+        self.week_totals = weeks
+        self.week_normal_hours = normal_by_week
+
+    def _append(self, d: TimesheetDay) -> None:
+        if d.employee_id != self.employee_id:
+            raise ValueError(f"Day for employee {d.employee_id} in timesheet "
+                             f"for employee {self.employee_id}")
+        if (d.date.year, d.date.month) != (self.year, self.month):
+            raise ValueError(f"{d.date} is outside {self.year}-{self.month:02d}")
+        row = len(self._day)
+        self._day.append(d.date.day)
+        for k, name in enumerate(self.FIELDS):
+            value = getattr(d, name)
+            exp = value.as_tuple().exponent
+            coef = int(value.scaleb(-exp)) if isinstance(exp, int) else None
+            if coef is None or not -128 <= exp <= 127 or not -self._INT64 <= coef < self._INT64:
+                self._wide[(row, k)] = value
+                coef, exp = 0, 0
+            self._coef.append(coef)
+            self._exp.append(exp)
+        if d.absent:
+            self._absent |= 1 << row
+        if d.sick:
+            self._sick |= 1 << row
+
+    def _value(self, row: int, k: int) -> Decimal:
+        i = row * self._WIDTH + k
+        if self._wide and (row, k) in self._wide:
+            return self._wide[(row, k)]
+        return _DECIMALS[self._coef[i], self._exp[i]]
+
+    def column(self, name: str) -> list:
+        """One field for every day, in order: a date, a bool or a Decimal."""
+        if name == "date":
+            return [date(self.year, self.month, d) for d in self._day]
+        if name in ("absent", "sick"):
+            mask = self._absent if name == "absent" else self._sick
+            return [bool(mask >> row & 1) for row in range(len(self._day))]
+        k = self.FIELDS.index(name)
+        w = self._WIDTH
+        values = [_DECIMALS[key] for key in zip(self._coef[k::w], self._exp[k::w])]
+        for (row, field), value in self._wide.items():
+            if field == k:
+                values[row] = value
+        return values
+
+    def absences(self) -> list[TimesheetDay]:
+        """Just the days marked absent -- all that leave allocation reads."""
+        return [self[row] for row in range(len(self)) if self._absent >> row & 1]
+
+    def __len__(self) -> int:
+        return len(self._day)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        row = range(len(self))[index]  # normalises negatives, raises IndexError
+        values = [self._value(row, k) for k in range(self._WIDTH)]
+        return TimesheetDay(
+            employee_id=self.employee_id,
+            date=date(self.year, self.month, self._day[row]),
+            hours_normal=values[0],
+            hours_ot_1_5=values[1],
+            hours_ot_2_0=values[2],
+            absent=bool(self._absent >> row & 1),
+            sick=bool(self._sick >> row & 1),
+            adj_with_housing=values[3],
+            adj_no_housing=values[4],
+        )
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self[row]
+
+    def __eq__(self, other):
+        if isinstance(other, (TimesheetMonth, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (f"TimesheetMonth(employee_id={self.employee_id}, "
+                f"{self.year}-{self.month:02d}, {len(self)} days)")
+
+
+class _DecimalCache(dict):
+    """(coefficient, exponent) -> Decimal, filled on first use.
+
+    Timesheets repeat a handful of figures (8.67, 9, 0) across every day and
+    employee, so the Decimals TimesheetMonth hands back are shared rather
+    than rebuilt on each read. Decimals are immutable, so sharing is safe.
+    """
+    MAX_SIZE = 1 << 16
+
+    def __missing__(self, key):
+        value = Decimal(key[0]).scaleb(key[1])
+        if len(self) < self.MAX_SIZE:
+            self[key] = value
+        return value
+
+
+_DECIMALS = _DecimalCache()
+
+
+def timesheet_total(timesheet_days, field: str, start=0):
+    """sum(d.<field> for d in timesheet_days), read from the precomputed
+    totals when the days are a TimesheetMonth."""
+    if isinstance(timesheet_days, TimesheetMonth):
+        return start + timesheet_days.totals[field]
+    return sum((getattr(d, field) for d in timesheet_days), start)
+
+
+def timesheet_columns(timesheet_days, *fields: str) -> list[list]:
+    """The named fields as parallel lists, from either timesheet form."""
+    if isinstance(timesheet_days, TimesheetMonth):
+        return [timesheet_days.column(f) for f in fields]
+    return [[getattr(d, f) for d in timesheet_days] for f in fields]
+
+
 # Calculation Results
 
 @dataclass
@@ -102,6 +289,17 @@ class LeaveAllocation:
     updated_stock: LeaveStock
 
 
+@dataclass
+class Finding:
+    """One validation result on a payslip (see src/validation.py)."""
+    code: str                       # the check that raised it, e.g. "weekly_max"
+    severity: str                   # "info", "warning" or "breach"
+    message: str
+    day: date | None = None         # the day, or the Monday of the week, it is about
+    value: Decimal | None = None    # what was found: hours, or KES/hr for min_wage
+    limit: Decimal | None = None    # what it was checked against, in the same unit
+
+
 @dataclass
 class PaySlip:
     employee: Employee
@@ -111,5 +309,64 @@ class PaySlip:
     deductions: Deductions
     leave: LeaveAllocation
     net_pay: Decimal
-    days_worked: list[TimesheetDay]
+    days_worked: list[TimesheetDay] | TimesheetMonth
     warnings: list[str] | None = None  # Validation warnings (e.g., below min wage)
+    findings: list[Finding] = field(default_factory=list)  # the same, structured
+
+
+# Year to Date
+
+# The figures a P9 tax card carries for each month, in card order.
+TAX_MONTH_FIELDS = ("gross", "housing_benefit", "nssf", "shif", "ahl", "chargeable",
+                    "tax_charged", "relief", "paye", "net_pay")
+
+
+@dataclass
+class TaxMonth:
+    """One employee's payroll month as the P9 card reports it."""
+    employee_id: int
+    year: int
+    month: int
+    gross: Decimal            # total cash gross
+    housing_benefit: Decimal  # value of quarters (non-cash)
+    nssf: Decimal             # tier 1 + tier 2, employee share
+    shif: Decimal
+    ahl: Decimal              # employee share
+    chargeable: Decimal
+    tax_charged: Decimal      # before personal relief
+    relief: Decimal           # personal relief actually set off
+    paye: Decimal
+    net_pay: Decimal
+
+
+@dataclass
+class YTDTotals:
+    """An employee's TaxMonth figures summed from January to through_month."""
+    employee_id: int
+    year: int
+    through_month: int = 0
+    months: int = 0           # months with a payslip
+    gross: Decimal = Decimal(0)
+    housing_benefit: Decimal = Decimal(0)
+    nssf: Decimal = Decimal(0)
+    shif: Decimal = Decimal(0)
+    ahl: Decimal = Decimal(0)
+    chargeable: Decimal = Decimal(0)
+    tax_charged: Decimal = Decimal(0)
+    relief: Decimal = Decimal(0)
+    paye: Decimal = Decimal(0)
+    net_pay: Decimal = Decimal(0)
+
+    def add(self, month: TaxMonth) -> "YTDTotals":
+        """These totals carried through one more month of the same year."""
+        if (month.employee_id, month.year) != (self.employee_id, self.year):
+            raise ValueError(f"{month.year}-{month.month:02d} for employee "
+                             f"{month.employee_id} does not belong to these totals")
+        if month.month <= self.through_month:
+            raise ValueError(f"Totals already run through month {self.through_month}; "
+                             f"cannot add month {month.month}")
+        return YTDTotals(
+            employee_id=self.employee_id, year=self.year,
+            through_month=month.month, months=self.months + 1,
+            **{f: getattr(self, f) + getattr(month, f) for f in TAX_MONTH_FIELDS},
+        )
@@ -1,14 +1,17 @@
 import csv
-from calendar import monthrange
 from io import BytesIO, StringIO
 from pathlib import Path
 
-from .models import PaySlip
+from .context import PayrollContext
+from .models import PaySlip, TimesheetMonth, timesheet_total
 
 
 class PayslipRenderer:
-    def __init__(self, company_name: str = ""):
+    def __init__(self, company_name: str = "", ctx: PayrollContext | None = None):
         self.company_name = company_name
+        # The month being rendered; without one, each payslip's month is
+        # worked out from its first timesheet day.
+        self.ctx = ctx
 
     def render(self, payslip: PaySlip) -> str:
         lines = []
@@ -31,24 +34,24 @@ class PayslipRenderer:
         lines.append("")
 
         # Work & leave summary
-        from .rates import KenyanHolidays
         lines.append("-" * 60)
         lines.append("WORK SUMMARY")
         lines.append("-" * 60)
-        total_normal = sum(d.hours_normal for d in payslip.days_worked)
-        total_ot_1_5 = sum(d.hours_ot_1_5 for d in payslip.days_worked)
-        total_ot_2_0 = sum(d.hours_ot_2_0 for d in payslip.days_worked)
-        days_worked = len([d for d in payslip.days_worked if d.hours_normal > 0])
-        holidays = KenyanHolidays.get_holidays_for_month(
-            payslip.days_worked[0].date.year, payslip.days_worked[0].date.month
-        ) if payslip.days_worked else []
+        days = payslip.days_worked
+        total_normal = timesheet_total(days, "hours_normal")
+        total_ot_1_5 = timesheet_total(days, "hours_ot_1_5")
+        total_ot_2_0 = timesheet_total(days, "hours_ot_2_0")
+        if isinstance(days, TimesheetMonth):
+            days_worked = days.days_worked
+        else:
+            days_worked = len([d for d in days if d.hours_normal > 0])
+        ctx = self.ctx
+        if ctx is None and days:
+            ctx = PayrollContext.for_date(days[0].date)
+        holidays = ctx.holidays if ctx else ()
         lines.append(f"Days worked:     {days_worked}")
         if holidays:
-            holiday_dates = {h.date for h in holidays}
-            worked_holidays = sum(
-                1 for d in payslip.days_worked
-                if d.date in holiday_dates and d.hours_normal > 0
-            )
+            worked_holidays = ctx.worked_holidays(payslip.days_worked)
             holiday_line = f"Public holidays: {len(holidays)}  ({', '.join(h.name for h in holidays)})"
             if worked_holidays:
                 holiday_line += f" — worked {worked_holidays}"
@@ -137,8 +140,11 @@ class PayslipRenderer:
 
         return "\n".join(lines)
 
-    def render_all_pdf(self, payslips: list[PaySlip]) -> bytes:
-        """Render all payslips into a single PDF, one per page."""
+    def render_all_pdf(self, payslips: list[PaySlip], progress=None) -> bytes:
+        """Render all payslips into a single PDF, one per page.
+
+        progress, if given, is called with (payslips done, total) after each.
+        """
         from reportlab.lib.pagesizes import A4
         from reportlab.lib.units import mm
         from reportlab.pdfgen import canvas
@@ -167,6 +173,8 @@ class PayslipRenderer:
                 c.setFont(font_name, font_size)
                 c.drawString(margin_left, y, line)
                 y -= line_height
+            if progress is not None:
+                progress(i + 1, len(payslips))
 
         c.save()
         return buf.getvalue()
@@ -326,15 +334,89 @@ class SHAReturnGenerator:
         return output.getvalue()
 
 
+class P9Generator:
+    """KRA P9 tax deduction cards from the YTD store (src/ytd.py)."""
+
+    MONTHS = ("January", "February", "March", "April", "May", "June", "July",
+              "August", "September", "October", "November", "December")
+
+    def __init__(self, cards: dict):
+        self.cards = cards  # employee_id -> P9Card
+
+    def to_p9_csv(self, employee_id: int) -> str:
+        card = self.cards[employee_id]
+        output = StringIO()
+        writer = csv.writer(output)
+
+        writer.writerow(["P9A - Tax Deduction Card", f"Year {card.year}"])
+        writer.writerow(["Employee Name", card.name])
+        writer.writerow(["KRA PIN", card.kra_pin])
+        writer.writerow(["National ID", card.national_id])
+        writer.writerow([])
+        writer.writerow([
+            "Month",
+            "Cash Pay",
+            "Benefits Non-Cash",
+            "Value of Quarters",
+            "Total Gross Pay",
+            "NSSF",
+            "SHIF",
+            "AHL",
+            "Chargeable Pay",
+            "Tax Charged",
+            "Personal Relief",
+            "PAYE Tax",
+        ])
+
+        for m in card.months:
+            writer.writerow([self.MONTHS[m.month - 1]] + self._columns(m))
+        writer.writerow(["Total"] + self._columns(card.totals))
+
+        return output.getvalue()
+
+    def to_summary_csv(self) -> str:
+        """One line of annual totals per employee, for the reconciliation."""
+        output = StringIO()
+        writer = csv.writer(output)
+        writer.writerow([
+            "KRA PIN", "Employee Name", "Months", "Total Gross Pay", "NSSF", "SHIF",
+            "AHL", "Chargeable Pay", "Tax Charged", "Personal Relief", "PAYE Tax",
+        ])
+        for card in self.cards.values():
+            t = card.totals
+            writer.writerow([card.kra_pin, card.name, t.months]
+                            + self._columns(t)[3:])
+        return output.getvalue()
+
+    @staticmethod
+    def _columns(m) -> list[str]:
+        # Cash Pay is the whole cash gross (basic, allowances, overtime):
+        # the tax months do not split it. Housing is the only non-cash
+        # benefit payroll knows about.
+        return [
+            f"{m.gross:.2f}",
+            "0.00",
+            f"{m.housing_benefit:.2f}",
+            f"{m.gross + m.housing_benefit:.2f}",
+            f"{m.nssf:.2f}",
+            f"{m.shif:.2f}",
+            f"{m.ahl:.2f}",
+            f"{m.chargeable:.2f}",
+            f"{m.tax_charged:.2f}",
+            f"{m.relief:.2f}",
+            f"{m.paye:.2f}",
+        ]
+
+
 def generate_leave_stocks_tsv(payslips: list[PaySlip], year: int, month: int) -> str:
     """Generate updated leave_stocks TSV content from processed payslips."""
-    _, last_day = monthrange(year, month)
-    as_of = f"{year}-{month:02d}-{last_day:02d}"
+    as_of = PayrollContext.for_month(year, month).last_day.isoformat()
     output = StringIO()
     writer = csv.writer(output, delimiter="\t")
     writer.writerow([
         "employee_id", "name", "sick_full_pay", "sick_half_pay",
-        "annual_leave", "as_of_date", "notes",
+        "annual_leave", "as_of_date", "open_week", "open_week_hours",
+        "open_week_regular_hours", "notes",
     ])
     for ps in payslips:
         stock = ps.leave.updated_stock
@@ -345,6 +427,9 @@ def generate_leave_stocks_tsv(payslips: list[PaySlip], year: int, month: int) ->
             f"{stock.sick_half_pay}",
             f"{stock.annual_leave}",
             as_of,
+            stock.open_week.isoformat() if stock.open_week else "",
+            f"{stock.open_week_hours}" if stock.open_week else "",
+            f"{stock.open_week_regular_hours}" if stock.open_week else "",
             "",
         ])
     return output.getvalue()
@@ -357,10 +442,10 @@ def save_leave_stocks(
 
     Returns the path written.
     """
-    _, last_day = monthrange(year, month)
+    last_day = PayrollContext.for_month(year, month).last_day
     dest_dir = Path(leave_stocks_dir) / "leave_stocks" / str(year)
     dest_dir.mkdir(parents=True, exist_ok=True)
-    dest = dest_dir / f"leave_stocks_{year}_{month:02d}_{last_day:02d}.tsv"
+    dest = dest_dir / f"leave_stocks_{last_day:%Y_%m_%d}.tsv"
     dest.write_text(generate_leave_stocks_tsv(payslips, year, month))
     return dest
 
@@ -381,8 +466,8 @@ def upload_leave_stocks_to_gsheet(
 
     from .gauth import client
 
-    _, last_day = monthrange(year, month)
-    tab_name = f"{year}_{month:02d}_{last_day:02d}"
+    last_day = PayrollContext.for_month(year, month).last_day
+    tab_name = f"{last_day:%Y_%m_%d}"
     if spreadsheet_name is None:
         spreadsheet_name = f"leave_stocks_{year}"
 
@@ -410,8 +495,9 @@ def upload_leave_stocks_to_gsheet(
 
     # Build rows from payslips
     header = ["employee_id", "name", "sick_full_pay", "sick_half_pay",
-              "annual_leave", "as_of_date", "notes"]
-    as_of = f"{year}-{month:02d}-{last_day:02d}"
+              "annual_leave", "as_of_date", "open_week", "open_week_hours",
+              "open_week_regular_hours", "notes"]
+    as_of = last_day.isoformat()
     rows = [header]
     for ps in payslips:
         stock = ps.leave.updated_stock
@@ -422,6 +508,9 @@ def upload_leave_stocks_to_gsheet(
             float(stock.sick_half_pay),
             float(stock.annual_leave),
             as_of,
+            stock.open_week.isoformat() if stock.open_week else "",
+            float(stock.open_week_hours) if stock.open_week else "",
+            float(stock.open_week_regular_hours) if stock.open_week else "",
             "",
         ])
 
@@ -452,8 +541,11 @@ def save_payroll_outputs(
     month: int,
     output_dir: str | Path,
     company_name: str = "",
+    ctx: PayrollContext | None = None,
 ) -> list[Path]:
-    """Write all payroll output files to output_dir/YYYY_MM/.
+    """Write all payroll output files to output_dir/YYYY_MM/. ctx is the
+    month's context, if the caller has one (its holidays are the ones
+    printed); by default it is built for year and month.
 
     Returns list of written Path objects.
     """
@@ -461,11 +553,13 @@ def save_payroll_outputs(
     output_dir.mkdir(parents=True, exist_ok=True)
 
     written: list[Path] = []
+    if ctx is None:
+        ctx = PayrollContext.for_month(year, month)
 
     # Payslips (individual text + combined PDF)
     payslips_dir = output_dir / "payslips"
     payslips_dir.mkdir(exist_ok=True)
-    renderer = PayslipRenderer(company_name=company_name)
+    renderer = PayslipRenderer(company_name=company_name, ctx=ctx)
     for ps in payslips:
         safe_name = ps.employee.name.replace(" ", "_")
         path = payslips_dir / f"{ps.employee.employee_id}_{safe_name}.txt"
@@ -497,15 +591,11 @@ def save_payroll_outputs(
     written.append(sha_path)
 
     # Leave stocks updated TSV (named for use as next month's input)
-    _, last_day = monthrange(year, month)
-    leave_path = output_dir / f"leave_stocks_{year}_{month:02d}_{last_day:02d}.tsv"
+    leave_path = output_dir / f"leave_stocks_{ctx.last_day:%Y_%m_%d}.tsv"
     leave_path.write_text(generate_leave_stocks_tsv(payslips, year, month))
     written.append(leave_path)
 
     # Summary table TSV
-    from .rates import KenyanHolidays
-    holidays = {h.date for h in KenyanHolidays.get_holidays_for_month(year, month)}
-
     summary_path = output_dir / "summary_table.tsv"
     with open(summary_path, "w", newline="") as f:
         writer = csv.writer(f, delimiter="\t")
@@ -518,10 +608,7 @@ def save_payroll_outputs(
 
         for ps in payslips:
             daily_hours = LeaveCalculator._get_daily_hours(ps.contract)
-            hol_worked = sum(
-                1 for d in ps.days_worked
-                if d.date in holidays and d.hours_normal > 0
-            )
+            hol_worked = ctx.worked_holidays(ps.days_worked)
             writer.writerow([
                 ps.employee.employee_id,
                 ps.employee.name,
@@ -591,14 +678,15 @@ def _drive_get_or_create_folder(session, parent_id: str, name: str) -> str:
     return r.json()["id"]
 
 
-def _drive_list_children(session, parent_id: str) -> dict[str, str]:
-    """Map name -> id for all non-trashed children of a folder (one API call)."""
-    out: dict[str, str] = {}
+def _drive_list_children(session, parent_id: str) -> dict[str, tuple[str, str | None]]:
+    """Map name -> (id, md5) for all non-trashed children of a folder (one
+    API call). md5 is None for folders and Google-native documents."""
+    out: dict[str, tuple[str, str | None]] = {}
     page_token = None
     while True:
         params = {
             "q": f"'{parent_id}' in parents and trashed = false",
-            "fields": "nextPageToken, files(id,name)", "spaces": "drive",
+            "fields": "nextPageToken, files(id,name,md5Checksum)", "spaces": "drive",
             "pageSize": 1000, "supportsAllDrives": "true",
             "includeItemsFromAllDrives": "true",
         }
@@ -608,7 +696,7 @@ def _drive_list_children(session, parent_id: str) -> dict[str, str]:
         r.raise_for_status()
         j = r.json()
         for f in j.get("files", []):
-            out[f["name"]] = f["id"]
+            out[f["name"]] = (f["id"], f.get("md5Checksum"))
         page_token = j.get("nextPageToken")
         if not page_token:
             return out
@@ -660,6 +748,9 @@ def _drive_upload_dir(session, local_dir: Path, parent_id: str,
                       replace: bool = False) -> tuple[int, list[str]]:
     """Recursively upload a local directory's contents into a Drive folder.
 
+    Files whose bytes match the Drive copy's checksum are not re-sent, so a
+    rerun after a small correction only uploads what it changed.
+
     With replace, anything in the Drive folder that this run did not produce
     is trashed. Overwriting alone leaves stale files behind, and a payslip
     for a name that has since been corrected is worse than no payslip -- the
@@ -667,23 +758,28 @@ def _drive_upload_dir(session, local_dir: Path, parent_id: str,
 
     Returns (files uploaded, names trashed).
     """
+    import hashlib
+
     existing = _drive_list_children(session, parent_id)
     count, trashed = 0, []
     local_names = set()
     for entry in sorted(local_dir.iterdir()):
         local_names.add(entry.name)
         if entry.is_dir():
-            sub_id = existing.get(entry.name) or _drive_get_or_create_folder(
+            sub_id = existing.get(entry.name, (None,))[0] or _drive_get_or_create_folder(
                 session, parent_id, entry.name)
             n, t = _drive_upload_dir(session, entry, sub_id, replace)
             count += n
             trashed += [f"{entry.name}/{x}" for x in t]
         else:
-            _drive_upload_file(session, parent_id, entry, existing.get(entry.name))
+            file_id, md5 = existing.get(entry.name, (None, None))
+            if md5 and md5 == hashlib.md5(entry.read_bytes()).hexdigest():
+                continue
+            _drive_upload_file(session, parent_id, entry, file_id)
             count += 1
 
     if replace:
-        for name, fid in sorted(existing.items()):
+        for name, (fid, _) in sorted(existing.items()):
             if name not in local_names:
                 _drive_trash(session, fid)
                 trashed.append(name)
@@ -727,10 +823,11 @@ def upload_payroll_outputs_to_gdrive(
 
     Creates the YYYY_MM subfolder under parent_folder_id if it doesn't exist,
     then uploads every file (recursing into subfolders like payslips/),
-    overwriting files that already exist. With replace, files the run did not
-    produce are trashed rather than left behind.
+    overwriting files that already exist unless their content is unchanged.
+    With replace, files the run did not produce are trashed rather than
+    left behind.
 
-    Returns (folder_url, num_files, trashed_names).
+    Returns (folder_url, num_files_uploaded, trashed_names).
     """
     local = Path(output_dir) / f"{year}_{month:02d}"
     if not local.is_dir():
@@ -0,0 +1,129 @@
+"""Overtime derived from hours worked, instead of entered by hand.
+
+Supervisors work out hrs_ot_1_5 / hrs_ot_2_0 for every employee from the
+hours on the attendance sheet, and overtime_trigger_warnings only catches
+the daily half of the rule. This does the whole rule in one forward pass
+over each employee's month, with a running daily and weekly count:
+
+- hours beyond StatutoryRates.DAILY_HOURS_BEFORE_OT in a day are overtime;
+- so are the day's remaining hours that take the Monday-to-Sunday week past
+  WEEKLY_HOURS_BEFORE_OT (hours already counted as daily overtime do not
+  count toward the week);
+- overtime on a rest day or a gazetted holiday is paid at 2.0x, on any
+  other day at 1.5x. Rest days follow the contract's schedule as elsewhere:
+  Sunday for a six-day week (48 hours or more), Saturday and Sunday for a
+  five-day week.
+
+hrs_wrkd stays as entered: it is every hour worked, overtime included, as
+overtime_trigger_warnings reads it. A week that started last month picks
+up the regular hours carried in the opening leave stock's open_week
+(open_week_regular_hours, counted by week_regular_hours below).
+"""
+
+from dataclasses import dataclass, replace
+from datetime import date
+from decimal import Decimal
+
+from .context import PayrollContext
+from .models import Contract, LeaveStock, TimesheetDay, TimesheetMonth
+from .rates import StatutoryRates
+
+
+@dataclass
+class OvertimeMismatch:
+    """A day where the hand-entered overtime differs from the derived."""
+    employee_id: int
+    date: date
+    hours_worked: Decimal
+    entered: tuple[Decimal, Decimal]   # (ot_1_5, ot_2_0) as entered
+    derived: tuple[Decimal, Decimal]
+
+    def __str__(self) -> str:
+        return (f"{self.date}: {self.hours_worked:g}h worked, overtime entered as "
+                f"{self.entered[0]:g}h at 1.5x / {self.entered[1]:g}h at 2.0x, "
+                f"derived as {self.derived[0]:g}h / {self.derived[1]:g}h")
+
+
+def _split_day(worked: Decimal, week_hours: Decimal) -> tuple[Decimal, Decimal]:
+    """(overtime, regular hours) of a day's hours worked, given the regular
+    hours already in its week."""
+    daily_ot = max(worked - StatutoryRates.DAILY_HOURS_BEFORE_OT, Decimal(0))
+    regular = worked - daily_ot
+    weekly_ot = min(max(week_hours + regular - StatutoryRates.WEEKLY_HOURS_BEFORE_OT,
+                        Decimal(0)), regular)
+    return daily_ot + weekly_ot, regular - weekly_ot
+
+
+def week_regular_hours(timesheet_days: list[TimesheetDay], monday: date, last: date) -> Decimal:
+    """The regular hours derive_overtime counts toward the week from monday
+    to last: what the next month has to start that week from.
+
+    Day by day that is each day's hours up to the daily limit, until the
+    week reaches the weekly limit -- which comes to the same as adding them
+    all up and capping the sum, in whatever order the days come."""
+    if isinstance(timesheet_days, TimesheetMonth):
+        worked = timesheet_days.week_normal_hours.get(monday, ())
+    else:
+        worked = [d.hours_normal for d in timesheet_days if monday <= d.date <= last]
+    daily_limit = StatutoryRates.DAILY_HOURS_BEFORE_OT
+    regular = sum((min(hours, daily_limit) for hours in worked), Decimal(0))
+    return min(regular, StatutoryRates.WEEKLY_HOURS_BEFORE_OT)
+
+
+def derive_overtime(
+    timesheet_days: list[TimesheetDay], contract: Contract, ctx: PayrollContext,
+    opening: LeaveStock | None = None,
+) -> tuple[list[TimesheetDay], list[OvertimeMismatch]]:
+    """The month's days with overtime derived from hours worked, and the
+    days where that differs from what was entered. A TimesheetMonth comes
+    back as a TimesheetMonth."""
+    days_per_week = 6 if (contract.weekly_hours or 45) >= 48 else 5
+
+    week, week_hours = None, Decimal(0)
+    if opening is not None and opening.open_week is not None:
+        week, week_hours = opening.open_week.isocalendar()[:2], opening.open_week_regular_hours
+
+    out, mismatches = [], []
+    for d in sorted(timesheet_days, key=lambda d: d.date):
+        day, worked = d.date, d.hours_normal
+        key = day.isocalendar()[:2]
+        if key != week:
+            week, week_hours = key, Decimal(0)
+
+        overtime, regular = _split_day(worked, week_hours)
+        week_hours += regular
+
+        if day.weekday() >= days_per_week or ctx.is_holiday(day):
+            derived = (Decimal(0), overtime)
+        else:
+            derived = (overtime, Decimal(0))
+
+        entered = (d.hours_ot_1_5, d.hours_ot_2_0)
+        if entered != derived:
+            mismatches.append(OvertimeMismatch(d.employee_id, day, worked, entered, derived))
+            d = replace(d, hours_ot_1_5=derived[0], hours_ot_2_0=derived[1])
+        out.append(d)
+
+    if isinstance(timesheet_days, TimesheetMonth):
+        ts = timesheet_days
+        out = TimesheetMonth(ts.employee_id, ts.year, ts.month, out)
+    return out, mismatches
+
+
+def derive_month(
+    timesheets: dict, contracts: dict[int, Contract], ctx: PayrollContext,
+    leave_stocks: dict[int, LeaveStock] | None = None,
+) -> tuple[dict, dict[int, list[OvertimeMismatch]]]:
+    """derive_overtime over a month's timesheets, for every employee with
+    a contract. Returns (timesheets, employee_id -> mismatches) with only
+    the employees that had any in the second."""
+    out = dict(timesheets)
+    mismatches = {}
+    for emp_id, days in timesheets.items():
+        if emp_id not in contracts:
+            continue
+        out[emp_id], diff = derive_overtime(days, contracts[emp_id], ctx,
+                                            (leave_stocks or {}).get(emp_id))
+        if diff:
+            mismatches[emp_id] = diff
+    return out, mismatches
@@ -0,0 +1,209 @@
+"""Whole-run profiling, phase by phase, for run_payroll.py --profile.
+
+A slow run could be stuck on any of the Sheets sync, the workbook
+extraction, loading, computation, the output files (the payslip PDF above
+all) or the Drive upload. PhaseProfiler runs each phase under cProfile and
+notes its wall time, CPU time and I/O bytes, so a slow-run report can carry
+the evidence:
+
+    phases.txt          the phase table printed at the end of the run
+    profile.pstats      every phase's cProfile stats together (python -m
+                        pstats, snakeviz, ...)
+    <phase>.pstats      each phase on its own
+    profile.collapsed   "phase;frame;frame N" lines, N in microseconds,
+                        for flamegraph.pl, speedscope or inferno
+
+cProfile records caller/callee pairs rather than whole stacks, so the
+collapsed stacks are rebuilt from that graph, sharing each function's time
+among its callers in proportion to the calls they made -- the same
+approximation gprof2dot and flameprof make. It can smear time between two
+paths into a function that is slow on only one of them, and in call cycles
+through several functions (nested imports, above all) pairs cannot say
+which call was the outer one, so the stacks there add up only roughly. To
+keep the rebuild quick on any graph, thin paths are folded into their
+caller (see _MIN_SHARE and _MAX_NODES). The .pstats files have the exact
+figures.
+
+CPU time includes worker processes once they have exited (so --workers
+runs are covered); their functions are not in the pstats, which only sees
+this process. I/O bytes are what the process read and wrote (Linux
+/proc/self/io): for the sync that is the downloaded files as written, for
+the upload the files read to be sent. Elsewhere they show as "-".
+"""
+
+import cProfile
+import os
+import pstats
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Bounds on the rebuilt stacks. Every caller->callee path is a stack, and
+# a call graph as tangled as importlib's has exponentially many, so a path
+# worth less than _MIN_SHARE of the phase is folded into its caller, and
+# once _MAX_NODES frames have been visited each remaining path is folded
+# where it stands. Heaviest callees go first, so they keep their detail.
+# Deepest stack written; deeper frames are folded in.
+_MAX_DEPTH = 120
+_MIN_SHARE = 1e-4
+_MAX_NODES = 20_000
+
+
+def _io_bytes() -> tuple[int, int] | None:
+    """(bytes read, bytes written) by this process so far, if known."""
+    try:
+        with open("/proc/self/io") as f:
+            counters = dict(line.split(": ") for line in f.read().splitlines())
+    except (OSError, ValueError):
+        return None
+    return int(counters["rchar"]), int(counters["wchar"])
+
+
+def _cpu_seconds() -> float:
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+class PhaseProfiler:
+    """Wall, CPU and I/O per named phase, plus a cProfile of each.
+
+    A phase entered again (a month at a time in a range run) adds to what
+    it already has.
+    """
+
+    def __init__(self):
+        self.phases: dict[str, dict] = {}
+        self.profiles: dict[str, cProfile.Profile] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        profile = self.profiles.setdefault(name, cProfile.Profile())
+        io0, cpu0, t0 = _io_bytes(), _cpu_seconds(), time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            wall, cpu, io1 = time.perf_counter() - t0, _cpu_seconds() - cpu0, _io_bytes()
+            p = self.phases.setdefault(name, {"calls": 0, "wall": 0.0, "cpu": 0.0,
+                                              "read": None, "written": None})
+            p["calls"] += 1
+            p["wall"] += wall
+            p["cpu"] += cpu
+            if io0 is not None and io1 is not None:
+                p["read"] = (p["read"] or 0) + io1[0] - io0[0]
+                p["written"] = (p["written"] or 0) + io1[1] - io0[1]
+
+    def report(self) -> str:
+        """The phase table."""
+        def size(n):
+            if n is None:
+                return "-"
+            for unit in ("B", "KB", "MB"):
+                if n < 1024:
+                    return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+                n /= 1024
+            return f"{n:.1f} GB"
+
+        total = sum(p["wall"] for p in self.phases.values()) or 1
+        lines = [f"  {'Phase':<12} {'Calls':>5} {'Wall s':>8} {'%':>5} {'CPU s':>8} "
+                 f"{'Read':>10} {'Written':>10}"]
+        for name, p in self.phases.items():
+            lines.append(f"  {name:<12} {p['calls']:>5} {p['wall']:>8.2f} "
+                         f"{100 * p['wall'] / total:>5.1f} {p['cpu']:>8.2f} "
+                         f"{size(p['read']):>10} {size(p['written']):>10}")
+        return "\n".join(lines)
+
+    def write(self, directory: str | Path) -> list[Path]:
+        """Write the table, pstats and collapsed stacks into directory.
+        Returns the paths written."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        written = []
+        combined = None
+        for name, profile in self.profiles.items():
+            stats = pstats.Stats(profile)
+            if not stats.stats:
+                continue
+            path = directory / f"{name}.pstats"
+            stats.dump_stats(path)
+            written.append(path)
+            if combined is None:
+                combined = pstats.Stats(profile)
+            else:
+                combined.add(profile)
+        if combined is not None:
+            path = directory / "profile.pstats"
+            combined.dump_stats(path)
+            written.append(path)
+
+        path = directory / "profile.collapsed"
+        with open(path, "w") as f:
+            for name, profile in self.profiles.items():
+                stats = pstats.Stats(profile).stats
+                for stack, micros in collapsed_stacks(stats):
+                    f.write(";".join([name, *stack]) + f" {micros}\n")
+        written.append(path)
+
+        path = directory / "phases.txt"
+        path.write_text(self.report() + "\n")
+        written.append(path)
+        return written
+
+
+def _frame(func: tuple[str, int, str]) -> str:
+    filename, line, fn = func
+    if filename == "~":  # builtins
+        return fn.strip("<>").replace(";", ",")
+    return f"{Path(filename).name}:{fn}:{line}".replace(";", ",")
+
+
+def collapsed_stacks(stats: dict) -> list[tuple[list[str], int]]:
+    """(stack, self microseconds) pairs rebuilt from a pstats stats dict
+    (func -> (cc, nc, tt, ct, callers)). Folding keeps the time, so outside
+    call cycles the stacks add up to the profile's total."""
+    callees: dict = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+    for edges in callees.values():
+        edges.sort(key=lambda edge: -edge[1])
+    # Entry points: functions called from outside the profile (the phase's
+    # own body), with the part of their time those calls account for.
+    roots = []
+    for func, (_, nc, _, ct, callers) in stats.items():
+        if nc > sum(edge[1] for edge in callers.values()):
+            outside = ct - sum(edge[3] for caller, edge in callers.items() if caller != func)
+            roots.append((func, max(outside, 0.0)))
+    roots.sort(key=lambda root: -root[1])
+    floor = sum(share for _, share in roots) * _MIN_SHARE
+
+    out: dict[tuple[str, ...], float] = {}
+    visited = 0
+
+    def walk(func, share, path, seen):
+        nonlocal visited
+        visited += 1
+        _, _, tt, ct, _ = stats[func]
+        frames = path + (_frame(func),)
+        scale = share / ct if ct else 0.0
+        own = tt * scale
+        if len(frames) < _MAX_DEPTH and visited < _MAX_NODES:
+            for callee, edge_ct in callees.get(func, ()):
+                # A recursive call's time is already in this function's own
+                # time and its other callees' edges, which cover every level.
+                if callee in seen or not edge_ct:
+                    continue
+                if edge_ct * scale < floor:
+                    own += edge_ct * scale
+                else:
+                    walk(callee, edge_ct * scale, frames, seen | {callee})
+        else:
+            own = share
+        if own > 0:
+            out[frames] = out.get(frames, 0.0) + own
+
+    for root, share in roots:
+        walk(root, share, (), {root})
+    return [(list(stack), round(seconds * 1e6)) for stack, seconds in out.items()
+            if round(seconds * 1e6) > 0]
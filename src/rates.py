@@ -1,4 +1,4 @@
-from datetime import date
+from datetime import date, timedelta
 from decimal import Decimal
 from typing import NamedTuple
 
@@ -10,6 +10,60 @@ class PublicHoliday(NamedTuple):
     is_estimated: bool = False  # True for Islamic holidays with uncertain dates
 
 
+def easter_sunday(year: int) -> date:
+    """Western Easter Sunday, by the anonymous Gregorian computus."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+class HolidayCalendar:
+    """One year's public holidays, indexed for constant-time lookups.
+
+    Built once per year and set of overrides by KenyanHolidays.calendar()
+    and shared from then on, so the per-day checks in leave allocation and the per-month working
+    day counts stop rebuilding and re-sorting the holiday list.
+    """
+
+    def __init__(self, year: int, holidays: list[PublicHoliday]):
+        self.year = year
+        self.holidays = tuple(sorted(holidays, key=lambda h: h.date))
+        self.dates = frozenset(h.date for h in self.holidays)
+        self._by_month = {m: tuple(h for h in self.holidays if h.date.month == m)
+                          for m in range(1, 13)}
+        self._working_days: dict[tuple[int, int], int] = {}
+
+    def is_holiday(self, day: date) -> bool:
+        return day in self.dates
+
+    def holidays_in_month(self, month: int) -> tuple[PublicHoliday, ...]:
+        return self._by_month[month]
+
+    def working_days(self, month: int, days_per_week: int = 5) -> int:
+        """Working days in a month, excluding public holidays. Cached."""
+        key = (month, days_per_week)
+        count = self._working_days.get(key)
+        if count is None:
+            from calendar import monthrange
+
+            num_days = monthrange(self.year, month)[1]
+            count = sum(
+                1 for day in range(1, num_days + 1)
+                if date(self.year, month, day).weekday() < days_per_week
+                and date(self.year, month, day) not in self.dates
+            )
+            self._working_days[key] = count
+        return count
+
+
 class KenyanHolidays:
     """
     Kenyan public holidays per the Public Holidays Act (Cap 110).
@@ -25,8 +79,16 @@ class KenyanHolidays:
     - Dec 26: Boxing Day
 
     Variable holidays:
-    - Good Friday, Easter Monday (Christian)
-    - Eid ul-Fitr, Eid ul-Adha (Islamic - dates are estimates)
+    - Good Friday, Easter Monday (Christian) - computed for any year
+    - Eid ul-Fitr, Eid ul-Adha (Islamic - dates are estimates until gazetted)
+
+    The Islamic dates follow the moon sighting and cannot be computed ahead
+    of time. Years not in VARIABLE_HOLIDAYS simply lack them until they are
+    overridden, which is also how a gazetted date or a one-off holiday
+    replaces an estimate. Overrides are PublicHolidays read by
+    read_overrides(); the lookups below take them explicitly, or fall back
+    to the process-wide ones set by load_overrides() (the command-line
+    scripts, which load one inputs folder per process).
     """
 
     # Fixed holidays (same date every year)
@@ -41,75 +103,128 @@ class KenyanHolidays:
         (12, 26, "Boxing Day"),
     ]
 
-    # Variable holidays by year (pre-calculated)
+    # Islamic holidays by year (pre-calculated)
     # Format: {year: [(month, day, name, is_estimated), ...]}
     VARIABLE_HOLIDAYS = {
         2026: [
-            (4, 3, "Good Friday", False),
-            (4, 6, "Easter Monday", False),
             (3, 30, "Eid ul-Fitr", True),  # Estimated
             (5, 27, "Eid ul-Adha", False),
         ],
         2027: [
-            (3, 26, "Good Friday", False),
-            (3, 29, "Easter Monday", False),
             (3, 19, "Eid ul-Fitr", True),  # Estimated
             (5, 26, "Eid ul-Adha", True),  # Estimated
         ],
     }
 
+    # The process-wide overrides, in the order load_overrides read them
+    _overrides: tuple[PublicHoliday, ...] = ()
+    # (year, that year's overrides) -> calendar
+    _calendars: dict[tuple[int, tuple[PublicHoliday, ...]], HolidayCalendar] = {}
+
     @classmethod
-    def get_holidays_for_year(cls, year: int) -> list[PublicHoliday]:
-        """Get all public holidays for a given year."""
-        holidays = []
+    def overrides(cls) -> tuple[PublicHoliday, ...]:
+        """The process-wide overrides loaded so far."""
+        return cls._overrides
+
+    @classmethod
+    def calendar(cls, year: int,
+                 overrides: tuple[PublicHoliday, ...] | None = None) -> HolidayCalendar:
+        """The indexed holiday calendar for a year under overrides (default:
+        the process-wide ones), built on first use."""
+        if overrides is None:
+            overrides = cls._overrides
+        own = tuple(h for h in overrides if h.date.year == year)
+        cal = cls._calendars.get((year, own))
+        if cal is None:
+            cal = cls._calendars[year, own] = HolidayCalendar(year, cls._build_year(year, own))
+        return cal
 
-        # Add fixed holidays
+    @classmethod
+    def _build_year(cls, year: int, overrides=()) -> list[PublicHoliday]:
+        by_name = {}
         for month, day, name in cls.FIXED_HOLIDAYS:
-            holidays.append(PublicHoliday(date(year, month, day), name, False))
+            by_name[name] = PublicHoliday(date(year, month, day), name, False)
+
+        easter = easter_sunday(year)
+        by_name["Good Friday"] = PublicHoliday(easter - timedelta(days=2), "Good Friday")
+        by_name["Easter Monday"] = PublicHoliday(easter + timedelta(days=1), "Easter Monday")
 
-        # Add variable holidays if we have them
-        if year in cls.VARIABLE_HOLIDAYS:
-            for month, day, name, is_estimated in cls.VARIABLE_HOLIDAYS[year]:
-                holidays.append(PublicHoliday(date(year, month, day), name, is_estimated))
+        for month, day, name, is_estimated in cls.VARIABLE_HOLIDAYS.get(year, []):
+            by_name[name] = PublicHoliday(date(year, month, day), name, is_estimated)
 
-        return sorted(holidays, key=lambda h: h.date)
+        # An override replaces the holiday of the same name, or adds a new
+        # one; a later override of the same name wins.
+        by_name.update((h.name, h) for h in overrides)
+        return list(by_name.values())
+
+    @staticmethod
+    def read_overrides(path) -> tuple[PublicHoliday, ...]:
+        """Gazetted holiday dates from a TSV with date and name columns.
+
+        Each row replaces the computed or estimated holiday with the same
+        name in that year -- e.g. the gazetted Eid date -- or adds a
+        holiday that is not otherwise known, such as a one-off gazetted
+        day. Rows that repeat a holiday as computed change nothing.
+        """
+        import csv
+        from datetime import datetime
+
+        out = []
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for row in csv.DictReader(f, delimiter="\t"):
+                raw = (row.get("date") or "").strip()
+                name = (row.get("name") or "").strip()
+                if not raw or not name:
+                    continue
+                d = datetime.strptime(raw, "%Y-%m-%d").date()
+                out.append(PublicHoliday(d, name, False))
+        return tuple(out)
+
+    @classmethod
+    def load_overrides(cls, path) -> int:
+        """Add the overrides in path (see read_overrides) to the process-wide
+        ones. Returns the number of rows loaded."""
+        rows = cls.read_overrides(path)
+        cls._overrides += rows
+        return len(rows)
+
+    @classmethod
+    def clear_overrides(cls) -> None:
+        cls._overrides = ()
+        cls._calendars.clear()
 
     @classmethod
-    def get_holidays_for_month(cls, year: int, month: int) -> list[PublicHoliday]:
+    def get_holidays_for_year(cls, year: int, overrides=None) -> list[PublicHoliday]:
+        """Get all public holidays for a given year."""
+        return list(cls.calendar(year, overrides).holidays)
+
+    @classmethod
+    def get_holidays_for_month(cls, year: int, month: int,
+                               overrides=None) -> list[PublicHoliday]:
         """Get public holidays for a specific month."""
-        return [h for h in cls.get_holidays_for_year(year) if h.date.month == month]
+        return list(cls.calendar(year, overrides).holidays_in_month(month))
 
     @classmethod
-    def count_working_days(cls, year: int, month: int, days_per_week: int = 5) -> int:
+    def count_working_days(cls, year: int, month: int, days_per_week: int = 5,
+                           overrides=None) -> int:
         """
         Count working days in a month, excluding public holidays.
 
         days_per_week=5: Mon-Fri (default)
         days_per_week=6: Mon-Sat
         """
-        from calendar import monthrange, weekday
-
-        holidays = {h.date for h in cls.get_holidays_for_month(year, month)}
-        _, num_days = monthrange(year, month)
-
-        working_days = 0
-        for day in range(1, num_days + 1):
-            d = date(year, month, day)
-            wd = weekday(year, month, day)  # Monday=0, Sunday=6
-            if wd < days_per_week and d not in holidays:
-                working_days += 1
-
-        return working_days
+        return cls.calendar(year, overrides).working_days(month, days_per_week)
 
     @classmethod
-    def get_expected_hours(cls, year: int, month: int, weekly_hours: int = 45) -> Decimal:
+    def get_expected_hours(cls, year: int, month: int, weekly_hours: int = 45,
+                           overrides=None) -> Decimal:
         """
         Calculate expected working hours for a month.
         Derives schedule (5 or 6 day) from weekly_hours, then uses
         schedule-aware working day count.
         """
         days_per_week = 6 if weekly_hours >= 48 else 5
-        working_days = cls.count_working_days(year, month, days_per_week)
+        working_days = cls.count_working_days(year, month, days_per_week, overrides)
         daily_hours = Decimal(weekly_hours) / Decimal(days_per_week)
         return working_days * daily_hours
 
@@ -119,10 +234,10 @@ class KenyanHolidays:
         Count timesheet days that fall on a public holiday and have any
         normal hours worked. Used to compute the worked-holiday premium.
         """
-        holiday_dates = {h.date for h in cls.get_holidays_for_month(year, month)}
+        cal = cls.calendar(year)
         return sum(
             1 for d in timesheet_days
-            if d.date in holiday_dates and d.hours_normal > 0
+            if d.date.month == month and cal.is_holiday(d.date) and d.hours_normal > 0
         )
 
 
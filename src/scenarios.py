@@ -0,0 +1,186 @@
+"""Run one month's payroll under many alternative rate tables at once.
+
+Budget questions ("what if SHIF goes to 3%", "what if NSSF moves to the
+next year's limits") change only the statutory rates, and the rates only
+enter at the end of the pipeline: leave, gross pay, adjustments and the
+housing benefit (steps 1-4 of PayrollEngine) do not read them. So the
+workforce's gross column is computed once, and each scenario is just the
+deductions/PAYE/net pass (steps 5-8) over that column -- a tight loop of
+a dozen Decimal operations per employee, with the PAYE bands compiled
+once per scenario.
+
+Each scenario's figures are exactly what a full run under its rates
+would produce; the unmodified scenario reproduces the real payroll's
+totals to the last digit.
+
+A scenario file is a TSV with a 'name' column and one column per rate
+to override (any of RATE_FIELDS, plus 'tax_bands' written as
+'24000:0.10,32333:0.25,...'). Blank cells keep the month's actual rate.
+"""
+
+import copy
+import csv
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+from .calculators import PAYETable, PayrollEngine, settle
+from .models import Contract, Employee, LeaveStock
+from .rates import StatutoryRates
+
+RATE_FIELDS = ("nssf_lel", "nssf_uel", "nssf_rate", "shif_rate", "shif_min",
+               "ahl_rate", "personal_relief")
+
+# Below this many scenarios a process pool costs more than it saves.
+_MIN_PARALLEL = 256
+
+
+@dataclass
+class ScenarioTotals:
+    name: str
+    gross: Decimal
+    net_pay: Decimal
+    paye: Decimal
+    nssf_employee: Decimal
+    shif: Decimal
+    ahl_employee: Decimal
+    # Employer contributions match the employee's, as in the run summary.
+    nssf_employer: Decimal
+    ahl_employer: Decimal
+    employer_cost: Decimal  # gross + employer NSSF + employer AHL
+    # employee_id -> net pay under this scenario, when asked for (detail=True)
+    net_by_employee: dict[int, Decimal] = field(default_factory=dict, repr=False)
+
+
+def scenario_rates(base: StatutoryRates, **overrides) -> StatutoryRates:
+    """A copy of base with some rates replaced."""
+    unknown = set(overrides) - set(RATE_FIELDS) - {"tax_bands"}
+    if unknown:
+        raise ValueError(f"Unknown rate(s): {', '.join(sorted(unknown))}")
+    rates = copy.copy(base)
+    rates.tax_bands = list(base.tax_bands)
+    for name, value in overrides.items():
+        setattr(rates, name, value)
+    return rates
+
+
+def _parse_bands(text: str) -> list[tuple[Decimal, Decimal]]:
+    bands = []
+    for part in text.split(","):
+        limit, rate = part.split(":")
+        bands.append((Decimal(limit.strip()), Decimal(rate.strip())))
+    return bands
+
+
+def load_scenarios(path: str | Path, base: StatutoryRates) -> list[tuple[str, StatutoryRates]]:
+    """Read a scenario TSV (see module docstring) against the month's rates."""
+    out = []
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f, delimiter="\t")
+        for lineno, row in enumerate(reader, start=2):
+            name = (row.pop("name", "") or "").strip() or f"scenario {lineno - 1}"
+            overrides = {}
+            for key, value in row.items():
+                value = (value or "").strip()
+                if not value:
+                    continue
+                key = key.strip()
+                try:
+                    overrides[key] = (_parse_bands(value) if key == "tax_bands"
+                                      else Decimal(value))
+                except (ArithmeticError, ValueError):
+                    raise ValueError(f"{path}:{lineno}: bad {key} {value!r}") from None
+            try:
+                out.append((name, scenario_rates(base, **overrides)))
+            except ValueError as e:
+                raise ValueError(f"{path}:{lineno}: {e}") from None
+    return out
+
+
+def gross_column(
+    payroll_date: date,
+    employees: dict[int, Employee],
+    contracts: dict[int, Contract],
+    timesheets: dict,
+    leave_stocks: dict[int, LeaveStock],
+) -> list[tuple[int, Decimal, Decimal, Contract]]:
+    """Steps 1-4 for the workforce: (employee_id, total gross, housing
+    benefit, contract) per employee, in employee_id order."""
+    engine = PayrollEngine(payroll_date)
+    ids = [i for i in sorted(contracts)
+           if i in employees and i in timesheets and i in leave_stocks]
+    engine.ctx = engine.ctx.with_weekly_hours({contracts[i].weekly_hours or 45 for i in ids})
+    column = []
+    for i in ids:
+        c, days = contracts[i], timesheets[i]
+        leave = engine._allocate_leave(c, days, leave_stocks[i])
+        gross = engine._gross(c, days, leave)
+        column.append((i, gross.total_gross, gross.housing_benefit, c))
+    return column
+
+
+def settle_scenario(name: str, rates: StatutoryRates, column,
+                    detail: bool = False) -> ScenarioTotals:
+    """Steps 5-8 over the gross column under one rate table, totalled:
+    calculators.settle per employee, with the PAYE bands compiled once."""
+    table = PAYETable.for_rates(rates)
+    zero = Decimal(0)
+
+    gross_total = net_total = paye_total = nssf_total = shif_total = ahl_total = zero
+    net_by_employee = {}
+    for emp_id, gross, benefit, contract in column:
+        d, net = settle(gross, contract, rates, benefit, table)
+        if detail:
+            net_by_employee[emp_id] = net
+        gross_total += gross
+        net_total += net
+        paye_total += d.paye
+        nssf_total += d.nssf_tier_1 + d.nssf_tier_2
+        shif_total += d.shif
+        ahl_total += d.ahl_employee
+
+    return ScenarioTotals(
+        name=name, gross=gross_total, net_pay=net_total, paye=paye_total,
+        nssf_employee=nssf_total, shif=shif_total, ahl_employee=ahl_total,
+        nssf_employer=nssf_total, ahl_employer=ahl_total,
+        employer_cost=gross_total + nssf_total + ahl_total,
+        net_by_employee=net_by_employee,
+    )
+
+
+def run_scenarios(
+    payroll_date: date,
+    employees: dict[int, Employee],
+    contracts: dict[int, Contract],
+    timesheets: dict,
+    leave_stocks: dict[int, LeaveStock],
+    scenarios: list[tuple[str, StatutoryRates]],
+    workers: int = 1,
+    detail: bool = False,
+) -> list[ScenarioTotals]:
+    """Every employee under every scenario, totalled per scenario, in the
+    order given. Callers fill in default leave stocks first, as for
+    PayrollEngine.process_batch. detail also keeps each employee's net
+    pay per scenario.
+
+    With workers > 1 the scenarios are split into one contiguous run per
+    worker; the gross column is computed once, up front, and shipped to
+    each worker once.
+    """
+    column = gross_column(payroll_date, employees, contracts, timesheets, leave_stocks)
+    if workers <= 1 or len(scenarios) < _MIN_PARALLEL:
+        return [settle_scenario(name, rates, column, detail) for name, rates in scenarios]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    size = -(-len(scenarios) // workers)  # ceiling division
+    chunks = [scenarios[i:i + size] for i in range(0, len(scenarios), size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_settle_chunk, chunk, column, detail) for chunk in chunks]
+        return [totals for f in futures for totals in f.result()]
+
+
+def _settle_chunk(scenarios, column, detail) -> list[ScenarioTotals]:
+    """Worker-process entry point for run_scenarios."""
+    return [settle_scenario(name, rates, column, detail) for name, rates in scenarios]
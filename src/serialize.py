@@ -0,0 +1,82 @@
+"""PaySlips (and the records inside them) as plain JSON-safe dicts.
+
+Used wherever a computed payslip has to outlive the process that computed
+it -- the previous run kept for incremental reruns, the on-disk result
+cache. JSON rather than pickle for the same reason snapshot.py uses a zip:
+reading one back is inert, and a stale file fails loudly on decode rather
+than unpickling into objects of the wrong shape.
+
+Decimals are stored as their str(), which round-trips exactly (exponent
+included, so 8.67 stays '8.67' and 9 stays '9'); dates as ISO strings.
+"""
+
+import hashlib
+import json
+import types
+import typing
+from dataclasses import fields, is_dataclass
+from datetime import date
+from decimal import Decimal
+
+from .models import PaySlip, TimesheetMonth
+
+
+def to_jsonable(obj):
+    """A dataclass tree as dicts, lists, strings and numbers."""
+    if is_dataclass(obj):
+        return {f.name: to_jsonable(getattr(obj, f.name)) for f in fields(obj)}
+    if isinstance(obj, (list, tuple, TimesheetMonth)):
+        return [to_jsonable(x) for x in obj]
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, date):
+        return obj.isoformat()
+    return obj
+
+
+def _decode(tp, value):
+    if value is None:
+        return None
+    if isinstance(tp, types.UnionType) or typing.get_origin(tp) is typing.Union:
+        # X | None, or list[TimesheetDay] | TimesheetMonth: the first
+        # non-None member is the stored form.
+        tp = next(a for a in typing.get_args(tp) if a is not type(None))
+    if typing.get_origin(tp) is list:
+        (item,) = typing.get_args(tp)
+        return [_decode(item, v) for v in value]
+    if is_dataclass(tp):
+        return from_jsonable(tp, value)
+    if tp is Decimal:
+        return Decimal(value)
+    if tp is date:
+        return date.fromisoformat(value)
+    return value
+
+
+def from_jsonable(cls, data: dict):
+    """Rebuild a dataclass of type cls from to_jsonable() output."""
+    return cls(**{f.name: _decode(f.type, data[f.name])
+                  for f in fields(cls) if f.name in data})
+
+
+def payslip_to_dict(payslip: PaySlip) -> dict:
+    return to_jsonable(payslip)
+
+
+def payslip_from_dict(data: dict) -> PaySlip:
+    """Inverse of payslip_to_dict. The days come back as a TimesheetMonth
+    when they all fall in one month, as the loaders hand them out."""
+    payslip = from_jsonable(PaySlip, data)
+    days = payslip.days_worked
+    if days and len({(d.date.year, d.date.month) for d in days}) == 1:
+        payslip.days_worked = TimesheetMonth(
+            days[0].employee_id, days[0].date.year, days[0].date.month, days)
+    return payslip
+
+
+def digest(*parts) -> str:
+    """A stable hex digest of JSON-able parts (see to_jsonable)."""
+    blob = json.dumps([to_jsonable(p) for p in parts], sort_keys=True,
+                      separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
@@ -37,7 +37,7 @@ _FILE_PREFIX = "inputs/"
 _ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
 
 
-def _git_commit() -> str | None:
+def git_commit() -> str | None:
     """Current HEAD of the repo this module lives in, or None."""
     try:
         out = subprocess.run(
@@ -62,7 +62,7 @@ def write_snapshot(inputs_dir: str | Path, dest: str | Path,
         "year": year,
         "month": month,
         "created": datetime.now().isoformat(timespec="seconds"),
-        "git_commit": _git_commit(),
+        "git_commit": git_commit(),
         "file_count": len(paths),
     }
 
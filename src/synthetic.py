@@ -0,0 +1,277 @@
+"""Synthetic payroll inputs at any scale, for benchmarks and load tests.
+
+The fixtures under tests/fixtures hold a handful of employees, which says
+nothing about how a run scales. generate_inputs() writes an inputs folder
+laid out exactly as run_payroll.py stages one -- master_employees.tsv,
+contracts.tsv, the opening leave stocks, per-employee timesheet TSVs per
+month and an AttendanceYYYY.xlsx per year -- for any number of employees
+and months, so the real loaders and the real engine can be pointed at it.
+
+Everything is drawn from a seeded random.Random, so the same arguments
+always produce byte-identical files. Names and IDs are made up; nothing
+here is anyone's data.
+
+Contracts cycle through PROFILES, so even a small workforce covers every
+contract_type, housing_type, salary basis and casual arrangement the
+engine distinguishes. Timesheets follow each contract's schedule, with
+absences, sick days, overtime and one-off adjustments sprinkled in at
+roughly the rates a real month shows.
+"""
+
+import csv
+import random
+from calendar import monthrange
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from .rates import StatutoryRates
+
+# (contract_type, housing_type, weekly_hours, salary_basis, hourly_divisor, casual)
+# casual: None for an established employee, "trial" for a casual on working
+# trial (casual_start, no monthly terms yet), "converting" for one whose
+# monthly contract starts part-way through the generated period.
+PROFILES = (
+    ("fixed_monthly", "none", 45, "gross", "monthly", None),
+    ("fixed_monthly", "none", 52, "base", "statutory", None),
+    ("fixed_monthly", "quarters", 45, "gross", "monthly", None),
+    ("fixed_monthly", "dorm", 52, "gross", "monthly", None),
+    ("hourly", "none", 52, "gross", "monthly", None),
+    ("hourly", "dorm", 52, "base", "statutory", None),
+    ("consolidated_leave", "none", 45, "gross", "monthly", None),
+    ("prorated_min_wage", "none", 45, "gross", "monthly", None),
+    ("prorated_min_wage", "quarters", 52, "gross", "monthly", None),
+    ("fixed_monthly", "none", 52, "base", "monthly", "trial"),
+    ("fixed_monthly", "none", 52, "base", "monthly", "converting"),
+)
+
+EMPLOYEE_COLUMNS = ["employee_id", "name", "national_id", "kra_pin", "phone",
+                    "bank_account", "nssf_no", "shif_no"]
+CONTRACT_COLUMNS = ["employee_id", "contract_type", "base_salary", "weekly_hours",
+                    "standard_workday_hours", "housing_type", "housing_market_value",
+                    "nssf_tier", "start_date", "end_date", "status", "salary_basis",
+                    "hourly_divisor", "casual_start"]
+LEAVE_COLUMNS = ["employee_id", "sick_full_pay", "sick_half_pay", "annual_leave",
+                 "as_of_date"]
+TIMESHEET_COLUMNS = ["date", "wkdy", "hrs_norm", "hrs_wrkd", "hrs_miss", "hrs_sik",
+                     "hrs_ot_1_5", "hrs_ot_2_0", "adj_with_housing", "adj_no_housing",
+                     "notes"]
+
+_FIRST = ("Achieng", "Amani", "Baraka", "Chebet", "Faith", "Imani", "Jabari",
+          "Kamau", "Kendi", "Kibet", "Makena", "Mwangi", "Njeri", "Otieno",
+          "Wafula", "Wanjiru", "Zawadi")
+_LAST = ("Atieno", "Chege", "Kariuki", "Kiprop", "Muthoni", "Mutua", "Ndungu",
+         "Nyambura", "Odhiambo", "Omondi", "Onyango", "Wambui")
+
+# Per-day chances, per employee-day on the schedule
+_P_ABSENT = 0.02
+_P_SICK = 0.015
+_P_OVERTIME = 0.08
+# Per employee-month
+_P_ADJUSTMENT = 0.05
+
+
+def months(start: tuple[int, int], count: int) -> list[tuple[int, int]]:
+    """count consecutive (year, month) pairs from start."""
+    year, month = start
+    out = []
+    for _ in range(count):
+        out.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return out
+
+
+def _days_per_week(weekly_hours: int) -> int:
+    return 6 if weekly_hours >= 48 else 5
+
+
+def make_workforce(n: int, start: tuple[int, int], n_months: int,
+                   seed: int = 0) -> tuple[list[dict], list[dict]]:
+    """Employee and contract rows (column -> text) for n employees."""
+    rng = random.Random(seed)
+    first_day = date(*start, 1)
+    last_year, last_month = months(start, n_months)[-1]
+    last_day = date(last_year, last_month, monthrange(last_year, last_month)[1])
+    span = (last_day - first_day).days
+
+    employees, contracts = [], []
+    for i in range(n):
+        emp_id = i + 1
+        contract_type, housing, weekly, basis, divisor, casual = PROFILES[i % len(PROFILES)]
+        employees.append({
+            "employee_id": str(emp_id),
+            "name": f"{rng.choice(_FIRST)} {rng.choice(_LAST)}",
+            "national_id": str(20000000 + emp_id),
+            "kra_pin": f"A{emp_id:09d}Z",
+            "phone": f"07{rng.randrange(10**8):08d}",
+            "bank_account": f"{rng.randrange(10**12):013d}",
+            "nssf_no": str(rng.randrange(10**9)),
+            "shif_no": f"CR{rng.randrange(10**10):010d}",
+        })
+
+        if contract_type == "prorated_min_wage":
+            base = StatutoryRates.MIN_WAGE_NAIROBI_UNSKILLED
+        else:
+            base = Decimal(rng.randrange(16_000, 250_001, 500))
+        start_date = first_day - timedelta(days=rng.randrange(30, 1500))
+        casual_start = None
+        if casual == "trial":
+            base, start_date = Decimal(0), None
+            casual_start = first_day + timedelta(days=rng.randrange(max(span, 1)))
+        elif casual == "converting":
+            casual_start = first_day - timedelta(days=rng.randrange(1, 60))
+            start_date = first_day + timedelta(days=rng.randrange(max(span, 1)))
+
+        contracts.append({
+            "employee_id": str(emp_id),
+            "contract_type": contract_type,
+            "base_salary": f"{base:.2f}" if base else "",
+            "weekly_hours": str(weekly),
+            "standard_workday_hours": f"{Decimal(weekly) / _days_per_week(weekly):.2f}",
+            "housing_type": housing,
+            "housing_market_value": (f"{rng.randrange(3_000, 15_001, 500)}.00"
+                                     if housing != "none" else ""),
+            "nssf_tier": "standard",
+            "start_date": start_date.isoformat() if start_date else "",
+            "end_date": "",
+            "status": "active",
+            "salary_basis": basis,
+            "hourly_divisor": divisor,
+            "casual_start": casual_start.isoformat() if casual_start else "",
+        })
+    return employees, contracts
+
+
+def make_month(contract: dict, year: int, month: int, rng: random.Random) -> list[list]:
+    """One employee's attendance rows for a month, in TIMESHEET_COLUMNS
+    order. Days off the schedule, and days before the employee started,
+    are left blank as they are on a real sheet."""
+    weekly = int(contract["weekly_hours"])
+    per_week = _days_per_week(weekly)
+    daily = Decimal(contract["standard_workday_hours"])
+    starts = [date.fromisoformat(contract[k]) for k in ("casual_start", "start_date")
+              if contract[k]]
+    first_worked = min(starts) if starts else date.min
+
+    rows = []
+    for day in range(1, monthrange(year, month)[1] + 1):
+        d = date(year, month, day)
+        row = [d, d.strftime("%a"), "", "", "", "", "", "", "", "", ""]
+        if d.weekday() < per_week and d >= first_worked:
+            row[2] = daily
+            roll = rng.random()
+            if roll < _P_SICK:
+                row[3:6] = [Decimal(0), Decimal(0), daily]
+            elif roll < _P_SICK + _P_ABSENT:
+                row[3:6] = [Decimal(0), daily, Decimal(0)]
+            else:
+                row[3:6] = [daily, Decimal(0), Decimal(0)]
+                if rng.random() < _P_OVERTIME:
+                    row[6] = Decimal(rng.randrange(1, 4))
+            for i in (6, 7):
+                row[i] = row[i] or Decimal(0)
+        rows.append(row)
+
+    if rng.random() < _P_ADJUSTMENT:
+        worked = [r for r in rows if r[3]] or rows
+        target = rng.choice(worked)
+        target[8 if rng.random() < 0.5 else 9] = Decimal(rng.randrange(500, 10_001, 500))
+        target[10] = "synthetic adjustment"
+    return rows
+
+
+def _tab_name(employee: dict) -> str:
+    """Attendance tab / timesheet file stem: first name and ID, as on the
+    real workbook (load_timesheet_folder reads the ID off the end)."""
+    return f"{employee['name'].split()[0]}_{employee['employee_id']}"
+
+
+def _write_tsv(path: Path, columns: list[str], rows) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f, delimiter="\t")
+        writer.writerow(columns)
+        writer.writerows(rows)
+
+
+def _text(v) -> str:
+    if isinstance(v, date):
+        return v.isoformat()
+    return str(v)
+
+
+def _opening_leave(contracts: list[dict], as_of: date, rng: random.Random) -> list[list]:
+    rows = []
+    for c in contracts:
+        full = rng.randrange(0, 8)
+        rows.append([c["employee_id"], full, 7 if full else rng.randrange(0, 8),
+                     rng.randrange(0, 22), as_of.isoformat()])
+    return rows
+
+
+def _new_workbook():
+    import openpyxl
+
+    return openpyxl.Workbook(write_only=True)
+
+
+def _append_sheet(wb, tab: str, rows: list[list]) -> None:
+    """Add one employee's tab in the layout extract_month reads: a header
+    row, then one row per day with a real datetime in the first column."""
+    ws = wb.create_sheet(tab)
+    ws.append(TIMESHEET_COLUMNS)
+    for row in rows:
+        d = row[0]
+        ws.append([datetime(d.year, d.month, d.day), row[1]]
+                  + [float(v) if isinstance(v, Decimal) else v for v in row[2:]])
+
+
+def generate_inputs(dest: str | Path, employees: int, start: tuple[int, int],
+                    n_months: int = 1, seed: int = 0, xlsx: bool = True) -> dict:
+    """Write a synthetic inputs folder under dest. Returns counts of what
+    was written: employees, months, timesheet_files, workbooks.
+
+    The opening leave stocks are dated the day before the first month, so
+    run_payroll finds them; later months' stocks are the runs' own output.
+    xlsx=False skips the attendance workbooks (which need openpyxl) and
+    leaves only the per-month timesheet TSVs.
+    """
+    dest = Path(dest)
+    rng = random.Random(seed)
+    emp_rows, contract_rows = make_workforce(employees, start, n_months, seed)
+    periods = months(start, n_months)
+
+    _write_tsv(dest / "master_employees.tsv", EMPLOYEE_COLUMNS,
+               ([e[c] for c in EMPLOYEE_COLUMNS] for e in emp_rows))
+    _write_tsv(dest / "contracts.tsv", CONTRACT_COLUMNS,
+               ([c[k] for k in CONTRACT_COLUMNS] for c in contract_rows))
+
+    as_of = date(*start, 1) - timedelta(days=1)
+    _write_tsv(dest / "leave_stocks" / str(start[0])
+               / f"leave_stocks_{as_of:%Y_%m_%d}.tsv",
+               LEAVE_COLUMNS, _opening_leave(contract_rows, as_of, rng))
+
+    files = workbooks = 0
+    for year in sorted({y for y, _ in periods}):
+        in_year = [m for y, m in periods if y == year]
+        wb = _new_workbook() if xlsx else None
+        # Employee by employee, so only one employee-year is ever held in
+        # memory however large the workforce.
+        for e, c in zip(emp_rows, contract_rows):
+            tab = _tab_name(e)
+            year_rows = []
+            for month in in_year:
+                rows = make_month(c, year, month, rng)
+                _write_tsv(dest / "timesheets" / f"{year}_{month:02d}" / f"{tab}.tsv",
+                           TIMESHEET_COLUMNS, ([_text(v) for v in row] for row in rows))
+                files += 1
+                year_rows += rows
+            if wb is not None:
+                _append_sheet(wb, tab, year_rows)
+        if wb is not None:
+            # Where sync_attendance puts it (gsync.attendance_xlsx_path)
+            wb.save(dest / "timesheets" / f"Attendance{year}.xlsx")
+            workbooks += 1
+
+    return {"employees": employees, "months": len(periods),
+            "timesheet_files": files, "workbooks": workbooks}
@@ -0,0 +1,86 @@
+"""Wall time per PayrollEngine stage, across a whole run.
+
+A slow run could be spending its time anywhere from leave allocation to
+the validation checks. With engine.timings set to a StageTimings, every
+numbered step of the pipeline records how long it took; with it left at
+None (the default) each step costs one attribute check.
+
+Per-employee stages (leave, gross, adjustments, housing_benefit,
+validation) record one sample per employee. The settlement (settle:
+deductions, PAYE and net pay) runs once over a column of employees in
+process_batch, so there a sample is one batch and rows says how many
+employees it covered.
+
+to_json() gives the figures in a stable form for comparing releases:
+run the same month on both and diff the two files.
+"""
+
+import json
+import platform
+from datetime import datetime
+
+# Pipeline order, for reports
+STAGES = ("leave", "gross", "adjustments", "housing_benefit",
+          "settle", "validation")
+
+
+def _percentile(ordered: list[float], p: int) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    return ordered[max(0, -(-len(ordered) * p // 100) - 1)]
+
+
+class StageTimings:
+    """Seconds per call, per stage."""
+
+    def __init__(self):
+        self.samples: dict[str, list[float]] = {}
+        self.rows: dict[str, int] = {}
+
+    def add(self, stage: str, seconds: float, rows: int = 1) -> None:
+        self.samples.setdefault(stage, []).append(seconds)
+        self.rows[stage] = self.rows.get(stage, 0) + rows
+
+    def merge(self, other: "StageTimings") -> None:
+        """Add another run's samples -- a worker process's, say."""
+        for stage, samples in other.samples.items():
+            self.samples.setdefault(stage, []).extend(samples)
+            self.rows[stage] = self.rows.get(stage, 0) + other.rows[stage]
+
+    def summary(self) -> dict[str, dict]:
+        """stage -> calls, rows, total, p50, p95 and max (seconds), in
+        pipeline order."""
+        order = [s for s in STAGES if s in self.samples]
+        order += sorted(s for s in self.samples if s not in STAGES)
+        out = {}
+        for stage in order:
+            ordered = sorted(self.samples[stage])
+            out[stage] = {
+                "calls": len(ordered),
+                "rows": self.rows[stage],
+                "total": sum(ordered),
+                "p50": _percentile(ordered, 50),
+                "p95": _percentile(ordered, 95),
+                "max": ordered[-1],
+            }
+        return out
+
+    def report(self) -> str:
+        """The summary as a table, times in milliseconds."""
+        lines = [f"  {'Stage':<16} {'Calls':>7} {'Rows':>7} {'Total ms':>10} "
+                 f"{'p50 ms':>9} {'p95 ms':>9} {'Max ms':>9}"]
+        for stage, s in self.summary().items():
+            lines.append(f"  {stage:<16} {s['calls']:>7} {s['rows']:>7} "
+                         f"{s['total'] * 1e3:>10.2f} {s['p50'] * 1e3:>9.3f} "
+                         f"{s['p95'] * 1e3:>9.3f} {s['max'] * 1e3:>9.3f}")
+        return "\n".join(lines)
+
+    def to_json(self, **meta) -> str:
+        """The summary with the machine and anything in meta (period,
+        workers, git commit...), as JSON."""
+        return json.dumps({
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            **meta,
+            "stages": self.summary(),
+        }, indent=2)
@@ -0,0 +1,174 @@
+"""Payslip checks: a registry of validators driven in one pass per employee.
+
+Every check is a class registered under a code. For each employee the
+engine makes one instance of every enabled check, walks the month's days
+once in date order handing each day to the checks that look at days, then
+collects what each check found. A check that only needs the employee's
+contract or pay (contract coverage) simply has no day hook.
+
+Findings are structured -- code, severity, the day, the figure found and
+the limit it broke -- so a report can filter or total them; the message is
+what the payslip prints, word for word what the old warnings said.
+Severities: "breach" for a statutory limit broken, "warning" for figures
+that are probably wrong, "info" for things worth knowing when a payslip is
+questioned later.
+
+Checks are switched off per run with PayrollEngine(checks=...) (all of
+CHECKS by default; run_payroll.py --skip-check).
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from .calculators import MinimumWageValidator, contract_coverage_warnings
+from .context import PayrollContext
+from .models import Contract, Finding, GrossBreakdown, LeaveStock, timesheet_columns
+from .rates import StatutoryRates
+
+# code -> check class, in the order their findings are listed
+CHECKS: dict[str, type["Check"]] = {}
+
+
+def register(cls: type["Check"]) -> type["Check"]:
+    """Class decorator adding a check to CHECKS under its code."""
+    if cls.code in CHECKS:
+        raise ValueError(f"Check {cls.code!r} registered twice")
+    CHECKS[cls.code] = cls
+    return cls
+
+
+class Check:
+    """Base class. Subclasses set code and severity, and override day()
+    (called once per day, in date order) and/or finish()."""
+    code = ""
+    severity = "warning"
+
+    def __init__(self, contract: Contract | None, ctx: PayrollContext | None,
+                 gross: GrossBreakdown | None, opening: LeaveStock | None):
+        self.contract = contract
+        self.ctx = ctx
+        self.gross = gross
+        self.opening = opening
+        self.found: list[Finding] = []
+
+    def day(self, day: date, normal: Decimal, ot_1_5: Decimal, ot_2_0: Decimal) -> None:
+        pass
+
+    def finish(self) -> list[Finding]:
+        return self.found
+
+    def flag(self, message: str, **kw) -> None:
+        self.found.append(Finding(self.code, self.severity, message, **kw))
+
+
+@register
+class MinimumWage(Check):
+    """Pay over hours worked against the minimum hourly rate."""
+    code = "min_wage"
+    severity = "breach"
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.hours = Decimal(0)
+
+    def day(self, day, normal, ot_1_5, ot_2_0):
+        self.hours += normal
+
+    def finish(self):
+        validator = MinimumWageValidator(self.gross.base_pay, self.contract, self.hours,
+                                         self.ctx)
+        is_valid, message = validator.validate()
+        if not is_valid and message:
+            self.flag(message, value=self.gross.base_pay / self.hours,
+                      limit=validator.hourly_floor())
+        return self.found
+
+
+@register
+class ContractCoverage(Check):
+    """A month the contract on file does not cover."""
+    code = "contract_coverage"
+    severity = "info"
+
+    def finish(self):
+        for message in contract_coverage_warnings(self.contract, self.ctx):
+            self.flag(message)
+        return self.found
+
+
+@register
+class OvertimeUnrecorded(Check):
+    """Days over the daily limit without the overtime to match."""
+    code = "overtime_unrecorded"
+
+    def day(self, day, normal, ot_1_5, ot_2_0):
+        limit = StatutoryRates.DAILY_HOURS_BEFORE_OT
+        recorded_ot = ot_1_5 + ot_2_0
+        excess = normal - limit
+        if excess > 0 and recorded_ot < excess:
+            self.flag(
+                f"{day}: {normal:g}h worked exceeds the {limit:g}h daily "
+                f"limit by {excess:g}h, but only {recorded_ot:g}h is recorded as "
+                f"overtime. The excess is being paid at normal rate.",
+                day=day, value=normal, limit=limit,
+            )
+
+
+@register
+class WeeklyMaximum(Check):
+    """Monday-to-Sunday weeks over the weekly maximum, counting the hours
+    the opening leave stock carries for a week that began last month."""
+    code = "weekly_max"
+    severity = "breach"
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.monday = None
+        self.next_monday = date.min
+        self.total = Decimal(0)
+
+    def day(self, day, normal, ot_1_5, ot_2_0):
+        # Days come in date order, so a new week starts at the first day on
+        # or after the next Monday -- no calendar lookup per day.
+        if day >= self.next_monday:
+            self._close()
+            self.monday = day - timedelta(days=day.weekday())
+            self.next_monday = self.monday + timedelta(days=7)
+            self.total = Decimal(0)
+            if self.opening is not None and self.opening.open_week == self.monday:
+                self.total = self.opening.open_week_hours
+        self.total += normal + ot_1_5 + ot_2_0
+
+    def _close(self):
+        limit = StatutoryRates.WEEKLY_HOURS_BEFORE_OT
+        if self.monday is not None and self.total > limit:
+            self.flag(
+                f"Week of {self.monday} (Mon-Sun): {self.total:g}h worked exceeds the "
+                f"{limit:g}h weekly maximum by {self.total - limit:g}h.",
+                day=self.monday, value=self.total, limit=limit,
+            )
+
+    def finish(self):
+        self._close()
+        return self.found
+
+
+def run_checks(
+    timesheet_days, codes=None, contract: Contract | None = None,
+    ctx: PayrollContext | None = None, gross: GrossBreakdown | None = None,
+    opening: LeaveStock | None = None,
+) -> list[Finding]:
+    """Every check in codes (default: all of CHECKS) over one employee's
+    month, in a single pass over the days. Findings come back grouped by
+    check, in CHECKS order, each check's in date order."""
+    codes = CHECKS if codes is None else set(codes)
+    checks = [cls(contract, ctx, gross, opening) for code, cls in CHECKS.items()
+              if code in codes]
+    hooks = [c.day for c in checks if type(c).day is not Check.day]
+    if hooks:
+        rows = zip(*timesheet_columns(timesheet_days, "date", "hours_normal",
+                                      "hours_ot_1_5", "hours_ot_2_0"))
+        for day, normal, ot_1_5, ot_2_0 in sorted(rows, key=lambda r: r[0]):
+            for hook in hooks:
+                hook(day, normal, ot_1_5, ot_2_0)
+    return [f for c in checks for f in c.finish()]
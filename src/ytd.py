@@ -0,0 +1,172 @@
+"""A local store of every employee's tax months, for P9 cards and year-end.
+
+The P9 card and the annual reconciliation want each month's gross, NSSF,
+SHIF, AHL, chargeable pay and PAYE per employee. Those figures are in the
+kra_p10.csv of each month's Drive folder, but assembling a year from them
+means downloading and parsing twelve archives. Instead each payroll run
+records its month here (PayrollEngine.tax_months), and a P9 for the whole
+workforce is one read of one table.
+
+The store is a single SQLite file. Rows are keyed (year, employee_id,
+month) -- the primary key is the table's only index, and a year's cards
+come back in card order straight off it. Amounts are kept as decimal
+strings, never floats, so what comes out is exactly what the run computed.
+
+Recording a month replaces whatever the store held for that month, so a
+rerun or a replay simply overwrites it; replaying every archived month of
+a year (p9.py --rebuild) rebuilds the year from the input snapshots.
+
+Like --cache-dir and --workdir, the store is private employee data and
+belongs outside the working tree.
+"""
+
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+from .models import TAX_MONTH_FIELDS, Employee, TaxMonth, YTDTotals
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS tax_months (
+    year INTEGER NOT NULL,
+    employee_id INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    {", ".join(f"{f} TEXT NOT NULL" for f in TAX_MONTH_FIELDS)},
+    PRIMARY KEY (year, employee_id, month)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS employees (
+    year INTEGER NOT NULL,
+    employee_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    kra_pin TEXT NOT NULL,
+    national_id TEXT NOT NULL,
+    PRIMARY KEY (year, employee_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS recorded (
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    at TEXT NOT NULL,
+    PRIMARY KEY (year, month)
+) WITHOUT ROWID;
+"""
+
+
+@dataclass
+class P9Card:
+    """One employee's year: identity as last paid, and each month on file."""
+    employee_id: int
+    year: int
+    name: str = ""
+    kra_pin: str = ""
+    national_id: str = ""
+    months: list[TaxMonth] = field(default_factory=list)
+
+    @property
+    def totals(self) -> YTDTotals:
+        totals = YTDTotals(self.employee_id, self.year)
+        for m in self.months:
+            totals = totals.add(m)
+        return totals
+
+
+class YTDStore:
+    """The tax months of every recorded payroll run, by year."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            self._db.close()
+            raise ValueError(f"{self.path} is a version {version} YTD store; "
+                             f"this code reads version {SCHEMA_VERSION}")
+        with self._db:
+            self._db.executescript(_SCHEMA)
+            self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "YTDStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # Writing
+
+    def record(self, year: int, month: int, months: list[TaxMonth],
+               employees: list[Employee], source: str = "run") -> None:
+        """Store one payroll month, replacing anything held for it.
+
+        employees are the people paid, for the card headers; source says
+        where the figures came from ("run", "replay").
+        """
+        wrong = [m for m in months if (m.year, m.month) != (year, month)]
+        if wrong:
+            raise ValueError(f"Tax month {wrong[0].year}-{wrong[0].month:02d} recorded "
+                             f"as {year}-{month:02d}")
+        columns = ", ".join(("year", "employee_id", "month") + TAX_MONTH_FIELDS)
+        marks = ", ".join("?" * (3 + len(TAX_MONTH_FIELDS)))
+        with self._db:
+            self._db.execute("DELETE FROM tax_months WHERE year = ? AND month = ?",
+                             (year, month))
+            self._db.executemany(
+                f"INSERT INTO tax_months ({columns}) VALUES ({marks})",
+                [(year, m.employee_id, month) + tuple(str(getattr(m, f))
+                                                      for f in TAX_MONTH_FIELDS)
+                 for m in months])
+            self._db.executemany(
+                "INSERT OR REPLACE INTO employees VALUES (?, ?, ?, ?, ?)",
+                [(year, e.employee_id, e.name, e.kra_pin, e.national_id)
+                 for e in employees])
+            self._db.execute(
+                "INSERT OR REPLACE INTO recorded VALUES (?, ?, ?, ?)",
+                (year, month, source, datetime.now().isoformat(timespec="seconds")))
+
+    # Reading
+
+    def recorded_months(self, year: int) -> list[int]:
+        """Months of year on file, in order."""
+        rows = self._db.execute("SELECT month FROM recorded WHERE year = ? ORDER BY month",
+                                (year,))
+        return [m for (m,) in rows]
+
+    def _tax_months(self, year: int, through_month: int):
+        columns = ", ".join(("employee_id", "month") + TAX_MONTH_FIELDS)
+        rows = self._db.execute(
+            f"SELECT {columns} FROM tax_months WHERE year = ? AND month <= ? "
+            f"ORDER BY employee_id, month", (year, through_month))
+        for emp_id, month, *amounts in rows:
+            yield TaxMonth(emp_id, year, month, *map(Decimal, amounts))
+
+    def cards(self, year: int) -> dict[int, P9Card]:
+        """Every employee's P9 card for year, by employee_id."""
+        cards: dict[int, P9Card] = {}
+        for m in self._tax_months(year, 12):
+            card = cards.get(m.employee_id)
+            if card is None:
+                card = cards[m.employee_id] = P9Card(m.employee_id, year)
+            card.months.append(m)
+        rows = self._db.execute(
+            "SELECT employee_id, name, kra_pin, national_id FROM employees WHERE year = ?",
+            (year,))
+        for emp_id, name, kra_pin, national_id in rows:
+            if emp_id in cards:
+                card = cards[emp_id]
+                card.name, card.kra_pin, card.national_id = name, kra_pin, national_id
+        return cards
+
+    def totals(self, year: int, through_month: int = 12) -> dict[int, YTDTotals]:
+        """Year-to-date totals through through_month, by employee_id."""
+        out: dict[int, YTDTotals] = {}
+        for m in self._tax_months(year, through_month):
+            before = out.get(m.employee_id) or YTDTotals(m.employee_id, year)
+            out[m.employee_id] = before.add(m)
+        return out
@@ -0,0 +1,97 @@
+"""Each download file of a payroll result is built once, and is the same
+file the generators build directly.
+
+The app reruns on every click; a PayrollArtifacts kept per result must
+hand back what it built the first time, and the PDF, built on a
+background thread, must end up either built or with its error kept for
+the app to show -- never silently missing.
+"""
+
+import pytest
+
+from src import artifacts as artifacts_module
+from src.artifacts import PayrollArtifacts
+from src.calculators import PayrollEngine
+from src.outputs import BankFileGenerator, KRAReturnGenerator, PayslipRenderer
+
+from tests.test_batch import PAYROLL_DATE, workforce
+
+
+def payslips():
+    return PayrollEngine(PAYROLL_DATE).process_batch(*workforce())
+
+
+class TestPayrollArtifacts:
+    def test_csvs_match_the_generators(self):
+        ps = payslips()
+        artifacts = PayrollArtifacts(ps)
+        assert artifacts.csv("bank") == BankFileGenerator(ps).to_equity_csv()
+        assert artifacts.csv("kra_p10") == KRAReturnGenerator(ps).to_p10_csv()
+
+    def test_each_csv_is_built_once(self, monkeypatch):
+        calls = []
+        monkeypatch.setitem(artifacts_module.CSV_BUILDERS, "bank",
+                            lambda p: calls.append(len(p)) or "csv")
+        artifacts = PayrollArtifacts(payslips())
+        for _ in range(3):
+            assert artifacts.csv("bank") == "csv"
+        assert len(calls) == 1
+
+    def test_pdf_is_built_once_in_the_background(self, monkeypatch):
+        calls = []
+
+        def render_all_pdf(self, ps, progress=None):
+            calls.append(1)
+            for i in range(len(ps)):
+                progress(i + 1, len(ps))
+            return b"%PDF"
+
+        monkeypatch.setattr(artifacts_module.PayslipRenderer, "render_all_pdf", render_all_pdf)
+        artifacts = PayrollArtifacts(payslips())
+        assert artifacts.pdf() is None and not artifacts.pdf_building()
+        artifacts.start_pdf()
+        artifacts.start_pdf()
+        assert artifacts.wait_pdf(timeout=10) == b"%PDF"
+        assert calls == [1]
+        done, total = artifacts.pdf_progress()
+        assert done == total == len(artifacts.payslips)
+
+    def test_pdf_failure_is_kept(self, monkeypatch):
+        def render_all_pdf(self, ps, progress=None):
+            raise ImportError("No module named 'reportlab'", name="reportlab")
+
+        monkeypatch.setattr(artifacts_module.PayslipRenderer, "render_all_pdf", render_all_pdf)
+        artifacts = PayrollArtifacts(payslips())
+        artifacts.start_pdf()
+        assert artifacts.wait_pdf(timeout=10) is None
+        assert isinstance(artifacts.pdf_error, ImportError)
+
+    def test_failed_pdf_can_be_retried(self, monkeypatch):
+        calls = []
+
+        def render_all_pdf(self, ps, progress=None):
+            calls.append(len(ps))
+            if len(calls) == 1:
+                raise OSError("disk full")
+            return b"%PDF retried"
+
+        monkeypatch.setattr(artifacts_module.PayslipRenderer, "render_all_pdf", render_all_pdf)
+        artifacts = PayrollArtifacts(payslips())
+        artifacts.start_pdf()
+        assert artifacts.wait_pdf(timeout=10) is None
+        assert isinstance(artifacts.pdf_error, OSError)
+
+        artifacts.start_pdf()
+        assert artifacts.wait_pdf(timeout=10) == b"%PDF retried"
+        assert artifacts.pdf_error is None
+        artifacts.start_pdf()  # built: not started again
+        assert artifacts.wait_pdf(timeout=10) == b"%PDF retried" and len(calls) == 2
+
+    def test_renderer_reports_progress(self):
+        pytest.importorskip("reportlab")
+        ps = payslips()
+        seen = []
+        pdf = PayslipRenderer().render_all_pdf(
+            ps, progress=lambda done, total: seen.append((done, total)))
+        assert pdf.startswith(b"%PDF")
+        assert seen == [(i + 1, len(ps)) for i in range(len(ps))]
@@ -0,0 +1,129 @@
+"""Back pay must pay exactly the gross a corrected rerun finds was owed.
+
+The arrears are only right if paying them through the adjustment columns
+in a later month adds the summed gross difference to that month's gross,
+to the cent, whatever mix of housing and non-housing pay it came from.
+"""
+
+from dataclasses import replace
+from datetime import date
+from decimal import Decimal
+
+from src.backpay import (
+    arrears_moved, back_pay, compute_month, inject_arrears, load_arrears, month_inputs, split_arrears,
+    write_arrears,
+)
+from src.models import TimesheetMonth
+
+from tests.test_batch import workforce
+
+
+def month(m, contracts=None, overrides=None):
+    """One of the test months, optionally with corrected contracts/rates."""
+    employees, base_contracts, timesheets, leave_stocks = workforce()
+    ts = {i: [replace(d, date=d.date.replace(month=m)) for d in days
+              if d.date.day <= 28]
+          for i, days in timesheets.items()}
+    return month_inputs(date(2026, m, 28), employees, contracts or base_contracts, ts,
+                        leave_stocks, overrides)
+
+
+def raised(by):
+    contracts = workforce()[1]
+    return {i: replace(c, base_salary=c.base_salary * by) for i, c in contracts.items()}
+
+
+class TestBackPay:
+    def test_arrears_sum_each_months_difference(self):
+        pairs = [(month(m), month(m, raised(Decimal("1.1")))) for m in (1, 2, 3)]
+        arrears, differences = back_pay(pairs)
+        assert {(d.year, d.month) for d in differences} == {(2026, 1), (2026, 2), (2026, 3)}
+        for a in arrears:
+            assert a.gross_difference == sum(d.gross_difference for d in differences
+                                             if d.employee_id == a.employee_id)
+            assert a.gross_difference > 0 or a.employee_id == 7  # 7 is a casual
+
+    def test_paying_the_arrears_adds_the_gross_difference(self):
+        pairs = [(month(m), month(m, raised(Decimal("1.07")))) for m in (2, 3)]
+        arrears, _ = back_pay(pairs)
+        current = month(7)  # no public holidays
+        before = {ps.employee.employee_id: ps for ps in compute_month(current)}
+        timesheets, missing = inject_arrears(
+            current.timesheets,
+            {a.employee_id: (a.adj_with_housing, a.adj_no_housing) for a in arrears},
+            current.contracts)
+        assert missing == [4]  # prorated_min_wage has no adjustment columns
+        after = {ps.employee.employee_id: ps
+                 for ps in compute_month(replace(current, timesheets=timesheets))}
+        moved = arrears_moved(current.timesheets, {a.employee_id: a for a in arrears},
+                              current.ctx)
+        assert 1 in moved  # overtime on the 9th and 10th
+        for a in arrears:
+            if a.employee_id in missing or a.employee_id in moved:
+                continue
+            paid = (after[a.employee_id].gross.total_gross
+                    - before[a.employee_id].gross.total_gross)
+            assert abs(paid - a.gross_difference) <= Decimal("0.01"), a.employee_id
+
+    def test_parallel_matches_serial(self):
+        pairs = [(month(m), month(m, raised(Decimal("1.05")))) for m in (1, 2, 3, 4)]
+        assert back_pay(pairs, workers=2) == back_pay(pairs)
+
+    def test_rate_only_correction_moves_net_not_gross(self):
+        arrears, _ = back_pay([(month(4), month(4, overrides={"shif_rate": Decimal("0.03")}))])
+        assert arrears
+        for a in arrears:
+            assert a.gross_difference == 0
+            assert (a.adj_with_housing, a.adj_no_housing) == (0, 0)
+            assert a.net_difference < 0
+
+    def test_split_for_housed_staff_has_no_housing_part(self):
+        assert split_arrears(Decimal("1000"), Decimal("0"), True) == (0, Decimal("1000.00"))
+        with_housing, no_housing = split_arrears(Decimal("1250"), Decimal("150"), False)
+        assert with_housing == Decimal("1000.00")
+        assert no_housing == Decimal("100.00")
+
+    def test_arrears_file_round_trips(self, tmp_path):
+        arrears, _ = back_pay([(month(3), month(3, raised(Decimal("1.2"))))])
+        path = write_arrears(arrears, tmp_path / "arrears.tsv")
+        assert load_arrears(path) == {a.employee_id: (a.adj_with_housing, a.adj_no_housing)
+                                      for a in arrears}
+
+    def test_inject_keeps_the_timesheet_form(self):
+        current = month(4)
+        ts = {1: TimesheetMonth(1, 2026, 4, current.timesheets[1])}
+        out, missing = inject_arrears(ts, {1: (Decimal("10"), Decimal("5")), 99: (1, 1)})
+        assert missing == [99]
+        assert isinstance(out[1], TimesheetMonth)
+        assert out[1].totals["adj_with_housing"] == Decimal("10")
+        assert out[1].totals["adj_no_housing"] == Decimal("5")
+        # The original month is untouched
+        assert ts[1].totals["adj_with_housing"] == 0
+
+    def test_arrears_are_valued_into_overtime_like_any_adjustment(self):
+        # Adjustments are part of the base the month's overtime is valued
+        # at, as they always have been, so that published months replay to
+        # the same payslips; arrears_moved() flags the employees this affects.
+        current = month(5)
+        before = {ps.employee.employee_id: ps for ps in compute_month(current)}
+        timesheets, _ = inject_arrears(current.timesheets, {1: (Decimal(0), Decimal("20000"))})
+        after = {ps.employee.employee_id: ps
+                 for ps in compute_month(replace(current, timesheets=timesheets))}
+        base = before[1].gross.base_pay
+        expected = before[1].gross.overtime_1_5 * (base + 20000) / base
+        assert abs(after[1].gross.overtime_1_5 - expected) < Decimal("0.01")
+        assert arrears_moved(timesheets, {1: None}, current.ctx) == [1]
+
+    def test_trial_casual_without_a_leave_record_is_paid(self):
+        # run_payroll seeds a default stock for everyone without a leave
+        # row, working-trial casuals included; back pay must too, or their
+        # arrears vanish without a word.
+        current = month(4)
+        stocks = dict(current.leave_stocks)
+        del stocks[7]
+        assert current.contracts[7].start_date is None
+        seeded = {ps.employee.employee_id: ps
+                  for ps in compute_month(replace(current, leave_stocks=stocks))}
+        on_file = {ps.employee.employee_id: ps for ps in compute_month(current)}
+        assert seeded.keys() == on_file.keys()
+        assert seeded[7] == on_file[7]
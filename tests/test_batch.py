@@ -0,0 +1,146 @@
+"""Whole-workforce processing must reproduce the per-employee path exactly.
+
+process_batch regroups the month by step rather than by employee, so the
+only thing worth testing is that nobody's figures move: every payslip it
+returns should equal the one process() builds for the same inputs.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from src.calculators import PayrollEngine, default_leave_stock
+from src.models import Contract, Employee, LeaveStock, TimesheetDay
+
+PAYROLL_DATE = date(2026, 4, 28)  # April 2026 has Good Friday and Easter Monday
+
+
+def employee(emp_id):
+    return Employee(employee_id=emp_id, name=f"Employee {emp_id}",
+                    national_id=str(emp_id), kra_pin=f"A{emp_id:09d}X",
+                    phone="", bank_account=str(emp_id))
+
+
+def contract(emp_id, contract_type, **kw):
+    return Contract(
+        employee_id=emp_id,
+        contract_type=contract_type,
+        base_salary=kw.pop("base", Decimal("30000")),
+        weekly_hours=kw.pop("weekly_hours", 52),
+        housing_type=kw.pop("housing_type", "none"),
+        housing_market_value=kw.pop("housing_market_value", None),
+        nssf_tier=kw.pop("nssf_tier", "standard"),
+        start_date=kw.pop("start_date", date(2024, 1, 1)),
+        end_date=None,
+        status="active",
+        salary_basis=kw.pop("salary_basis", "gross"),
+        hourly_divisor=kw.pop("hourly_divisor", "monthly"),
+        **kw,
+    )
+
+
+def month_of_days(emp_id, hours=Decimal("8.67"), absent=(), sick=(), ot=(), adj=None):
+    """Mon-Sat attendance for April 2026, with the given days varied."""
+    out = []
+    d = date(2026, 4, 1)
+    while d.month == 4:
+        if d.weekday() < 6:
+            is_absent = d.day in absent or d.day in sick
+            out.append(TimesheetDay(
+                employee_id=emp_id, date=d,
+                hours_normal=Decimal(0) if is_absent else hours,
+                hours_ot_1_5=Decimal("2") if d.day in ot else Decimal(0),
+                hours_ot_2_0=Decimal(0),
+                absent=is_absent, sick=d.day in sick,
+            ))
+        d += timedelta(days=1)
+    if adj:
+        out[-1].adj_with_housing, out[-1].adj_no_housing = adj
+    return out
+
+
+def workforce():
+    contracts = {
+        1: contract(1, "fixed_monthly", base=Decimal("73000")),
+        2: contract(2, "fixed_monthly", salary_basis="base", housing_type="quarters",
+                    housing_market_value=Decimal("4000")),
+        3: contract(3, "consolidated_leave", base=Decimal("23500")),
+        4: contract(4, "prorated_min_wage", base=Decimal("16113.75"), weekly_hours=45),
+        5: contract(5, "hourly", base=Decimal("18900"), nssf_tier="contracted_out",
+                    hourly_divisor="statutory"),
+        6: contract(6, "fixed_monthly", start_date=date(2026, 4, 15),
+                    casual_start=date(2026, 4, 1)),
+        7: contract(7, "fixed_monthly", base=Decimal(0), start_date=None,
+                    casual_start=date(2026, 4, 8)),
+        8: contract(8, "fixed_monthly", base=Decimal("650000"), salary_basis="base"),
+        9: contract(9, "fixed_monthly", base=Decimal("16113.75"), housing_type="dorm",
+                    housing_market_value=Decimal("1500")),
+    }
+    timesheets = {
+        1: month_of_days(1, absent=(7, 8), ot=(9, 10)),
+        2: month_of_days(2, sick=(13, 14, 15), adj=(Decimal("5000"), Decimal("0"))),
+        3: month_of_days(3, absent=(20, 21, 22, 23)),
+        4: month_of_days(4, hours=Decimal("7.5")),
+        5: month_of_days(5, hours=Decimal("10")),
+        6: month_of_days(6, absent=(2,)),
+        7: month_of_days(7),
+        8: month_of_days(8, adj=(Decimal("0"), Decimal("20000"))),
+        9: month_of_days(9, sick=(1, 2, 3, 4, 6, 7, 8, 9, 10)),
+    }
+    employees = {i: employee(i) for i in contracts}
+    leave_stocks = {i: default_leave_stock(i, c, PAYROLL_DATE)
+                    for i, c in contracts.items() if c.start_date is not None}
+    leave_stocks[7] = LeaveStock(employee_id=7, sick_full_pay=Decimal(0),
+                                 sick_half_pay=Decimal(0), annual_leave=Decimal(0),
+                                 as_of_date=date(2026, 3, 31))
+    leave_stocks[1] = LeaveStock(employee_id=1, sick_full_pay=Decimal("1"),
+                                 sick_half_pay=Decimal("7"), annual_leave=Decimal("0.5"),
+                                 as_of_date=date(2026, 3, 31))
+    return employees, contracts, timesheets, leave_stocks
+
+
+class TestProcessBatch:
+    def test_matches_per_employee_processing_exactly(self):
+        employees, contracts, timesheets, leave_stocks = workforce()
+        engine = PayrollEngine(PAYROLL_DATE)
+
+        batch = engine.process_batch(employees, contracts, timesheets, leave_stocks)
+        single = [engine.process(employees[i], contracts[i], timesheets[i], leave_stocks[i])
+                  for i in sorted(contracts)]
+
+        assert batch == single
+
+    def test_rows_come_back_in_employee_id_order(self):
+        employees, contracts, timesheets, leave_stocks = workforce()
+        shuffled = {i: contracts[i] for i in (9, 3, 1, 7, 5, 2, 8, 4, 6)}
+        batch = PayrollEngine(PAYROLL_DATE).process_batch(
+            employees, shuffled, timesheets, leave_stocks)
+        assert [ps.employee.employee_id for ps in batch] == sorted(contracts)
+
+    def test_employees_missing_an_input_are_left_out(self):
+        employees, contracts, timesheets, leave_stocks = workforce()
+        del employees[2]
+        del timesheets[3]
+        del leave_stocks[4]
+        batch = PayrollEngine(PAYROLL_DATE).process_batch(
+            employees, contracts, timesheets, leave_stocks)
+        assert [ps.employee.employee_id for ps in batch] == [1, 5, 6, 7, 8, 9]
+
+    def test_empty_workforce(self):
+        assert PayrollEngine(PAYROLL_DATE).process_batch({}, {}, {}, {}) == []
+
+
+class TestParallelBatch:
+    def test_process_pool_matches_serial_run(self):
+        employees, contracts, timesheets, leave_stocks = workforce()
+        engine = PayrollEngine(PAYROLL_DATE)
+        serial = engine.process_batch(employees, contracts, timesheets, leave_stocks)
+        parallel = engine.process_batch(employees, contracts, timesheets, leave_stocks,
+                                        workers=3)
+        assert parallel == serial
+
+    def test_more_workers_than_employees(self):
+        employees, contracts, timesheets, leave_stocks = workforce()
+        engine = PayrollEngine(PAYROLL_DATE)
+        parallel = engine.process_batch(employees, contracts, timesheets, leave_stocks,
+                                        workers=32)
+        assert [ps.employee.employee_id for ps in parallel] == sorted(contracts)
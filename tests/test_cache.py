@@ -0,0 +1,114 @@
+"""The on-disk payslip cache must be invisible in the results.
+
+A cached run returns exactly what an uncached one does; the cache only
+decides how much of it had to be computed.
+"""
+
+import os
+from dataclasses import replace
+from decimal import Decimal
+
+from src.cache import PayslipCache, default_cache_dir
+from src.calculators import PayrollEngine
+from src.scenarios import scenario_rates
+
+from tests.test_batch import PAYROLL_DATE, workforce
+
+
+def cached_run(cache, *inputs, **kw):
+    return PayrollEngine(PAYROLL_DATE, cache=cache, **kw).process_batch(*inputs)
+
+
+class TestPayslipCache:
+    def test_second_run_comes_from_the_cache(self, tmp_path):
+        inputs = workforce()
+        expected = PayrollEngine(PAYROLL_DATE).process_batch(*inputs)
+        first = PayslipCache(tmp_path)
+        assert cached_run(first, *inputs) == expected
+        assert (first.hits, first.misses) == (0, len(expected))
+
+        second = PayslipCache(tmp_path)  # a later run, same directory
+        assert cached_run(second, *inputs) == expected
+        assert (second.hits, second.misses) == (len(expected), 0)
+
+    def test_changed_inputs_miss(self, tmp_path):
+        employees, contracts, timesheets, stocks = workforce()
+        cached_run(PayslipCache(tmp_path), employees, contracts, timesheets, stocks)
+
+        contracts[4] = replace(contracts[4], base_salary=Decimal("17000"))
+        contracts[9] = replace(contracts[9], housing_market_value=Decimal("1800"))
+        cache = PayslipCache(tmp_path)
+        payslips = PayrollEngine(PAYROLL_DATE, cache=cache).process_batch(
+            employees, contracts, timesheets, stocks, workers=2)
+        assert cache.misses == 2
+        assert payslips == PayrollEngine(PAYROLL_DATE).process_batch(
+            employees, contracts, timesheets, stocks)
+
+    def test_checks_backend_and_code_are_part_of_the_key(self, tmp_path, monkeypatch):
+        inputs = workforce()
+        cached_run(PayslipCache(tmp_path), *inputs)
+        fewer = PayslipCache(tmp_path)
+        cached_run(fewer, *inputs, checks=())
+        assert fewer.hits == 0
+        cents = PayslipCache(tmp_path)
+        cached_run(cents, *inputs, backend="cents")
+        assert cents.hits == 0
+
+        monkeypatch.setattr("src.cache.code_version", lambda: "edited")
+        edited = PayslipCache(tmp_path)
+        cached_run(edited, *inputs)
+        assert edited.hits == 0
+
+    def test_rates_are_part_of_the_key(self, tmp_path):
+        inputs = workforce()
+        cached_run(PayslipCache(tmp_path), *inputs)
+        cache = PayslipCache(tmp_path)
+        engine = PayrollEngine(PAYROLL_DATE, cache=cache)
+        engine.ctx = engine.ctx.with_rates(
+            scenario_rates(engine.rates, shif_rate=Decimal("0.03")))
+        payslips = engine.process_batch(*inputs)
+        assert cache.hits == 0
+        uncached = PayrollEngine(PAYROLL_DATE)
+        uncached.ctx = engine.ctx
+        assert payslips == uncached.process_batch(*inputs)
+        assert payslips != PayrollEngine(PAYROLL_DATE).process_batch(*inputs)
+
+    def test_process_uses_the_cache(self, tmp_path):
+        employees, contracts, timesheets, stocks = workforce()
+        cache = PayslipCache(tmp_path)
+        engine = PayrollEngine(PAYROLL_DATE, cache=cache)
+        a = engine.process(employees[1], contracts[1], timesheets[1], stocks[1])
+        b = engine.process(employees[1], contracts[1], timesheets[1], stocks[1])
+        assert a == b and (cache.hits, cache.misses) == (1, 1)
+
+    def test_least_recently_used_is_evicted(self, tmp_path):
+        inputs = workforce()
+        payslip = cached_run(PayslipCache(tmp_path), *inputs)[0]
+        paths = sorted(tmp_path.glob("*/*.json"))
+        for n, path in enumerate(paths):  # distinct, ordered last-use times
+            os.utime(path, (n, n))
+        total = sum(p.stat().st_size for p in paths)
+
+        cache = PayslipCache(tmp_path, max_bytes=total)
+        assert cache.get(paths[0].stem) is not None  # oldest, now the newest
+        cache.put("ff" * 32, payslip)
+        assert paths[0].exists() and not paths[1].exists()
+        assert cache._path("ff" * 32).exists()
+        assert cache._bytes <= cache.max_bytes
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path):
+        inputs = workforce()
+        cache = PayslipCache(tmp_path)
+        cached_run(cache, *inputs)
+        next(tmp_path.glob("*/*.json")).write_text("{not json")
+        again = PayslipCache(tmp_path)
+        assert cached_run(again, *inputs) == PayrollEngine(PAYROLL_DATE).process_batch(*inputs)
+        assert again.misses == 1
+
+    def test_default_directory_is_the_users_cache(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("sys.platform", "linux")
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        assert default_cache_dir() == tmp_path / "kenyacc" / "payslips"
+        monkeypatch.delenv("XDG_CACHE_HOME")
+        monkeypatch.setenv("HOME", str(tmp_path / "home"))
+        assert default_cache_dir() == tmp_path / "home" / ".cache" / "kenyacc" / "payslips"
@@ -17,7 +17,9 @@ from src.calculators import (
     month_split, overtime_trigger_warnings, weekly_hours_warnings,
     MinimumWageValidator, contract_coverage_warnings,
 )
+from src.loaders import load_leave_stocks
 from src.models import Contract, Employee, LeaveStock, TimesheetDay
+from src.outputs import generate_leave_stocks_tsv
 from src.rates import StatutoryRates
 
 
@@ -228,6 +230,10 @@ class TestSickLeaveQualifyingPeriod:
         stock = default_leave_stock(99, contract(date(2020, 1, 1)), date(2026, 7, 28))
         assert stock.annual_leave == Decimal(0)
 
+    def test_casual_on_trial_opens_with_no_sick_leave(self):
+        c = contract(None, base=Decimal(0), casual_start=date(2026, 7, 20))
+        assert default_leave_stock(99, c, date(2026, 7, 28)).sick_full_pay == Decimal(0)
+
 
 class TestTaxTreatment:
     """A split month is taxed as one month, not as two separate engagements."""
@@ -320,6 +326,38 @@ class TestWorkingTimeLimits:
         days[0].hours_ot_1_5 = Decimal("8")  # 53h total
         assert len(weekly_hours_warnings(days)) == 1
 
+    def test_open_week_carries_into_the_next_month(self, tmp_path):
+        """Mon 27 Jul to Sun 2 Aug straddles the month end: 45h in July and
+        9h on Sat 1 Aug only breach the maximum when added together."""
+        emp = Employee(employee_id=99, name="Test", national_id="1", kra_pin="A1",
+                       phone="", bank_account="1", nssf_no="1", shif_no="1")
+        c = contract(date(2026, 1, 1))
+        july = PayrollEngine(date(2026, 7, 28)).process(
+            emp, c, workdays([date(2026, 7, d) for d in range(27, 32)], hours=Decimal("9")),
+            default_leave_stock(99, c, date(2026, 7, 28)))
+        stock = july.leave.updated_stock
+        assert (stock.open_week, stock.open_week_hours) == (date(2026, 7, 27), Decimal("45"))
+
+        path = tmp_path / "leave_stocks.tsv"
+        path.write_text(generate_leave_stocks_tsv([july], 2026, 7))
+        (opening,) = load_leave_stocks(path)
+        assert (opening.open_week, opening.open_week_hours) == (date(2026, 7, 27), 45)
+
+        saturday = workdays([date(2026, 8, 1)], hours=Decimal("9"))
+        assert weekly_hours_warnings(saturday) == []
+        (w,) = weekly_hours_warnings(saturday, opening)
+        assert "2026-07-27 (Mon-Sun)" in w and "54h" in w
+        august = PayrollEngine(date(2026, 8, 28)).process(emp, c, saturday, opening)
+        assert w in august.warnings
+
+    def test_month_ending_on_sunday_leaves_no_open_week(self):
+        c = contract(date(2026, 1, 1))
+        ps = PayrollEngine(date(2026, 5, 28)).process(  # Sun 31 May
+            Employee(employee_id=99, name="Test", national_id="1", kra_pin="A1",
+                     phone="", bank_account="1", nssf_no="1", shif_no="1"),
+            c, workdays([date(2026, 5, 29)]), default_leave_stock(99, c, date(2026, 5, 28)))
+        assert ps.leave.updated_stock.open_week is None
+
 
 class TestEffectiveHourlyMinimum:
     """Minimum wage is tested as total pay over total hours."""
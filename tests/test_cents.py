@@ -0,0 +1,152 @@
+"""The integer-cents backend must agree with the Decimal engine to the cent.
+
+The cents backend works out each gross figure exactly in ints and rounds
+it once, so every gross figure is the Decimal engine's rounded to the
+cent. Deductions are then taken from the rounded gross, so they and the
+totals are allowed to differ from the unquantized Decimal ones by that
+rounding: at most one cent per figure, on every employee in the fixtures.
+"""
+
+import csv
+from dataclasses import fields
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from src.calculators import PAYECalculator, PayrollEngine
+from src.cents import CentsRates, apply_rate, from_cents, to_cents
+from src.loaders import load_contracts, load_employees, load_leave_stocks
+from src.models import GrossBreakdown, TimesheetDay
+from src.rates import StatutoryRates
+
+from tests.test_batch import PAYROLL_DATE, workforce
+
+FIXTURES = Path(__file__).parent / "fixtures" / "generated_supplementals"
+GROSS = tuple(f.name for f in fields(GrossBreakdown))
+DEDUCTIONS = ("nssf_tier_1", "nssf_tier_2", "shif", "ahl_employee", "paye", "total")
+
+
+def fixture_timesheets(month):
+    """The generated fixture timesheets, which record leave as hours columns."""
+    out = {}
+    with open(FIXTURES / "test_timesheets" / f"2026_{month:02d}.tsv") as f:
+        for row in csv.DictReader(f, delimiter="\t"):
+            normal = Decimal(row["hours_normal"])
+            off = sum(Decimal(row[k]) for k in ("hours_sick", "hours_annual", "hours_unpaid"))
+            emp_id = int(row["employee_id"])
+            out.setdefault(emp_id, []).append(TimesheetDay(
+                employee_id=emp_id, date=date.fromisoformat(row["date"]),
+                hours_normal=normal, hours_ot_1_5=Decimal(row["hours_ot_1_5"]),
+                hours_ot_2_0=Decimal(row["hours_ot_2_0"]),
+                absent=normal == 0 and off > 0, sick=Decimal(row["hours_sick"]) > 0,
+            ))
+    return out
+
+
+def fixture_month(month):
+    employees = {e.employee_id: e for e in load_employees(FIXTURES / "test_employees.tsv")}
+    contracts = {c.employee_id: c for c in load_contracts(FIXTURES / "test_contracts.tsv")}
+    stocks = {s.employee_id: s for s in load_leave_stocks(FIXTURES / "test_leave_stocks.tsv")}
+    return date(2026, month, 28), (employees, contracts, fixture_timesheets(month), stocks)
+
+
+def both_backends(payroll_date, inputs):
+    exact = PayrollEngine(payroll_date).process_batch(*inputs)
+    cents = PayrollEngine(payroll_date, backend="cents").process_batch(*inputs)
+    assert len(exact) == len(cents) > 0
+    return zip(exact, cents)
+
+
+def within_a_cent(a, b):
+    return abs(to_cents(a) - to_cents(b)) <= 1
+
+
+def assert_agree(exact, cents):
+    for name in GROSS:
+        assert to_cents(getattr(exact.gross, name)) == getattr(cents.gross, name) * 100, name
+    for name in DEDUCTIONS:
+        assert within_a_cent(getattr(exact.deductions, name),
+                             getattr(cents.deductions, name)), name
+    assert within_a_cent(exact.net_pay, cents.net_pay)
+    # Matched on code and day: a shortfall printed in a message is itself a
+    # figure that may be a cent out.
+    assert ([(f.code, f.day) for f in exact.findings]
+            == [(f.code, f.day) for f in cents.findings])
+
+
+class TestEquivalence:
+    @pytest.mark.parametrize("month", [1, 2])
+    def test_fixture_workforce(self, month):
+        for exact, cents in both_backends(*fixture_month(month)):
+            assert_agree(exact, cents)
+
+    def test_batch_workforce(self):
+        for exact, cents in both_backends(PAYROLL_DATE, workforce()):
+            assert_agree(exact, cents)
+
+    def test_leave_drawn_past_a_balance_is_paid_exactly(self):
+        # Employee 23 runs out of full-pay sick leave in February: the hours
+        # moved to half pay come from a day balance, to eight places.
+        payroll_date, inputs = fixture_month(2)
+        exact, cents = next((a, b) for a, b in both_backends(payroll_date, inputs)
+                            if a.employee.employee_id == 23)
+        assert cents.leave.sick_half_pay_used == Decimal("12.28250289")
+        assert_agree(exact, cents)
+
+    def test_payslip_adds_up_exactly(self):
+        _, inputs = fixture_month(2)
+        for ps in PayrollEngine(date(2026, 2, 28), backend="cents").process_batch(*inputs):
+            d = ps.deductions
+            assert d.total == d.nssf_tier_1 + d.nssf_tier_2 + d.shif + d.ahl_employee + d.paye
+            assert ps.net_pay == ps.gross.total_gross - d.total
+            assert ps.net_pay.as_tuple().exponent == -2
+            assert ps.gross.total_gross.as_tuple().exponent == -2
+
+    def test_single_and_parallel_match_batch(self):
+        employees, contracts, timesheets, stocks = workforce()
+        engine = PayrollEngine(PAYROLL_DATE, backend="cents")
+        batch = engine.process_batch(employees, contracts, timesheets, stocks)
+        single = [engine.process(employees[i], contracts[i], timesheets[i], stocks[i])
+                  for i in sorted(contracts)]
+        assert batch == single
+        assert engine.process_batch(employees, contracts, timesheets, stocks, workers=2) == batch
+
+
+class TestIntegerArithmetic:
+    def test_round_trip(self):
+        for text in ("0", "0.01", "1234.56", "-7.5", "99999999.99"):
+            assert from_cents(to_cents(Decimal(text))) == Decimal(text)
+
+    def test_half_up_both_ways(self):
+        assert to_cents(Decimal("0.005")) == 1
+        assert to_cents(Decimal("-0.005")) == -1
+        assert apply_rate(1, 500_000) == 1    # 0.5 cent rounds up
+        assert apply_rate(-1, 500_000) == -1  # and away from zero
+
+    def test_paye_matches_the_decimal_table(self):
+        rates = StatutoryRates(date(2026, 4, 30))
+        compiled = CentsRates(rates)
+        calc = PAYECalculator(rates)
+        for shillings in (0, 24000, 26925, 32333, 185020, 472270, 800001, 2_000_000):
+            c = shillings * 100
+            assert compiled.paye(c) == to_cents(calc.calculate(Decimal(shillings)))
+
+    def test_timesheet_hours_enter_in_hundredths(self):
+        employees, contracts, timesheets, stocks = workforce()
+        engine = PayrollEngine(PAYROLL_DATE, backend="cents")
+        days = timesheets[1]
+        whole = engine.process(employees[1], contracts[1], days, stocks[1])
+        days[0].hours_ot_1_5 += Decimal("0.004")  # the month's total rounds back
+        rounded = engine.process(employees[1], contracts[1], days, stocks[1])
+        assert rounded.gross.overtime_1_5 == whole.gross.overtime_1_5 > 0
+
+    def test_tax_card_adds_up(self):
+        engine = PayrollEngine(PAYROLL_DATE, backend="cents")
+        for month in engine.tax_months(engine.process_batch(*workforce())):
+            assert month.paye == max(month.tax_charged - month.relief, 0)
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            PayrollEngine(PAYROLL_DATE, backend="float")
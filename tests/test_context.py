@@ -0,0 +1,109 @@
+"""The shared month context must give the same answers as the calendar.
+
+PayrollContext replaces calendar arithmetic that every calculator used to
+redo per employee; these check the precomputed facts and that passing a
+context or a bare date to the calculators is interchangeable.
+"""
+
+import dataclasses
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from src.calculators import (
+    GrossCalculator, MinimumWageValidator, PayrollEngine, contract_coverage_warnings,
+    month_split,
+)
+from src.context import PayrollContext
+from src.models import Contract, TimesheetDay
+from src.outputs import PayslipRenderer
+from src.rates import KenyanHolidays
+
+from tests.test_batch import PAYROLL_DATE, workforce
+
+
+def contract(**kw):
+    return Contract(
+        employee_id=1, contract_type=kw.pop("contract_type", "fixed_monthly"),
+        base_salary=Decimal("30000"), weekly_hours=kw.pop("weekly_hours", 52),
+        housing_type="none", housing_market_value=None, nssf_tier="standard",
+        start_date=kw.pop("start_date", date(2024, 1, 1)), end_date=None,
+        status="active", hourly_divisor="monthly", **kw,
+    )
+
+
+class TestMonthFacts:
+    def test_april_2026(self):
+        ctx = PayrollContext.for_date(date(2026, 4, 28))
+        assert (ctx.first_day, ctx.last_day, ctx.days_in_month) == (
+            date(2026, 4, 1), date(2026, 4, 30), 30)
+        assert ctx.holiday_dates == {date(2026, 4, 3), date(2026, 4, 6)}
+        assert ctx.period == "April 2026"
+        assert ctx.rates.nssf_uel == Decimal("108000")
+
+    @pytest.mark.parametrize("weekly_hours", [40, 45, 48, 52])
+    def test_expected_hours_match_the_calendar(self, weekly_hours):
+        ctx = PayrollContext.for_date(date(2026, 12, 15))
+        assert ctx.expected_hours(weekly_hours) == KenyanHolidays.get_expected_hours(
+            2026, 12, weekly_hours)
+
+    def test_with_weekly_hours_returns_a_new_context(self):
+        ctx = PayrollContext.for_date(date(2026, 3, 31))
+        filled = ctx.with_weekly_hours({45, 52})
+        assert set(filled.expected) == {45, 52} and ctx.expected == {}
+        assert filled.with_weekly_hours({52}) is filled
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            filled.period = "x"
+
+    def test_holidays_outside_the_month_still_answer(self):
+        ctx = PayrollContext.for_date(date(2026, 4, 28))
+        assert ctx.is_holiday(date(2026, 5, 1))
+        assert not ctx.is_holiday(date(2026, 4, 4))
+
+
+class TestCalculatorsAcceptEither:
+    def test_month_split(self):
+        c = contract(start_date=date(2026, 7, 11), casual_start=date(2026, 7, 1))
+        d = date(2026, 7, 28)
+        assert month_split(c, PayrollContext.for_date(d)) == month_split(c, d)
+
+    def test_gross_with_monthly_divisor(self):
+        c = contract(contract_type="hourly")
+        days = [TimesheetDay(employee_id=1, date=date(2026, 4, 3),
+                             hours_normal=Decimal("8"), hours_ot_1_5=Decimal(0),
+                             hours_ot_2_0=Decimal(0), absent=False, sick=False)]
+        a = GrossCalculator(c, days, PAYROLL_DATE)
+        b = GrossCalculator(c, days, PayrollContext.for_date(PAYROLL_DATE))
+        assert a._get_divisor() == b._get_divisor()
+        assert a.calculate() == b.calculate()
+
+    def test_min_wage_message_names_the_period(self):
+        c = contract(contract_type="hourly")
+        ok, msg = MinimumWageValidator(Decimal("1000"), c, Decimal("100"),
+                                       PayrollContext.for_date(PAYROLL_DATE)).validate()
+        assert not ok and "April 2026" in msg
+
+    def test_coverage_warnings(self):
+        c = contract(start_date=date(2026, 9, 1))
+        d = date(2026, 7, 28)
+        assert contract_coverage_warnings(c, PayrollContext.for_date(d)) == \
+            contract_coverage_warnings(c, d)
+
+
+class TestEngineContext:
+    def test_batch_precomputes_every_schedule(self):
+        employees, contracts, timesheets, leave_stocks = workforce()
+        engine = PayrollEngine(PAYROLL_DATE)
+        engine.process_batch(employees, contracts, timesheets, leave_stocks)
+        assert set(engine.ctx.expected) == {c.weekly_hours for c in contracts.values()}
+
+    def test_renderer_output_is_the_same_with_a_shared_context(self):
+        employees, contracts, timesheets, leave_stocks = workforce()
+        engine = PayrollEngine(PAYROLL_DATE)
+        payslips = engine.process_batch(employees, contracts, timesheets, leave_stocks)
+        shared = PayslipRenderer(ctx=engine.ctx)
+        own = PayslipRenderer()
+        for ps in payslips:
+            assert shared.render(ps) == own.render(ps)
+        assert "Good Friday" in shared.render(payslips[0])
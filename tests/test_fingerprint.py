@@ -0,0 +1,70 @@
+"""A file's fingerprint must change exactly when its contents do.
+
+The app caches every loader, and the payroll results, on these
+fingerprints: one that stayed put after an edit would serve stale
+payslips, and one that moved on a mere re-save would throw away cached
+work. Loading timesheets file by file, as the app does to reload only
+the files that changed, must give what loading the folder gives.
+"""
+
+import os
+
+from src.fingerprint import file_fingerprint, files_fingerprint
+from src.loaders import load_timesheet_file, load_timesheet_folder
+from src.synthetic import generate_inputs
+
+
+class TestFileFingerprint:
+    def test_changes_with_contents(self, tmp_path):
+        path = tmp_path / "contracts.tsv"
+        path.write_text("employee_id\tbase_salary\n1\t30000\n")
+        before = file_fingerprint(path)
+        path.write_text("employee_id\tbase_salary\n1\t31000\n")
+        assert file_fingerprint(path) != before
+
+    def test_same_contents_saved_again_keep_it(self, tmp_path):
+        path = tmp_path / "contracts.tsv"
+        path.write_text("employee_id\n1\n")
+        before = file_fingerprint(path)
+        path.write_text("employee_id\n1\n")
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 10**9))
+        assert file_fingerprint(path) == before
+
+    def test_unchanged_stat_is_not_rehashed(self, tmp_path):
+        path = tmp_path / "contracts.tsv"
+        path.write_text("employee_id\n1\n")
+        before = file_fingerprint(path)
+        mtime = path.stat().st_mtime_ns
+        # Same size and mtime: trusted as unchanged, as make would.
+        path.write_text("employee_id\n2\n")
+        os.utime(path, ns=(mtime, mtime))
+        assert file_fingerprint(path) == before
+
+    def test_combined_fingerprint_survives_a_moved_folder(self, tmp_path):
+        for folder in (tmp_path / "a", tmp_path / "b"):
+            folder.mkdir()
+            (folder / "contracts.tsv").write_text("employee_id\n1\n")
+        a, b = (files_fingerprint(f, {f / "contracts.tsv": file_fingerprint(f / "contracts.tsv")},
+                                  2026, 1)
+                for f in (tmp_path / "a", tmp_path / "b"))
+        assert a == b
+        folder = tmp_path / "a"
+        assert files_fingerprint(folder, {folder / "contracts.tsv": "x"}, 2026, 2) != a
+
+
+class TestTimesheetFile:
+    def test_file_by_file_matches_folder(self, tmp_path):
+        generate_inputs(tmp_path, 22, (2026, 1), 2, seed=3, xlsx=False)
+        folder = tmp_path / "timesheets" / "2026_02"
+        by_file = {}
+        for path in sorted(folder.glob("*.tsv")):
+            month = load_timesheet_file(path, 2026, 2)
+            if month is not None:
+                by_file[month.employee_id] = month
+        assert by_file == load_timesheet_folder(folder, 2026, 2)
+        assert by_file
+
+    def test_name_without_id_is_skipped(self, tmp_path):
+        path = tmp_path / "notes.tsv"
+        path.write_text("date\thrs_wrkd\n2026-02-02\t8\n")
+        assert load_timesheet_file(path, 2026, 2) is None
@@ -0,0 +1,61 @@
+"""The differential fuzzer must catch a wrong fast path and shrink it.
+
+A harness that never fails proves nothing, so besides checking the real
+candidates agree with process() on a few rounds, a deliberately broken
+candidate has to be caught and cut down to the one day that breaks it.
+"""
+
+from dataclasses import replace
+
+from src.fuzz import (
+    CONTRACT_TYPES, HOUSING_TYPES, Case, compare, fuzz_round, load_repro, random_round,
+    replay, run, save_repro, shrink, _batch,
+)
+
+
+def off_on_double_time(payroll_date, cases, scratch):
+    """process_batch, but a shilling short for anyone with double time."""
+    payslips = _batch(payroll_date, cases, scratch)
+    return [replace(ps, net_pay=ps.net_pay - 1)
+            if any(d.hours_ot_2_0 for d in ps.days_worked) else ps
+            for ps in payslips]
+
+
+class TestFuzzer:
+    def test_fast_paths_agree_with_process(self):
+        cases, found = run(0, 2, 15)
+        assert cases == 30 and found == []
+
+    def test_rounds_are_reproducible_and_varied(self):
+        assert random_round("3:1", 5) == random_round("3:1", 5)
+        contracts = [c.contract for n in range(10) for c in random_round(f"0:{n}", 20)[1]]
+        assert {c.contract_type for c in contracts} == set(CONTRACT_TYPES)
+        assert {c.housing_type for c in contracts} == set(HOUSING_TYPES)
+        assert any(c.start_date is None for c in contracts)
+
+    def test_a_broken_path_is_caught_and_shrunk(self, tmp_path):
+        found = fuzz_round("0:0", 30, {"broken": off_on_double_time}, tmp_path)
+        (m,) = found
+        assert m.candidate == "broken" and "net_pay" in m.detail
+        (case,) = m.cases
+        (day,) = case.days
+        assert day.hours_ot_2_0 and not day.hours_ot_1_5 and not day.adj_with_housing
+        assert case.contract.housing_type == "none"
+
+    def test_shrink_keeps_only_what_the_failure_needs(self):
+        payroll_date, cases = random_round("1:0", 10)
+        target = cases[4].employee.employee_id
+        small = shrink(lambda d, c: any(x.employee.employee_id == target for x in c),
+                       payroll_date, cases)
+        assert [c.employee.employee_id for c in small] == [target]
+        assert small[0].days == []
+
+    def test_repro_round_trips(self, tmp_path):
+        (m,) = fuzz_round("0:0", 30, {"broken": off_on_double_time}, tmp_path)
+        save_repro(m, tmp_path / "m.json")
+        loaded = load_repro(tmp_path / "m.json")
+        assert loaded == m and isinstance(loaded.cases[0], Case)
+        assert compare("broken", loaded.payroll_date, loaded.cases, tmp_path,
+                       off_on_double_time) == m.detail
+        # Against the real batch path the same case matches
+        assert replay(replace(loaded, candidate="batch")) is None
@@ -0,0 +1,85 @@
+"""The closed-form gross-up must invert the payroll it is built from.
+
+For every target net the solver's gross, run forward through the same
+deduction and PAYE calculators, has to give the target back -- across
+band edges, the SHIF floor, the NSSF limits and the quarters benefit.
+"""
+
+from datetime import date
+from decimal import ROUND_CEILING, Decimal
+
+import pytest
+
+from src.calculators import HousingBenefitCalculator, PayrollEngine
+from src.grossup import GrossUpSolver
+from src.models import GrossBreakdown
+from src.rates import StatutoryRates
+
+from tests.test_batch import PAYROLL_DATE, contract
+
+TERMS = {
+    "gross basis": contract(1, "fixed_monthly"),
+    "base basis": contract(1, "fixed_monthly", salary_basis="base"),
+    "contracted out": contract(1, "fixed_monthly", nssf_tier="contracted_out"),
+    "quarters": contract(1, "fixed_monthly", housing_type="quarters",
+                         housing_market_value=Decimal("4000")),
+    "dorm, base basis": contract(1, "fixed_monthly", housing_type="dorm",
+                                 housing_market_value=Decimal("1500"), salary_basis="base"),
+}
+NETS = [Decimal(n) for n in range(-300, 1_200_000, 1_771)] + [
+    Decimal("0"), Decimal("20000.01"), Decimal("99999.99"), Decimal("5000000")]
+
+
+def solver(name, payroll_date=PAYROLL_DATE):
+    return GrossUpSolver(StatutoryRates(payroll_date), TERMS[name])
+
+
+class TestInverse:
+    @pytest.mark.parametrize("name", TERMS)
+    @pytest.mark.parametrize("payroll_date", [date(2026, 1, 31), PAYROLL_DATE])
+    def test_net_of_the_gross_is_the_target(self, name, payroll_date):
+        s = solver(name, payroll_date)
+        for net, gross in zip(NETS, s.gross_many(NETS)):
+            assert abs(s.net_for_gross(gross) - net) < Decimal("1E-15"), net
+            assert s.gross_for_net(net) == gross
+
+    @pytest.mark.parametrize("name", TERMS)
+    def test_kinks_are_exact(self, name):
+        # At every kink the inverse must land back on the kink itself.
+        s = solver(name)
+        for g in s._grosses:
+            assert abs(s.gross_for_net(s.net_for_gross(g)) - g) < Decimal("1E-15")
+
+    def test_below_a_zero_gross(self):
+        with pytest.raises(ValueError):
+            solver("gross basis").gross_for_net(Decimal("-301"))
+
+    def test_bonus(self):
+        s = solver("quarters")
+        extra = s.bonus_for_net(Decimal("80000"), Decimal("10000"))
+        after = s.net_for_gross(Decimal("80000") + extra)
+        assert abs(after - s.net_for_gross(Decimal("80000")) - Decimal("10000")) < Decimal("1E-15")
+
+
+class TestAgainstTheEngine:
+    @pytest.mark.parametrize("name", TERMS)
+    def test_engine_settles_to_the_target(self, name):
+        # The solver's forward model is the engine's steps 4-8; hand the
+        # engine the quoted gross and it must pay the target to the cent.
+        s = solver(name)
+        answer = s.solve(Decimal("45000"))
+        gross = answer.total_gross.quantize(Decimal("0.01"), rounding=ROUND_CEILING)
+        benefit = HousingBenefitCalculator(TERMS[name], gross).calculate()
+        breakdown = GrossBreakdown(
+            base_pay=gross, overtime_1_5=Decimal(0), overtime_2_0=Decimal(0),
+            housing_allowance=Decimal(0), housing_benefit=benefit, total_gross=gross)
+        [_], [net] = PayrollEngine(PAYROLL_DATE)._settle([breakdown], [TERMS[name]])
+        assert Decimal("45000") <= net < Decimal("45000.01")
+
+    def test_salary_basis(self):
+        gross_basis = solver("gross basis").solve(Decimal("45000"))
+        base_basis = solver("base basis").solve(Decimal("45000"))
+        assert gross_basis.total_gross == base_basis.total_gross
+        assert gross_basis.base_salary == gross_basis.total_gross
+        assert base_basis.base_salary * Decimal("1.15") == pytest.approx(base_basis.total_gross)
+        assert solver("dorm, base basis").solve(Decimal("45000")).housing_allowance == 0
@@ -0,0 +1,137 @@
+"""The indexed holiday calendar must agree with the old per-call lists.
+
+Easter is now computed rather than tabled, and gazetted dates come in
+through override files, so these pin the computed dates and the override
+rules against the published 2026 calendar.
+"""
+
+from calendar import monthrange
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from src.calculators import PayrollEngine
+from src.context import PayrollContext
+from src.loaders import load_holiday_overrides, read_holiday_overrides
+from src.rates import KenyanHolidays, easter_sunday
+
+from tests.test_batch import PAYROLL_DATE, workforce
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture(autouse=True)
+def clean_calendar():
+    KenyanHolidays.clear_overrides()
+    yield
+    KenyanHolidays.clear_overrides()
+
+
+def write_overrides(path, rows):
+    path.write_text("date\tname\tnotes\n" + "".join(f"{d}\t{n}\t\n" for d, n in rows))
+    return path
+
+
+class TestEaster:
+    @pytest.mark.parametrize("year, expected", [
+        (2024, date(2024, 3, 31)),
+        (2025, date(2025, 4, 20)),
+        (2026, date(2026, 4, 5)),
+        (2027, date(2027, 3, 28)),
+        (2028, date(2028, 4, 16)),
+        (2038, date(2038, 4, 25)),
+    ])
+    def test_computus(self, year, expected):
+        assert easter_sunday(year) == expected
+
+    def test_good_friday_and_easter_monday_for_an_untabled_year(self):
+        names = {h.name: h.date for h in KenyanHolidays.get_holidays_for_year(2030)}
+        assert names["Good Friday"] == date(2030, 4, 19)
+        assert names["Easter Monday"] == date(2030, 4, 22)
+        assert "Eid ul-Fitr" not in names
+
+
+class TestCalendar:
+    def test_published_2026_file_changes_nothing(self):
+        before = KenyanHolidays.get_holidays_for_year(2026)
+        n = KenyanHolidays.load_overrides(FIXTURES / "public_holidays_2026.tsv")
+        assert n == 10
+        assert KenyanHolidays.get_holidays_for_year(2026) == before
+
+    def test_published_2026_dates_are_all_holidays(self):
+        cal = KenyanHolidays.calendar(2026)
+        lines = (FIXTURES / "public_holidays_2026.tsv").read_text().splitlines()[1:]
+        for line in lines:
+            assert cal.is_holiday(date.fromisoformat(line.split("\t")[0]))
+        assert not cal.is_holiday(date(2026, 4, 4))
+
+    def test_override_replaces_estimate_by_name(self, tmp_path):
+        write_overrides(tmp_path / "h.tsv", [("2026-03-20", "Eid ul-Fitr")])
+        KenyanHolidays.calendar(2026)  # built before the override lands
+        KenyanHolidays.load_overrides(tmp_path / "h.tsv")
+
+        march = KenyanHolidays.get_holidays_for_month(2026, 3)
+        assert [(h.date, h.is_estimated) for h in march] == [(date(2026, 3, 20), False)]
+        assert not KenyanHolidays.calendar(2026).is_holiday(date(2026, 3, 30))
+
+    def test_override_adds_one_off_holiday(self, tmp_path):
+        write_overrides(tmp_path / "h.tsv", [("2026-11-17", "National Tree Growing Day")])
+        before = KenyanHolidays.count_working_days(2026, 11, 6)
+        KenyanHolidays.load_overrides(tmp_path / "h.tsv")
+        assert KenyanHolidays.count_working_days(2026, 11, 6) == before - 1
+
+    def test_loading_another_folder_drops_earlier_overrides(self, tmp_path):
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        write_overrides(tmp_path / "a" / "public_holidays.tsv",
+                        [("2026-11-17", "National Tree Growing Day")])
+        assert load_holiday_overrides(tmp_path / "a") == 1
+        assert KenyanHolidays.calendar(2026).is_holiday(date(2026, 11, 17))
+        assert load_holiday_overrides(tmp_path / "b") == 0
+        assert not KenyanHolidays.calendar(2026).is_holiday(date(2026, 11, 17))
+
+    @pytest.mark.parametrize("year", [2026, 2027, 2031])
+    @pytest.mark.parametrize("days_per_week", [5, 6])
+    def test_working_days_match_a_day_by_day_count(self, year, days_per_week):
+        holidays = {h.date for h in KenyanHolidays.get_holidays_for_year(year)}
+        for month in range(1, 13):
+            expected = sum(
+                1 for day in range(1, monthrange(year, month)[1] + 1)
+                if date(year, month, day).weekday() < days_per_week
+                and date(year, month, day) not in holidays
+            )
+            assert KenyanHolidays.count_working_days(year, month, days_per_week) == expected
+
+
+class TestContextOverrides:
+    """Overrides read for a context must reach the run without touching the
+    process-wide calendar, as the app relies on."""
+
+    def test_reading_a_folder_changes_nothing_process_wide(self, tmp_path):
+        write_overrides(tmp_path / "public_holidays.tsv",
+                        [("2026-11-17", "National Tree Growing Day")])
+        overrides = read_holiday_overrides(tmp_path)
+        assert len(overrides) == 1
+        assert not KenyanHolidays.calendar(2026).is_holiday(date(2026, 11, 17))
+
+        ctx = PayrollContext.for_date(date(2026, 11, 30), holiday_overrides=overrides)
+        plain = PayrollContext.for_date(date(2026, 11, 30))
+        assert date(2026, 11, 17) in ctx.holiday_dates
+        assert date(2026, 11, 17) not in plain.holiday_dates
+        assert ctx.expected_hours(45) == plain.expected_hours(45) - 9
+        assert ctx.is_holiday(date(2026, 11, 17))
+        # Out of the month, as for a week that straddles it.
+        december = PayrollContext.for_date(date(2026, 12, 31), holiday_overrides=overrides)
+        assert december.is_holiday(date(2026, 11, 17))
+
+    def test_engine_and_workers_use_the_contexts_holidays(self, tmp_path):
+        write_overrides(tmp_path / "public_holidays.tsv", [("2026-04-15", "One-off Day")])
+        inputs = workforce()
+        engine = PayrollEngine(PAYROLL_DATE)
+        engine.ctx = PayrollContext.for_date(
+            PAYROLL_DATE, holiday_overrides=read_holiday_overrides(tmp_path))
+        serial = engine.process_batch(*inputs)
+        assert engine.process_batch(*inputs, workers=2) == serial
+        assert serial != PayrollEngine(PAYROLL_DATE).process_batch(*inputs)
+        assert not KenyanHolidays.calendar(2026).is_holiday(date(2026, 4, 15))
@@ -0,0 +1,65 @@
+"""A rerun must reuse unchanged employees and give the same payslips.
+
+process_incremental skips employees whose fingerprinted inputs match the
+previous run; whatever it reuses or recomputes, the list it returns has
+to equal a fresh process_batch over the same inputs.
+"""
+
+from dataclasses import replace
+from decimal import Decimal
+
+from src.calculators import PayrollEngine
+from src.incremental import PreviousRun, process_incremental
+from src.models import TimesheetMonth
+from src.serialize import payslip_from_dict, payslip_to_dict
+
+from tests.test_batch import PAYROLL_DATE, workforce
+
+
+def rerun(previous, *inputs):
+    return process_incremental(PayrollEngine(PAYROLL_DATE), *inputs, previous)
+
+
+class TestSerialize:
+    def test_payslips_round_trip(self):
+        for ps in PayrollEngine(PAYROLL_DATE).process_batch(*workforce()):
+            again = payslip_from_dict(payslip_to_dict(ps))
+            assert again == ps
+            assert isinstance(again.days_worked, TimesheetMonth)
+            assert str(again.days_worked[0].hours_normal) == str(ps.days_worked[0].hours_normal)
+
+
+class TestIncremental:
+    def test_first_run_computes_everyone(self):
+        inputs = workforce()
+        payslips, recomputed, _ = rerun(PreviousRun(2026, 4), *inputs)
+        assert payslips == PayrollEngine(PAYROLL_DATE).process_batch(*inputs)
+        assert recomputed == sorted(inputs[1])
+
+    def test_one_cell_fix_recomputes_one_employee(self, tmp_path):
+        employees, contracts, timesheets, stocks = workforce()
+        _, _, first = rerun(PreviousRun(2026, 4), employees, contracts, timesheets, stocks)
+        first.save(tmp_path / "state.json")
+
+        timesheets[3][4] = replace(timesheets[3][4], hours_ot_1_5=Decimal("1.5"))
+        contracts[8] = replace(contracts[8], base_salary=Decimal("640000"))
+        previous = PreviousRun.load(tmp_path / "state.json", 2026, 4)
+        payslips, recomputed, _ = rerun(previous, employees, contracts, timesheets, stocks)
+
+        assert recomputed == [3, 8]
+        assert payslips == PayrollEngine(PAYROLL_DATE).process_batch(
+            employees, contracts, timesheets, stocks)
+
+    def test_state_for_another_month_is_ignored(self, tmp_path):
+        inputs = workforce()
+        _, _, first = rerun(PreviousRun(2026, 4), *inputs)
+        first.save(tmp_path / "state.json")
+        assert PreviousRun.load(tmp_path / "state.json", 2026, 5).entries == {}
+        assert PreviousRun.load(tmp_path / "missing.json", 2026, 4).entries == {}
+
+    def test_changed_code_invalidates_the_state(self, tmp_path, monkeypatch):
+        inputs = workforce()
+        _, _, first = rerun(PreviousRun(2026, 4), *inputs)
+        first.save(tmp_path / "state.json")
+        monkeypatch.setattr("src.incremental.code_version", lambda: "edited")
+        assert PreviousRun.load(tmp_path / "state.json", 2026, 4).entries == {}
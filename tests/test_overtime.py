@@ -0,0 +1,95 @@
+"""Derived overtime must follow the daily and weekly limits to the hour.
+
+Whatever the supervisor would have entered by hand -- the hours past 9 in
+a day, the hours that take the week past 52, at 2.0x on a rest day or a
+holiday -- the one forward pass has to arrive at the same figures.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from src.calculators import PayrollEngine, default_leave_stock
+from src.context import PayrollContext
+from src.models import LeaveStock, TimesheetDay, TimesheetMonth
+from src.overtime import derive_month, derive_overtime
+
+from tests.test_batch import contract, employee
+
+
+def days(first, hours, ot_1_5=Decimal(0)):
+    """Consecutive days from first, one per entry in hours."""
+    return [TimesheetDay(employee_id=1, date=first + timedelta(days=i),
+                         hours_normal=Decimal(h), hours_ot_1_5=ot_1_5,
+                         hours_ot_2_0=Decimal(0), absent=False, sick=False)
+            for i, h in enumerate(hours)]
+
+
+def overtime(timesheet, weekly_hours=52, opening=None):
+    ctx = PayrollContext.for_date(timesheet[0].date)
+    derived, _ = derive_overtime(timesheet, contract(1, "fixed_monthly",
+                                                     weekly_hours=weekly_hours), ctx, opening)
+    return [(d.hours_ot_1_5, d.hours_ot_2_0) for d in derived]
+
+
+class TestDeriveOvertime:
+    def test_hours_past_the_daily_limit(self):
+        assert overtime(days(date(2026, 7, 6), ["11", "9"])) == [(2, 0), (0, 0)]
+
+    def test_hours_past_the_weekly_limit(self):
+        # Mon 6 to Sat 11 Jul at 9h: the Saturday takes the week to 54h.
+        assert overtime(days(date(2026, 7, 6), ["9"] * 6))[-1] == (2, 0)
+
+    def test_daily_overtime_does_not_count_toward_the_week(self):
+        # 5 x 10h is 45h of regular time and 5h of daily overtime; a 7h
+        # Saturday brings regular time to 52h exactly.
+        assert overtime(days(date(2026, 7, 6), ["10"] * 5 + ["7"])) == [(1, 0)] * 5 + [(0, 0)]
+
+    def test_rest_days_follow_the_schedule(self):
+        saturday = days(date(2026, 7, 11), ["10"])
+        assert overtime(saturday, weekly_hours=52) == [(1, 0)]
+        assert overtime(saturday, weekly_hours=45) == [(0, 1)]
+        assert overtime(days(date(2026, 7, 12), ["10"])) == [(0, 1)]  # Sunday
+
+    def test_holiday_overtime_is_double_time(self):
+        assert overtime(days(date(2026, 10, 20), ["10"])) == [(0, 1)]  # Mashujaa Day
+
+    def test_open_week_from_last_month_counts(self):
+        # Sat 1 Aug closes a week that had 45h in July.
+        opening = LeaveStock(1, Decimal(0), Decimal(0), Decimal(0), date(2026, 7, 31),
+                             open_week=date(2026, 7, 27), open_week_hours=Decimal("45"),
+                             open_week_regular_hours=Decimal("45"))
+        assert overtime(days(date(2026, 8, 1), ["9"])) == [(0, 0)]
+        assert overtime(days(date(2026, 8, 1), ["9"]), opening=opening) == [(2, 0)]
+
+    def test_week_split_across_months_matches_one_pass(self):
+        # Mon 29 and Tue 30 Sep at 12h are 18h of regular time and 6h of
+        # daily overtime; with Wed 1 to Fri 3 Oct at 8h the week has 42h of
+        # regular time, short of the weekly limit.
+        september = days(date(2025, 9, 29), ["12"] * 2)
+        october = days(date(2025, 10, 1), ["8"] * 3)
+        one_pass = overtime(september + october)
+        assert one_pass[2:] == [(0, 0)] * 3
+
+        c = contract(1, "fixed_monthly")
+        closing = PayrollEngine(date(2025, 9, 28)).process(
+            employee(1), c, september, default_leave_stock(1, c, date(2025, 9, 28)),
+        ).leave.updated_stock
+        assert (closing.open_week, closing.open_week_hours,
+                closing.open_week_regular_hours) == (date(2025, 9, 29), 24, 18)
+        packed = PayrollEngine(date(2025, 9, 28)).process(
+            employee(1), c, TimesheetMonth(1, 2025, 9, september),
+            default_leave_stock(1, c, date(2025, 9, 28)),
+        ).leave.updated_stock
+        assert packed == closing
+        assert overtime(october, opening=closing) == one_pass[2:]
+
+    def test_mismatches_against_hand_entered_figures(self):
+        entered = days(date(2026, 7, 6), ["11", "8"], ot_1_5=Decimal("1"))
+        ts = {1: TimesheetMonth(1, 2026, 7, entered), 2: entered}
+        out, mismatches = derive_month(ts, {1: contract(1, "fixed_monthly")},
+                                       PayrollContext.for_date(date(2026, 7, 28)))
+        assert isinstance(out[1], TimesheetMonth)
+        assert out[2] is entered  # no contract, left as entered
+        assert [(m.date.day, m.entered, m.derived) for m in mismatches[1]] == [
+            (6, (1, 0), (2, 0)), (7, (1, 0), (0, 0))]
+        assert out[1].totals["hours_ot_1_5"] == 2
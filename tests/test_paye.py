@@ -0,0 +1,86 @@
+"""The compiled PAYE table against the band walk and published figures.
+
+PAYETable replaces the per-employee walk up the tax bands with a bisect
+into precomputed offsets. It has to agree with the walk to the last
+Decimal digit, and both have to agree with the third-party calculators
+recorded in tests/fixtures/single_source_truth_tests/.
+"""
+
+import re
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from src.calculators import PAYECalculator, PAYETable
+from src.rates import StatutoryRates
+
+TRUTH = Path(__file__).parent / "fixtures" / "single_source_truth_tests"
+
+
+def _amount(text):
+    return Decimal(text.replace(",", ""))
+
+
+def aren_cases():
+    """(taxable pay, PAYE) from the aren.software January 2026 printouts."""
+    text = (TRUTH / "test_cases_aren.txt").read_text()
+    paye = re.findall(r"^\s+PAYE\t([\d,.]+)", text, re.M)
+    taxable = re.findall(r"^Taxable Pay\t \t([\d,.]+)", text, re.M)
+    assert len(paye) == len(taxable) > 0
+    return [(_amount(t), _amount(p)) for t, p in zip(taxable, paye)]
+
+
+def published_cases():
+    """(taxable pay, PAYE) from the netpay / HR Fleek examples, February 2026 on."""
+    text = (TRUTH / "specific_published_examples.txt").read_text()
+    taxable = re.findall(r"^\| Taxable Pay\s+\| ([\d,.]+)", text, re.M)
+    paye = re.findall(r"^\| PAYE Tax\s+\| ([\d,.]+)", text, re.M)
+    assert len(paye) == len(taxable) > 0
+    return [(_amount(t), _amount(p)) for t, p in zip(taxable, paye)]
+
+
+class TestPublishedExamples:
+    @pytest.mark.parametrize("taxable, expected", aren_cases())
+    def test_aren_january_2026_to_the_cent(self, taxable, expected):
+        calc = PAYECalculator(StatutoryRates(date(2026, 1, 31)))
+        assert calc.calculate(taxable) == expected
+        assert calc.calculate_banded(taxable) == expected
+
+    @pytest.mark.parametrize("taxable, expected", published_cases())
+    def test_published_examples_to_the_shilling(self, taxable, expected):
+        # These sources round PAYE to whole shillings.
+        calc = PAYECalculator(StatutoryRates(date(2026, 2, 28)))
+        assert abs(calc.calculate(taxable) - expected) < 1
+        assert calc.calculate(taxable) == calc.calculate_banded(taxable)
+
+
+class TestCompiledTable:
+    def _values(self, rates):
+        edges = [limit for limit, _ in rates.tax_bands]
+        values = [Decimal(v) for v in ("-500", "0", "0.01", "12345.67", "2400", "23999.99")]
+        for e in edges:
+            values += [e - Decimal("0.01"), e, e + Decimal("0.01")]
+        values += [Decimal(v) / 7 for v in range(0, 2_000_000, 13_337)]
+        values.append(Decimal("5000000000"))
+        return values
+
+    def test_matches_the_band_walk_exactly(self):
+        calc = PAYECalculator(StatutoryRates(date(2026, 4, 30)))
+        for v in self._values(calc.rates):
+            assert calc.calculate(v) == calc.calculate_banded(v), v
+
+    def test_column_api_matches_single_lookups(self):
+        calc = PAYECalculator(StatutoryRates(date(2026, 4, 30)))
+        values = self._values(calc.rates)
+        assert calc.calculate_many(values) == [calc.calculate(v) for v in values]
+
+    def test_one_compiled_table_per_rate_table(self):
+        a = PAYETable.for_rates(StatutoryRates(date(2026, 1, 31)))
+        b = PAYETable.for_rates(StatutoryRates(date(2026, 9, 30)))
+        assert a is b  # the bands did not change with the NSSF year
+
+        rates = StatutoryRates(date(2026, 9, 30))
+        rates.personal_relief = Decimal("3000")
+        assert PAYETable.for_rates(rates) is not a
@@ -0,0 +1,122 @@
+"""The phase profiler has to account for the time it was shown.
+
+Every phase entered must appear in the table with its calls and times
+added up across re-entries, and the collapsed stacks rebuilt from
+cProfile's caller/callee graph must sum to the same total as the pstats
+they came from -- recursion included -- or a flame graph drawn from them
+would not show where the run actually went. Rebuilding them has to stay
+quick on any graph, importlib's included, or --profile hangs at the end
+of a real run.
+"""
+
+import importlib
+import pstats
+import sys
+import time
+
+from src import profiling
+from src.calculators import PayrollEngine
+from src.profiling import PhaseProfiler, collapsed_stacks
+
+from tests.test_batch import PAYROLL_DATE, workforce
+
+
+def fib(n):
+    return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+
+# Not imported by the package or the tests, so importing them drives the
+# whole of importlib: nested imports, finders, loaders, module bodies.
+STDLIB = ("xml.dom.minidom", "email.mime.multipart", "http.client", "logging.handlers",
+          "smtplib", "ftplib", "tarfile", "plistlib", "mailbox", "asyncio")
+
+
+def profile_imports():
+    """A cProfile of importing STDLIB from scratch. sys.modules is put back
+    afterwards, so no module object in use is replaced."""
+    saved = dict(sys.modules)
+    for name in list(sys.modules):
+        if name.split(".")[0] in {m.split(".")[0] for m in STDLIB}:
+            del sys.modules[name]
+    profiler = PhaseProfiler()
+    try:
+        with profiler.phase("imports"):
+            for name in STDLIB:
+                importlib.import_module(name)
+    finally:
+        sys.modules.clear()
+        sys.modules.update(saved)
+    return profiler.profiles["imports"]
+
+
+def total_micros(profile):
+    return round(pstats.Stats(profile).total_tt * 1e6)
+
+
+class TestPhaseProfiler:
+    def test_phases_accumulate(self):
+        profiler = PhaseProfiler()
+        for _ in range(3):
+            with profiler.phase("compute"):
+                PayrollEngine(PAYROLL_DATE).process_batch(*workforce())
+        with profiler.phase("load"):
+            workforce()
+        assert list(profiler.phases) == ["compute", "load"]
+        assert profiler.phases["compute"]["calls"] == 3
+        assert profiler.phases["compute"]["wall"] > 0
+        assert "compute" in profiler.report().splitlines()[1]
+
+    def test_failed_phase_is_still_recorded(self):
+        profiler = PhaseProfiler()
+        try:
+            with profiler.phase("sync"):
+                raise RuntimeError("network down")
+        except RuntimeError:
+            pass
+        assert profiler.phases["sync"]["calls"] == 1
+
+    def test_writes_pstats_and_collapsed_stacks(self, tmp_path):
+        profiler = PhaseProfiler()
+        with profiler.phase("compute"):
+            PayrollEngine(PAYROLL_DATE).process_batch(*workforce())
+        names = {p.name for p in profiler.write(tmp_path)}
+        assert names == {"compute.pstats", "profile.pstats", "profile.collapsed",
+                         "phases.txt"}
+        assert pstats.Stats(str(tmp_path / "profile.pstats")).total_calls > 0
+        lines = (tmp_path / "profile.collapsed").read_text().splitlines()
+        assert lines and all(line.startswith("compute;") for line in lines)
+
+
+class TestCollapsedStacks:
+    def collapse(self, fn):
+        profiler = PhaseProfiler()
+        with profiler.phase("p"):
+            fn()
+        profile = profiler.profiles["p"]
+        return collapsed_stacks(pstats.Stats(profile).stats), profile
+
+    def test_total_matches_pstats(self):
+        stacks, profile = self.collapse(
+            lambda: PayrollEngine(PAYROLL_DATE).process_batch(*workforce()))
+        # Each stack is rounded to the microsecond on its own.
+        assert abs(sum(m for _, m in stacks) - total_micros(profile)) <= len(stacks)
+
+    def test_recursion_is_counted_once(self):
+        stacks, profile = self.collapse(lambda: fib(16))
+        assert abs(sum(m for _, m in stacks) - total_micros(profile)) <= len(stacks)
+        # A recursive function is one frame in the stack, not one per level.
+        assert max(sum("fib" in frame for frame in s) for s, _ in stacks) == 1
+
+    def test_import_graph_is_bounded(self, monkeypatch):
+        # Every caller->callee path through importlib is exponentially many
+        # stacks; the rebuild has to fold them rather than walk them all.
+        stats = pstats.Stats(profile_imports()).stats
+        assert len(stats) > 500
+        frames = []
+        monkeypatch.setattr(profiling, "_frame",
+                            lambda func: frames.append(func) or func[2])
+        start = time.perf_counter()
+        stacks = collapsed_stacks(stats)
+        assert time.perf_counter() - start < 10
+        assert stacks
+        assert len(frames) <= 2 * profiling._MAX_NODES
@@ -0,0 +1,123 @@
+"""A projected month must be the payroll run of a month of standard attendance.
+
+project_costs never looks at a timesheet, so the check is that for every
+employee-month its figures equal what PayrollEngine computes from a
+timesheet with the expected hours on every working day of the contract.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from src.calculators import PayrollEngine, default_leave_stock
+from src.context import PayrollContext
+from src.models import LeaveStock, TimesheetDay
+from src.projection import month_ends, project_costs, standard_gross
+
+from tests.test_batch import contract, employee, workforce
+
+
+def standard_month(c, last_day):
+    """Full attendance on every working day the contract covers."""
+    weekly = c.weekly_hours or 45
+    days_per_week = 6 if weekly >= 48 else 5
+    hours = Decimal(weekly) / days_per_week
+    ctx = PayrollContext.for_date(last_day)
+    starts = [d for d in (c.casual_start, c.start_date) if d is not None]
+    out = []
+    d = ctx.first_day
+    while d <= last_day:
+        working = (d.weekday() < days_per_week and d not in ctx.holiday_dates
+                   and d >= min(starts))
+        out.append(TimesheetDay(
+            employee_id=c.employee_id, date=d,
+            hours_normal=hours if working else Decimal(0),
+            hours_ot_1_5=Decimal(0), hours_ot_2_0=Decimal(0),
+            absent=False, sick=False,
+        ))
+        d += timedelta(days=1)
+    return out
+
+
+def engine_month(contracts, last_day):
+    payroll_date = last_day.replace(day=28)
+    ids = [i for i, c in contracts.items()
+           if min(d for d in (c.casual_start, c.start_date) if d) <= last_day]
+    employees = {i: employee(i) for i in ids}
+    timesheets = {i: standard_month(contracts[i], last_day) for i in ids}
+    stocks = {i: default_leave_stock(i, contracts[i], payroll_date)
+              if contracts[i].start_date is not None
+              else LeaveStock(i, Decimal(0), Decimal(0), Decimal(0), last_day)
+              for i in ids}
+    payslips = PayrollEngine(payroll_date).process_batch(
+        employees, {i: contracts[i] for i in ids}, timesheets, stocks)
+    return {ps.employee.employee_id: ps for ps in payslips}
+
+
+class TestProjection:
+    def test_matches_engine_at_standard_attendance(self):
+        contracts = workforce()[1]
+        # Across the NSSF Year 4 transition, with casual and mid-month starts
+        projections = project_costs(contracts, (2026, 1), 5)
+        assert [(p.year, p.month) for p in projections] == [(2026, m) for m in range(1, 6)]
+        for p in projections:
+            payslips = engine_month(contracts, month_ends((p.year, p.month), 1)[0])
+            assert set(p.pay) == set(payslips)
+            for emp_id, pay in p.pay.items():
+                ps = payslips[emp_id]
+                assert pay.gross == ps.gross.total_gross, (p.month, emp_id)
+                assert pay.housing_benefit == ps.gross.housing_benefit
+                assert pay.paye == ps.deductions.paye
+                assert pay.net_pay == ps.net_pay, (p.month, emp_id)
+
+    def test_rates_follow_the_month(self):
+        contracts = {1: contract(1, "fixed_monthly", base=Decimal("150000"))}
+        jan, feb = project_costs(contracts, (2026, 1), 2)
+        assert jan.rates.nssf_uel == Decimal("72000")
+        assert feb.rates.nssf_uel == Decimal("108000")
+        assert feb.pay[1].nssf_employer == (Decimal("108000") * Decimal("0.06"))
+        assert jan.pay[1].gross == feb.pay[1].gross
+
+    def test_rate_changes_apply_from_their_date(self):
+        contracts = {1: contract(1, "fixed_monthly", base=Decimal("50000"))}
+        out = project_costs(contracts, (2026, 5), 3,
+                            rate_changes=[(date(2026, 6, 1), {"shif_rate": Decimal("0.03")})])
+        assert [p.rates.shif_rate for p in out] == [
+            Decimal("0.0275"), Decimal("0.03"), Decimal("0.03")]
+        assert out[1].pay[1].shif == Decimal("50000") * Decimal("0.03")
+
+    def test_contract_window(self):
+        c = contract(1, "fixed_monthly", base=Decimal("31000"),
+                     start_date=date(2026, 3, 1))
+        c.end_date = date(2026, 5, 15)
+        out = project_costs({1: c}, (2026, 2), 5)
+        assert [p.headcount for p in out] == [0, 1, 1, 1, 0]
+        assert out[3].pay[1].gross == Decimal("31000") * Decimal(15) / Decimal(31)
+
+        c.status = "terminated"
+        assert all(p.headcount == 0 for p in project_costs({1: c}, (2026, 3), 2))
+
+    def test_casual_only_pays_working_days(self):
+        c = contract(1, "fixed_monthly", start_date=None, casual_start=date(2026, 4, 1))
+        ctx = PayrollContext.for_date(date(2026, 4, 30))
+        # Mon-Sat in April 2026 less Good Friday and Easter Monday
+        assert standard_gross(c, ctx) == Decimal("868.44") * 24 * Decimal("1.15")
+
+    def test_totals(self):
+        contracts = workforce()[1]
+        (p,) = project_costs(contracts, (2026, 4), 1)
+        assert p.total("employer_cost") == (p.total("gross") + p.total("nssf_employer")
+                                            + p.total("ahl_employer"))
+
+    def test_large_workforce(self):
+        base = workforce()[1]
+        contracts = {}
+        for i in range(3000):
+            c = base[i % len(base) + 1]
+            contracts[i] = contract(
+                i, c.contract_type, base=c.base_salary + i,
+                weekly_hours=c.weekly_hours, housing_type=c.housing_type,
+                housing_market_value=c.housing_market_value,
+                salary_basis=c.salary_basis, start_date=c.start_date,
+                casual_start=c.casual_start)
+        out = project_costs(contracts, (2026, 5), 24)
+        assert all(p.headcount == 3000 for p in out)
@@ -0,0 +1,73 @@
+"""Scenario totals must be the totals a full run under those rates gives.
+
+run_scenarios reuses one gross column for every rate table, so the check
+is that each scenario reproduces process_batch under its own rates.
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from src.calculators import PayrollEngine
+from src.rates import StatutoryRates
+from src.scenarios import load_scenarios, run_scenarios, scenario_rates
+
+from tests.test_batch import PAYROLL_DATE, workforce
+
+
+def full_run(rates, inputs):
+    engine = PayrollEngine(PAYROLL_DATE)
+    engine.ctx = engine.ctx.with_rates(rates)
+    return engine.process_batch(*inputs)
+
+
+class TestScenarios:
+    def test_each_scenario_matches_a_full_run(self):
+        inputs = workforce()
+        actual = StatutoryRates(PAYROLL_DATE)
+        variants = [
+            ("actual", actual),
+            ("shif 3%", scenario_rates(actual, shif_rate=Decimal("0.03"))),
+            ("nssf limits", scenario_rates(actual, nssf_lel=Decimal("10000"),
+                                           nssf_uel=Decimal("120000"))),
+            ("flat 30%", scenario_rates(actual, tax_bands=[(Decimal("999999999"),
+                                                            Decimal("0.30"))])),
+        ]
+        results = run_scenarios(PAYROLL_DATE, *inputs, variants, detail=True)
+        assert [r.name for r in results] == [name for name, _ in variants]
+        for (_, rates), totals in zip(variants, results):
+            payslips = full_run(rates, inputs)
+            assert totals.net_pay == sum(ps.net_pay for ps in payslips)
+            assert totals.paye == sum(ps.deductions.paye for ps in payslips)
+            assert totals.shif == sum(ps.deductions.shif for ps in payslips)
+            assert totals.net_by_employee == {ps.employee.employee_id: ps.net_pay
+                                              for ps in payslips}
+            assert totals.employer_cost == (totals.gross + totals.nssf_employer
+                                            + totals.ahl_employer)
+
+    def test_parallel_matches_serial(self):
+        inputs = workforce()
+        actual = StatutoryRates(PAYROLL_DATE)
+        variants = [(f"shif {n}", scenario_rates(actual, shif_rate=Decimal(n) / 10000))
+                    for n in range(250, 550)]
+        serial = run_scenarios(PAYROLL_DATE, *inputs, variants, detail=True)
+        assert run_scenarios(PAYROLL_DATE, *inputs, variants, workers=2, detail=True) == serial
+
+    def test_load_scenarios(self, tmp_path):
+        path = tmp_path / "what_if.tsv"
+        path.write_text("name\tshif_rate\ttax_bands\tpersonal_relief\n"
+                        "shif 3%\t0.03\t\t\n"
+                        "two bands\t\t24000:0.10, 999999999:0.30\t3000\n")
+        actual = StatutoryRates(PAYROLL_DATE)
+        (a, ra), (b, rb) = load_scenarios(path, actual)
+        assert (a, ra.shif_rate, ra.tax_bands) == ("shif 3%", Decimal("0.03"), actual.tax_bands)
+        assert rb.tax_bands == [(Decimal("24000"), Decimal("0.10")),
+                                (Decimal("999999999"), Decimal("0.30"))]
+        assert rb.personal_relief == Decimal("3000") and rb.shif_rate == actual.shif_rate
+        assert actual.shif_rate == Decimal("0.0275")  # the base is not touched
+
+    def test_unknown_rate(self, tmp_path):
+        path = tmp_path / "bad.tsv"
+        path.write_text("name\tshif_rat\nx\t0.03\n")
+        with pytest.raises(ValueError, match="shif_rat"):
+            load_scenarios(path, StatutoryRates(PAYROLL_DATE))
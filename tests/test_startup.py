@@ -0,0 +1,65 @@
+"""Starting run_payroll.py must not load what the run may never use.
+
+gspread, the Google auth stack, openpyxl and reportlab are imported only
+on the code paths that sync, extract, render PDFs or upload. --help, a
+--no-save preview and a --replay-file run start without them, so
+importing the CLI (and through it the src package) stays within a fixed
+time budget. The imports are checked in a fresh interpreter, as a cold
+start would see them.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+
+HEAVY = ("gspread", "google", "openpyxl", "reportlab", "numpy", "pandas", "streamlit")
+# Cumulative import time of run_payroll, best of a few cold interpreters.
+# Well above what it takes today (a few tens of milliseconds), and well
+# below what any of the libraries above would add.
+BUDGET_SECONDS = 0.25
+
+
+def fresh_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], cwd=REPO, capture_output=True,
+                          text=True, timeout=60)
+
+
+def import_seconds(module: str) -> float:
+    """Cumulative time -X importtime reports for importing module."""
+    result = fresh_python("-X", "importtime", "-c", f"import {module}")
+    assert result.returncode == 0, result.stderr
+    for line in result.stderr.splitlines():
+        _, _, cumulative, name = (part.strip() for part in line.replace("|", ":").split(":"))
+        if name == module:
+            return int(cumulative) / 1e6
+    raise AssertionError(f"{module} not in -X importtime output")
+
+
+def loaded_after_import(module: str) -> list[str]:
+    result = fresh_python("-c", f"import sys, {module}; print(' '.join(sys.modules))")
+    assert result.returncode == 0, result.stderr
+    loaded = result.stdout.split()
+    return [m for m in loaded if m.split(".")[0] in HEAVY]
+
+
+class TestStartup:
+    def test_cli_loads_no_heavy_dependency(self):
+        assert loaded_after_import("run_payroll") == []
+
+    def test_src_modules_load_no_heavy_dependency(self):
+        for module in ("src.gsync", "src.outputs", "src.loaders", "src.calculators",
+                       "src.snapshot", "extract_timesheets_xlsx2tsvs"):
+            assert loaded_after_import(module) == [], module
+
+    def test_help_runs_without_the_google_client(self):
+        result = fresh_python("run_payroll.py", "--help")
+        assert result.returncode == 0, result.stderr
+        assert "--replay-file" in result.stdout
+
+    def test_import_time_budget(self):
+        seconds = min(import_seconds("run_payroll") for _ in range(3))
+        assert seconds < BUDGET_SECONDS, (
+            f"importing run_payroll took {seconds:.3f}s (budget {BUDGET_SECONDS}s); "
+            "look for a module-level import of a heavy library")
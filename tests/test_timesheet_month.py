@@ -0,0 +1,110 @@
+"""TimesheetMonth must be a drop-in for a list of TimesheetDay.
+
+The columnar month packs the same attendance into arrays; these check it
+hands every day back unchanged, that its precomputed totals are the sums
+the calculators used to take, and that payslips do not move.
+"""
+
+import pickle
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from src.calculators import PayrollEngine
+from src.loaders import load_timesheet_folder
+from src.models import TimesheetDay, TimesheetMonth, timesheet_columns, timesheet_total
+
+from tests.test_batch import PAYROLL_DATE, month_of_days, workforce
+
+
+def as_months(timesheets):
+    return {i: TimesheetMonth(i, 2026, 4, days) for i, days in timesheets.items()}
+
+
+class TestRoundTrip:
+    def test_days_come_back_unchanged(self):
+        days = month_of_days(2, sick=(13, 14), ot=(9,), adj=(Decimal("5000"), Decimal("0.5")))
+        tm = TimesheetMonth(2, 2026, 4, days)
+        assert len(tm) == len(days)
+        assert list(tm) == days and tm == days
+        assert tm[-1] == days[-1] and tm[2:5] == days[2:5]
+        with pytest.raises(IndexError):
+            tm[len(days)]
+
+    def test_decimal_formatting_is_preserved(self):
+        tm = TimesheetMonth(1, 2026, 4, month_of_days(1, hours=Decimal("10")))
+        assert str(tm[0].hours_normal) == "10"
+        tm = TimesheetMonth(1, 2026, 4, month_of_days(1))
+        assert str(tm[0].hours_normal) == "8.67"
+
+    def test_values_too_large_to_pack_are_kept(self):
+        days = month_of_days(1)
+        days[0].adj_no_housing = Decimal("1E+200")
+        days[1].hours_normal = Decimal("0.1234567890123456789012345")
+        assert list(TimesheetMonth(1, 2026, 4, days)) == days
+
+    def test_pickles(self):
+        tm = TimesheetMonth(1, 2026, 4, month_of_days(1, absent=(7,)))
+        again = pickle.loads(pickle.dumps(tm))
+        assert again == tm and again.totals == tm.totals
+
+    def test_refuses_other_months_and_employees(self):
+        with pytest.raises(ValueError):
+            TimesheetMonth(1, 2026, 5, month_of_days(1))
+        with pytest.raises(ValueError):
+            TimesheetMonth(2, 2026, 4, month_of_days(1))
+
+
+class TestTotals:
+    @pytest.mark.parametrize("field", TimesheetMonth.FIELDS)
+    def test_totals_match_sum(self, field):
+        days = month_of_days(1, absent=(7, 8), ot=(9, 10), adj=(Decimal("5000"), Decimal("7")))
+        tm = TimesheetMonth(1, 2026, 4, days)
+        expected = sum(getattr(d, field) for d in days)
+        assert timesheet_total(tm, field) == timesheet_total(days, field) == expected
+
+    def test_columns_and_absences(self):
+        days = month_of_days(3, absent=(20, 21), sick=(22,))
+        tm = TimesheetMonth(3, 2026, 4, days)
+        assert timesheet_columns(tm, "date", "sick") == timesheet_columns(days, "date", "sick")
+        assert tm.absences() == [d for d in days if d.absent]
+        assert tm.days_worked == sum(1 for d in days if d.hours_normal > 0)
+
+    def test_week_totals_by_monday(self):
+        days = month_of_days(1, ot=(9, 10))
+        tm = TimesheetMonth(1, 2026, 4, days)
+        # April 2026 starts on a Wednesday: its first week began in March.
+        assert min(tm.week_totals) == date(2026, 3, 30)
+        assert all(monday.weekday() == 0 for monday in tm.week_totals)
+        for monday, hours in tm.week_totals.items():
+            assert hours == sum(d.hours_normal + d.hours_ot_1_5 + d.hours_ot_2_0
+                                for d in days if 0 <= (d.date - monday).days < 7)
+
+    def test_empty_month(self):
+        tm = TimesheetMonth(1, 2026, 4)
+        assert len(tm) == 0 and list(tm) == []
+        assert timesheet_total(tm, "hours_normal") == 0
+
+
+class TestPayslips:
+    def test_batch_is_unchanged(self):
+        employees, contracts, timesheets, stocks = workforce()
+        engine = PayrollEngine(PAYROLL_DATE)
+        expected = engine.process_batch(employees, contracts, timesheets, stocks)
+        months = as_months(timesheets)
+        assert engine.process_batch(employees, contracts, months, stocks) == expected
+        assert engine.process_batch(employees, contracts, months, stocks, workers=2) == expected
+
+    def test_loader_returns_months(self, tmp_path):
+        (tmp_path / "beth_1.tsv").write_text(
+            "date\thrs_wrkd\thrs_miss\thrs_sik\thrs_ot_1_5\thrs_ot_2_0\n"
+            "2026-04-01\t8.67\t\t\t1\t\n"
+            "2026-04-02\t\t8.67\t\t\t\n"
+            "2026-05-01\t8\t\t\t\t\n"
+        )
+        tm = load_timesheet_folder(tmp_path, 2026, 4)[1]
+        assert isinstance(tm, TimesheetMonth) and len(tm) == 2
+        assert tm[0].date == date(2026, 4, 1) and tm[1].absent
+        assert timesheet_total(tm, "hours_ot_1_5") == Decimal("1")
+        assert isinstance(tm[0], TimesheetDay)
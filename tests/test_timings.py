@@ -0,0 +1,59 @@
+"""Stage timings must observe the engine without changing what it computes.
+
+Every employee computed has to show up once in each per-employee stage,
+whether the batch ran serially or across worker processes, and the
+payslips have to be the ones an untimed run produces.
+"""
+
+import json
+
+from src.calculators import PayrollEngine
+from src.timings import StageTimings
+
+from tests.test_batch import PAYROLL_DATE, workforce
+
+
+def timed_batch(workers=1, backend="decimal"):
+    engine = PayrollEngine(PAYROLL_DATE, backend=backend)
+    engine.timings = StageTimings()
+    return engine.process_batch(*workforce(), workers=workers), engine.timings
+
+
+class TestStageTimings:
+    def test_payslips_are_unchanged(self):
+        payslips, _ = timed_batch()
+        assert payslips == PayrollEngine(PAYROLL_DATE).process_batch(*workforce())
+
+    def test_every_employee_is_counted_once_per_stage(self):
+        payslips, timings = timed_batch()
+        summary = timings.summary()
+        n = len(payslips)
+        for stage in ("leave", "gross", "housing_benefit", "validation"):
+            assert summary[stage]["calls"] == n
+        # The settlement runs once over the whole column.
+        assert (summary["settle"]["calls"], summary["settle"]["rows"]) == (1, n)
+        assert list(summary)[:2] == ["leave", "gross"]
+
+    def test_worker_timings_are_merged(self):
+        payslips, timings = timed_batch(workers=2)
+        assert timings.summary()["leave"]["calls"] == len(payslips)
+        assert timings.summary()["settle"]["rows"] == len(payslips)
+
+    def test_cents_backend_runs_gross_and_settle_as_one_stage_each(self):
+        payslips, timings = timed_batch(backend="cents")
+        summary = timings.summary()
+        assert summary["gross"]["calls"] == len(payslips)
+        assert summary["settle"]["rows"] == len(payslips)
+        assert "adjustments" not in summary and "paye" not in summary
+
+    def test_percentiles_and_json(self):
+        timings = StageTimings()
+        for ms in range(1, 101):
+            timings.add("gross", ms / 1000)
+        s = timings.summary()["gross"]
+        assert (s["p50"], s["p95"], s["max"]) == (0.05, 0.095, 0.1)
+        data = json.loads(timings.to_json(period="2026-04"))
+        assert data["period"] == "2026-04" and data["stages"]["gross"]["calls"] == 100
+
+    def test_off_by_default(self):
+        assert PayrollEngine(PAYROLL_DATE).timings is None
@@ -0,0 +1,85 @@
+"""The check registry must find what the separate warning walks found.
+
+One pass over the days now drives every check, so each finding has to
+carry the same message the payslip always printed, plus the figures behind
+it -- and a check switched off must leave no trace on the payslip.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from src.calculators import PayrollEngine, default_leave_stock
+from src.serialize import payslip_from_dict, payslip_to_dict
+from src.validation import CHECKS, Check, register, run_checks
+
+from tests.test_batch import PAYROLL_DATE, contract, employee, month_of_days
+
+
+def long_days():
+    """April 2026 with an 11-hour Monday (6th) and a 60-hour week (13th-18th)."""
+    days = month_of_days(1, hours=Decimal("8"))
+    for d in days:
+        if d.date.day == 6:
+            d.hours_normal = Decimal("11")
+        if 13 <= d.date.day <= 18:
+            d.hours_normal = Decimal("10")
+    return days
+
+
+def payslip(days, c=None, **kw):
+    c = c or contract(1, "fixed_monthly")
+    engine = PayrollEngine(PAYROLL_DATE, **kw)
+    return engine.process(employee(1), c, days, default_leave_stock(1, c, PAYROLL_DATE))
+
+
+class TestFindings:
+    def test_findings_are_structured_and_match_the_warnings(self):
+        ps = payslip(long_days())
+        assert [f.message for f in ps.findings] == ps.warnings
+        daily = [f for f in ps.findings if f.code == "overtime_unrecorded"]
+        assert [(f.day, f.value, f.limit) for f in daily][0] == (
+            date(2026, 4, 6), Decimal("11"), Decimal("9"))
+        (weekly,) = [f for f in ps.findings if f.code == "weekly_max"]
+        assert (weekly.severity, weekly.day, weekly.value, weekly.limit) == (
+            "breach", date(2026, 4, 13), Decimal("60"), Decimal("52"))
+
+    def test_minimum_wage_finding_carries_the_rate(self):
+        c = contract(1, "fixed_monthly", base=Decimal("5000"))
+        (f,) = payslip(month_of_days(1, hours=Decimal("8")), c).findings
+        assert (f.code, f.severity, f.day) == ("min_wage", "breach", None)
+        assert f.value < f.limit
+
+    def test_checks_can_be_switched_off(self):
+        ps = payslip(long_days(), checks=["min_wage", "contract_coverage"])
+        assert ps.findings == [] and ps.warnings is None
+
+    def test_unknown_check_is_refused(self):
+        with pytest.raises(ValueError):
+            PayrollEngine(PAYROLL_DATE, checks=["no_such_check"])
+
+    def test_findings_survive_the_cache_format(self):
+        ps = payslip(long_days())
+        assert payslip_from_dict(payslip_to_dict(ps)) == ps
+
+
+class TestRegistry:
+    def test_registered_check_runs_in_the_same_pass(self, monkeypatch):
+        monkeypatch.setattr("src.validation.CHECKS", dict(CHECKS))
+
+        @register
+        class Saturdays(Check):
+            code = "saturdays"
+            severity = "info"
+
+            def day(self, day, normal, ot_1_5, ot_2_0):
+                if day.weekday() == 5 and normal:
+                    self.flag(f"{day}: Saturday", day=day, value=normal)
+
+        found = run_checks(month_of_days(1), ["saturdays"])
+        assert [f.day.day for f in found] == [4, 11, 18, 25]
+
+    def test_a_code_is_registered_once(self):
+        with pytest.raises(ValueError):
+            register(type("Again", (Check,), {"code": "weekly_max"}))
@@ -0,0 +1,93 @@
+"""YTD accumulators and the P9 store must carry the run's figures exactly.
+
+The store is only useful if a card read back from it is the payslips that
+were recorded, to the last digit, and if recording a month again replaces
+it rather than adding to it.
+"""
+
+from datetime import date
+
+import pytest
+
+from src.calculators import PayrollEngine
+from src.models import YTDTotals
+from src.outputs import P9Generator
+from src.ytd import YTDStore
+
+from tests.test_batch import workforce
+
+
+def run_month(month):
+    engine = PayrollEngine(date(2026, month, 28))
+    employees, contracts, timesheets, leave_stocks = workforce()
+    return engine, employees, engine.process_batch(employees, contracts, timesheets,
+                                                   leave_stocks)
+
+
+class TestTaxMonths:
+    def test_figures_match_the_payslips(self):
+        engine, _, payslips = run_month(4)
+        for ps, m in zip(payslips, engine.tax_months(payslips)):
+            d = ps.deductions
+            assert (m.employee_id, m.year, m.month) == (ps.employee.employee_id, 2026, 4)
+            assert m.gross == ps.gross.total_gross
+            assert m.nssf == d.nssf_tier_1 + d.nssf_tier_2
+            assert m.chargeable == PayrollEngine._chargeable(ps.gross, d)
+            assert m.paye == d.paye
+            assert m.tax_charged - m.relief == m.paye
+
+    def test_add_rejects_a_month_already_counted(self):
+        engine, _, payslips = run_month(3)
+        (m, *_) = engine.tax_months(payslips)
+        with pytest.raises(ValueError):
+            YTDTotals(m.employee_id, 2026, through_month=3).add(m)
+
+
+class TestYTDStore:
+    def test_cards_read_back_exactly(self, tmp_path):
+        with YTDStore(tmp_path / "ytd.sqlite") as store:
+            expected = {}
+            for month in (1, 2, 3):
+                engine, _, payslips = run_month(month)
+                store.record(2026, month, engine.tax_months(payslips),
+                             [ps.employee for ps in payslips])
+                for m in engine.tax_months(payslips):
+                    before = expected.get(m.employee_id) or YTDTotals(m.employee_id, 2026)
+                    expected[m.employee_id] = before.add(m)
+            cards = store.cards(2026)
+            assert store.recorded_months(2026) == [1, 2, 3]
+            assert store.totals(2026) == expected
+            assert store.totals(2026, through_month=1)[1].through_month == 1
+
+        card = cards[1]
+        assert card.name == "Employee 1" and card.kra_pin == "A000000001X"
+        assert [m.month for m in card.months] == [1, 2, 3]
+        assert card.totals == expected[1]
+
+    def test_recording_again_replaces_the_month(self, tmp_path):
+        engine, _, payslips = run_month(4)
+        months = engine.tax_months(payslips)
+        with YTDStore(tmp_path / "ytd.sqlite") as store:
+            store.record(2026, 4, months, [ps.employee for ps in payslips])
+            store.record(2026, 4, months[:2], [ps.employee for ps in payslips[:2]],
+                         source="replay")
+            cards = store.cards(2026)
+        assert sorted(cards) == [m.employee_id for m in months[:2]]
+
+    def test_rejects_months_from_another_period(self, tmp_path):
+        engine, _, payslips = run_month(4)
+        with YTDStore(tmp_path / "ytd.sqlite") as store:
+            with pytest.raises(ValueError):
+                store.record(2026, 5, engine.tax_months(payslips), [])
+
+    def test_p9_card_totals_row(self, tmp_path):
+        engine, _, payslips = run_month(4)
+        with YTDStore(tmp_path / "ytd.sqlite") as store:
+            store.record(2026, 4, engine.tax_months(payslips),
+                         [ps.employee for ps in payslips])
+            cards = store.cards(2026)
+        lines = P9Generator(cards).to_p9_csv(1).splitlines()
+        april, total = lines[-2].split(","), lines[-1].split(",")
+        assert april[0] == "April" and total[0] == "Total"
+        assert april[1:] == total[1:]
+        assert len(P9Generator(cards).to_summary_csv().splitlines()) == len(cards) + 1